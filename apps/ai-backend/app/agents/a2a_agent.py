@@ -28,6 +28,7 @@ from app.agents.a2a_models import (
     FitOSCalendarEvent,
     FitOSHealthRecord,
 )
+from app.outcome_verification.activity_bitmap import get_activity_bitmap_store
 
 
 # Initialize Supabase client
@@ -372,6 +373,13 @@ class FitOSAgent:
             'is_synced': True,
         }).execute()
 
+        # Keep nutrition consistency current without waiting for a sync
+        get_activity_bitmap_store().record(
+            user_id,
+            'nutrition',
+            [{'id': result.data[0]['id'], 'date': nutrition_entry.timestamp.date()}]
+        )
+
         return {
             "success": True,
             "entry_id": result.data[0]['id']
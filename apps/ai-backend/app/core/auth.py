@@ -4,22 +4,24 @@ Validates Supabase-issued JWTs and extracts the authenticated user_id.
 Used as a FastAPI Depends() on all endpoints that handle user data.
 """
 
+from typing import Optional
+
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, WebSocket, WebSocketException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
 
 security = HTTPBearer()
 
+# `role` claim of the Supabase service key, used by backend workers
+SERVICE_ROLE = "service_role"
 
-def get_current_user_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> str:
-    """Extract and validate user_id from Supabase JWT.
 
-    Returns the `sub` claim (Supabase user UUID).
-    Raises 401 on missing, expired, or invalid tokens.
+def claims_from_token(token: str) -> dict:
+    """Validate a Supabase JWT and return its claims.
+
+    Raises 401 on expired or invalid tokens.
     """
     secret = settings.SUPABASE_JWT_SECRET
     if not secret:
@@ -28,21 +30,13 @@ def get_current_user_id(
             detail="Server misconfiguration: JWT secret not set",
         )
 
-    token = credentials.credentials
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token,
             secret,
             algorithms=["HS256"],
             options={"verify_exp": True, "verify_aud": False},
         )
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token: missing sub claim",
-            )
-        return user_id
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -54,3 +48,110 @@ def get_current_user_id(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {e}",
         )
+
+
+def user_id_from_token(token: str) -> str:
+    """Validate a Supabase JWT and return its `sub` claim.
+
+    Raises 401 on expired or invalid tokens.
+    """
+    user_id = claims_from_token(token).get("sub")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token: missing sub claim",
+        )
+    return user_id
+
+
+def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> str:
+    """Extract and validate user_id from Supabase JWT.
+
+    Returns the `sub` claim (Supabase user UUID).
+    Raises 401 on missing, expired, or invalid tokens.
+    """
+    return user_id_from_token(credentials.credentials)
+
+
+def get_token_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> dict:
+    """Validated claims of the bearer JWT (a user or a backend service).
+
+    Raises 401 on missing, expired, or invalid tokens.
+    """
+    return claims_from_token(credentials.credentials)
+
+
+def is_service(claims: dict) -> bool:
+    """Whether the token is the Supabase service key (backend workers)"""
+    return claims.get("role") == SERVICE_ROLE
+
+
+def require_service_role(claims: dict = Depends(get_token_claims)) -> dict:
+    """Allow only backend services (workers, schedulers).
+
+    Raises 403 for user tokens.
+    """
+    if not is_service(claims):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Service role required",
+        )
+    return claims
+
+
+def require_self_or_service(user_id: str, claims: dict) -> None:
+    """Allow acting on a user's data as that user or as a backend service.
+
+    Raises 403 for anyone else.
+    """
+    if not is_service(claims) and claims.get("sub") != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+
+
+def require_client_access(user_id: str, client_id: str, supabase) -> None:
+    """Allow a client to read their own data, or their trainer to read it.
+
+    Raises 403 for anyone else.
+    """
+    if user_id == client_id:
+        return
+    result = (supabase.table('client_profiles')
+              .select('id')
+              .eq('id', client_id)
+              .eq('trainer_id', user_id)
+              .limit(1)
+              .execute())
+    if not result.data:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+
+
+def get_websocket_user_id(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+) -> str:
+    """Extract and validate user_id for a WebSocket connection.
+
+    Browsers can't set headers on WebSockets, so the JWT may come as a
+    `token` query parameter as well as an Authorization: Bearer header.
+    Closes the connection with 1008 (policy violation) if it is missing
+    or invalid.
+    """
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    if not token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Not authenticated")
+    try:
+        return user_id_from_token(token)
+    except HTTPException as e:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
@@ -26,6 +26,25 @@ class Settings(BaseSettings):
 
     # Voice AI
     DEEPGRAM_API_KEY: str | None = None
+    ELEVENLABS_API_KEY: str | None = None
+    TTS_CACHE_DIR: str = "data/tts_cache"
+    TTS_CACHE_MEMORY_MB: int = 64
+    TTS_CACHE_DISK_MB: int = 1024
+    TTS_CACHE_MAX_CHARS: int = 120  # Longer fragments are never cached
+    TTS_PREWARM_ON_STARTUP: bool = False  # Only with a persistent TTS_CACHE_DIR; otherwise every cold start re-synthesizes
+    TTS_PREWARM_PHRASES: dict[str, list[str]] = {}  # Extra phrases per voice profile
+    VOICE_AUDIO_RETENTION_KB: int = 2048  # Spoken audio kept in memory per session
+    VOICE_AUDIO_SPILL_MB: int = 0  # Also keep this much on disk (0 = off)
+    VOICE_AUDIO_SPILL_DIR: str | None = None  # Defaults to the system temp dir
+    VOICE_MAX_SESSIONS: int = 50  # Per worker
+    VOICE_SESSION_IDLE_SECONDS: int = 300
+    VOICE_PAUSE_STATS_USERS: int = 10000  # Users whose pause statistics are kept
+    VOICE_SHED_CAPACITY_FRACTION: float = 0.5  # Admission cap while latency is degraded
+    VOICE_SHED_TTS_P95_MS: float = 800.0
+    VOICE_SHED_FIRST_AUDIO_P95_MS: float = 1500.0
+    VOICE_SPECULATION_ENABLED: bool = True  # Start the LLM on stable interim transcripts
+    VOICE_SPECULATION_MIN_SIMILARITY: float = 0.9  # Final vs speculated transcript
+    VOICE_SPECULATION_MAX_PER_TURN: int = 2
 
     # Database
     SUPABASE_URL: str = "http://localhost:54321"
@@ -40,6 +59,14 @@ class Settings(BaseSettings):
     # Wearables
     TERRA_API_KEY: str | None = None
     TERRA_DEV_ID: str | None = None
+    WEARABLE_STORE_PATH: str = "data/wearables.sqlite3"
+    HEALTH_QUERY_CACHE_SIZE: int = 2048  # (user, metric, range) results kept by the health MCP server
+    CORRELATION_CACHE_SIZE: int = 1024  # (user, metric pair, range) correlation results
+    CORRELATION_CACHE_TTL_SECONDS: int = 900  # Workout logs carry no sync version
+    CORRELATION_BOOTSTRAP_SAMPLES: int = 1000
+
+    # Outcome Verification
+    ACTIVITY_BITMAP_PATH: str = "data/activity_bitmaps.sqlite3"
 
     # Error Tracking
     SENTRY_DSN: str | None = None
@@ -0,0 +1,21 @@
+"""Shared Supabase client.
+
+State that every API instance must see (precomputed results, schedules,
+counters) lives in Supabase rather than on an instance's local disk.
+"""
+
+from typing import Optional
+
+from supabase import Client, create_client
+
+from app.core.config import settings
+
+_supabase: Optional[Client] = None
+
+
+def get_supabase_client() -> Client:
+    """Get or create global Supabase client (service role)"""
+    global _supabase
+    if _supabase is None:
+        _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+    return _supabase
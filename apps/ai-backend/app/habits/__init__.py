@@ -23,6 +23,7 @@ from app.habits.habit_formation import (
     HabitProgress,
     get_habit_formation,
 )
+from app.habits.completion_history import CompletionHistory
 from app.habits.habit_stacking import (
     HabitStackingEngine,
     StackSuggestion,
@@ -34,6 +35,11 @@ from app.habits.context_notifications import (
     NotificationTiming,
     get_notification_engine,
 )
+from app.habits.notification_scheduler import (
+    Delivery,
+    NotificationScheduler,
+    get_notification_scheduler,
+)
 
 __all__ = [
     "HabitFormation",
@@ -43,6 +49,7 @@ __all__ = [
     "HabitDifficulty",
     "HabitProgress",
     "get_habit_formation",
+    "CompletionHistory",
     "HabitStackingEngine",
     "StackSuggestion",
     "get_habit_stacking_engine",
@@ -50,4 +57,7 @@ __all__ = [
     "NotificationContext",
     "NotificationTiming",
     "get_notification_engine",
+    "NotificationScheduler",
+    "Delivery",
+    "get_notification_scheduler",
 ]
@@ -0,0 +1,122 @@
+"""
+Habit Completion History
+
+Day-indexed completion bits for many habits at once.
+
+Every habit gets one bit per day from its first tracked day through
+"today", laid out back to back in a single boolean array with a zero gap
+between habits. Streaks fall out of one run-length pass over that array,
+so evaluating every habit of every client costs a few NumPy calls rather
+than a sort-and-walk per habit.
+
+Sprint 38: 66-Day Habit Tracking
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _epoch_days(dates: Sequence[date]) -> np.ndarray:
+    # toordinal() is much cheaper than NumPy's date -> datetime64 conversion
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+    return ordinals - _EPOCH_ORDINAL
+
+
+@dataclass
+class CompletionHistory:
+    """
+    Completion bits for a batch of habits.
+
+    Habit i's days are bits[offsets[i]:offsets[i] + lengths[i]], bit j being
+    origins[i] + j days; bits[offsets[i] + lengths[i]] is always False so
+    runs never join across habits.
+    """
+
+    origins: np.ndarray  # int64 epoch days
+    lengths: np.ndarray  # int64 days per habit
+    offsets: np.ndarray  # int64, len(habits) + 1
+    bits: np.ndarray  # bool
+
+    @classmethod
+    def from_logs(
+        cls,
+        start_dates: Sequence[date],
+        completion_logs: Sequence[Sequence[date]],
+        current_dates: Sequence[date],
+    ) -> "CompletionHistory":
+        """
+        Build from per-habit completion dates.
+
+        Duplicate dates count once. Only completions from a habit's start
+        date through its current date are tracked; dates outside that
+        window are ignored.
+        """
+        n = len(start_dates)
+        start = _epoch_days(start_dates)
+        current = _epoch_days(current_dates)
+
+        counts = np.array([len(log) for log in completion_logs], dtype=np.int64)
+        habit = np.repeat(np.arange(n), counts)
+        day = _epoch_days([d for log in completion_logs for d in log])
+
+        keep = (day >= start[habit]) & (day <= current[habit])
+        habit, day = habit[keep], day[keep]
+
+        lengths = np.maximum(current - start + 1, 0)
+        offsets = np.concatenate([[0], np.cumsum(lengths + 1)])
+
+        bits = np.zeros(int(offsets[-1]), dtype=bool)
+        bits[offsets[habit] + day - start[habit]] = True
+
+        return cls(origins=start, lengths=lengths, offsets=offsets, bits=bits)
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def row(self, i: int) -> np.ndarray:
+        """Completion bits for one habit, origin first"""
+        start = int(self.offsets[i])
+        return self.bits[start:start + int(self.lengths[i])]
+
+    def completed_days(self) -> np.ndarray:
+        """Distinct completed days per habit"""
+        total = np.concatenate([[0], np.cumsum(self.bits)])
+        return total[self.offsets[1:]] - total[self.offsets[:-1]]
+
+    def streaks(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Current and longest streak per habit.
+
+        The current streak is the run of completed days ending on the
+        habit's current date (0 if it isn't completed yet today).
+        """
+        n = len(self)
+        edges = np.diff(np.concatenate([[0], self.bits.view(np.int8), [0]]))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        run_lengths = run_ends - run_starts
+        run_habit = np.searchsorted(self.offsets, run_starts, side="right") - 1
+
+        longest = np.zeros(n, dtype=np.int64)
+        np.maximum.at(longest, run_habit, run_lengths)
+
+        current = np.zeros(n, dtype=np.int64)
+        ends_today = run_ends == self.offsets[run_habit] + self.lengths[run_habit]
+        current[run_habit[ends_today]] = run_lengths[ends_today]
+        return current, longest
+
+    def last_completed(self) -> list[Optional[date]]:
+        """Most recent completed day per habit"""
+        positions = np.flatnonzero(self.bits)
+        habit = np.searchsorted(self.offsets, positions, side="right") - 1
+        last = np.full(len(self), -1, dtype=np.int64)
+        np.maximum.at(last, habit, positions - self.offsets[habit])
+        days = (self.origins + last).astype("datetime64[D]").astype(object)
+        return [d if offset >= 0 else None for d, offset in zip(days, last)]
+
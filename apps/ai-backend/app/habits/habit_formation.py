@@ -16,14 +16,21 @@ Key Findings:
 - Complex habits (gym workout): 4-7 months
 - Consistency matters more than perfection (missing 1 day doesn't reset)
 
+Completion logs are evaluated as day-indexed bit arrays (see
+completion_history), so streaks and risk for many habits are computed
+together.
+
 Sprint 38: 66-Day Habit Tracking
 """
 
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Optional, Literal
+from typing import Optional, Literal, Sequence
 from enum import Enum
-import math
+
+import numpy as np
+
+from app.habits.completion_history import CompletionHistory
 
 
 class HabitType(str, Enum):
@@ -148,157 +155,147 @@ class HabitFormation:
             difficulty: Complexity level
             time_preference: Time of day preference
             start_date: When habit tracking started
-            completion_log: List of dates when habit was completed
+            completion_log: List of dates when habit was completed; dates
+                before start_date or after current_date are ignored
             current_date: Today's date (defaults to today)
 
         Returns:
             HabitProgress with formation metrics and insights
         """
-        if current_date is None:
-            current_date = date.today()
-
-        # Days elapsed
-        days_elapsed = (current_date - start_date).days + 1  # Include start day
-
-        # Target days based on difficulty
-        target_days = self.FORMATION_DAYS[difficulty]
-
-        # Sort completion log
-        completion_log_sorted = sorted(completion_log)
+        return self.calculate_progress_batch(
+            [
+                {
+                    "habit_id": habit_id,
+                    "habit_name": habit_name,
+                    "habit_type": habit_type,
+                    "difficulty": difficulty,
+                    "time_preference": time_preference,
+                    "start_date": start_date,
+                    "completion_log": completion_log,
+                }
+            ],
+            current_date=current_date,
+        )[0]
+
+    def calculate_progress_batch(
+        self,
+        habits: Sequence[dict],
+        current_date: date = None,
+        include_notes: bool = True,
+    ) -> list[HabitProgress]:
+        """
+        Calculate progress for many habits in one vectorized pass.
 
-        # Days completed
-        days_completed = len(completion_log_sorted)
+        Args:
+            habits: Dicts with the calculate_progress arguments; a habit may
+                carry its own "current_date"
+            current_date: Default for habits without one (defaults to today)
+            include_notes: Generate insight notes (skip for dashboards)
 
-        # Calculate streaks
-        current_streak = self._calculate_current_streak(
-            completion_log_sorted, current_date
+        Returns:
+            HabitProgress per habit, in input order
+        """
+        if current_date is None:
+            current_date = date.today()
+        if not habits:
+            return []
+
+        current_dates = [h.get("current_date") or current_date for h in habits]
+        history = CompletionHistory.from_logs(
+            start_dates=[h["start_date"] for h in habits],
+            completion_logs=[h["completion_log"] for h in habits],
+            current_dates=current_dates,
         )
-        longest_streak = self._calculate_longest_streak(completion_log_sorted)
 
-        # Days missed
-        days_missed = days_elapsed - days_completed
+        # Days elapsed (including start day)
+        days_elapsed = np.array(
+            [(today - h["start_date"]).days + 1 for h, today in zip(habits, current_dates)]
+        )
 
-        # Completion rate
-        completion_rate = days_completed / days_elapsed if days_elapsed > 0 else 0.0
+        # Target days based on difficulty
+        target_days = np.array([self.FORMATION_DAYS[h["difficulty"]] for h in habits])
 
-        # Automaticity score (asymptotic curve)
-        automaticity_score = self._calculate_automaticity(
-            days_completed, target_days
-        )
+        days_completed = history.completed_days()
+        current_streak, longest_streak = history.streaks()
+        days_missed = np.maximum(days_elapsed - days_completed, 0)
 
-        # Formation progress
-        formation_progress = min(days_completed / target_days, 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            completion_rate = np.where(days_elapsed > 0, days_completed / days_elapsed, 0.0)
 
-        # Formation stage
+        automaticity_score = self._calculate_automaticity(days_completed, target_days)
+        formation_progress = np.minimum(days_completed / target_days, 1.0)
         formation_stage = self._determine_formation_stage(
             days_completed, target_days, completion_rate
         )
-
-        # Estimated days remaining
         estimated_days_remaining = self._estimate_days_remaining(
             days_completed, target_days, completion_rate
         )
-
-        # On track?
         on_track = self._is_on_track(days_elapsed, days_completed, target_days)
-
-        # Risk level
         risk_level = self._assess_risk_level(
             current_streak, completion_rate, days_elapsed
         )
+        last_completed = history.last_completed()
+
+        results = []
+        for i, h in enumerate(habits):
+            notes = []
+            if include_notes:
+                notes = self._generate_insights(
+                    int(days_completed[i]),
+                    int(target_days[i]),
+                    int(current_streak[i]),
+                    float(completion_rate[i]),
+                    str(formation_stage[i]),
+                    h["time_preference"],
+                )
+            results.append(
+                HabitProgress(
+                    habit_id=h["habit_id"],
+                    habit_name=h["habit_name"],
+                    habit_type=h["habit_type"],
+                    difficulty=h["difficulty"],
+                    time_preference=h["time_preference"],
+                    start_date=h["start_date"],
+                    target_days=int(target_days[i]),
+                    current_streak=int(current_streak[i]),
+                    longest_streak=int(longest_streak[i]),
+                    days_completed=int(days_completed[i]),
+                    days_missed=int(days_missed[i]),
+                    completion_rate=float(completion_rate[i]),
+                    automaticity_score=float(automaticity_score[i]),
+                    formation_progress=float(formation_progress[i]),
+                    formation_stage=str(formation_stage[i]),
+                    estimated_days_remaining=int(estimated_days_remaining[i]),
+                    on_track=bool(on_track[i]),
+                    risk_level=str(risk_level[i]),
+                    last_completed=last_completed[i],
+                    notes=notes,
+                )
+            )
+        return results
 
-        # Last completed
-        last_completed = completion_log_sorted[-1] if completion_log_sorted else None
-
-        # Generate insights
-        notes = self._generate_insights(
-            days_completed,
-            target_days,
-            current_streak,
-            completion_rate,
-            formation_stage,
-            time_preference,
-        )
-
-        return HabitProgress(
-            habit_id=habit_id,
-            habit_name=habit_name,
-            habit_type=habit_type,
-            difficulty=difficulty,
-            time_preference=time_preference,
-            start_date=start_date,
-            target_days=target_days,
-            current_streak=current_streak,
-            longest_streak=longest_streak,
-            days_completed=days_completed,
-            days_missed=days_missed,
-            completion_rate=completion_rate,
-            automaticity_score=automaticity_score,
-            formation_progress=formation_progress,
-            formation_stage=formation_stage,
-            estimated_days_remaining=estimated_days_remaining,
-            on_track=on_track,
-            risk_level=risk_level,
-            last_completed=last_completed,
-            notes=notes,
-        )
-
-    def _calculate_current_streak(
-        self, completion_log: list[date], current_date: date
-    ) -> int:
-        """Calculate current consecutive streak"""
-        if not completion_log:
-            return 0
-
-        streak = 0
-        check_date = current_date
-
-        # Work backwards from today
-        while check_date in completion_log:
-            streak += 1
-            check_date -= timedelta(days=1)
-
-        return streak
-
-    def _calculate_longest_streak(self, completion_log: list[date]) -> int:
-        """Calculate longest streak ever achieved"""
-        if not completion_log:
-            return 0
-
-        longest = 1
-        current = 1
-
-        for i in range(1, len(completion_log)):
-            days_apart = (completion_log[i] - completion_log[i - 1]).days
-
-            if days_apart == 1:
-                current += 1
-                longest = max(longest, current)
-            else:
-                current = 1
-
-        return longest
-
-    def _calculate_automaticity(self, days_completed: int, target_days: int) -> float:
+    def _calculate_automaticity(
+        self, days_completed: np.ndarray, target_days: np.ndarray
+    ) -> np.ndarray:
         """
         Calculate automaticity score using asymptotic curve.
 
         Based on Lally et al. (2010): Automaticity increases rapidly in first
         20 days, then plateaus around target_days.
 
-        Returns: 0.0-1.0 score
+        Returns: 0.0-1.0 score per habit
         """
         # Asymptotic curve: 1 - e^(-k * x)
         # Plateaus at ~0.95 when x = target_days
         k = self.AUTOMATICITY_CURVE_K
-        automaticity = 1 - math.exp(-k * days_completed)
+        automaticity = 1 - np.exp(-k * days_completed)
 
         # Cap at 1.0
-        return min(automaticity, 1.0)
+        return np.minimum(automaticity, 1.0)
 
     def _determine_formation_stage(
-        self, days_completed: int, target_days: int, completion_rate: float
-    ) -> str:
+        self, days_completed: np.ndarray, target_days: np.ndarray, completion_rate: np.ndarray
+    ) -> np.ndarray:
         """
         Determine habit formation stage.
 
@@ -308,60 +305,54 @@ class HabitFormation:
         - Stability (22-66 days): Routine established, low effort
         - Mastery (66+ days): Automatic behavior, minimal effort
         """
-        if days_completed < 7:
-            return "initiation"
-        elif days_completed < 21:
-            return "learning"
-        elif days_completed < target_days:
-            return "stability"
-        else:
-            return "mastery"
+        return np.select(
+            [days_completed < 7, days_completed < 21, days_completed < target_days],
+            ["initiation", "learning", "stability"],
+            "mastery",
+        )
 
     def _estimate_days_remaining(
-        self, days_completed: int, target_days: int, completion_rate: float
-    ) -> int:
+        self, days_completed: np.ndarray, target_days: np.ndarray, completion_rate: np.ndarray
+    ) -> np.ndarray:
         """
         Estimate days remaining to habit formation.
 
         Uses completion rate to project timeline.
         """
-        if days_completed >= target_days:
-            return 0
-
         days_remaining = target_days - days_completed
 
-        # If completion rate is low, adjust estimate upward
-        if completion_rate < 0.7:
-            # Assume they'll maintain current rate
-            adjusted_days = int(days_remaining / max(completion_rate, 0.1))
-            return adjusted_days
-        else:
-            return days_remaining
+        # If completion rate is low, assume they'll maintain current rate
+        adjusted_days = np.trunc(days_remaining / np.maximum(completion_rate, 0.1))
+
+        return np.select(
+            [days_completed >= target_days, completion_rate < 0.7],
+            [0, adjusted_days],
+            days_remaining,
+        ).astype(np.int64)
 
     def _is_on_track(
-        self, days_elapsed: int, days_completed: int, target_days: int
-    ) -> bool:
+        self, days_elapsed: np.ndarray, days_completed: np.ndarray, target_days: np.ndarray
+    ) -> np.ndarray:
         """
         Determine if on track to form habit.
 
         On track if completion rate ≥70% and on pace to reach target.
         """
         expected_completion_rate = 0.7  # 70% minimum for "on track"
-        completion_rate = days_completed / days_elapsed if days_elapsed > 0 else 0.0
-
-        if completion_rate < expected_completion_rate:
-            return False
+        with np.errstate(divide="ignore", invalid="ignore"):
+            completion_rate = np.where(days_elapsed > 0, days_completed / days_elapsed, 0.0)
 
-        # Project forward
-        projected_total_days = int(days_elapsed / completion_rate)
-        projected_completions = int(target_days / completion_rate)
+            # Project forward
+            projected_total_days = np.trunc(days_elapsed / completion_rate)
 
         # On track if projected to complete within ~25% of target timeline
-        return projected_total_days <= target_days * 1.25
+        return (completion_rate >= expected_completion_rate) & (
+            projected_total_days <= target_days * 1.25
+        )
 
     def _assess_risk_level(
-        self, current_streak: int, completion_rate: float, days_elapsed: int
-    ) -> str:
+        self, current_streak: np.ndarray, completion_rate: np.ndarray, days_elapsed: np.ndarray
+    ) -> np.ndarray:
         """
         Assess risk of habit abandonment.
 
@@ -370,22 +361,20 @@ class HabitFormation:
         - Zero or low current streak
         - Early abandonment pattern (high in first 2 weeks)
         """
-        # Early abandonment (first 14 days)
-        if days_elapsed <= 14:
-            if completion_rate < 0.5:
-                return "high"
-            elif completion_rate < 0.7:
-                return "medium"
-            else:
-                return "low"
-
-        # Beyond 14 days
-        if completion_rate < 0.6 or current_streak == 0:
-            return "high"
-        elif completion_rate < 0.75 or current_streak < 3:
-            return "medium"
-        else:
-            return "low"
+        early = days_elapsed <= 14
+        return np.select(
+            [
+                # Early abandonment (first 14 days)
+                early & (completion_rate < 0.5),
+                early & (completion_rate < 0.7),
+                early,
+                # Beyond 14 days
+                (completion_rate < 0.6) | (current_streak == 0),
+                (completion_rate < 0.75) | (current_streak < 3),
+            ],
+            ["high", "medium", "low", "high", "medium"],
+            "low",
+        )
 
     def _generate_insights(
         self,
@@ -12,12 +12,16 @@ Key Principles:
 - Stack should be logical and sequential
 - Specificity increases success (when, where, how)
 
+The anchor catalogue is static, so candidates are scored and sorted once
+per (habit type, time preference) when the engine is created.
+
 Sprint 38: 66-Day Habit Tracking
 """
 
 from dataclasses import dataclass, field
 from typing import Optional, Literal
 from enum import Enum
+import heapq
 
 from app.habits.habit_formation import HabitType, HabitTimePreference, HabitDifficulty
 
@@ -62,6 +66,16 @@ class StackSuggestion:
     solutions: list[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class IndexedAnchor:
+    """Pre-scored anchor candidate for one habit type"""
+
+    anchor_type: AnchorType
+    anchor_description: str
+    base_score: float  # Success probability before user-specific adjustments
+    reasoning: str
+
+
 class HabitStackingEngine:
     """
     Generate habit stacking suggestions to increase formation success by 2.3x.
@@ -164,8 +178,72 @@ class HabitStackingEngine:
         HabitType.SOCIAL: [AnchorType.WORK_END, AnchorType.EVENING_ROUTINE],
     }
 
+    # Anchors that fit each time preference
+    TIME_TO_ANCHORS = {
+        HabitTimePreference.MORNING: [
+            AnchorType.WAKE_UP,
+            AnchorType.MORNING_ROUTINE,
+            AnchorType.COMMUTE,
+        ],
+        HabitTimePreference.AFTERNOON: [
+            AnchorType.LUNCH,
+            AnchorType.WORK_END,
+        ],
+        HabitTimePreference.EVENING: [
+            AnchorType.ARRIVE_HOME,
+            AnchorType.DINNER,
+            AnchorType.EVENING_ROUTINE,
+        ],
+        HabitTimePreference.NIGHT: [
+            AnchorType.EVENING_ROUTINE,
+            AnchorType.BEDTIME_ROUTINE,
+        ],
+        HabitTimePreference.AFTER_WORKOUT: [AnchorType.FINISH_WORKOUT],
+        HabitTimePreference.BEFORE_WORKOUT: [AnchorType.ARRIVE_GYM],
+    }
+
+    MAX_SUGGESTIONS = 3
+    EXISTING_ANCHOR_BONUS = 0.05  # Anchors the user already does reliably
+
+    # Difficulty penalty applied to every candidate
+    DIFFICULTY_PENALTY = {
+        HabitDifficulty.SIMPLE: 0.0,
+        HabitDifficulty.MODERATE: -0.05,
+        HabitDifficulty.COMPLEX: -0.1,
+    }
+
     def __init__(self):
-        pass
+        # The anchor catalogue is static, so candidates are scored and
+        # sorted once per (habit type, time preference)
+        self._index: dict[
+            tuple[HabitType, Optional[HabitTimePreference]], tuple[IndexedAnchor, ...]
+        ] = {}
+        self._scores: dict[tuple[AnchorType, HabitType], IndexedAnchor] = {}
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """Pre-score every (anchor, habit type) pair and index optimal anchors"""
+        for habit_type in HabitType:
+            for anchor_type in AnchorType:
+                self._scores[(anchor_type, habit_type)] = IndexedAnchor(
+                    anchor_type=anchor_type,
+                    anchor_description=self.ANCHORS[anchor_type][0],  # Primary anchor
+                    base_score=self._calculate_success_probability(
+                        anchor_type, habit_type, HabitDifficulty.SIMPLE
+                    ),
+                    reasoning=self._generate_reasoning(anchor_type, habit_type),
+                )
+
+            optimal = self.OPTIMAL_ANCHORS.get(habit_type, [])
+            for time_preference in [None, *HabitTimePreference]:
+                anchors = optimal
+                if time_preference:
+                    anchors = self._filter_anchors_by_time(anchors, time_preference)
+                candidates = [self._scores[(a, habit_type)] for a in anchors[:self.MAX_SUGGESTIONS]]
+                # Stable sort keeps catalogue order between equal scores
+                self._index[(habit_type, time_preference)] = tuple(
+                    sorted(candidates, key=lambda c: c.base_score, reverse=True)
+                )
 
     def suggest_stacks(
         self,
@@ -178,6 +256,10 @@ class HabitStackingEngine:
         """
         Generate habit stacking suggestions for a new habit.
 
+        Candidates come pre-sorted from the anchor index; anchors the user
+        already has (matching the time preference) are merged in with a
+        small bonus.
+
         Args:
             new_habit_name: Name of the new habit to form
             habit_type: Category of habit
@@ -188,34 +270,49 @@ class HabitStackingEngine:
         Returns:
             List of StackSuggestion ranked by success probability
         """
-        suggestions = []
-
-        # Get optimal anchors for this habit type
-        optimal_anchors = self.OPTIMAL_ANCHORS.get(habit_type, [])
-
-        # Filter by time preference if specified
-        if time_preference:
-            optimal_anchors = self._filter_anchors_by_time(
-                optimal_anchors, time_preference
+        candidates = self._index[(habit_type, time_preference or None)]
+
+        # User-specific candidates, scored from the precomputed table
+        existing = []
+        if existing_anchors:
+            if time_preference:
+                existing_anchors = self._filter_anchors_by_time(
+                    existing_anchors, time_preference
+                )
+            existing = sorted(
+                (self._scores[(a, habit_type)] for a in dict.fromkeys(existing_anchors)),
+                key=lambda c: c.base_score,
+                reverse=True,
             )
+        bonus = {c.anchor_type: self.EXISTING_ANCHOR_BONUS for c in existing}
+
+        # Top-k merge of the two sorted lists; the difficulty penalty is the
+        # same for every candidate so it doesn't change the order
+        merged = heapq.merge(
+            [(c.base_score + bonus.get(c.anchor_type, 0.0), c) for c in existing],
+            [(c.base_score + bonus.get(c.anchor_type, 0.0), c) for c in candidates],
+            key=lambda item: item[0],
+            reverse=True,
+        )
 
-        # Generate suggestions for each optimal anchor
-        for anchor_type in optimal_anchors[:3]:  # Top 3 anchors
-            # Get anchor descriptions
-            anchor_descriptions = self.ANCHORS.get(anchor_type, [])
-
-            for anchor_desc in anchor_descriptions[:1]:  # Primary anchor
-                suggestion = self._create_stack_suggestion(
-                    anchor_type,
-                    anchor_desc,
+        penalty = self.DIFFICULTY_PENALTY.get(habit_difficulty, 0.0)
+        suggestions = []
+        seen = set()
+        for score, candidate in merged:
+            if candidate.anchor_type in seen:
+                continue
+            seen.add(candidate.anchor_type)
+            suggestions.append(
+                self._create_stack_suggestion(
+                    candidate,
                     new_habit_name,
                     habit_type,
                     habit_difficulty,
+                    success_probability=min(max(score + penalty, 0.0), 1.0),
                 )
-                suggestions.append(suggestion)
-
-        # Sort by success probability
-        suggestions.sort(key=lambda x: x.success_probability, reverse=True)
+            )
+            if len(suggestions) == self.MAX_SUGGESTIONS:
+                break
 
         return suggestions
 
@@ -223,53 +320,24 @@ class HabitStackingEngine:
         self, anchors: list[AnchorType], time_preference: HabitTimePreference
     ) -> list[AnchorType]:
         """Filter anchors that match time preference"""
-        time_to_anchors = {
-            HabitTimePreference.MORNING: [
-                AnchorType.WAKE_UP,
-                AnchorType.MORNING_ROUTINE,
-                AnchorType.COMMUTE,
-            ],
-            HabitTimePreference.AFTERNOON: [
-                AnchorType.LUNCH,
-                AnchorType.WORK_END,
-            ],
-            HabitTimePreference.EVENING: [
-                AnchorType.ARRIVE_HOME,
-                AnchorType.DINNER,
-                AnchorType.EVENING_ROUTINE,
-            ],
-            HabitTimePreference.NIGHT: [
-                AnchorType.EVENING_ROUTINE,
-                AnchorType.BEDTIME_ROUTINE,
-            ],
-            HabitTimePreference.AFTER_WORKOUT: [AnchorType.FINISH_WORKOUT],
-            HabitTimePreference.BEFORE_WORKOUT: [AnchorType.ARRIVE_GYM],
-        }
-
-        matching_anchors = time_to_anchors.get(time_preference, [])
+        matching_anchors = self.TIME_TO_ANCHORS.get(time_preference, [])
         return [a for a in anchors if a in matching_anchors]
 
     def _create_stack_suggestion(
         self,
-        anchor_type: AnchorType,
-        anchor_description: str,
+        candidate: IndexedAnchor,
         new_habit_name: str,
         habit_type: HabitType,
         habit_difficulty: HabitDifficulty,
+        success_probability: float,
     ) -> StackSuggestion:
-        """Create a single stack suggestion with reasoning"""
+        """Create a single stack suggestion from an indexed anchor"""
+        anchor_type = candidate.anchor_type
+        anchor_description = candidate.anchor_description
 
         # Stack formula
         stack_formula = f"{anchor_description}, I will {new_habit_name}"
 
-        # Success probability (based on anchor strength and logical connection)
-        success_probability = self._calculate_success_probability(
-            anchor_type, habit_type, habit_difficulty
-        )
-
-        # Reasoning
-        reasoning = self._generate_reasoning(anchor_type, habit_type)
-
         # Tips
         tips = self._generate_tips(anchor_type, habit_type, habit_difficulty)
 
@@ -283,7 +351,7 @@ class HabitStackingEngine:
             anchor_description=anchor_description,
             new_habit_description=new_habit_name,
             stack_formula=stack_formula,
-            reasoning=reasoning,
+            reasoning=candidate.reasoning,
             success_probability=success_probability,
             tips=tips,
             obstacles=obstacles,
@@ -324,12 +392,7 @@ class HabitStackingEngine:
         connection_bonus = self._assess_logical_connection(anchor_type, habit_type)
 
         # Difficulty penalty
-        difficulty_penalty = {
-            HabitDifficulty.SIMPLE: 0.0,
-            HabitDifficulty.MODERATE: -0.05,
-            HabitDifficulty.COMPLEX: -0.1,
-        }
-        penalty = difficulty_penalty.get(habit_difficulty, 0.0)
+        penalty = self.DIFFICULTY_PENALTY.get(habit_difficulty, 0.0)
 
         # Calculate final probability
         probability = base_prob * strength + connection_bonus + penalty
@@ -0,0 +1,628 @@
+"""
+Notification Scheduler
+
+Keeps every user's time-based notification triggers in one min-heap keyed
+by next fire time. A worker polls `due()` (e.g. once a minute), which pops
+only the triggers whose time has come, evaluates them as a batch and
+re-arms recurring ones for the next day, so finding who to nudge costs
+O(due · log n) instead of a scan over all users.
+
+Per-user daily counters enforce MAX_DAILY_INTERVENTIONS across all of a
+user's habits; each habit's strategy still caps its own notifications and
+quiet hours via ContextNotificationEngine.should_send_notification.
+
+Location triggers are event-driven (see `fire_event`), not scheduled.
+
+Registrations and per-user daily counters are written through to Supabase
+(SupabaseNotificationStore), so a restarted instance rebuilds its heap with
+`load()`, and each `due()`/`fire_event()` first applies registrations
+changed on other instances and reads the counters of the users involved.
+
+Sprint 38: 66-Day Habit Tracking
+"""
+
+import heapq
+import itertools
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from app.core.config import settings
+from app.habits.context_notifications import (
+    ContextNotificationEngine,
+    NotificationContext,
+    NotificationStrategy,
+    NotificationTiming,
+    NotificationTrigger,
+    get_notification_engine,
+)
+
+# Re-read this much before the sync watermark (commit order vs. updated_at)
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+# Offset from the habit window for each timing
+TIMING_OFFSETS = {
+    NotificationTiming.BEFORE_HABIT_WINDOW: timedelta(minutes=-30),
+    NotificationTiming.START_HABIT_WINDOW: timedelta(0),
+    NotificationTiming.DURING_HABIT_WINDOW: timedelta(minutes=30),
+    NotificationTiming.MISSED_HABIT_WINDOW: timedelta(0),
+    NotificationTiming.END_OF_DAY: timedelta(0),
+}
+
+# Contexts that fire once rather than every day
+ONE_SHOT_CONTEXTS = {NotificationContext.MILESTONE}
+
+# Contexts that only fire if the habit hasn't been completed that day
+UNLESS_COMPLETED_CONTEXTS = {
+    NotificationContext.STREAK_RISK,
+    NotificationContext.MISS_PATTERN,
+    NotificationContext.OPTIMAL_WINDOW,
+}
+
+
+@dataclass
+class Delivery:
+    """A notification the worker should send now"""
+
+    user_id: str
+    habit_id: str
+    trigger: NotificationTrigger
+    fire_at: datetime
+
+
+@dataclass
+class _Registration:
+    """A user's strategy for one habit"""
+
+    user_id: str
+    strategy: NotificationStrategy
+    version: int
+    window_time: time
+    revision: str  # Shared across instances; changes when the strategy does
+    completed_on: Optional[date] = None
+    sent_on: Optional[date] = None
+    sent_today: int = 0
+
+
+@dataclass
+class _UserCounter:
+    day: Optional[date] = None
+    sent: int = 0
+
+
+@dataclass
+class SchedulerStats:
+    registered_habits: int = 0
+    scheduled_triggers: int = 0
+    delivered: int = 0
+    suppressed: dict = field(default_factory=dict)  # reason -> count
+
+
+class SupabaseNotificationStore:
+    """Registrations and per-user daily counters shared by every instance"""
+
+    REGISTRATIONS_TABLE = 'habit_notification_registrations'
+    COUNTERS_TABLE = 'habit_notification_counters'
+    ROW_PAGE = 1000  # PostgREST's default max rows per response
+    USER_BATCH = 50  # user_ids per in_() filter (keeps the URL short)
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+
+    def save_registrations(self, rows: list[dict[str, Any]]) -> None:
+        if rows:
+            (self.supabase.table(self.REGISTRATIONS_TABLE)
+             .upsert(rows, on_conflict='user_id,habit_id')
+             .execute())
+
+    def changed_since(self, since: Optional[datetime]) -> list[dict[str, Any]]:
+        """Registrations updated since `since` (every active one when None)"""
+        rows: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            query = self.supabase.table(self.REGISTRATIONS_TABLE).select('*')
+            if since is None:
+                query = query.eq('active', True)
+            else:
+                query = query.gte('updated_at', since.isoformat())
+            result = (query
+                      .order('updated_at', desc=False)
+                      .order('user_id', desc=False)
+                      .order('habit_id', desc=False)
+                      .range(offset, offset + self.ROW_PAGE - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.ROW_PAGE:
+                return rows
+            offset += self.ROW_PAGE
+
+    def load_counters(self, user_ids: list[str], day: date) -> dict[str, int]:
+        """Notifications sent on `day` per user"""
+        sent = {}
+        for i in range(0, len(user_ids), self.USER_BATCH):
+            result = (self.supabase.table(self.COUNTERS_TABLE)
+                      .select('user_id, sent')
+                      .in_('user_id', user_ids[i:i + self.USER_BATCH])
+                      .eq('day', day.isoformat())
+                      .execute())
+            sent.update((row['user_id'], row['sent']) for row in result.data or [])
+        return sent
+
+    def save_counters(self, rows: list[dict[str, Any]]) -> None:
+        if rows:
+            (self.supabase.table(self.COUNTERS_TABLE)
+             .upsert(rows, on_conflict='user_id')
+             .execute())
+
+
+class NotificationScheduler:
+    """Min-heap of notification triggers across all users"""
+
+    def __init__(
+        self,
+        engine: Optional[ContextNotificationEngine] = None,
+        max_daily_per_user: Optional[int] = None,
+        max_lateness: timedelta = timedelta(hours=1),
+        store: Optional[SupabaseNotificationStore] = None,
+    ):
+        self.engine = engine or get_notification_engine()
+        self.store = store  # None keeps everything in this process
+        self.max_lateness = max_lateness  # Older due triggers are skipped, not sent
+        self.max_daily_per_user = (
+            max_daily_per_user
+            if max_daily_per_user is not None
+            else settings.MAX_DAILY_INTERVENTIONS
+        )
+        # (fire_at, seq, (user_id, habit_id), version, trigger index)
+        self._heap: list[tuple] = []
+        self._seq = itertools.count()
+        self._registrations: dict[tuple[str, str], _Registration] = {}
+        self._user_habits: dict[str, set[str]] = {}  # user_id -> registered habit ids
+        self._counters: dict[str, _UserCounter] = {}
+        self._counters_pruned_on: Optional[date] = None
+        self._synced_through: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self.stats = SchedulerStats()
+
+    def load(self, now: Optional[datetime] = None) -> int:
+        """
+        Rebuild the heap from the store (on startup).
+
+        Returns:
+            Number of registrations loaded
+        """
+        if self.store is None:
+            return 0
+        rows = self.store.changed_since(None)
+        with self._lock:
+            self._apply_rows(rows, now or datetime.now())
+            return len(self._registrations)
+
+    def register(
+        self,
+        user_id: str,
+        strategy: NotificationStrategy,
+        now: Optional[datetime] = None,
+        window_time: Optional[time] = None,
+    ) -> int:
+        """
+        Schedule (or reschedule) a user's strategy for one habit.
+
+        Replacing a strategy invalidates its previously scheduled triggers;
+        stale heap entries are dropped when they surface.
+
+        Args:
+            user_id: User to notify
+            strategy: Strategy from ContextNotificationEngine
+            now: Current time (defaults to now)
+            window_time: Habit window for triggers without their own time
+                (defaults to the strategy's time-of-day trigger)
+
+        Returns:
+            Number of triggers scheduled
+        """
+        now = now or datetime.now()
+        key = (user_id, strategy.habit_id)
+        window_time = window_time or _window_time(strategy)
+
+        with self._lock:
+            previous = self._registrations.get(key)
+            registration = _Registration(
+                user_id=user_id,
+                strategy=strategy,
+                version=previous.version + 1 if previous else 0,
+                window_time=window_time,
+                revision=uuid.uuid4().hex,
+                completed_on=previous.completed_on if previous else None,
+                sent_on=previous.sent_on if previous else None,
+                sent_today=previous.sent_today if previous else 0,
+            )
+            scheduled = self._schedule(key, registration, now)
+            self._save([registration])
+        return scheduled
+
+    def unregister(self, user_id: str, habit_id: str) -> None:
+        """Stop notifying for a habit (its heap entries become stale)"""
+        with self._lock:
+            self._drop((user_id, habit_id))
+            if self.store is not None:
+                self.store.save_registrations([{
+                    'user_id': user_id,
+                    'habit_id': habit_id,
+                    'active': False,
+                    'updated_at': _utcnow(),
+                }])
+
+    def mark_completed(self, user_id: str, habit_id: str, day: Optional[date] = None) -> None:
+        """Record today's completion so reminders for it are skipped"""
+        with self._lock:
+            self._sync(datetime.now())
+            registration = self._registrations.get((user_id, habit_id))
+            if registration:
+                registration.completed_on = day or date.today()
+                self._save([registration])
+
+    def next_fire_at(self) -> Optional[datetime]:
+        """Earliest scheduled fire time (may belong to a stale entry)"""
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def due(self, now: Optional[datetime] = None) -> list[Delivery]:
+        """
+        Pop and evaluate every trigger due at `now`.
+
+        Due triggers are evaluated highest priority first so per-user limits
+        keep the most important notifications. Recurring triggers are
+        re-armed for the next day whether or not they were sent.
+
+        Returns:
+            Notifications to send now
+        """
+        now = now or datetime.now()
+        with self._lock:
+            self._sync(now)
+            batch = []
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, _, key, version, index = heapq.heappop(self._heap)
+                registration = self._registrations.get(key)
+                if registration is None or registration.version != version:
+                    continue  # Unregistered or replaced
+                trigger = registration.strategy.triggers[index]
+                if trigger.context not in ONE_SHOT_CONTEXTS:
+                    # Next occurrence after now, even if polling fell behind
+                    days = max(1, (now - fire_at).days + 1)
+                    self._push(fire_at + timedelta(days=days), key, version, index)
+                if now - fire_at > self.max_lateness:
+                    self._suppress("missed")
+                    continue
+                batch.append((fire_at, key, registration, index, trigger))
+
+            batch.sort(key=lambda item: (-item[4].priority, item[0]))
+            self._load_counters({item[2].user_id for item in batch}, now.date())
+            deliveries = []
+            sent = {}
+            for fire_at, key, registration, index, trigger in batch:
+                reason = self._suppression_reason(registration, trigger, now)
+                if reason:
+                    self._suppress(reason)
+                    continue
+                self._count(registration, now.date())
+                sent[key] = registration
+                deliveries.append(
+                    Delivery(user_id=key[0], habit_id=key[1], trigger=trigger, fire_at=fire_at)
+                )
+
+            self._save(sent.values(), counters=True)
+            self.stats.delivered += len(deliveries)
+            self.stats.scheduled_triggers = len(self._heap)
+        return deliveries
+
+    def fire_event(
+        self,
+        user_id: str,
+        context: NotificationContext,
+        now: Optional[datetime] = None,
+    ) -> list[Delivery]:
+        """
+        Evaluate a user's event-driven triggers (e.g. arrived at the gym).
+
+        Only that user's registrations are touched; the same per-user and
+        per-habit limits apply.
+        """
+        now = now or datetime.now()
+        with self._lock:
+            self._sync(now)
+            self._load_counters({user_id}, now.date())
+            deliveries = []
+            sent = {}
+            for habit_id in self._user_habits.get(user_id, ()):
+                registration = self._registrations[(user_id, habit_id)]
+                for trigger in registration.strategy.triggers:
+                    if trigger.context != context:
+                        continue
+                    if self._suppression_reason(registration, trigger, now):
+                        continue
+                    self._count(registration, now.date())
+                    sent[(user_id, habit_id)] = registration
+                    deliveries.append(
+                        Delivery(user_id=user_id, habit_id=habit_id, trigger=trigger, fire_at=now)
+                    )
+            self._save(sent.values(), counters=True)
+            self.stats.delivered += len(deliveries)
+        return deliveries
+
+    def sent_today(self, user_id: str, today: Optional[date] = None) -> int:
+        """Notifications delivered to a user today across all habits"""
+        counter = self._counters.get(user_id)
+        today = today or date.today()
+        return counter.sent if counter and counter.day == today else 0
+
+    def _schedule(self, key: tuple[str, str], registration: _Registration, now: datetime) -> int:
+        """Install a registration and push its timed triggers"""
+        self._registrations[key] = registration
+        self._user_habits.setdefault(key[0], set()).add(key[1])
+
+        scheduled = 0
+        for index, trigger in enumerate(registration.strategy.triggers):
+            fire_time = _fire_time(trigger, registration.window_time)
+            if fire_time is None:
+                continue  # Event-driven
+            fire_at = datetime.combine(now.date(), fire_time)
+            if fire_at < now:
+                fire_at += timedelta(days=1)
+            self._push(fire_at, key, registration.version, index)
+            scheduled += 1
+
+        self.stats.registered_habits = len(self._registrations)
+        self.stats.scheduled_triggers = len(self._heap)
+        return scheduled
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        self._registrations.pop(key, None)
+        habits = self._user_habits.get(key[0])
+        if habits is not None:
+            habits.discard(key[1])
+            if not habits:
+                del self._user_habits[key[0]]
+        self.stats.registered_habits = len(self._registrations)
+
+    def _sync(self, now: datetime) -> None:
+        """Apply registrations other instances changed since the last sync"""
+        if self.store is None:
+            return
+        since = self._synced_through - SYNC_OVERLAP if self._synced_through else None
+        self._apply_rows(self.store.changed_since(since), now)
+
+    def _apply_rows(self, rows: list[dict[str, Any]], now: datetime) -> None:
+        for row in rows:
+            key = (row['user_id'], row['habit_id'])
+            local = self._registrations.get(key)
+            if not row.get('active', True):
+                self._drop(key)
+            elif local is None or local.revision != row['revision']:
+                self._schedule(key, _registration_from_row(
+                    row, version=local.version + 1 if local else 0
+                ), now)
+            else:
+                # Same strategy; take the shared completion and send state
+                local.completed_on = _parse_date(row.get('completed_on'))
+                local.sent_on = _parse_date(row.get('sent_on'))
+                local.sent_today = row.get('sent_today') or 0
+            if row.get('updated_at'):
+                updated_at = datetime.fromisoformat(row['updated_at'])
+                if self._synced_through is None or updated_at > self._synced_through:
+                    self._synced_through = updated_at
+        if self._synced_through is None:
+            self._synced_through = datetime.now(timezone.utc)
+
+    def _load_counters(self, user_ids: Iterable[str], today: date) -> None:
+        """Take the shared daily counters of the users about to be evaluated"""
+        if self.store is None:
+            return
+        user_ids = sorted(user_ids)
+        sent = self.store.load_counters(user_ids, today)
+        for user_id in user_ids:
+            self._counters[user_id] = _UserCounter(day=today, sent=sent.get(user_id, 0))
+
+    def _save(self, registrations: Iterable[_Registration], counters: bool = False) -> None:
+        """Write registrations (and their users' counters) through to the store"""
+        if self.store is None:
+            return
+        registrations = list(registrations)
+        updated_at = _utcnow()
+        self.store.save_registrations([
+            {**_registration_to_row(r), 'updated_at': updated_at} for r in registrations
+        ])
+        if counters:
+            users = {r.user_id for r in registrations}
+            self.store.save_counters([
+                {
+                    'user_id': user_id,
+                    'day': self._counters[user_id].day.isoformat(),
+                    'sent': self._counters[user_id].sent,
+                    'updated_at': updated_at,
+                }
+                for user_id in sorted(users)
+            ])
+
+    def _suppress(self, reason: str) -> None:
+        self.stats.suppressed[reason] = self.stats.suppressed.get(reason, 0) + 1
+
+    def _push(self, fire_at: datetime, key: tuple[str, str], version: int, index: int) -> None:
+        heapq.heappush(self._heap, (fire_at, next(self._seq), key, version, index))
+
+    def _suppression_reason(
+        self,
+        registration: _Registration,
+        trigger: NotificationTrigger,
+        now: datetime,
+    ) -> Optional[str]:
+        today = now.date()
+        if registration.completed_on == today and (
+            trigger.context in UNLESS_COMPLETED_CONTEXTS
+            or trigger.trigger_conditions.get("not_completed")
+        ):
+            return "completed"
+        if self.sent_today(registration.user_id, today) >= self.max_daily_per_user:
+            return "user_daily_limit"
+        habit_sent = registration.sent_today if registration.sent_on == today else 0
+        strategy = registration.strategy
+        if not self.engine.should_send_notification(
+            trigger,
+            current_time=now,
+            notifications_sent_today=habit_sent,
+            max_daily=strategy.max_daily_notifications,
+            quiet_hours=strategy.quiet_hours,
+        ):
+            return "habit_limit_or_quiet_hours"
+        return None
+
+    def _count(self, registration: _Registration, today: date) -> None:
+        if self._counters_pruned_on != today:
+            # Counters from earlier days no longer limit anything
+            self._counters = {
+                user_id: counter
+                for user_id, counter in self._counters.items()
+                if counter.day is not None and counter.day >= today
+            }
+            self._counters_pruned_on = today
+        counter = self._counters.setdefault(registration.user_id, _UserCounter())
+        if counter.day != today:
+            counter.day, counter.sent = today, 0
+        counter.sent += 1
+        if registration.sent_on != today:
+            registration.sent_on, registration.sent_today = today, 0
+        registration.sent_today += 1
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(str(value)[:10]) if value else None
+
+
+def _registration_to_row(registration: _Registration) -> dict[str, Any]:
+    strategy = registration.strategy
+    return {
+        'user_id': registration.user_id,
+        'habit_id': strategy.habit_id,
+        'revision': registration.revision,
+        'strategy': {
+            'habit_name': strategy.habit_name,
+            'triggers': [
+                {
+                    'context': t.context.value,
+                    'timing': t.timing.value,
+                    'priority': t.priority,
+                    'title': t.title,
+                    'message': t.message,
+                    'action_text': t.action_text,
+                    'trigger_conditions': t.trigger_conditions,
+                    'reasoning': t.reasoning,
+                    'expected_engagement': t.expected_engagement,
+                }
+                for t in strategy.triggers
+            ],
+            'max_daily_notifications': strategy.max_daily_notifications,
+            'quiet_hours': [strategy.quiet_hours[0].isoformat(), strategy.quiet_hours[1].isoformat()],
+        },
+        'window_time': registration.window_time.isoformat(),
+        'completed_on': registration.completed_on.isoformat() if registration.completed_on else None,
+        'sent_on': registration.sent_on.isoformat() if registration.sent_on else None,
+        'sent_today': registration.sent_today,
+        'active': True,
+    }
+
+
+def _registration_from_row(row: dict[str, Any], version: int) -> _Registration:
+    stored = row['strategy']
+    strategy = NotificationStrategy(
+        habit_id=row['habit_id'],
+        habit_name=stored['habit_name'],
+        triggers=[
+            NotificationTrigger(
+                **{
+                    **t,
+                    'context': NotificationContext(t['context']),
+                    'timing': NotificationTiming(t['timing']),
+                }
+            )
+            for t in stored['triggers']
+        ],
+        max_daily_notifications=stored['max_daily_notifications'],
+        quiet_hours=(
+            time.fromisoformat(stored['quiet_hours'][0]),
+            time.fromisoformat(stored['quiet_hours'][1]),
+        ),
+    )
+    return _Registration(
+        user_id=row['user_id'],
+        strategy=strategy,
+        version=version,
+        window_time=time.fromisoformat(row['window_time']),
+        revision=row['revision'],
+        completed_on=_parse_date(row.get('completed_on')),
+        sent_on=_parse_date(row.get('sent_on')),
+        sent_today=row.get('sent_today') or 0,
+    )
+
+
+def _window_time(strategy: NotificationStrategy) -> time:
+    """The habit window: the strategy's time-of-day trigger, else 9am"""
+    for trigger in strategy.triggers:
+        if (
+            trigger.context == NotificationContext.TIME_OF_DAY
+            and trigger.timing == NotificationTiming.START_HABIT_WINDOW
+            and "time" in trigger.trigger_conditions
+        ):
+            return time.fromisoformat(trigger.trigger_conditions["time"])
+    return time(9, 0)
+
+
+def _fire_time(trigger: NotificationTrigger, window_time: time) -> Optional[time]:
+    """Time of day a trigger fires, or None for event-driven triggers"""
+    if trigger.context == NotificationContext.LOCATION:
+        return None
+
+    conditions = trigger.trigger_conditions
+    if "time_past" in conditions:
+        return time.fromisoformat(conditions["time_past"])
+
+    if "time" in conditions:
+        # Explicit times are already the fire time, except the preparation
+        # cue which goes out 10 minutes before the usual completion time
+        base = time.fromisoformat(conditions["time"])
+        offset = (
+            timedelta(minutes=-10)
+            if trigger.context == NotificationContext.OPTIMAL_WINDOW
+            else timedelta(0)
+        )
+    else:
+        base = window_time
+        offset = TIMING_OFFSETS.get(trigger.timing, timedelta(0))
+
+    # Any date works; offsets before midnight wrap to the previous evening
+    return (datetime.combine(date(2000, 1, 2), base) + offset).time()
+
+
+# Global instance
+_notification_scheduler: Optional[NotificationScheduler] = None
+
+
+def get_notification_scheduler() -> NotificationScheduler:
+    """Get or create global notification scheduler"""
+    global _notification_scheduler
+    if _notification_scheduler is None:
+        from app.core.database import get_supabase_client
+
+        _notification_scheduler = NotificationScheduler(
+            store=SupabaseNotificationStore(get_supabase_client())
+        )
+        _notification_scheduler.load()
+    return _notification_scheduler
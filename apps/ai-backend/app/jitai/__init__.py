@@ -0,0 +1,55 @@
+"""
+JITAI (Just-In-Time Adaptive Interventions)
+
+Feature store and batch scoring behind the /api/v1/jitai endpoints.
+
+- Feature store: per-user columns (missed workouts, adherence trend, HRV
+  deviation, engagement recency, intervention history) updated
+  incrementally from events
+- Scorer: vulnerability, receptivity and opportunity for all users in one
+  vectorized pass, compared against INTERVENTION_THRESHOLD
+- Templates: intervention messages per type, context bucket and coaching
+  voice, filled in locally; the LLM only writes new templates
+"""
+
+from app.jitai.feature_store import (
+    JITAIFeatureStore,
+    JITAIEvent,
+    JITAIEventType,
+    FeatureSnapshot,
+    epoch_day,
+    get_jitai_feature_store,
+)
+from app.jitai.scorer import (
+    JITAIScorer,
+    JITAIScores,
+    evaluate_users,
+    get_jitai_scorer,
+)
+from app.jitai.templates import (
+    InterventionTemplate,
+    InterventionTemplateBank,
+    InterventionTemplateGenerator,
+    context_bucket,
+    get_template_bank,
+    get_template_generator,
+)
+
+__all__ = [
+    "JITAIFeatureStore",
+    "JITAIEvent",
+    "JITAIEventType",
+    "FeatureSnapshot",
+    "epoch_day",
+    "get_jitai_feature_store",
+    "JITAIScorer",
+    "JITAIScores",
+    "evaluate_users",
+    "get_jitai_scorer",
+    "InterventionTemplate",
+    "InterventionTemplateBank",
+    "InterventionTemplateGenerator",
+    "context_bucket",
+    "get_template_bank",
+    "get_template_generator",
+]
@@ -0,0 +1,432 @@
+"""
+JITAI Feature Store
+
+Per-user features for intervention decisions, kept as one column per
+feature across all users and updated in O(1) as events arrive:
+
+- Missed / completed workouts per day in a 7-day ring (rolling counts)
+- Adherence trend: fast and slow EWMAs of workout outcomes
+- HRV deviation from an EWMA baseline (z-score of the latest reading)
+- Engagement recency: last app activity
+- Usual workout time: circular EWMA of workout start times
+- Intervention history: sent today, last sent, EWMA response rate
+
+Because every user lives in the same arrays, the scorer evaluates the
+whole user base with a handful of NumPy operations.
+
+The shared copy of each user's features is a row in Supabase
+(jitai_features). Ingest refreshes the affected users' rows, applies the
+events and writes them back; snapshots first pull rows other instances
+changed since the last sync. Every instance therefore scores every event,
+and nothing is lost on restart.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.wearables.timeseries_store import SECONDS_PER_DAY, to_epoch_seconds
+
+
+WINDOW_DAYS = 7
+MINUTES_PER_DAY = 1440
+
+ADHERENCE_FAST_ALPHA = 0.3  # ~last 3 scheduled workouts
+ADHERENCE_SLOW_ALPHA = 0.05  # ~last 20 scheduled workouts
+HRV_BASELINE_ALPHA = 1 / 14  # ~2-week baseline
+HRV_MIN_READINGS = 5  # Readings before deviations are trusted
+WORKOUT_TIME_ALPHA = 0.2
+RESPONSE_ALPHA = 0.2
+RESPONSE_PRIOR = 0.5  # Response rate before any intervention was answered
+
+# Re-read this much before the sync watermark (commit order vs. updated_at)
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+def epoch_day(timestamp: datetime) -> int:
+    """Day index of a timestamp, as used by the workout ring"""
+    return int(to_epoch_seconds(timestamp) // SECONDS_PER_DAY)
+
+
+class JITAIEventType(str, Enum):
+    """Events that update JITAI features"""
+
+    WORKOUT_STARTED = "workout_started"
+    WORKOUT_COMPLETED = "workout_completed"
+    WORKOUT_MISSED = "workout_missed"
+    HRV_READING = "hrv_reading"
+    APP_OPEN = "app_open"
+    INTERVENTION_SENT = "intervention_sent"
+    INTERVENTION_RESPONSE = "intervention_response"
+
+
+@dataclass
+class JITAIEvent:
+    """A single user event (value: HRV in ms, or 1/0 engaged for responses)"""
+
+    user_id: str
+    event_type: JITAIEventType
+    timestamp: datetime
+    value: Optional[float] = None
+
+
+# Events that mean the user is actively using the app
+_ENGAGEMENT_EVENTS = {
+    JITAIEventType.APP_OPEN,
+    JITAIEventType.WORKOUT_STARTED,
+    JITAIEventType.WORKOUT_COMPLETED,
+}
+
+# name -> (dtype, trailing shape, initial value)
+_COLUMNS = {
+    "ring_day": (np.int64, (WINDOW_DAYS,), -1),
+    "missed": (np.int16, (WINDOW_DAYS,), 0),
+    "completed": (np.int16, (WINDOW_DAYS,), 0),
+    "adherence_fast": (np.float64, (), np.nan),
+    "adherence_slow": (np.float64, (), np.nan),
+    "hrv_mean": (np.float64, (), np.nan),
+    "hrv_var": (np.float64, (), 0.0),
+    "hrv_count": (np.int32, (), 0),
+    "hrv_z": (np.float64, (), 0.0),
+    "hrv_ts": (np.float64, (), np.nan),
+    "last_active_ts": (np.float64, (), np.nan),
+    "workout_started_ts": (np.float64, (), np.nan),
+    "workout_ended_ts": (np.float64, (), np.nan),
+    "workout_time_sin": (np.float64, (), 0.0),
+    "workout_time_cos": (np.float64, (), 0.0),
+    "workout_time_count": (np.int32, (), 0),
+    "sent_day": (np.int64, (), -1),
+    "sent_today": (np.int16, (), 0),
+    "last_sent_ts": (np.float64, (), np.nan),
+    "response_rate": (np.float64, (), RESPONSE_PRIOR),
+}
+
+
+class SupabaseFeatureTable:
+    """Per-user feature rows in Supabase, shared by every API instance"""
+
+    TABLE = 'jitai_features'
+    ROW_PAGE = 1000  # PostgREST's default max rows per response
+    USER_BATCH = 50  # user_ids per in_() filter (keeps the URL short)
+    WRITE_BATCH = 500  # rows per upsert request
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+
+    def fetch(self, user_ids: Sequence[str]) -> list[dict[str, Any]]:
+        """Rows for the given users (missing users are skipped)"""
+        user_ids = sorted(set(user_ids))
+        rows: list[dict[str, Any]] = []
+        for i in range(0, len(user_ids), self.USER_BATCH):
+            result = (self.supabase.table(self.TABLE)
+                      .select('user_id, features, updated_at')
+                      .in_('user_id', user_ids[i:i + self.USER_BATCH])
+                      .execute())
+            rows.extend(result.data or [])
+        return rows
+
+    def changed_since(self, since: Optional[datetime]) -> list[dict[str, Any]]:
+        """Rows updated since `since` (every row when None), page by page"""
+        rows: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            query = self.supabase.table(self.TABLE).select('user_id, features, updated_at')
+            if since is not None:
+                query = query.gte('updated_at', since.isoformat())
+            result = (query
+                      .order('updated_at', desc=False)
+                      .order('user_id', desc=False)
+                      .range(offset, offset + self.ROW_PAGE - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.ROW_PAGE:
+                return rows
+            offset += self.ROW_PAGE
+
+    def save(self, rows: list[dict[str, Any]]) -> None:
+        for i in range(0, len(rows), self.WRITE_BATCH):
+            (self.supabase.table(self.TABLE)
+             .upsert(rows[i:i + self.WRITE_BATCH], on_conflict='user_id')
+             .execute())
+
+
+class JITAIFeatureStore:
+    """
+    Columnar feature store for all users.
+
+    Row i holds user_ids[i]; columns grow by doubling. With a `table`, the
+    columns are a local cache of the shared Supabase rows; without one (tests,
+    benchmarks) they live only in this process and can be saved to and
+    loaded from an .npz file.
+    """
+
+    def __init__(self, capacity: int = 1024, table: Optional[SupabaseFeatureTable] = None):
+        self.table = table
+        self._synced_through: Optional[datetime] = None
+        self.user_ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._columns = {
+            name: np.full((capacity, *shape), fill, dtype=dtype)
+            for name, (dtype, shape, fill) in _COLUMNS.items()
+        }
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def ingest(self, events: Iterable[JITAIEvent]) -> int:
+        """Apply events in order; returns how many were applied"""
+        events = list(events)
+        users = sorted({event.user_id for event in events})
+        with self._lock:
+            if self.table is not None:
+                # Start from the shared state so other instances' events count
+                self._pull(self.table.fetch(users))
+            for event in events:
+                self._apply(self._row(event.user_id), event)
+            if self.table is not None:
+                updated_at = datetime.now(timezone.utc).isoformat()
+                self.table.save([
+                    {'user_id': user_id, 'features': self._features(user_id), 'updated_at': updated_at}
+                    for user_id in users
+                ])
+        return len(events)
+
+    def record(
+        self,
+        user_id: str,
+        event_type: JITAIEventType,
+        timestamp: Optional[datetime] = None,
+        value: Optional[float] = None,
+    ) -> None:
+        """Apply a single event"""
+        self.ingest([JITAIEvent(user_id, event_type, timestamp or datetime.now(), value)])
+
+    def _row(self, user_id: str) -> int:
+        row = self._rows.get(user_id)
+        if row is None:
+            row = len(self.user_ids)
+            if row == len(self._columns["ring_day"]):
+                self._grow(2 * row)
+            self._rows[user_id] = row
+            self.user_ids.append(user_id)
+        return row
+
+    def _grow(self, capacity: int) -> None:
+        for name, (dtype, shape, fill) in _COLUMNS.items():
+            column = np.full((capacity, *shape), fill, dtype=dtype)
+            column[:len(self._columns[name])] = self._columns[name]
+            self._columns[name] = column
+
+    def _apply(self, row: int, event: JITAIEvent) -> None:
+        c = self._columns
+        ts = to_epoch_seconds(event.timestamp)
+        kind = event.event_type
+
+        if kind in _ENGAGEMENT_EVENTS or (kind == JITAIEventType.INTERVENTION_RESPONSE and event.value):
+            c["last_active_ts"][row] = np.fmax(c["last_active_ts"][row], ts)
+
+        if kind in (JITAIEventType.WORKOUT_COMPLETED, JITAIEventType.WORKOUT_MISSED):
+            completed = kind == JITAIEventType.WORKOUT_COMPLETED
+            self._count_day(row, ts, "completed" if completed else "missed")
+            outcome = 1.0 if completed else 0.0
+            for name, alpha in (
+                ("adherence_fast", ADHERENCE_FAST_ALPHA),
+                ("adherence_slow", ADHERENCE_SLOW_ALPHA),
+            ):
+                previous = c[name][row]
+                c[name][row] = outcome if np.isnan(previous) else previous + alpha * (outcome - previous)
+            if completed:
+                c["workout_ended_ts"][row] = ts
+
+        elif kind == JITAIEventType.WORKOUT_STARTED:
+            c["workout_started_ts"][row] = ts
+            angle = 2 * np.pi * (ts % SECONDS_PER_DAY) / SECONDS_PER_DAY
+            first = c["workout_time_count"][row] == 0
+            alpha = 1.0 if first else WORKOUT_TIME_ALPHA
+            c["workout_time_sin"][row] += alpha * (np.sin(angle) - c["workout_time_sin"][row])
+            c["workout_time_cos"][row] += alpha * (np.cos(angle) - c["workout_time_cos"][row])
+            c["workout_time_count"][row] += 1
+
+        elif kind == JITAIEventType.HRV_READING:
+            if event.value is None:
+                raise ValueError("HRV reading requires a value")
+            self._update_hrv(row, ts, float(event.value))
+
+        elif kind == JITAIEventType.INTERVENTION_SENT:
+            day = int(ts // SECONDS_PER_DAY)
+            if c["sent_day"][row] != day:
+                c["sent_day"][row], c["sent_today"][row] = day, 0
+            c["sent_today"][row] += 1
+            c["last_sent_ts"][row] = np.fmax(c["last_sent_ts"][row], ts)
+
+        elif kind == JITAIEventType.INTERVENTION_RESPONSE:
+            engaged = 1.0 if event.value else 0.0
+            c["response_rate"][row] += RESPONSE_ALPHA * (engaged - c["response_rate"][row])
+
+    def _count_day(self, row: int, ts: float, column: str) -> None:
+        day = int(ts // SECONDS_PER_DAY)
+        slot = day % WINDOW_DAYS
+        ring_day = self._columns["ring_day"][row]
+        if ring_day[slot] > day:
+            return  # Older than the window
+        if ring_day[slot] < day:
+            ring_day[slot] = day
+            self._columns["missed"][row, slot] = 0
+            self._columns["completed"][row, slot] = 0
+        self._columns[column][row, slot] += 1
+
+    def _update_hrv(self, row: int, ts: float, value: float) -> None:
+        c = self._columns
+        count = c["hrv_count"][row]
+        if count == 0:
+            c["hrv_mean"][row], c["hrv_var"][row], c["hrv_z"][row] = value, 0.0, 0.0
+        else:
+            mean, var = c["hrv_mean"][row], c["hrv_var"][row]
+            diff = value - mean
+            # Deviation against the baseline before this reading
+            c["hrv_z"][row] = diff / np.sqrt(var) if count >= HRV_MIN_READINGS and var > 0 else 0.0
+            c["hrv_mean"][row] = mean + HRV_BASELINE_ALPHA * diff
+            c["hrv_var"][row] = (1 - HRV_BASELINE_ALPHA) * (var + HRV_BASELINE_ALPHA * diff * diff)
+        c["hrv_count"][row] = count + 1
+        c["hrv_ts"][row] = ts
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    def snapshot(self, user_ids: Optional[Sequence[str]] = None) -> "FeatureSnapshot":
+        """
+        Copy of the feature columns for scoring.
+
+        Args:
+            user_ids: Users to include (default: everyone). Unknown users get
+                a row of defaults.
+        """
+        with self._lock:
+            if self.table is not None:
+                if user_ids is None:
+                    self._sync()
+                else:
+                    self._pull(self.table.fetch(user_ids))
+            n = len(self.user_ids)
+            if user_ids is None:
+                ids = list(self.user_ids)
+                columns = {name: column[:n].copy() for name, column in self._columns.items()}
+            else:
+                ids = list(user_ids)
+                rows = np.array([self._rows.get(u, n) for u in ids], dtype=np.int64)
+                if n == len(self._columns["ring_day"]):
+                    self._grow(n + 1)  # Keep a spare default row for unknown users
+                columns = {name: column[rows] for name, column in self._columns.items()}
+        return FeatureSnapshot(user_ids=ids, columns=columns)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _features(self, user_id: str) -> dict[str, Any]:
+        """One user's columns as JSON (NaN as null)"""
+        row = self._rows[user_id]
+        return {
+            name: np.where(np.isnan(column[row]), None, column[row]).tolist()
+            if column.dtype.kind == "f" else column[row].tolist()
+            for name, column in self._columns.items()
+        }
+
+    def _pull(self, rows: list[dict[str, Any]]) -> None:
+        """Overwrite local rows with shared ones (caller holds the lock)"""
+        for record in rows:
+            row = self._row(record['user_id'])
+            for name, value in record['features'].items():
+                if name in self._columns:
+                    column = self._columns[name]
+                    column[row] = np.array(value, dtype=np.float64) if column.dtype.kind == "f" else value
+
+    def _sync(self) -> None:
+        """Pull every row changed since the last full sync (caller holds the lock)"""
+        since = self._synced_through - SYNC_OVERLAP if self._synced_through else None
+        rows = self.table.changed_since(since)
+        self._pull(rows)
+        stamps = [datetime.fromisoformat(r['updated_at']) for r in rows if r.get('updated_at')]
+        if stamps:
+            self._synced_through = max([*stamps, self._synced_through] if self._synced_through else stamps)
+        elif self._synced_through is None:
+            self._synced_through = datetime.now(timezone.utc)
+
+    def save(self, path: str | Path) -> None:
+        """Write all features to an .npz file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            n = len(self.user_ids)
+            arrays = {name: column[:n] for name, column in self._columns.items()}
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, "wb") as f:
+                np.savez(f, user_ids=np.array(self.user_ids, dtype=str), **arrays)
+            tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "JITAIFeatureStore":
+        """Read a store written by `save`; columns added since are defaulted"""
+        with np.load(path) as data:
+            user_ids = [str(u) for u in data["user_ids"]]
+            store = cls(capacity=max(1024, 2 * len(user_ids)))
+            for name in _COLUMNS:
+                if name in data:
+                    store._columns[name][:len(user_ids)] = data[name]
+        store.user_ids = user_ids
+        store._rows = {u: i for i, u in enumerate(user_ids)}
+        return store
+
+
+@dataclass
+class FeatureSnapshot:
+    """Feature columns for a set of users, row-aligned with user_ids"""
+
+    user_ids: list[str]
+    columns: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def window_counts(self, today: int) -> tuple[np.ndarray, np.ndarray]:
+        """Missed and completed workouts over the last WINDOW_DAYS days"""
+        ring_day = self.columns["ring_day"]
+        valid = (ring_day > today - WINDOW_DAYS) & (ring_day <= today)
+        missed = (self.columns["missed"] * valid).sum(axis=1)
+        completed = (self.columns["completed"] * valid).sum(axis=1)
+        return missed, completed
+
+    def usual_workout_minute(self) -> np.ndarray:
+        """Circular mean workout start (minute of day), NaN without history"""
+        angle = np.arctan2(self.columns["workout_time_sin"], self.columns["workout_time_cos"])
+        minute = (angle % (2 * np.pi)) * MINUTES_PER_DAY / (2 * np.pi)
+        return np.where(self.columns["workout_time_count"] > 0, minute, np.nan)
+
+
+# Global instance
+_feature_store: Optional[JITAIFeatureStore] = None
+
+
+def get_jitai_feature_store() -> JITAIFeatureStore:
+    """Get or create global JITAI feature store (backed by Supabase)"""
+    global _feature_store
+    if _feature_store is None:
+        from app.core.database import get_supabase_client
+
+        _feature_store = JITAIFeatureStore(table=SupabaseFeatureTable(get_supabase_client()))
+    return _feature_store
@@ -0,0 +1,195 @@
+"""
+JITAI Context Scorer
+
+Turns feature store columns into vulnerability, receptivity and
+opportunity scores for every user at once, and picks the users whose
+combined score clears INTERVENTION_THRESHOLD.
+
+Vulnerability (risk of skipping):
+- Missed workouts in the last 7 days
+- Declining adherence (fast EWMA below slow EWMA)
+- Low HRV relative to the user's baseline (fatigue)
+- Low 7-day completion rate
+
+Receptivity (willingness to engage):
+- Time of day (prime workout hours vs late night)
+- Engagement recency
+- Response rate to past interventions
+- Cooldown after the last intervention
+
+Opportunity (context allows action):
+- Not currently in a workout
+- App used recently
+- Near the user's usual workout time
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.jitai.feature_store import (
+    MINUTES_PER_DAY,
+    FeatureSnapshot,
+    JITAIFeatureStore,
+    epoch_day,
+    get_jitai_feature_store,
+)
+from app.wearables.timeseries_store import SECONDS_PER_DAY, to_epoch_seconds
+
+
+# Same weights as the intervention priority
+VULNERABILITY_WEIGHT = 0.4
+RECEPTIVITY_WEIGHT = 0.35
+OPPORTUNITY_WEIGHT = 0.25
+
+MISSED_SATURATION = 3  # Missed workouts in 7 days for full vulnerability
+HRV_STALE_SECONDS = 2 * SECONDS_PER_DAY  # Older readings say nothing about today
+ENGAGEMENT_HALF_LIFE_HOURS = 24
+PHONE_ACTIVE_HALF_LIFE_MINUTES = 60
+WORKOUT_TIME_SCALE_MINUTES = 90  # Proximity falls off over ~1.5h
+MAX_WORKOUT_SECONDS = 3 * 3600  # Unfinished workouts older than this are over
+COOLDOWN_SECONDS = 2 * 3600
+
+# Priority bins, as in routes/jitai.calculate_priority (score > edge)
+PRIORITY_EDGES = np.array([0.2, 0.4, 0.6, 0.8])
+
+
+@dataclass
+class JITAIScores:
+    """Context scores for a set of users, row-aligned with user_ids"""
+
+    user_ids: list[str]
+    vulnerability: np.ndarray
+    receptivity: np.ndarray
+    opportunity: np.ndarray
+    score: np.ndarray  # Weighted combination
+    priority: np.ndarray  # 1-5
+    eligible: np.ndarray  # Under the daily limit and not mid-workout
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def candidates(self, threshold: Optional[float] = None) -> np.ndarray:
+        """Rows that should get an intervention now, highest score first"""
+        threshold = settings.INTERVENTION_THRESHOLD if threshold is None else threshold
+        rows = np.flatnonzero(self.eligible & (self.score >= threshold))
+        return rows[np.argsort(-self.score[rows], kind="stable")]
+
+
+class JITAIScorer:
+    """Vectorized JITAI context scoring over a feature snapshot"""
+
+    def __init__(self, max_daily: Optional[int] = None):
+        self.max_daily = settings.MAX_DAILY_INTERVENTIONS if max_daily is None else max_daily
+
+    def score(self, features: FeatureSnapshot, now: Optional[datetime] = None) -> JITAIScores:
+        """Score every user in the snapshot"""
+        now = now or datetime.now()
+        now_ts = to_epoch_seconds(now)
+        today = epoch_day(now)
+
+        in_workout = (
+            (features["workout_started_ts"] > np.nan_to_num(features["workout_ended_ts"], nan=-np.inf))
+            & (now_ts - features["workout_started_ts"] < MAX_WORKOUT_SECONDS)
+        )
+
+        vulnerability = self._vulnerability(features, today, now_ts)
+        receptivity = self._receptivity(features, now, now_ts)
+        opportunity = self._opportunity(features, now_ts, in_workout)
+
+        score = (
+            VULNERABILITY_WEIGHT * vulnerability
+            + RECEPTIVITY_WEIGHT * receptivity
+            + OPPORTUNITY_WEIGHT * opportunity
+        )
+        sent_today = np.where(features["sent_day"] == today, features["sent_today"], 0)
+
+        return JITAIScores(
+            user_ids=features.user_ids,
+            vulnerability=vulnerability,
+            receptivity=receptivity,
+            opportunity=opportunity,
+            score=score,
+            priority=1 + np.searchsorted(PRIORITY_EDGES, score, side="left"),
+            eligible=(sent_today < self.max_daily) & ~in_workout,
+        )
+
+    def _vulnerability(self, f: FeatureSnapshot, today: int, now_ts: float) -> np.ndarray:
+        missed, completed = f.window_counts(today)
+        missed_component = np.minimum(missed / MISSED_SATURATION, 1.0)
+
+        trend = f["adherence_fast"] - f["adherence_slow"]
+        decline = np.clip(-2 * np.nan_to_num(trend), 0.0, 1.0)
+
+        hrv_fresh = now_ts - f["hrv_ts"] < HRV_STALE_SECONDS
+        fatigue = np.where(hrv_fresh, np.clip(-f["hrv_z"] / 2, 0.0, 1.0), 0.0)
+
+        scheduled = missed + completed
+        non_adherence = np.divide(
+            missed, scheduled, out=np.full(len(f), 0.5), where=scheduled > 0
+        )
+
+        return np.clip(
+            0.4 * missed_component + 0.25 * decline + 0.2 * fatigue + 0.15 * non_adherence,
+            0.0,
+            1.0,
+        )
+
+    def _receptivity(self, f: FeatureSnapshot, now: datetime, now_ts: float) -> np.ndarray:
+        hour = now.hour
+        if 6 <= hour <= 10 or 16 <= hour <= 20:  # Prime workout hours
+            time_of_day = 1.0
+        elif hour >= 22 or hour < 6:
+            time_of_day = 0.1
+        else:
+            time_of_day = 0.5
+
+        hours_idle = (now_ts - f["last_active_ts"]) / 3600
+        recency = np.nan_to_num(0.5 ** (np.maximum(hours_idle, 0) / ENGAGEMENT_HALF_LIFE_HOURS))
+
+        since_sent = now_ts - f["last_sent_ts"]
+        cooldown = np.where(since_sent < COOLDOWN_SECONDS, since_sent / COOLDOWN_SECONDS, 1.0)
+
+        return np.clip(
+            (0.35 * time_of_day + 0.3 * recency + 0.35 * f["response_rate"]) * cooldown,
+            0.0,
+            1.0,
+        )
+
+    def _opportunity(self, f: FeatureSnapshot, now_ts: float, in_workout: np.ndarray) -> np.ndarray:
+        minutes_idle = (now_ts - f["last_active_ts"]) / 60
+        phone_active = np.nan_to_num(
+            0.5 ** (np.maximum(minutes_idle, 0) / PHONE_ACTIVE_HALF_LIFE_MINUTES)
+        )
+
+        now_minute = (now_ts % SECONDS_PER_DAY) / 60
+        distance = np.abs(f.usual_workout_minute() - now_minute)
+        distance = np.minimum(distance, MINUTES_PER_DAY - distance)
+        proximity = np.nan_to_num(np.exp(-((distance / WORKOUT_TIME_SCALE_MINUTES) ** 2)), nan=0.5)
+
+        return np.where(in_workout, 0.0, 0.6 * proximity + 0.4 * phone_active)
+
+
+def evaluate_users(
+    store: Optional[JITAIFeatureStore] = None,
+    now: Optional[datetime] = None,
+    user_ids: Optional[list[str]] = None,
+) -> JITAIScores:
+    """Score all users (or the given ones) from the feature store"""
+    store = store or get_jitai_feature_store()
+    return get_jitai_scorer().score(store.snapshot(user_ids), now)
+
+
+# Global instance
+_scorer: Optional[JITAIScorer] = None
+
+
+def get_jitai_scorer() -> JITAIScorer:
+    """Get or create global JITAI scorer"""
+    global _scorer
+    if _scorer is None:
+        _scorer = JITAIScorer()
+    return _scorer
@@ -0,0 +1,723 @@
+"""
+JITAI Intervention Templates
+
+Pre-generated intervention messages keyed by (intervention type, context
+bucket, coaching voice), filled in locally with the user's details.
+
+- Built-in templates cover every type and voice for any context
+- Context-specific templates are generated by the LLM the first time a
+  (type, bucket, voice) key is requested, in the background; until then
+  the built-in templates for that type and voice are served
+- Each template tracks sends and engagements from /log-response, and
+  Thompson sampling over those counts picks which template to send
+- A scheduled refresh retires templates that underperform their key and
+  asks the LLM for replacements
+- Templates, their counts and the intervention -> template mapping live in
+  Supabase, so a response is attributed whichever instance sent it
+
+Sending an intervention is a dictionary lookup and a string format, so the
+LLM cost is per template, not per message.
+"""
+
+import json
+import logging
+import sqlite3
+import string
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+import numpy as np
+from langchain_core.messages import HumanMessage, SystemMessage
+
+logger = logging.getLogger("fitos-ai")
+
+
+INTERVENTION_TYPES = ("nudge", "reminder", "celebration", "concern", "insight")
+VOICES = ("professional", "energetic", "calm")  # Same profiles as voice coaching
+DEFAULT_VOICE = "professional"
+ANY_BUCKET = "any"
+
+# Placeholders a template may use
+SLOTS = frozenset({"name", "missed_workouts", "completed_workouts"})
+
+ACTIONS = {
+    "nudge": ("Start Workout", "/tabs/workouts"),
+    "reminder": ("Start Workout", "/tabs/workouts"),
+    "celebration": ("View Progress", "/tabs/dashboard"),
+    "concern": ("Message Coach", "/tabs/coaching"),
+    "insight": ("View Progress", "/tabs/dashboard"),
+}
+
+TEMPLATES_PER_KEY = 3  # Generated per cache miss
+MAX_TITLE_LENGTH = 60
+MAX_MESSAGE_LENGTH = 320
+MIN_SENDS_TO_JUDGE = 30  # Sends before a template can be retired
+RETIRE_RATIO = 0.5  # Retired below this fraction of the key's best rate
+REFRESH_AFTER_DAYS = 30  # Generated templates older than this are regenerated
+ISSUED_RETENTION_DAYS = 14  # How long responses can be attributed
+INDEX_REFRESH_SECONDS = 300  # Reload counts and templates written by other instances
+
+
+# (type, voice) -> [(title, message, action label)]
+BUILTIN_TEMPLATES: dict[tuple[str, str], list[tuple[str, str, str]]] = {
+    ("nudge", "professional"): [
+        ("A quick session fits today", "Hi {name}, even a short workout keeps your routine on track. Your plan is ready when you are.", "Start Workout"),
+        ("Your plan is waiting", "{name}, today's session is set up for you. Twenty minutes is enough to keep moving forward.", "Start Workout"),
+    ],
+    ("nudge", "energetic"): [
+        ("Let's get moving!", "Hey {name}! Your workout is ready to go. Let's knock out even a quick one today!", "Let's Go"),
+        ("Time to show up!", "{name}, you've got this! Start with the warm-up and let momentum do the rest.", "Let's Go"),
+    ],
+    ("nudge", "calm"): [
+        ("A gentle check-in", "Hi {name}, whenever you're ready, today's session is here. Even a little movement counts.", "Start Workout"),
+        ("Small steps count", "{name}, no pressure. A short, easy session today is a great way to stay connected to your goals.", "Start Workout"),
+    ],
+    ("reminder", "professional"): [
+        ("Today's workout is scheduled", "{name}, your workout is on the plan for today. Start now to stay on schedule.", "Start Workout"),
+        ("Time for your session", "Hi {name}, it's your usual training time. Your workout is loaded and ready.", "Start Workout"),
+    ],
+    ("reminder", "energetic"): [
+        ("It's go time!", "{name}, it's your training time! Your workout is loaded. Let's do this!", "Start Now"),
+        ("Workout o'clock!", "Hey {name}! Right now is the perfect window. Hit start and crush it!", "Start Now"),
+    ],
+    ("reminder", "calm"): [
+        ("Your session is ready", "Hi {name}, it's about the time you usually train. Your workout is ready whenever you are.", "Start Workout"),
+        ("A good moment to train", "{name}, this is usually a good time for you. Your session is set up and waiting.", "Start Workout"),
+    ],
+    ("celebration", "professional"): [
+        ("Strong week so far", "{name}, you've logged {completed_workouts} this week. That consistency is what drives results.", "View Progress"),
+        ("Consistency pays off", "Nice work, {name}. {completed_workouts} this week puts you right on track.", "View Progress"),
+    ],
+    ("celebration", "energetic"): [
+        ("You're on fire!", "{name}, {completed_workouts} this week! Keep that energy rolling!", "See Progress"),
+        ("Crushing it!", "Look at you, {name}! {completed_workouts} done this week. Unstoppable!", "See Progress"),
+    ],
+    ("celebration", "calm"): [
+        ("Well done this week", "{name}, {completed_workouts} this week. Take a moment to appreciate the work you're putting in.", "View Progress"),
+        ("Steady progress", "Nice, {name}. {completed_workouts} this week shows real commitment to yourself.", "View Progress"),
+    ],
+    ("concern", "professional"): [
+        ("Checking in", "Hi {name}, I noticed {missed_workouts} missed this week. Is something getting in the way? Let's adjust the plan together.", "Message Coach"),
+        ("Let's adjust your plan", "{name}, with {missed_workouts} missed recently, a lighter schedule might fit better right now. Want to talk it through?", "Message Coach"),
+    ],
+    ("concern", "energetic"): [
+        ("Hey, we miss you!", "{name}, {missed_workouts} missed this week. No judgment! Let's find a plan that works for you.", "Chat Now"),
+        ("Let's get you back", "{name}, life happens! {missed_workouts} missed is just a blip. Ping me and we'll reset.", "Chat Now"),
+    ],
+    ("concern", "calm"): [
+        ("How are you doing?", "Hi {name}, I saw {missed_workouts} missed this week. It's okay. How are you feeling? I'm here if you want to talk.", "Message Coach"),
+        ("Just checking in", "{name}, it's been a busy stretch with {missed_workouts} missed. Rest matters too. Let me know how I can help.", "Message Coach"),
+    ],
+    ("insight", "professional"): [
+        ("A quick progress note", "{name}, habits form through repetition. Each session you complete makes the next one easier to start.", "View Progress"),
+        ("Why consistency matters", "{name}, two or three sessions a week beat one hard one. Regular training keeps progress compounding.", "View Progress"),
+    ],
+    ("insight", "energetic"): [
+        ("Fun fact!", "{name}, every workout makes the next one easier to start. Your future self is cheering!", "See Progress"),
+        ("Did you know?", "{name}, short sessions done often beat long ones done rarely. Every rep counts!", "See Progress"),
+    ],
+    ("insight", "calm"): [
+        ("Something to consider", "{name}, progress comes from showing up gently and often. There's no need to be perfect.", "View Progress"),
+        ("A small reflection", "{name}, rest and movement work together. Listening to your body is part of the process.", "View Progress"),
+    ],
+}
+
+
+_TEMPLATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jitai_templates (
+    template_id TEXT PRIMARY KEY,
+    intervention_type TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    voice TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    action_label TEXT NOT NULL,
+    source TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    sent INTEGER NOT NULL DEFAULT 0,
+    engaged INTEGER NOT NULL DEFAULT 0,
+    active INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS jitai_issued (
+    intervention_id TEXT PRIMARY KEY,
+    template_id TEXT NOT NULL,
+    issued_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jitai_issued_at ON jitai_issued (issued_at);
+"""
+
+_TEMPLATE_COLUMNS = (
+    "template_id", "intervention_type", "bucket", "voice", "title", "message",
+    "action_label", "source", "created_at", "sent", "engaged", "active",
+)
+
+
+def _level(score: float) -> str:
+    return "low" if score < 0.4 else "mid" if score < 0.7 else "high"
+
+
+def context_bucket(vulnerability: float, receptivity: float) -> str:
+    """Coarse context bucket, e.g. "v_high-r_low" """
+    return f"v_{_level(vulnerability)}-r_{_level(receptivity)}"
+
+
+def count_phrase(count: int, noun: str = "workout") -> str:
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+
+def _template_slots(text: str) -> set[str]:
+    return {name for _, name, _, _ in string.Formatter().parse(text) if name is not None}
+
+
+@dataclass
+class InterventionTemplate:
+    """A message template and its effectiveness counts"""
+
+    template_id: str
+    intervention_type: str
+    bucket: str
+    voice: str
+    title: str
+    message: str
+    action_label: str
+    source: str  # "builtin" or "llm"
+    created_at: datetime
+    sent: int = 0
+    engaged: int = 0
+    active: bool = True
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return (self.intervention_type, self.bucket, self.voice)
+
+    @property
+    def engagement_rate(self) -> float:
+        """Posterior mean with a uniform prior"""
+        return (self.engaged + 1) / (self.sent + 2)
+
+    def render(self, slots: dict[str, str]) -> tuple[str, str]:
+        """Fill placeholders; returns (title, message)"""
+        return self.title.format_map(slots), self.message.format_map(slots)
+
+
+def _template_row(template: InterventionTemplate) -> dict[str, Any]:
+    row = asdict(template)
+    row["created_at"] = template.created_at.isoformat()
+    return row
+
+
+def validate_template(title: str, message: str) -> bool:
+    """Whether a generated template is safe to store"""
+    if not title or not message:
+        return False
+    if len(title) > MAX_TITLE_LENGTH or len(message) > MAX_MESSAGE_LENGTH:
+        return False
+    try:
+        return (_template_slots(title) | _template_slots(message)) <= SLOTS
+    except ValueError:
+        return False  # Unbalanced braces
+
+
+class TemplateStore(Protocol):
+    """Where templates, their counts and issued interventions are kept"""
+
+    def seed(self, rows: list[dict[str, Any]]) -> None:
+        """Insert templates that don't exist yet"""
+        ...
+
+    def load_active(self) -> list[dict[str, Any]]:
+        ...
+
+    def add(self, rows: list[dict[str, Any]]) -> None:
+        ...
+
+    def issue(self, intervention_id: str, template_id: str, issued_at: datetime) -> None:
+        """Count a send and map the intervention to its template, atomically"""
+        ...
+
+    def record_response(self, intervention_id: str, engaged: bool) -> Optional[str]:
+        """Consume the mapping and count an engagement; returns the template id"""
+        ...
+
+    def retire(self, template_id: str) -> None:
+        ...
+
+    def prune_issued(self, cutoff: datetime) -> int:
+        ...
+
+
+class SupabaseTemplateStore:
+    """
+    Template bank tables in Supabase, shared by every API instance.
+
+    Sends and responses go through RPCs (issue_jitai_intervention,
+    record_jitai_response) so concurrent instances never lose a count.
+    """
+
+    TEMPLATES_TABLE = 'jitai_templates'
+    ISSUED_TABLE = 'jitai_issued_interventions'
+    ROW_PAGE = 1000  # PostgREST's default max rows per response
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+
+    def seed(self, rows: list[dict[str, Any]]) -> None:
+        (self.supabase.table(self.TEMPLATES_TABLE)
+         .upsert(rows, on_conflict='template_id', ignore_duplicates=True)
+         .execute())
+
+    def load_active(self) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            result = (self.supabase.table(self.TEMPLATES_TABLE)
+                      .select(', '.join(_TEMPLATE_COLUMNS))
+                      .eq('active', True)
+                      .order('template_id', desc=False)
+                      .range(offset, offset + self.ROW_PAGE - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.ROW_PAGE:
+                return rows
+            offset += self.ROW_PAGE
+
+    def add(self, rows: list[dict[str, Any]]) -> None:
+        if rows:
+            self.supabase.table(self.TEMPLATES_TABLE).insert(rows).execute()
+
+    def issue(self, intervention_id: str, template_id: str, issued_at: datetime) -> None:
+        self.supabase.rpc('issue_jitai_intervention', {
+            'intervention_id_param': intervention_id,
+            'template_id_param': template_id,
+            'issued_at_param': issued_at.isoformat(),
+        }).execute()
+
+    def record_response(self, intervention_id: str, engaged: bool) -> Optional[str]:
+        result = self.supabase.rpc('record_jitai_response', {
+            'intervention_id_param': intervention_id,
+            'engaged_param': engaged,
+        }).execute()
+        return result.data or None
+
+    def retire(self, template_id: str) -> None:
+        (self.supabase.table(self.TEMPLATES_TABLE)
+         .update({'active': False})
+         .eq('template_id', template_id)
+         .execute())
+
+    def prune_issued(self, cutoff: datetime) -> int:
+        result = (self.supabase.table(self.ISSUED_TABLE)
+                  .delete()
+                  .lt('issued_at', cutoff.isoformat())
+                  .execute())
+        return len(result.data or [])
+
+
+class SQLiteTemplateStore:
+    """Template bank tables in a local SQLite file (tests, single process)"""
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_TEMPLATE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def seed(self, rows: list[dict[str, Any]]) -> None:
+        self._insert("INSERT OR IGNORE", rows)
+
+    def add(self, rows: list[dict[str, Any]]) -> None:
+        self._insert("INSERT", rows)
+
+    def _insert(self, verb: str, rows: list[dict[str, Any]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"{verb} INTO jitai_templates ({', '.join(_TEMPLATE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _TEMPLATE_COLUMNS)})",
+                [tuple(row[c] for c in _TEMPLATE_COLUMNS) for row in rows],
+            )
+
+    def load_active(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_TEMPLATE_COLUMNS)} FROM jitai_templates WHERE active = 1"
+            ).fetchall()
+        return [dict(zip(_TEMPLATE_COLUMNS, row)) for row in rows]
+
+    def issue(self, intervention_id: str, template_id: str, issued_at: datetime) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jitai_templates SET sent = sent + 1 WHERE template_id = ?",
+                (template_id,),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jitai_issued (intervention_id, template_id, issued_at) "
+                "VALUES (?, ?, ?)",
+                (intervention_id, template_id, issued_at.isoformat()),
+            )
+
+    def record_response(self, intervention_id: str, engaged: bool) -> Optional[str]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT template_id FROM jitai_issued WHERE intervention_id = ?",
+                (intervention_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "DELETE FROM jitai_issued WHERE intervention_id = ?", (intervention_id,)
+            )
+            if engaged:
+                self._conn.execute(
+                    "UPDATE jitai_templates SET engaged = engaged + 1 WHERE template_id = ?",
+                    (row[0],),
+                )
+        return row[0]
+
+    def retire(self, template_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jitai_templates SET active = 0 WHERE template_id = ?", (template_id,)
+            )
+
+    def prune_issued(self, cutoff: datetime) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM jitai_issued WHERE issued_at < ?", (cutoff.isoformat(),)
+            ).rowcount
+
+
+class InterventionTemplateBank:
+    """
+    Template bank with an in-memory index over a TemplateStore.
+
+    Selection and rendering never touch the store; send and response
+    counts are written through, and the index is reloaded every
+    INDEX_REFRESH_SECONDS to pick up other instances' counts and templates.
+    """
+
+    def __init__(self, store: TemplateStore, seed: Optional[int] = None):
+        self.store = store
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)
+        self._index: dict[tuple[str, str, str], list[InterventionTemplate]] = {}
+        self._by_id: dict[str, InterventionTemplate] = {}
+        self._loaded_at = 0.0
+        self._seed_builtins()
+        self._load()
+
+    def _seed_builtins(self) -> None:
+        now = datetime.now()
+        self.store.seed([
+            _template_row(InterventionTemplate(
+                template_id=f"builtin:{kind}:{voice}:{i}",
+                intervention_type=kind,
+                bucket=ANY_BUCKET,
+                voice=voice,
+                title=title,
+                message=message,
+                action_label=label,
+                source="builtin",
+                created_at=now,
+            ))
+            for (kind, voice), drafts in BUILTIN_TEMPLATES.items()
+            for i, (title, message, label) in enumerate(drafts)
+        ])
+
+    def _load(self) -> None:
+        index: dict[tuple[str, str, str], list[InterventionTemplate]] = {}
+        by_id: dict[str, InterventionTemplate] = {}
+        for values in self.store.load_active():
+            values = dict(values)
+            values["created_at"] = datetime.fromisoformat(str(values["created_at"]))
+            values["active"] = bool(values["active"])
+            template = InterventionTemplate(**values)
+            index.setdefault(template.key, []).append(template)
+            by_id[template.template_id] = template
+        with self._lock:
+            self._index, self._by_id = index, by_id
+            self._loaded_at = time.monotonic()
+
+    def _add_to_index(self, template: InterventionTemplate) -> None:
+        self._index.setdefault(template.key, []).append(template)
+        self._by_id[template.template_id] = template
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def has_templates(self, intervention_type: str, bucket: str, voice: str) -> bool:
+        return bool(self._index.get((intervention_type, bucket, voice)))
+
+    def select(
+        self, intervention_type: str, bucket: str, voice: str = DEFAULT_VOICE
+    ) -> tuple[Optional[InterventionTemplate], bool]:
+        """
+        Pick a template by Thompson sampling over engagement counts.
+
+        Falls back to the voice's built-in templates for any context, then
+        to the default voice.
+
+        Returns:
+            (template or None, whether the exact key had templates)
+        """
+        if time.monotonic() - self._loaded_at > INDEX_REFRESH_SECONDS:
+            self._load()
+        for key in (
+            (intervention_type, bucket, voice),
+            (intervention_type, ANY_BUCKET, voice),
+            (intervention_type, ANY_BUCKET, DEFAULT_VOICE),
+        ):
+            candidates = self._index.get(key)
+            if candidates:
+                with self._lock:
+                    sent = np.array([t.sent for t in candidates], dtype=np.float64)
+                    engaged = np.array([t.engaged for t in candidates], dtype=np.float64)
+                    draws = self._rng.beta(engaged + 1, sent - engaged + 1)
+                return candidates[int(np.argmax(draws))], key[1] == bucket
+        return None, False
+
+    def issue(self, intervention_id: str, template: InterventionTemplate, now: Optional[datetime] = None) -> None:
+        """Count a send and remember which template an intervention used"""
+        self.store.issue(intervention_id, template.template_id, now or datetime.now())
+        with self._lock:
+            template.sent += 1
+
+    def record_response(self, intervention_id: str, engaged: bool) -> Optional[str]:
+        """
+        Attribute a response to the template that produced the intervention.
+
+        Each intervention counts once. Returns the template id, or None for
+        unknown or already-answered interventions.
+        """
+        template_id = self.store.record_response(intervention_id, engaged)
+        if template_id is not None and engaged:
+            with self._lock:
+                template = self._by_id.get(template_id)
+                if template is not None:
+                    template.engaged += 1
+        return template_id
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def add_generated(
+        self,
+        intervention_type: str,
+        bucket: str,
+        voice: str,
+        drafts: list[dict[str, Any]],
+        now: Optional[datetime] = None,
+    ) -> list[InterventionTemplate]:
+        """Store valid LLM-generated drafts ({title, message, action_label})"""
+        now = now or datetime.now()
+        default_label = ACTIONS[intervention_type][0]
+        added = []
+        for draft in drafts:
+            title = str(draft.get("title", "")).strip()
+            message = str(draft.get("message", "")).strip()
+            if not validate_template(title, message):
+                logger.warning(f"Rejected generated {intervention_type} template: {title!r}")
+                continue
+            added.append(InterventionTemplate(
+                template_id=f"llm:{uuid.uuid4().hex[:12]}",
+                intervention_type=intervention_type,
+                bucket=bucket,
+                voice=voice,
+                title=title,
+                message=message,
+                action_label=str(draft.get("action_label") or default_label)[:30],
+                source="llm",
+                created_at=now,
+            ))
+
+        self.store.add([_template_row(t) for t in added])
+        with self._lock:
+            for template in added:
+                self._add_to_index(template)
+        return added
+
+    def retire(self, template_id: str) -> None:
+        """Stop serving a template (its counts are kept)"""
+        self.store.retire(template_id)
+        with self._lock:
+            template = self._by_id.pop(template_id, None)
+            if template is not None:
+                template.active = False
+                self._index[template.key].remove(template)
+
+    def refresh_candidates(self, now: Optional[datetime] = None) -> list[InterventionTemplate]:
+        """
+        Generated templates due for replacement: clear underperformers
+        (after MIN_SENDS_TO_JUDGE sends) and anything older than
+        REFRESH_AFTER_DAYS. Built-in templates are never retired.
+        """
+        now = now or datetime.now()
+        cutoff = now - timedelta(days=REFRESH_AFTER_DAYS)
+        stale = []
+        with self._lock:
+            for templates in self._index.values():
+                if not templates:
+                    continue
+                best = max(t.engagement_rate for t in templates)
+                for template in templates:
+                    if template.source != "llm":
+                        continue
+                    judged = template.sent >= MIN_SENDS_TO_JUDGE
+                    if template.created_at < cutoff or (
+                        judged and template.engagement_rate < RETIRE_RATIO * best
+                    ):
+                        stale.append(template)
+        return stale
+
+    def prune_issued(self, now: Optional[datetime] = None) -> int:
+        """Forget interventions too old to still get a response"""
+        cutoff = (now or datetime.now()) - timedelta(days=ISSUED_RETENTION_DAYS)
+        return self.store.prune_issued(cutoff)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Per-template effectiveness, best first within each key"""
+        with self._lock:
+            templates = sorted(
+                self._by_id.values(), key=lambda t: (t.key, -t.engagement_rate)
+            )
+        return [
+            {
+                "template_id": t.template_id,
+                "intervention_type": t.intervention_type,
+                "bucket": t.bucket,
+                "voice": t.voice,
+                "source": t.source,
+                "sent": t.sent,
+                "engaged": t.engaged,
+                "engagement_rate": round(t.engagement_rate, 3),
+            }
+            for t in templates
+        ]
+
+
+class InterventionTemplateGenerator:
+    """Fills template bank keys with LLM-written templates"""
+
+    def __init__(self, bank: InterventionTemplateBank, llm=None):
+        self.bank = bank
+        self._llm = llm
+        self._pending: set[tuple[str, str, str]] = set()
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from app.core.llm import get_routine_llm
+
+            self._llm = get_routine_llm()
+        return self._llm
+
+    async def fill(
+        self, intervention_type: str, bucket: str, voice: str, count: int = TEMPLATES_PER_KEY
+    ) -> list[InterventionTemplate]:
+        """Generate templates for one key (skipped if already in flight)"""
+        key = (intervention_type, bucket, voice)
+        if key in self._pending:
+            return []
+        self._pending.add(key)
+        try:
+            response = await self.llm.ainvoke([
+                SystemMessage(content=self._build_prompt(intervention_type, bucket, voice, count)),
+                HumanMessage(content=f"Write {count} {intervention_type} templates."),
+            ])
+            drafts = self._parse(response.content)
+            added = self.bank.add_generated(intervention_type, bucket, voice, drafts)
+            logger.info(f"Generated {len(added)} templates for {key}")
+            return added
+        except Exception as e:
+            logger.error(f"Template generation failed for {key}: {e}", exc_info=True)
+            return []
+        finally:
+            self._pending.discard(key)
+
+    async def refresh(self, max_keys: int = 20) -> dict[str, int]:
+        """Scheduled refresh: replace stale or underperforming templates"""
+        stale = self.bank.refresh_candidates()
+        keys = list(dict.fromkeys(t.key for t in stale))[:max_keys]
+        retired = generated = 0
+        for key in keys:
+            added = await self.fill(*key, count=sum(1 for t in stale if t.key == key))
+            if not added:
+                continue  # Keep serving the old ones
+            for template in stale:
+                if template.key == key:
+                    self.bank.retire(template.template_id)
+                    retired += 1
+            generated += len(added)
+        pruned = self.bank.prune_issued()
+        return {"keys": len(keys), "retired": retired, "generated": generated, "pruned_issued": pruned}
+
+    @staticmethod
+    def _build_prompt(intervention_type: str, bucket: str, voice: str, count: int) -> str:
+        vulnerability, receptivity = (part.split("_")[1] for part in bucket.split("-"))
+        return f"""You are writing reusable push-notification templates for a fitness coaching app.
+
+Intervention Type: {intervention_type}
+Coaching Voice: {voice}
+User Context: {vulnerability} risk of skipping workouts, {receptivity} receptivity to messages
+
+Placeholders (use only these, in curly braces):
+- {{name}}: the user's first name
+- {{missed_workouts}}: e.g. "2 workouts" missed in the last 7 days
+- {{completed_workouts}}: e.g. "3 workouts" completed in the last 7 days
+
+Guidelines:
+1. Keep each message under 50 words and each title to 4-6 words
+2. Be warm and encouraging, never guilt-inducing
+3. Match the coaching voice
+4. Provide one clear micro-action if appropriate
+5. Avoid clichés and toxic positivity
+
+Format as a JSON array of {count} objects:
+[
+  {{"title": "Your workout is ready", "message": "{{name}}, today's session builds on your momentum. Ready?", "action_label": "Start Workout"}}
+]
+"""
+
+    @staticmethod
+    def _parse(content: str) -> list[dict[str, Any]]:
+        start, end = content.find("["), content.rfind("]")
+        if start < 0 or end < start:
+            raise ValueError("No JSON array in response")
+        drafts = json.loads(content[start:end + 1])
+        return [d for d in drafts if isinstance(d, dict)]
+
+
+# Global instances
+_template_bank: Optional[InterventionTemplateBank] = None
+_template_generator: Optional[InterventionTemplateGenerator] = None
+
+
+def get_template_bank() -> InterventionTemplateBank:
+    """Get or create global intervention template bank"""
+    global _template_bank
+    if _template_bank is None:
+        from app.core.database import get_supabase_client
+
+        _template_bank = InterventionTemplateBank(SupabaseTemplateStore(get_supabase_client()))
+    return _template_bank
+
+
+def get_template_generator() -> InterventionTemplateGenerator:
+    """Get or create global intervention template generator"""
+    global _template_generator
+    if _template_generator is None:
+        _template_generator = InterventionTemplateGenerator(get_template_bank())
+    return _template_generator
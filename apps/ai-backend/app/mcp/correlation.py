@@ -0,0 +1,494 @@
+"""
+Health ↔ Performance Correlation Engine
+
+Correlates a daily health series from the wearable store (HRV, sleep,
+resting heart rate, ...) with a daily training series built from logged
+workout sets (volume, sets, reps, RPE, relative strength):
+
+- Both series are laid on one calendar axis over the requested range;
+  days missing from either side (no sync, rest days) are left out of the
+  pairs rather than filled in
+- Pearson and Spearman coefficients at each requested lag, where lag N
+  pairs health on day d with performance on day d+N (sleep → next-day
+  volume is lag 1)
+- Percentile bootstrap confidence intervals, all resamples computed as
+  one NumPy array per coefficient
+- Results cached per (user, metric pair, range); entries expire after a
+  TTL and as soon as the wearable store reports a new sync
+
+Sprint 31: Apple Health MCP Integration
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from enum import Enum
+from typing import Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.outcome_verification.strength_engine import get_strength_engine
+from app.wearables.timeseries_store import (
+    SECONDS_PER_DAY,
+    Granularity,
+    WearableMetric,
+    WearableTimeSeriesStore,
+    day_index,
+    get_wearable_store,
+)
+
+
+class PerformanceMetric(str, Enum):
+    """Daily training metrics derived from workout sets"""
+
+    WORKOUT_VOLUME = "workout_volume"  # Σ weight × reps
+    TOTAL_SETS = "total_sets"
+    TOTAL_REPS = "total_reps"
+    AVERAGE_RPE = "average_rpe"
+    RELATIVE_STRENGTH = "relative_strength"  # Mean e1RM as % of each lift's best in range
+
+
+# Names agents use for the same metrics
+METRIC_ALIASES: Dict[str, WearableMetric | PerformanceMetric] = {
+    "sleep": WearableMetric.SLEEP_DURATION,
+    "resting_hr": WearableMetric.RESTING_HR,
+    "rhr": WearableMetric.RESTING_HR,
+    "heart_rate_variability": WearableMetric.HRV,
+    "weight": WearableMetric.BODY_WEIGHT,
+    "volume": PerformanceMetric.WORKOUT_VOLUME,
+    "training_volume": PerformanceMetric.WORKOUT_VOLUME,
+    "sets": PerformanceMetric.TOTAL_SETS,
+    "reps": PerformanceMetric.TOTAL_REPS,
+    "rpe": PerformanceMetric.AVERAGE_RPE,
+    "intensity": PerformanceMetric.AVERAGE_RPE,
+    "strength": PerformanceMetric.RELATIVE_STRENGTH,
+    "strength_gains": PerformanceMetric.RELATIVE_STRENGTH,
+    "e1rm": PerformanceMetric.RELATIVE_STRENGTH,
+}
+
+MIN_PAIRED_DAYS = 7  # Fewer overlapping days and no coefficient is reported
+DEFAULT_LAGS = (0, 1)
+
+
+def resolve_metric(name: str) -> WearableMetric | PerformanceMetric:
+    """
+    Map a metric name (or alias) onto a stored or derived metric.
+
+    Raises:
+        ValueError: Unknown metric
+    """
+    key = name.strip().lower().replace(" ", "_").replace("-", "_")
+    for enum in (WearableMetric, PerformanceMetric):
+        try:
+            return enum(key)
+        except ValueError:
+            pass
+    if key in METRIC_ALIASES:
+        return METRIC_ALIASES[key]
+    supported = [m.value for m in WearableMetric] + [m.value for m in PerformanceMetric]
+    raise ValueError(f"Unknown metric '{name}'. Supported: {', '.join(supported)}")
+
+
+# =====================================================
+# Workout series
+# =====================================================
+
+class WorkoutSetSource(Protocol):
+    """Where logged workout sets come from"""
+
+    def fetch_sets(self, user_id: str, start: date, end: date) -> list[dict]:
+        """Sets completed in [start, end] as dicts: exercise_id, weight, reps, rpe, completed_at"""
+        ...
+
+
+class SupabaseWorkoutSetSource:
+    """Reads completed sets from workout_sets"""
+
+    ROW_PAGE = 1000  # PostgREST's default max rows per response
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+
+    def fetch_sets(self, user_id: str, start: date, end: date) -> list[dict]:
+        """Every set in [start, end], oldest first, read a page at a time"""
+        rows: list[dict] = []
+        offset = 0
+        while True:
+            result = (self.supabase.table('workout_sets')
+                      .select('id, exercise_id, weight, reps, rpe, completed_at')
+                      .eq('client_id', user_id)
+                      .gte('completed_at', start.isoformat())
+                      .lt('completed_at', (end + timedelta(days=1)).isoformat())
+                      .order('completed_at', desc=False)
+                      .order('id', desc=False)  # Stable pages when timestamps tie
+                      .range(offset, offset + self.ROW_PAGE - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(row for row in page if row.get('weight') and row.get('reps'))
+            if len(page) < self.ROW_PAGE:
+                return rows
+            offset += self.ROW_PAGE
+
+
+def daily_performance(sets: Sequence[dict], metric: PerformanceMetric) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate workout sets into one value per training day.
+
+    Returns:
+        (day indices, values), ascending by day. Days without a usable
+        value (e.g. no RPE logged) are dropped.
+    """
+    if not sets:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    analytics = get_strength_engine().analyze(
+        exercise_ids=[s['exercise_id'] or '' for s in sets],
+        timestamps=[s['completed_at'] for s in sets],
+        weight=[float(s['weight']) for s in sets],
+        reps=[int(s['reps']) for s in sets],
+        rpe=[s.get('rpe') for s in sets],
+    )
+    days, day_of_set = np.unique(
+        np.floor(analytics.timestamps / SECONDS_PER_DAY).astype(np.int64), return_inverse=True
+    )
+    n_days = days.size
+
+    if metric == PerformanceMetric.WORKOUT_VOLUME:
+        values = np.bincount(day_of_set, weights=analytics.weight * analytics.reps, minlength=n_days)
+    elif metric == PerformanceMetric.TOTAL_SETS:
+        values = np.bincount(day_of_set, minlength=n_days).astype(np.float64)
+    elif metric == PerformanceMetric.TOTAL_REPS:
+        values = np.bincount(day_of_set, weights=analytics.reps, minlength=n_days)
+    elif metric == PerformanceMetric.AVERAGE_RPE:
+        values = _daily_nanmean(analytics.rpe, day_of_set, n_days)
+    else:
+        # Each set's e1RM relative to its lift's best, so lifts of different size mix
+        _, lift_of_set = np.unique(analytics.exercise_ids, return_inverse=True)
+        lift_best = np.full(lift_of_set.max() + 1, np.nan)
+        np.fmax.at(lift_best, lift_of_set, analytics.e1rm)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            relative = analytics.e1rm / lift_best[lift_of_set] * 100
+        values = _daily_nanmean(relative, day_of_set, n_days)
+
+    keep = np.isfinite(values)
+    return days[keep], values[keep]
+
+
+def _daily_nanmean(values: np.ndarray, day_of_set: np.ndarray, n_days: int) -> np.ndarray:
+    present = np.isfinite(values)
+    totals = np.bincount(day_of_set[present], weights=values[present], minlength=n_days)
+    counts = np.bincount(day_of_set[present], minlength=n_days)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return totals / counts
+
+
+# =====================================================
+# Statistics
+# =====================================================
+
+def rank_average(x: np.ndarray) -> np.ndarray:
+    """Ranks along the last axis (1-based), ties sharing their average rank"""
+    n = x.shape[-1]
+    order = np.argsort(x, axis=-1, kind="stable")
+    ordered = np.take_along_axis(x, order, axis=-1)
+    position = np.broadcast_to(np.arange(n), x.shape)
+
+    starts = np.ones(x.shape, dtype=bool)
+    starts[..., 1:] = ordered[..., 1:] != ordered[..., :-1]
+    ends = np.ones(x.shape, dtype=bool)
+    ends[..., :-1] = starts[..., 1:]
+
+    # First and last sorted position of each element's tie group
+    first = np.maximum.accumulate(np.where(starts, position, 0), axis=-1)
+    last = np.flip(np.minimum.accumulate(np.flip(np.where(ends, position, n - 1), axis=-1), axis=-1), axis=-1)
+
+    ranks = np.empty(x.shape, dtype=np.float64)
+    np.put_along_axis(ranks, order, (first + last) / 2 + 1, axis=-1)
+    return ranks
+
+
+def pearson_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pearson r along the last axis (NaN where either side is constant)"""
+    a = a - a.mean(axis=-1, keepdims=True)
+    b = b - b.mean(axis=-1, keepdims=True)
+    denominator = np.sqrt(np.einsum("...i,...i->...", a, a) * np.einsum("...i,...i->...", b, b))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = np.einsum("...i,...i->...", a, b) / denominator
+    return np.where(denominator > 0, np.clip(r, -1.0, 1.0), np.nan)
+
+
+def spearman_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Spearman rho along the last axis"""
+    return pearson_rows(rank_average(a), rank_average(b))
+
+
+def bootstrap_intervals(
+    a: np.ndarray,
+    b: np.ndarray,
+    samples: int,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> dict[str, Optional[tuple[float, float]]]:
+    """
+    Percentile bootstrap intervals for Pearson and Spearman.
+
+    Every resample of the pairs is one row of a (samples, n) index matrix,
+    so each coefficient is computed once over the whole matrix.
+    """
+    rng = np.random.default_rng(seed)
+    index = rng.integers(0, a.size, size=(samples, a.size))
+    resampled_a, resampled_b = a[index], b[index]
+    tail = (1 - confidence) / 2 * 100
+
+    intervals: dict[str, Optional[tuple[float, float]]] = {}
+    for name, coefficients in (
+        ("pearson", pearson_rows(resampled_a, resampled_b)),
+        ("spearman", spearman_rows(resampled_a, resampled_b)),
+    ):
+        valid = coefficients[np.isfinite(coefficients)]
+        if valid.size < samples / 2:
+            intervals[name] = None
+            continue
+        low, high = np.percentile(valid, [tail, 100 - tail])
+        intervals[name] = (round(float(low), 4), round(float(high), 4))
+    return intervals
+
+
+# =====================================================
+# Engine
+# =====================================================
+
+@dataclass
+class LagCorrelation:
+    """Correlation at one lag (health on day d vs performance on day d + lag_days)"""
+
+    lag_days: int
+    paired_days: int
+    pearson: Optional[float] = None
+    spearman: Optional[float] = None
+    pearson_ci: Optional[tuple[float, float]] = None
+    spearman_ci: Optional[tuple[float, float]] = None
+
+    @property
+    def significant(self) -> bool:
+        """Pearson interval excludes zero"""
+        return self.pearson_ci is not None and (self.pearson_ci[0] > 0 or self.pearson_ci[1] < 0)
+
+    def to_dict(self) -> dict:
+        return {
+            "lag_days": self.lag_days,
+            "paired_days": self.paired_days,
+            "pearson": self.pearson,
+            "spearman": self.spearman,
+            "pearson_ci": list(self.pearson_ci) if self.pearson_ci else None,
+            "spearman_ci": list(self.spearman_ci) if self.spearman_ci else None,
+            "significant": self.significant,
+        }
+
+
+@dataclass
+class CorrelationResult:
+    """Correlations between one health and one performance metric over a range"""
+
+    user_id: str
+    health_metric: str
+    performance_metric: str
+    start: date
+    end: date
+    health_days: int
+    performance_days: int
+    lags: List[LagCorrelation] = field(default_factory=list)
+    cached: bool = False
+
+    @property
+    def best(self) -> Optional[LagCorrelation]:
+        """Lag with the strongest Pearson coefficient (shortest lag on ties)"""
+        scored = [lag for lag in self.lags if lag.pearson is not None]
+        return max(scored, key=lambda lag: (abs(lag.pearson), -lag.lag_days)) if scored else None
+
+    def to_dict(self) -> dict:
+        best = self.best
+        return {
+            "health_metric": self.health_metric,
+            "performance_metric": self.performance_metric,
+            "time_range": {"start": self.start.isoformat(), "end": self.end.isoformat()},
+            "health_days": self.health_days,
+            "performance_days": self.performance_days,
+            "best_lag_days": best.lag_days if best else None,
+            "lags": [lag.to_dict() for lag in self.lags],
+            "cached": self.cached,
+        }
+
+
+class CorrelationEngine:
+    """Computes and caches health ↔ performance correlations per user"""
+
+    def __init__(
+        self,
+        store: Optional[WearableTimeSeriesStore] = None,
+        workout_source: Optional[WorkoutSetSource] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        bootstrap_samples: Optional[int] = None,
+    ):
+        self._store = store
+        self._workout_source = workout_source
+        self.max_entries = max_entries or settings.CORRELATION_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds or settings.CORRELATION_CACHE_TTL_SECONDS
+        self.bootstrap_samples = bootstrap_samples or settings.CORRELATION_BOOTSTRAP_SAMPLES
+
+        self._cache: OrderedDict[tuple, tuple[tuple, float, CorrelationResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0}
+
+    @property
+    def store(self) -> WearableTimeSeriesStore:
+        return self._store or get_wearable_store()
+
+    @property
+    def workout_source(self) -> WorkoutSetSource:
+        if self._workout_source is None:
+            from supabase import create_client
+
+            self._workout_source = SupabaseWorkoutSetSource(
+                create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+            )
+        return self._workout_source
+
+    def analyze(
+        self,
+        user_id: str,
+        health_metric: str,
+        performance_metric: str,
+        start: date,
+        end: date,
+        lags: Sequence[int] = DEFAULT_LAGS,
+    ) -> CorrelationResult:
+        """
+        Correlate two metrics over [start, end] at each lag.
+
+        Raises:
+            ValueError: Unknown metric name
+        """
+        health = resolve_metric(health_metric)
+        performance = resolve_metric(performance_metric)
+        lags = tuple(sorted(set(int(lag) for lag in lags)))
+
+        key = (user_id, health.value, performance.value, day_index(start), day_index(end), lags)
+        versions = (self._version(user_id, health), self._version(user_id, performance))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == versions and now - entry[1] < self.ttl_seconds:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return replace(entry[2], cached=True)
+            self.stats["stale" if entry is not None else "misses"] += 1
+
+        result = self._compute(user_id, health, performance, start, end, lags)
+
+        with self._lock:
+            self._cache[key] = (versions, now, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return result
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's cached correlations (e.g. after logging a workout)"""
+        with self._lock:
+            for key in [k for k in self._cache if k[0] == user_id]:
+                del self._cache[key]
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._cache), "max_entries": self.max_entries, **self.stats}
+
+    # ------------------------------------------------------------------
+
+    def _version(self, user_id: str, metric: WearableMetric | PerformanceMetric) -> Optional[int]:
+        # Workout sets carry no version; the TTL bounds how stale they get
+        if isinstance(metric, WearableMetric):
+            return self.store.data_version(user_id, metric)
+        return None
+
+    def _series(
+        self,
+        user_id: str,
+        metric: WearableMetric | PerformanceMetric,
+        start: date,
+        end: date,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if isinstance(metric, WearableMetric):
+            block = self.store.read_rollups(user_id, metric, start, end, Granularity.DAY)
+            return block.buckets, block.values
+        return daily_performance(self.workout_source.fetch_sets(user_id, start, end), metric)
+
+    def _compute(
+        self,
+        user_id: str,
+        health: WearableMetric | PerformanceMetric,
+        performance: WearableMetric | PerformanceMetric,
+        start: date,
+        end: date,
+        lags: tuple[int, ...],
+    ) -> CorrelationResult:
+        first_day = day_index(start)
+        n_days = day_index(end) - first_day + 1
+
+        # One calendar axis; NaN where a series has no value that day
+        aligned = []
+        for metric in (health, performance):
+            days, values = self._series(user_id, metric, start, end)
+            series = np.full(max(n_days, 0), np.nan)
+            inside = (days >= first_day) & (days < first_day + n_days)
+            series[days[inside] - first_day] = values[inside]
+            aligned.append(series)
+        health_series, performance_series = aligned
+
+        result = CorrelationResult(
+            user_id=user_id,
+            health_metric=health.value,
+            performance_metric=performance.value,
+            start=start,
+            end=end,
+            health_days=int(np.isfinite(health_series).sum()),
+            performance_days=int(np.isfinite(performance_series).sum()),
+        )
+
+        for lag in lags:
+            if lag >= 0:
+                a, b = health_series[:max(n_days - lag, 0)], performance_series[lag:]
+            else:
+                a, b = health_series[-lag:], performance_series[:max(n_days + lag, 0)]
+            paired = np.isfinite(a) & np.isfinite(b)
+            a, b = a[paired], b[paired]
+
+            lag_result = LagCorrelation(lag_days=lag, paired_days=int(a.size))
+            if a.size >= MIN_PAIRED_DAYS:
+                pearson = pearson_rows(a, b)
+                if np.isfinite(pearson):
+                    intervals = bootstrap_intervals(a, b, self.bootstrap_samples, seed=a.size + lag)
+                    lag_result.pearson = round(float(pearson), 4)
+                    lag_result.spearman = round(float(spearman_rows(a, b)), 4)
+                    lag_result.pearson_ci = intervals["pearson"]
+                    lag_result.spearman_ci = intervals["spearman"]
+            result.lags.append(lag_result)
+
+        return result
+
+
+# Global instance
+_correlation_engine: Optional[CorrelationEngine] = None
+
+
+def get_correlation_engine() -> CorrelationEngine:
+    """Get or create global correlation engine"""
+    global _correlation_engine
+    if _correlation_engine is None:
+        _correlation_engine = CorrelationEngine()
+    return _correlation_engine
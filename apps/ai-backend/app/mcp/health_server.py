@@ -2,6 +2,8 @@
 Apple Health MCP Server
 
 Provides natural language interface to Apple Health data via HealthKit.
+Queries are answered from the wearable store's per-user daily rollups
+(app/wearables/timeseries_store.py) through a cached query engine.
 
 Features:
 - HRV, heart rate, sleep, steps, workouts
@@ -18,6 +20,10 @@ Example Queries:
 Sprint 31: Apple Health MCP Integration
 """
 
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 from enum import Enum
@@ -25,6 +31,19 @@ from enum import Enum
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
+from app.core.config import settings
+from app.wearables.timeseries_store import (
+    METRIC_UNITS,
+    Granularity,
+    RollupBlock,
+    WearableMetric,
+    WearableTimeSeriesStore,
+    day_from_index,
+    day_index,
+    get_wearable_store,
+    summarize_block,
+)
+
 
 class HealthMetric(str, Enum):
     """Available health metrics from Apple Health"""
@@ -91,43 +110,73 @@ app = FastAPI(
 )
 
 
-def parse_time_range(query: str) -> tuple[datetime, datetime]:
+# Keywords per metric. One compiled alternation (longest keyword first)
+# finds the leftmost mention, so "heart rate variability" beats "heart rate"
+# and "sleep quality" beats "sleep".
+METRIC_KEYWORDS: Dict[HealthMetric, List[str]] = {
+    HealthMetric.HRV: ["hrv", "heart rate variability", "variability"],
+    HealthMetric.RESTING_HR: ["resting heart rate", "resting hr", "rhr"],
+    HealthMetric.HEART_RATE: ["heart rate", "bpm", "pulse"],
+    HealthMetric.SLEEP_DURATION: ["sleep", "sleep duration", "hours of sleep", "slept"],
+    HealthMetric.SLEEP_QUALITY: ["sleep quality", "deep sleep", "rem sleep"],
+    HealthMetric.STEPS: ["steps", "step count", "walking"],
+    HealthMetric.ACTIVE_CALORIES: ["active calories", "calories burned", "energy"],
+    HealthMetric.DISTANCE: ["distance", "miles", "kilometers"],
+    HealthMetric.WORKOUT_DURATION: ["workout", "exercise", "training duration"],
+    HealthMetric.BODY_WEIGHT: ["weight", "body weight", "weigh"],
+    HealthMetric.BODY_FAT: ["body fat", "fat percentage"],
+}
+
+_KEYWORD_METRIC = {
+    keyword: metric for metric, keywords in METRIC_KEYWORDS.items() for keyword in keywords
+}
+_METRIC_PATTERN = re.compile(
+    r"\b(?P<keyword>{})(?:s|ing)?\b".format(
+        "|".join(re.escape(k) for k in sorted(_KEYWORD_METRIC, key=len, reverse=True))
+    )
+)
+
+# Days covered by each unit / preset
+RANGE_DAYS = {"day": 1, "week": 7, "month": 30, "quarter": 90, "year": 365}
+DEFAULT_RANGE_DAYS = 7
+
+_TIME_RANGE_PATTERN = re.compile(
+    r"\b(?:(?P<today>today)"
+    r"|(?P<yesterday>yesterday)"
+    r"|(?P<n>\d+)[\s-]*(?P<unit>day|week|month|quarter|year)s?"
+    r"|(?P<preset>week|month|quarter|year))\b"
+)
+
+
+def parse_time_range(query: str, now: Optional[datetime] = None) -> tuple[datetime, datetime]:
     """
     Parse time range from natural language query.
 
+    Understands "today", "yesterday", "last/past N days|weeks|months|years"
+    and the week/month/quarter/year presets; anything else is the last 7 days.
+
     Args:
         query: Natural language query
+        now: Reference time (defaults to the current time)
 
     Returns:
         Tuple of (start_time, end_time)
     """
-    now = datetime.now()
-    query_lower = query.lower()
-
-    if "today" in query_lower:
-        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end = now
-    elif "yesterday" in query_lower:
-        start = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        end = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    elif "week" in query_lower or "7 day" in query_lower:
-        start = now - timedelta(days=7)
-        end = now
-    elif "month" in query_lower or "30 day" in query_lower:
-        start = now - timedelta(days=30)
-        end = now
-    elif "quarter" in query_lower or "90 day" in query_lower:
-        start = now - timedelta(days=90)
-        end = now
-    elif "year" in query_lower or "365 day" in query_lower:
-        start = now - timedelta(days=365)
-        end = now
+    now = now or datetime.now()
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    match = _TIME_RANGE_PATTERN.search(query.lower())
+    if match is None:
+        return now - timedelta(days=DEFAULT_RANGE_DAYS), now
+    if match["today"]:
+        return midnight, now
+    if match["yesterday"]:
+        return midnight - timedelta(days=1), midnight - timedelta(microseconds=1)
+    if match["n"]:
+        days = int(match["n"]) * RANGE_DAYS[match["unit"]]
     else:
-        # Default to last 7 days
-        start = now - timedelta(days=7)
-        end = now
-
-    return start, end
+        days = RANGE_DAYS[match["preset"]]
+    return now - timedelta(days=days), now
 
 
 def detect_metric(query: str) -> Optional[HealthMetric]:
@@ -140,139 +189,149 @@ def detect_metric(query: str) -> Optional[HealthMetric]:
     Returns:
         Detected HealthMetric or None
     """
-    query_lower = query.lower()
-
-    metric_keywords = {
-        HealthMetric.HRV: ["hrv", "heart rate variability", "variability"],
-        HealthMetric.RESTING_HR: ["resting heart rate", "resting hr", "rhr"],
-        HealthMetric.HEART_RATE: ["heart rate", "bpm", "pulse"],
-        HealthMetric.SLEEP_DURATION: ["sleep", "sleep duration", "hours of sleep"],
-        HealthMetric.SLEEP_QUALITY: ["sleep quality", "deep sleep", "rem sleep"],
-        HealthMetric.STEPS: ["steps", "step count", "walking"],
-        HealthMetric.ACTIVE_CALORIES: ["active calories", "calories burned", "energy"],
-        HealthMetric.DISTANCE: ["distance", "miles", "kilometers"],
-        HealthMetric.WORKOUT_DURATION: ["workout", "exercise", "training duration"],
-        HealthMetric.BODY_WEIGHT: ["weight", "body weight"],
-        HealthMetric.BODY_FAT: ["body fat", "fat percentage"],
-    }
+    match = _METRIC_PATTERN.search(query.lower())
+    return _KEYWORD_METRIC[match["keyword"]] if match else None
 
-    for metric, keywords in metric_keywords.items():
-        if any(keyword in query_lower for keyword in keywords):
-            return metric
-
-    return None
-
-
-async def fetch_health_data(
-    user_id: str,
-    metric: HealthMetric,
-    start_time: datetime,
-    end_time: datetime,
-) -> List[HealthDataPoint]:
-    """
-    Fetch health data from Apple Health / HealthKit.
 
-    In production, this would integrate with:
-    - iOS HealthKit via Capacitor plugin
-    - Terra API for cross-platform wearables
-    - Supabase cache of synced health data
+def _stored_metric(metric: HealthMetric) -> Optional[WearableMetric]:
+    """Map a HealthMetric onto the wearable store, if the store keeps it"""
+    try:
+        return WearableMetric(metric.value)
+    except ValueError:
+        return None
 
-    Args:
-        user_id: User ID
-        metric: Health metric to fetch
-        start_time: Start of time range
-        end_time: End of time range
 
-    Returns:
-        List of health data points
-    """
-    # TODO: Integrate with actual HealthKit / Terra API
-    # For now, return mock data
-
-    import random
-
-    data_points = []
-    current = start_time
-
-    while current <= end_time:
-        # Generate mock data based on metric
-        if metric == HealthMetric.HRV:
-            value = random.uniform(40, 80)
-            unit = "ms"
-        elif metric == HealthMetric.RESTING_HR:
-            value = random.uniform(50, 70)
-            unit = "bpm"
-        elif metric == HealthMetric.SLEEP_DURATION:
-            value = random.uniform(6.5, 8.5)
-            unit = "hours"
-        elif metric == HealthMetric.STEPS:
-            value = random.uniform(5000, 15000)
-            unit = "steps"
-        elif metric == HealthMetric.BODY_WEIGHT:
-            value = random.uniform(170, 180)
-            unit = "lbs"
-        else:
-            value = random.uniform(50, 100)
-            unit = "units"
-
-        data_points.append(HealthDataPoint(
+def _daily_points(block: RollupBlock) -> List[HealthDataPoint]:
+    """One data point per day from the store's daily rollups"""
+    metric = HealthMetric(block.metric.value)
+    unit = METRIC_UNITS[block.metric]
+    return [
+        HealthDataPoint(
             metric=metric,
             value=round(value, 2),
             unit=unit,
-            timestamp=current,
-            source="Apple Health (Mock)",
-        ))
+            timestamp=datetime.combine(day_from_index(bucket), datetime.min.time()),
+            source="Wearable Store",
+            metadata={"samples": count},
+        )
+        for bucket, value, count in zip(
+            block.buckets.tolist(), block.values.tolist(), block.count.tolist()
+        )
+    ]
 
-        # Increment by 1 day for daily metrics
-        current += timedelta(days=1)
 
-    return data_points
+@dataclass
+class HealthQueryAnswer:
+    """Daily points and summary for one (user, metric, range)"""
 
+    points: List[HealthDataPoint]
+    summary: Dict[str, Any]
+    data_available: bool
+    cached: bool = False
 
-def calculate_summary(data_points: List[HealthDataPoint]) -> Dict[str, Any]:
-    """
-    Calculate summary statistics for health data.
 
-    Args:
-        data_points: List of health data points
+class HealthQueryEngine:
+    """
+    Answers (user, metric, range) queries from the wearable store.
 
-    Returns:
-        Summary dict with average, min, max, trend
+    Each query is a single range scan over the user's daily rollups, from
+    which both the points and the summary are built. Results are kept in an
+    LRU keyed by (user, metric, first day, last day) and tagged with the
+    store's data version for (user, metric), so a sync makes them stale
+    without any explicit invalidation.
     """
-    if not data_points:
-        return {}
 
-    values = [dp.value for dp in data_points]
+    def __init__(self, store: Optional[WearableTimeSeriesStore] = None, max_entries: Optional[int] = None):
+        self._store = store
+        self.max_entries = max_entries or settings.HEALTH_QUERY_CACHE_SIZE
+        self._cache: OrderedDict[tuple, tuple[int, HealthQueryAnswer]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0}
+
+    @property
+    def store(self) -> WearableTimeSeriesStore:
+        return self._store or get_wearable_store()
+
+    def query(
+        self,
+        user_id: str,
+        metric: HealthMetric,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> HealthQueryAnswer:
+        stored_metric = _stored_metric(metric)
+        if stored_metric is None:
+            # Not synced by any integration yet
+            return HealthQueryAnswer(points=[], summary={}, data_available=False)
+
+        key = (user_id, stored_metric, day_index(start_time.date()), day_index(end_time.date()))
+        version = self.store.data_version(user_id, stored_metric)
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == version:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return replace(entry[1], cached=True)
+            self.stats["stale" if entry is not None else "misses"] += 1
+
+        block = self.store.read_rollups(user_id, stored_metric, start_time, end_time, Granularity.DAY)
+        answer = HealthQueryAnswer(
+            points=_daily_points(block),
+            summary=summarize_block(block),
+            data_available=version > 0,
+        )
 
-    # Calculate trend (simple linear regression)
-    n = len(values)
-    x = list(range(n))
-    y = values
+        with self._lock:
+            self._cache[key] = (version, answer)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return answer
 
-    x_mean = sum(x) / n
-    y_mean = sum(y) / n
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
 
-    numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-    denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._cache), "max_entries": self.max_entries, **self.stats}
 
-    slope = numerator / denominator if denominator != 0 else 0
 
-    trend = "increasing" if slope > 0.5 else "decreasing" if slope < -0.5 else "stable"
+# Global instance
+_query_engine: Optional[HealthQueryEngine] = None
 
-    return {
-        "count": len(values),
-        "average": round(sum(values) / len(values), 2),
-        "min": round(min(values), 2),
-        "max": round(max(values), 2),
-        "latest": round(values[-1], 2),
-        "trend": trend,
-        "trend_slope": round(slope, 4),
-        "unit": data_points[0].unit,
-        "time_range": {
-            "start": data_points[0].timestamp.isoformat(),
-            "end": data_points[-1].timestamp.isoformat(),
-        },
-    }
+
+def get_health_query_engine() -> HealthQueryEngine:
+    """Get or create global health query engine"""
+    global _query_engine
+    if _query_engine is None:
+        _query_engine = HealthQueryEngine()
+    return _query_engine
+
+
+async def fetch_health_data(
+    user_id: str,
+    metric: HealthMetric,
+    start_time: datetime,
+    end_time: datetime,
+) -> List[HealthDataPoint]:
+    """
+    Fetch daily health data synced into the wearable store.
+
+    Metrics the store doesn't keep, and users who haven't synced, return
+    no points.
+
+    Args:
+        user_id: User ID
+        metric: Health metric to fetch
+        start_time: Start of time range
+        end_time: End of time range
+
+    Returns:
+        List of health data points, oldest first
+    """
+    return get_health_query_engine().query(user_id, metric, start_time, end_time).points
 
 
 @app.post("/query", response_model=HealthQueryResult)
@@ -301,20 +360,16 @@ async def query_health_data(query: HealthQuery):
 
     start_time, end_time = parse_time_range(query.query)
 
-    # Fetch data
-    data_points = await fetch_health_data(
+    answer = get_health_query_engine().query(
         user_id=query.user_id,
         metric=metric,
         start_time=start_time,
         end_time=end_time,
     )
 
-    # Calculate summary
-    summary = calculate_summary(data_points)
-
     return HealthQueryResult(
-        results=data_points[:query.max_results],
-        summary=summary,
+        results=answer.points[:query.max_results],
+        summary=answer.summary,
         metadata={
             "query": query.query,
             "detected_metric": metric,
@@ -322,7 +377,9 @@ async def query_health_data(query: HealthQuery):
                 "start": start_time.isoformat(),
                 "end": end_time.isoformat(),
             },
-            "source": "Apple Health via MCP",
+            "data_available": answer.data_available,
+            "cached": answer.cached,
+            "source": "Wearable Store via MCP",
         },
     )
 
@@ -334,12 +391,13 @@ async def get_capabilities():
         "name": "FitOS Health MCP Server",
         "version": "1.0.0",
         "supported_metrics": [metric.value for metric in HealthMetric],
+        "stored_metrics": [metric.value for metric in WearableMetric],
         "supported_time_ranges": [tr.value for tr in TimeRange],
         "features": [
             "Natural language queries",
             "Trend analysis",
             "Summary statistics",
-            "Cross-metric correlations (coming soon)",
+            "Cross-metric correlations (Pearson/Spearman, lagged, bootstrap CIs)",
         ],
         "example_queries": [
             "What was my average HRV this week?",
@@ -353,7 +411,11 @@ async def get_capabilities():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "FitOS Health MCP Server"}
+    return {
+        "status": "healthy",
+        "service": "FitOS Health MCP Server",
+        "query_cache": get_health_query_engine().info(),
+    }
 
 
 if __name__ == "__main__":
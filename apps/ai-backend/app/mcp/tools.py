@@ -9,10 +9,13 @@ Provides tools that agents can use to query MCP servers for:
 Sprint 31: Apple Health MCP Integration
 """
 
+import asyncio
+from datetime import date, timedelta
 from typing import Any, Dict, Optional
 from langchain_core.tools import tool
 
 from app.mcp.client import get_mcp_client, MCPQuery
+from app.mcp.correlation import MIN_PAIRED_DAYS, get_correlation_engine
 
 
 # =====================================================
@@ -139,41 +142,101 @@ async def correlate_health_and_performance(
     - "Is my HRV related to my recovery?"
     - "Do my steps correlate with my energy levels?"
 
+    Same-day and next-day (e.g. sleep → next day's volume) relationships
+    are both checked; the stronger one is reported.
+
     Args:
-        health_metric: Health metric to analyze (hrv, sleep, resting_hr, etc.)
-        performance_metric: Performance metric (workout_volume, strength_gains, etc.)
+        health_metric: Health metric to analyze (hrv, sleep, resting_hr, steps, body_weight)
+        performance_metric: Performance metric (workout_volume, total_sets, total_reps,
+            average_rpe, relative_strength / strength_gains) or another health metric
         user_id: User ID to analyze
         time_range_days: Number of days to analyze
 
     Returns:
         Correlation analysis with insights
     """
-    # TODO: Implement actual correlation analysis
-    # For now, return template response
-
-    import random
+    end = date.today()
+    start = end - timedelta(days=max(time_range_days, 1) - 1)
+
+    try:
+        result = await asyncio.to_thread(
+            get_correlation_engine().analyze,
+            user_id,
+            health_metric,
+            performance_metric,
+            start,
+            end,
+        )
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+    health_name = result.health_metric.replace("_", " ")
+    performance_name = result.performance_metric.replace("_", " ")
+    best = result.best
+
+    response = {
+        "success": True,
+        "health_metric": result.health_metric,
+        "performance_metric": result.performance_metric,
+        "time_range_days": time_range_days,
+        "analysis": result.to_dict(),
+    }
 
-    correlation_coefficient = random.uniform(-0.8, 0.8)
+    if best is None:
+        paired = max((lag.paired_days for lag in result.lags), default=0)
+        return {
+            **response,
+            "correlation_coefficient": None,
+            "correlation_strength": "insufficient_data",
+            "correlation_direction": None,
+            "insight": (
+                f"Only {paired} days have both {health_name} and {performance_name} data "
+                f"(at least {MIN_PAIRED_DAYS} are needed)."
+            ),
+            "recommendation": f"Keep syncing {health_name} and logging workouts to build up overlapping days.",
+        }
 
-    if abs(correlation_coefficient) > 0.6:
+    coefficient = best.pearson
+    if abs(coefficient) > 0.6:
         strength = "strong"
-    elif abs(correlation_coefficient) > 0.3:
+    elif abs(coefficient) > 0.3:
         strength = "moderate"
     else:
         strength = "weak"
 
-    direction = "positive" if correlation_coefficient > 0 else "negative"
+    direction = "positive" if coefficient > 0 else "negative"
+    timing = "the same day" if best.lag_days == 0 else f"{best.lag_days} day(s) later"
+
+    if not best.significant:
+        recommendation = (
+            f"The relationship isn't reliable yet (the confidence interval includes zero); "
+            f"keep monitoring {health_name} before adjusting training around it."
+        )
+    elif strength == "weak":
+        recommendation = (
+            f"The relationship is consistent but small; {health_name} explains little of "
+            f"your {performance_name}, so don't adjust training around it alone."
+        )
+    else:
+        recommendation = (
+            f"Your {health_name} is a useful signal for {performance_name} {timing}; "
+            f"factor it into training decisions."
+        )
 
     return {
-        "success": True,
-        "health_metric": health_metric,
-        "performance_metric": performance_metric,
-        "correlation_coefficient": round(correlation_coefficient, 3),
+        **response,
+        "correlation_coefficient": coefficient,
+        "spearman_coefficient": best.spearman,
+        "confidence_interval": list(best.pearson_ci) if best.pearson_ci else None,
+        "lag_days": best.lag_days,
+        "paired_days": best.paired_days,
         "correlation_strength": strength,
         "correlation_direction": direction,
-        "time_range_days": time_range_days,
-        "insight": f"There is a {strength} {direction} correlation between {health_metric} and {performance_metric}.",
-        "recommendation": "Higher sleep quality tends to correlate with better workout performance." if health_metric == "sleep" else f"Monitor {health_metric} as an indicator for {performance_metric}.",
+        "insight": (
+            f"There is a {strength} {direction} correlation between {health_name} and "
+            f"{performance_name} {timing} (r={coefficient:+.2f} over {best.paired_days} days)."
+        ),
+        "recommendation": recommendation,
     }
 
 
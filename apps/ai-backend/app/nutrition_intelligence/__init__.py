@@ -12,6 +12,12 @@ from app.nutrition_intelligence.expenditure import (
     ExpenditureEstimate,
     get_expenditure_calculator,
 )
+from app.nutrition_intelligence.tdee_engine import (
+    TDEEEngine,
+    TDEEHistory,
+    TDEEBatchResult,
+    get_tdee_engine,
+)
 from app.nutrition_intelligence.adaptation import (
     AdaptationDetector,
     AdaptationStatus,
@@ -32,6 +38,10 @@ __all__ = [
     "ExpenditureCalculator",
     "ExpenditureEstimate",
     "get_expenditure_calculator",
+    "TDEEEngine",
+    "TDEEHistory",
+    "TDEEBatchResult",
+    "get_tdee_engine",
     "AdaptationDetector",
     "AdaptationStatus",
     "get_adaptation_detector",
@@ -10,14 +10,22 @@ Research:
 - TEF varies by time: higher in morning
 - Protein post-workout: 0-2 hour window optimal
 
+Plans are built in two steps: meal timing plus a per-meal macro
+coefficient matrix depends only on (wake, sleep, workout time, meal
+frequency, IF) and is LRU-memoized; the caller's macro targets are then
+applied as one matrix multiply.
+
 Sprint 36: Nutrition Intelligence
 """
 
 from dataclasses import dataclass, field
-from datetime import time, datetime
+from datetime import time
+from functools import lru_cache
 from typing import Optional, Literal
 from enum import Enum
 
+import numpy as np
+
 
 class MealType(str, Enum):
     """Meal type categories"""
@@ -70,6 +78,91 @@ class DailyMealPlan:
     notes: list[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class MealSlot:
+    """Timing and context for one meal, independent of macro targets"""
+
+    meal_type: MealType
+    optimal_time: time
+    time_window_start: time
+    time_window_end: time
+    reasoning: str
+    priority: int
+    considerations: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class MealPlanTemplate:
+    """
+    Target-independent meal plan.
+
+    coefficients[i] maps the daily targets [calories, protein, carbs, fat]
+    to meal i's [calories, protein, carbs, fat]. For meals flagged in
+    `from_remainder` it instead maps what the other meals left over after
+    truncation, so those meals absorb the rounding like the scalar formulas.
+    """
+
+    slots: tuple[MealSlot, ...]
+    coefficients: np.ndarray  # (meals, 4, 4), read-only
+    from_remainder: np.ndarray  # (meals,) bool, read-only
+    eating_window_hours: float
+    notes: tuple[str, ...]
+
+    def scale(self, calories: int, protein_g: int, carbs_g: int, fat_g: int) -> np.ndarray:
+        """Per-meal macros as a (meals, 4) int array, truncated like the scalar formulas"""
+        targets = np.array([calories, protein_g, carbs_g, fat_g], dtype=np.float64)
+        macros = np.trunc(self.coefficients @ targets + 1e-9)
+        if self.from_remainder.any():
+            remaining = targets - macros[~self.from_remainder].sum(axis=0)
+            macros[self.from_remainder] = np.trunc(self.coefficients[self.from_remainder] @ remaining + 1e-9)
+        return macros.astype(np.int64)
+
+
+SECONDS_PER_DAY = 86400
+
+# Row indices into the [calories, protein, carbs, fat] target vector
+_CAL, _PRO, _CARB, _FAT = range(4)
+
+
+def _seconds(t: time) -> float:
+    """Seconds since midnight"""
+    return t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6
+
+
+def _at(seconds: float) -> time:
+    """Time of day for a second offset (wraps past midnight)"""
+    micros = round((seconds % SECONDS_PER_DAY) * 1e6) % (SECONDS_PER_DAY * 1_000_000)
+    minutes, micros = divmod(micros, 60_000_000)
+    hours, minutes = divmod(minutes, 60)
+    return time(int(hours), int(minutes), micros // 1_000_000, micros % 1_000_000)
+
+
+def _hours_between(start: float, end: float) -> float:
+    """Hours from start to end, rolling over midnight"""
+    if end < start:
+        end += SECONDS_PER_DAY
+    return (end - start) / 3600
+
+
+def _slot(
+    meal_type: MealType,
+    at: float,
+    window: tuple[float, float],
+    reasoning: str,
+    priority: int,
+    considerations: list[str],
+) -> MealSlot:
+    return MealSlot(
+        meal_type=meal_type,
+        optimal_time=_at(at),
+        time_window_start=_at(window[0]),
+        time_window_end=_at(window[1]),
+        reasoning=reasoning,
+        priority=priority,
+        considerations=tuple(considerations),
+    )
+
+
 class ChronoNutritionOptimizer:
     """
     Optimize meal timing based on circadian rhythm research.
@@ -81,6 +174,8 @@ class ChronoNutritionOptimizer:
     - Larger eating window = better adherence
     """
 
+    PLAN_CACHE_SIZE = 4096
+
     def __init__(self):
         pass
 
@@ -113,45 +208,80 @@ class ChronoNutritionOptimizer:
         Returns:
             DailyMealPlan with optimized timing
         """
-        meals = []
+        template = get_meal_plan_template(
+            wake_time, sleep_time, workout_time, meal_frequency, intermittent_fasting
+        )
+        macros = template.scale(total_calories, protein_g, carbs_g, fat_g).tolist()
+
+        meals = [
+            MealTimingRecommendation(
+                meal_type=slot.meal_type,
+                optimal_time=slot.optimal_time,
+                time_window_start=slot.time_window_start,
+                time_window_end=slot.time_window_end,
+                calories=meal_macros[_CAL],
+                protein_g=meal_macros[_PRO],
+                carbs_g=meal_macros[_CARB],
+                fat_g=meal_macros[_FAT],
+                reasoning=slot.reasoning,
+                priority=slot.priority,
+                considerations=list(slot.considerations),
+            )
+            for slot, meal_macros in zip(template.slots, macros)
+        ]
+
+        return DailyMealPlan(
+            total_calories=total_calories,
+            total_protein_g=protein_g,
+            total_carbs_g=carbs_g,
+            total_fat_g=fat_g,
+            meals=meals,
+            meal_frequency=len(meals),
+            eating_window_hours=template.eating_window_hours,
+            notes=list(template.notes),
+        )
+
+    def build_template(
+        self,
+        wake_time: time,
+        sleep_time: time,
+        workout_time: Optional[time],
+        meal_frequency: int,
+        intermittent_fasting: bool,
+    ) -> MealPlanTemplate:
+        """
+        Build the target-independent plan: meal timing and macro coefficients.
+
+        Prefer get_meal_plan_template(), which memoizes this.
+        """
         notes = []
+        wake = _seconds(wake_time)
+        sleep = _seconds(sleep_time)
 
         # Calculate eating window
         if intermittent_fasting:
             # 16:8 IF - start eating 4 hours after wake
             eating_window_hours = 8
-            first_meal_time = self._add_hours(wake_time, 4)
+            first_meal = wake + 4 * 3600
             notes.append("16:8 Intermittent Fasting protocol")
         else:
             # Regular eating - 1 hour after wake
-            eating_window_hours = self._calculate_hours_between(wake_time, sleep_time) - 2
-            first_meal_time = self._add_hours(wake_time, 1)
+            eating_window_hours = _hours_between(wake, sleep) - 2
+            first_meal = wake + 3600
 
-        last_meal_time = self._add_hours(sleep_time, -2)
+        last_meal = sleep - 2 * 3600
 
         # Distribute calories based on circadian principles
         if workout_time:
-            meals = self._create_workout_centered_plan(
-                total_calories,
-                protein_g,
-                carbs_g,
-                fat_g,
-                workout_time,
-                first_meal_time,
-                last_meal_time,
-                meal_frequency,
+            slots, coefficients, from_remainder = self._workout_centered_template(
+                _seconds(workout_time), first_meal, last_meal, meal_frequency
             )
             notes.append("Plan optimized around workout timing")
         else:
-            meals = self._create_standard_plan(
-                total_calories,
-                protein_g,
-                carbs_g,
-                fat_g,
-                first_meal_time,
-                last_meal_time,
-                meal_frequency,
+            slots, coefficients = self._standard_template(
+                first_meal, last_meal, meal_frequency
             )
+            from_remainder = [False] * len(slots)
             notes.append("Standard chrono-nutrition protocol")
 
         # General notes
@@ -160,29 +290,28 @@ class ChronoNutritionOptimizer:
         if not intermittent_fasting:
             notes.append("Early eating window supports better glucose control")
 
-        return DailyMealPlan(
-            total_calories=total_calories,
-            total_protein_g=protein_g,
-            total_carbs_g=carbs_g,
-            total_fat_g=fat_g,
-            meals=meals,
-            meal_frequency=len(meals),
+        coefficients = np.array(coefficients, dtype=np.float64).reshape(-1, 4, 4)
+        coefficients.setflags(write=False)
+        from_remainder = np.array(from_remainder, dtype=bool)
+        from_remainder.setflags(write=False)
+
+        return MealPlanTemplate(
+            slots=tuple(slots),
+            coefficients=coefficients,
+            from_remainder=from_remainder,
             eating_window_hours=eating_window_hours,
-            notes=notes,
+            notes=tuple(notes),
         )
 
-    def _create_standard_plan(
+    def _standard_template(
         self,
-        calories: int,
-        protein: int,
-        carbs: int,
-        fat: int,
-        first_meal: time,
-        last_meal: time,
+        first_meal: float,
+        last_meal: float,
         frequency: int,
-    ) -> list[MealTimingRecommendation]:
+    ) -> tuple[list[MealSlot], list[list[list[float]]]]:
         """Create standard meal plan without workout consideration"""
-        meals = []
+        slots = []
+        coefficients = []
 
         # Calorie distribution: front-loaded
         # 3 meals: 40/35/25
@@ -198,27 +327,23 @@ class ChronoNutritionOptimizer:
         else:  # 6+
             distributions = [0.25, 0.20, 0.20, 0.15, 0.10, 0.10]
 
-        # Protein evenly distributed
-        protein_per_meal = protein // frequency
-
         # Calculate meal times
-        eating_hours = self._calculate_hours_between(first_meal, last_meal)
+        eating_hours = _hours_between(first_meal, last_meal)
         interval_hours = eating_hours / (frequency - 1) if frequency > 1 else 0
 
         for i, cal_ratio in enumerate(distributions[:frequency]):
-            meal_time = self._add_hours(first_meal, i * interval_hours)
+            meal_time = first_meal + i * interval_hours * 3600
 
-            # Meal calories
-            meal_cals = int(calories * cal_ratio)
-
-            # Distribute macros
-            meal_protein = protein_per_meal
-            remaining_cals = meal_cals - (meal_protein * 4)
-
-            # More carbs early, more fat later
+            # Protein evenly distributed; calories left after protein are
+            # split carbs/fat, more carbs early and more fat later
             carb_ratio = 1.0 - (i / frequency) * 0.4  # 100% → 60%
-            meal_carbs = int((remaining_cals * carb_ratio) / 4)
-            meal_fat = int((remaining_cals - meal_carbs * 4) / 9)
+            protein_share = 1 / frequency
+            coefficients.append([
+                [cal_ratio, 0, 0, 0],
+                [0, protein_share, 0, 0],
+                [cal_ratio * carb_ratio / 4, -protein_share * carb_ratio, 0, 0],
+                [cal_ratio * (1 - carb_ratio) / 9, -protein_share * 4 * (1 - carb_ratio) / 9, 0, 0],
+            ])
 
             # Determine meal type
             if i == 0:
@@ -238,206 +363,156 @@ class ChronoNutritionOptimizer:
                 reasoning = "Smaller meal to maintain energy"
                 priority = 2
 
-            meals.append(
-                MealTimingRecommendation(
-                    meal_type=meal_type,
-                    optimal_time=meal_time,
-                    time_window_start=self._add_hours(meal_time, -0.5),
-                    time_window_end=self._add_hours(meal_time, 0.5),
-                    calories=meal_cals,
-                    protein_g=meal_protein,
-                    carbs_g=meal_carbs,
-                    fat_g=meal_fat,
-                    reasoning=reasoning,
-                    priority=priority,
-                    considerations=[
+            slots.append(
+                _slot(
+                    meal_type,
+                    meal_time,
+                    (meal_time - 1800, meal_time + 1800),
+                    reasoning,
+                    priority,
+                    [
                         "Aim for 30-40g protein minimum" if i == 0 else "",
                         "Include fiber for satiety",
                     ],
                 )
             )
 
-        return meals
+        return slots, coefficients
 
-    def _create_workout_centered_plan(
+    def _workout_centered_template(
         self,
-        calories: int,
-        protein: int,
-        carbs: int,
-        fat: int,
-        workout_time: time,
-        first_meal: time,
-        last_meal: time,
+        workout: float,
+        first_meal: float,
+        last_meal: float,
         frequency: int,
-    ) -> list[MealTimingRecommendation]:
+    ) -> tuple[list[MealSlot], list[list[list[float]]], list[bool]]:
         """Create meal plan centered around workout"""
-        meals = []
-
-        # Pre-workout meal (2-3 hours before)
-        pre_workout_time = self._add_hours(workout_time, -2.5)
-        pre_workout_cals = int(calories * 0.25)
-        pre_protein = int(protein * 0.20)
-        pre_carbs = int(carbs * 0.30)  # Fuel for workout
-        pre_fat = int((pre_workout_cals - pre_protein * 4 - pre_carbs * 4) / 9)
-
-        meals.append(
-            MealTimingRecommendation(
-                meal_type=MealType.PRE_WORKOUT,
-                optimal_time=pre_workout_time,
-                time_window_start=self._add_hours(pre_workout_time, -0.5),
-                time_window_end=self._add_hours(pre_workout_time, 0.5),
-                calories=pre_workout_cals,
-                protein_g=pre_protein,
-                carbs_g=pre_carbs,
-                fat_g=pre_fat,
-                reasoning="Fuel workout with carbs and moderate protein",
-                priority=5,
-                considerations=[
+        # Pre-workout meal (2-3 hours before): 25% kcal, 20% protein, 30% carbs
+        pre_workout = workout - 2.5 * 3600
+        pre = [
+            [0.25, 0, 0, 0],
+            [0, 0.20, 0, 0],
+            [0, 0, 0.30, 0],  # Fuel for workout
+            [0.25 / 9, -0.80 / 9, -1.20 / 9, 0],
+        ]
+        meals = [(
+            _slot(
+                MealType.PRE_WORKOUT,
+                pre_workout,
+                (pre_workout - 1800, pre_workout + 1800),
+                "Fuel workout with carbs and moderate protein",
+                5,
+                [
                     "2-3 hours before training",
                     "Easily digestible carbs",
                     "Moderate protein, low fat",
                 ],
-            )
-        )
-
-        # Post-workout meal (within 1 hour)
-        post_workout_time = self._add_hours(workout_time, 1)
-        post_workout_cals = int(calories * 0.30)
-        post_protein = int(protein * 0.35)  # High protein for MPS
-        post_carbs = int(carbs * 0.40)  # Replenish glycogen
-        post_fat = int((post_workout_cals - post_protein * 4 - post_carbs * 4) / 9)
-
-        meals.append(
-            MealTimingRecommendation(
-                meal_type=MealType.POST_WORKOUT,
-                optimal_time=post_workout_time,
-                time_window_start=workout_time,
-                time_window_end=self._add_hours(workout_time, 2),
-                calories=post_workout_cals,
-                protein_g=post_protein,
-                carbs_g=post_carbs,
-                fat_g=post_fat,
-                reasoning="Maximize muscle protein synthesis and glycogen replenishment",
-                priority=5,
-                considerations=[
+            ),
+            pre,
+            False,
+        )]
+
+        # Post-workout meal (within 1 hour): 30% kcal, 35% protein, 40% carbs
+        post_workout = workout + 3600
+        post = [
+            [0.30, 0, 0, 0],
+            [0, 0.35, 0, 0],  # High protein for MPS
+            [0, 0, 0.40, 0],  # Replenish glycogen
+            [0.30 / 9, -1.40 / 9, -1.60 / 9, 0],
+        ]
+        meals.append((
+            _slot(
+                MealType.POST_WORKOUT,
+                post_workout,
+                (workout, workout + 2 * 3600),
+                "Maximize muscle protein synthesis and glycogen replenishment",
+                5,
+                [
                     "Within 0-2 hours post-workout",
                     "High protein (0.4-0.5g/kg)",
                     "Fast-digesting carbs",
                 ],
-            )
-        )
+            ),
+            post,
+            False,
+        ))
 
-        # Fill in remaining meals
-        remaining_cals = calories - pre_workout_cals - post_workout_cals
-        remaining_protein = protein - pre_protein - post_protein
-        remaining_carbs = carbs - pre_carbs - post_carbs
-        remaining_fat = fat - pre_fat - post_fat
-
-        # Add 2-3 more meals depending on frequency
+        # Fill in remaining meals with whatever the workout meals left over
+        # (applied to the remainder at scale time, see MealPlanTemplate)
         other_meals_count = frequency - 2
         if other_meals_count > 0:
-            other_meals = self._distribute_remaining_meals(
-                remaining_cals,
-                remaining_protein,
-                remaining_carbs,
-                remaining_fat,
-                other_meals_count,
-                first_meal,
-                pre_workout_time,
-                post_workout_time,
-                last_meal,
+            meals.extend(
+                (slot, share, True)
+                for slot, share in self._remaining_meal_slots(
+                    other_meals_count,
+                    first_meal,
+                    pre_workout,
+                    post_workout,
+                    last_meal,
+                )
             )
-            meals.extend(other_meals)
 
-        # Sort by time
-        meals.sort(key=lambda m: m.optimal_time)
+        # Sort by time of day
+        meals.sort(key=lambda m: m[0].optimal_time)
 
-        return meals
+        return [m[0] for m in meals], [m[1] for m in meals], [m[2] for m in meals]
 
-    def _distribute_remaining_meals(
+    def _remaining_meal_slots(
         self,
-        calories: int,
-        protein: int,
-        carbs: int,
-        fat: int,
         count: int,
-        first_meal: time,
-        pre_workout: time,
-        post_workout: time,
-        last_meal: time,
-    ) -> list[MealTimingRecommendation]:
-        """Distribute remaining meals around workout"""
+        first_meal: float,
+        pre_workout: float,
+        post_workout: float,
+        last_meal: float,
+    ) -> list[tuple[MealSlot, list[list[float]]]]:
+        """Distribute remaining meals around workout (shares of the remainder)"""
         meals = []
 
-        cals_per_meal = calories // count
-        protein_per_meal = protein // count
-        carbs_per_meal = carbs // count
-        fat_per_meal = fat // count
+        per_meal = (np.eye(4) / count).tolist()
+
+        # Compare as times of day, like the meal times themselves
+        first_meal, pre_workout, post_workout, last_meal = (
+            _seconds(_at(t)) for t in (first_meal, pre_workout, post_workout, last_meal)
+        )
 
         # Breakfast (if before pre-workout)
-        if self._time_before(first_meal, pre_workout):
-            meals.append(
-                MealTimingRecommendation(
-                    meal_type=MealType.BREAKFAST,
-                    optimal_time=first_meal,
-                    time_window_start=first_meal,
-                    time_window_end=self._add_hours(first_meal, 1),
-                    calories=cals_per_meal,
-                    protein_g=protein_per_meal,
-                    carbs_g=carbs_per_meal,
-                    fat_g=fat_per_meal,
-                    reasoning="Start day with protein and energy",
-                    priority=4,
-                    considerations=["High protein breakfast supports MPS"],
-                )
-            )
+        if first_meal < pre_workout:
+            meals.append((
+                _slot(
+                    MealType.BREAKFAST,
+                    first_meal,
+                    (first_meal, first_meal + 3600),
+                    "Start day with protein and energy",
+                    4,
+                    ["High protein breakfast supports MPS"],
+                ),
+                per_meal,
+            ))
             count -= 1
 
         # Dinner (if after post-workout)
-        if count > 0 and self._time_before(post_workout, last_meal):
-            dinner_time = self._add_hours(post_workout, 3)
-            if self._time_before(dinner_time, last_meal):
-                meals.append(
-                    MealTimingRecommendation(
-                        meal_type=MealType.DINNER,
-                        optimal_time=dinner_time,
-                        time_window_start=self._add_hours(dinner_time, -0.5),
-                        time_window_end=self._add_hours(dinner_time, 0.5),
-                        calories=cals_per_meal,
-                        protein_g=protein_per_meal,
-                        carbs_g=int(carbs_per_meal * 0.7),  # Lower carbs at night
-                        fat_g=int(fat_per_meal * 1.3),  # Higher fat at night
-                        reasoning="Evening meal with moderate portions",
-                        priority=3,
-                        considerations=["Lower carbs, higher fat for evening"],
-                    )
-                )
+        if count > 0 and post_workout < last_meal:
+            dinner = post_workout + 3 * 3600
+            if _seconds(_at(dinner)) < last_meal:
+                meals.append((
+                    _slot(
+                        MealType.DINNER,
+                        dinner,
+                        (dinner - 1800, dinner + 1800),
+                        "Evening meal with moderate portions",
+                        3,
+                        ["Lower carbs, higher fat for evening"],
+                    ),
+                    [
+                        per_meal[_CAL],
+                        per_meal[_PRO],
+                        [c * 0.7 for c in per_meal[_CARB]],  # Lower carbs at night
+                        [c * 1.3 for c in per_meal[_FAT]],  # Higher fat at night
+                    ],
+                ))
 
         return meals
 
-    def _add_hours(self, t: time, hours: float) -> time:
-        """Add hours to time"""
-        dt = datetime.combine(datetime.today(), t)
-        dt += timedelta(hours=hours)
-        return dt.time()
-
-    def _calculate_hours_between(self, start: time, end: time) -> float:
-        """Calculate hours between two times"""
-        start_dt = datetime.combine(datetime.today(), start)
-        end_dt = datetime.combine(datetime.today(), end)
-        if end_dt < start_dt:
-            end_dt += timedelta(days=1)
-        return (end_dt - start_dt).total_seconds() / 3600
-
-    def _time_before(self, t1: time, t2: time) -> bool:
-        """Check if t1 is before t2"""
-        dt1 = datetime.combine(datetime.today(), t1)
-        dt2 = datetime.combine(datetime.today(), t2)
-        return dt1 < dt2
-
-
-# Import for type hints
-from datetime import timedelta
 
 # Global optimizer instance
 _optimizer: Optional[ChronoNutritionOptimizer] = None
@@ -449,3 +524,17 @@ def get_chrono_nutrition_optimizer() -> ChronoNutritionOptimizer:
     if _optimizer is None:
         _optimizer = ChronoNutritionOptimizer()
     return _optimizer
+
+
+@lru_cache(maxsize=ChronoNutritionOptimizer.PLAN_CACHE_SIZE)
+def get_meal_plan_template(
+    wake_time: time,
+    sleep_time: time,
+    workout_time: Optional[time],
+    meal_frequency: int,
+    intermittent_fasting: bool,
+) -> MealPlanTemplate:
+    """Memoized MealPlanTemplate; inputs are quarter-hour times in practice"""
+    return get_chrono_nutrition_optimizer().build_template(
+        wake_time, sleep_time, workout_time, meal_frequency, intermittent_fasting
+    )
@@ -16,7 +16,8 @@ from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from typing import Optional, Literal
 from enum import Enum
-import statistics
+
+import numpy as np
 
 
 class ActivityLevel(str, Enum):
@@ -185,6 +186,9 @@ class ExpenditureCalculator:
         Uses the rearranged CICO equation:
         TDEE = Calories In - (Weight Change in kcal)
 
+        Weight trend and TDEE come from the Kalman filter in tdee_engine,
+        run over the full history rather than the last 7 weigh-ins.
+
         Args:
             weight_data: List of weight measurements (minimum 14 days)
             intake_data: List of daily calorie intake (minimum 14 days)
@@ -202,27 +206,23 @@ class ExpenditureCalculator:
                 f"Have {len(weight_data)} weight, {len(intake_data)} intake."
             )
 
-        # Sort data by date
-        weight_data = sorted(weight_data, key=lambda x: x.date)
-        intake_data = sorted(intake_data, key=lambda x: x.date)
-
-        # Calculate 7-day weight trend (more stable than daily)
-        weight_trend_kg_per_week = self._calculate_weight_trend(weight_data, days=7)
+        # Kalman-filtered weight trend and TDEE over the whole history
+        from app.nutrition_intelligence.tdee_engine import get_tdee_engine, pack_logs
 
-        # Calculate average daily calorie intake
-        avg_calories_in = statistics.mean([d.calories for d in intake_data[-14:]])
-
-        # Convert weight change to calories
-        # Positive trend = weight gain, negative = weight loss
-        weight_change_kcal_per_day = (
-            weight_trend_kg_per_week * self.KCAL_PER_KG_FAT
-        ) / 7
+        weights, intake, intake_confidence, end_date = pack_logs([(weight_data, intake_data)])
+        result = get_tdee_engine().run(
+            weights, intake, end_date, intake_confidence=intake_confidence
+        )
+        tdee = float(result.latest_tdee[0])
+        tdee_std = float(result.latest_std[0])
+        weight_trend_kg_per_week = float(result.latest_weight_trend[0])
 
-        # CICO rearrangement: TDEE = Intake - Weight Change (in kcal)
-        tdee = avg_calories_in - weight_change_kcal_per_day
+        # Average daily calorie intake over the last 14 logged days
+        logged_intake = intake[0][~np.isnan(intake[0])]
+        avg_calories_in = float(logged_intake[-14:].mean())
 
-        # Estimate BMR (use most recent weight)
-        latest_weight = weight_data[-1].weight_kg
+        # Estimate BMR (use current trend weight)
+        latest_weight = float(result.trend_weight_kg[0, -1])
         bmr = self._estimate_bmr_from_tdee(tdee, latest_weight)
 
         # Estimate TEF (~10% of intake)
@@ -242,6 +242,9 @@ class ExpenditureCalculator:
         recommendation, notes = self._generate_recommendation(
             tdee, weight_trend_kg_per_week, len(weight_data)
         )
+        notes.append(
+            f"95% range: {int(tdee - 1.96 * tdee_std)}-{int(tdee + 1.96 * tdee_std)} kcal/day"
+        )
 
         return ExpenditureEstimate(
             tdee_kcal=round(tdee),
@@ -256,44 +259,6 @@ class ExpenditureCalculator:
             notes=notes,
         )
 
-    def _calculate_weight_trend(
-        self, weight_data: list[WeightDataPoint], days: int = 7
-    ) -> float:
-        """
-        Calculate weight trend using linear regression.
-
-        Returns kg per week change.
-        """
-        if len(weight_data) < days:
-            days = len(weight_data)
-
-        recent_data = weight_data[-days:]
-
-        # Simple linear regression
-        n = len(recent_data)
-        if n < 2:
-            return 0.0
-
-        # Convert dates to days from first measurement
-        first_date = recent_data[0].date
-        x_values = [(d.date - first_date).days for d in recent_data]
-        y_values = [d.weight_kg for d in recent_data]
-
-        # Calculate slope (kg per day)
-        x_mean = statistics.mean(x_values)
-        y_mean = statistics.mean(y_values)
-
-        numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_values, y_values))
-        denominator = sum((x - x_mean) ** 2 for x in x_values)
-
-        if denominator == 0:
-            return 0.0
-
-        slope_kg_per_day = numerator / denominator
-
-        # Convert to kg per week
-        return slope_kg_per_day * 7
-
     def _estimate_bmr_from_tdee(self, tdee: float, weight_kg: float) -> float:
         """
         Rough BMR estimate from TDEE.
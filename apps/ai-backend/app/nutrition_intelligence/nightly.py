@@ -0,0 +1,634 @@
+"""
+Nightly Nutrition Intelligence Recompute
+
+Offline pipeline that precomputes adaptive TDEE, metabolic adaptation and
+diet-break recommendations for every active client, so the
+/nutrition-intelligence/state endpoint is a cheap read.
+
+Flow:
+1. Page through active client IDs (keyset pagination on client_id)
+2. Fetch each page's weight and intake logs in one range query
+3. Split the page into chunks and evaluate them on a process pool; each
+   chunk is one vectorized TDEEEngine batch
+4. Bulk-write the page's results, then advance its checkpoint
+
+Results and checkpoints live in Supabase (nutrition_client_state,
+nutrition_pipeline_checkpoints) so the job and every API instance share
+them. A run is identified by its as-of date. Re-running an interrupted run
+resumes after the last committed page.
+
+Usage:
+    python -m app.nutrition_intelligence.nightly              # Supabase source
+    python -m app.nutrition_intelligence.nightly --benchmark 20000
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Literal, Optional, Protocol, Sequence
+
+import numpy as np
+
+from app.nutrition_intelligence.adaptation import AdaptationDetector
+from app.nutrition_intelligence.expenditure import (
+    ExpenditureCalculator,
+    IntakeDataPoint,
+    WeightDataPoint,
+)
+from app.nutrition_intelligence.tdee_engine import TDEEEngine, pack_logs
+
+logger = logging.getLogger(__name__)
+
+LBS_PER_KG = 2.20462
+
+
+@dataclass
+class ClientLogs:
+    """Everything the pipeline needs for one client"""
+
+    client_id: str
+    weight_data: list[WeightDataPoint]
+    intake_data: list[IntakeDataPoint]
+    sex: Literal["male", "female"] = "male"
+    activity_level: Literal["sedentary", "moderate", "active"] = "moderate"
+
+
+@dataclass
+class PipelineRunStats:
+    """Summary of one pipeline run"""
+
+    run_id: str
+    as_of: date
+    clients_read: int = 0
+    clients_written: int = 0
+    pages: int = 0
+    resumed_after: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    fetch_seconds: float = 0.0  # Share of elapsed time spent reading the source
+    already_complete: bool = False
+
+    @property
+    def clients_per_second(self) -> float:
+        return self.clients_read / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class NutritionLogSource(Protocol):
+    """Where the pipeline reads clients and logs from"""
+
+    def list_active_clients(self, after: Optional[str], limit: int) -> list[str]:
+        """Active client IDs in ascending order, strictly after `after`"""
+        ...
+
+    def fetch_logs(self, client_ids: Sequence[str], start: date, end: date) -> list[ClientLogs]:
+        """Weight and intake logs in [start, end] for the given clients"""
+        ...
+
+
+class SupabaseNutritionLogSource:
+    """Reads active clients from profiles and daily logs from nutrition_logs"""
+
+    CLIENT_BATCH = 50  # client_ids per in_() filter (keeps the URL short)
+    ROW_PAGE = 1000  # PostgREST's default max rows per response
+
+    def __init__(self, supabase_client, body_weight_unit: Literal["lbs", "kg"] = "lbs"):
+        self.supabase = supabase_client
+        self.weight_to_kg = 1 / LBS_PER_KG if body_weight_unit == "lbs" else 1.0
+
+    def list_active_clients(self, after: Optional[str], limit: int) -> list[str]:
+        query = (self.supabase.table('profiles')
+                 .select('id')
+                 .eq('role', 'client'))
+        if after is not None:
+            query = query.gt('id', after)
+        result = query.order('id', desc=False).limit(limit).execute()
+        return [row['id'] for row in result.data or []]
+
+    def _select_logs(self, client_ids: Sequence[str], start: date, end: date) -> list[dict]:
+        """Every log row for a small batch of clients, page by page"""
+        rows: list[dict] = []
+        offset = 0
+        while True:
+            result = (self.supabase.table('nutrition_logs')
+                      .select('id, client_id, logged_date, body_weight, calories, protein_g, carbs_g, fat_g')
+                      .in_('client_id', list(client_ids))
+                      .gte('logged_date', start.isoformat())
+                      .lte('logged_date', end.isoformat())
+                      .order('client_id', desc=False)
+                      .order('logged_date', desc=False)
+                      .order('id', desc=False)
+                      .range(offset, offset + self.ROW_PAGE - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.ROW_PAGE:
+                return rows
+            offset += self.ROW_PAGE
+
+    def fetch_logs(self, client_ids: Sequence[str], start: date, end: date) -> list[ClientLogs]:
+        client_ids = list(client_ids)
+        rows = [
+            row
+            for i in range(0, len(client_ids), self.CLIENT_BATCH)
+            for row in self._select_logs(client_ids[i:i + self.CLIENT_BATCH], start, end)
+        ]
+
+        logs = {cid: ClientLogs(client_id=cid, weight_data=[], intake_data=[]) for cid in client_ids}
+        for row in rows:
+            client = logs[row['client_id']]
+            logged = date.fromisoformat(str(row['logged_date'])[:10])
+            if row.get('body_weight') is not None:
+                client.weight_data.append(WeightDataPoint(
+                    date=logged,
+                    weight_kg=float(row['body_weight']) * self.weight_to_kg,
+                ))
+            if row.get('calories'):
+                client.intake_data.append(IntakeDataPoint(
+                    date=logged,
+                    calories=float(row['calories']),
+                    protein_g=float(row.get('protein_g') or 0),
+                    carbs_g=float(row.get('carbs_g') or 0),
+                    fat_g=float(row.get('fat_g') or 0),
+                ))
+        return list(logs.values())
+
+
+class SyntheticNutritionLogSource:
+    """Simulated clients for benchmarks (energy-balance model with noisy logs)"""
+
+    def __init__(self, n_clients: int, days: int = 90, seed: int = 0):
+        self.n_clients = n_clients
+        self.days = days
+        self.seed = seed
+
+    def list_active_clients(self, after: Optional[str], limit: int) -> list[str]:
+        start = int(after.split("-")[1]) + 1 if after is not None else 0
+        return [f"client-{i:08d}" for i in range(start, min(start + limit, self.n_clients))]
+
+    def fetch_logs(self, client_ids: Sequence[str], start: date, end: date) -> list[ClientLogs]:
+        days = min(self.days, (end - start).days + 1)
+        dates = [end - timedelta(days=days - 1 - i) for i in range(days)]
+        logs = []
+        for client_id in client_ids:
+            rng = np.random.default_rng(self.seed + int(client_id.split("-")[1]))
+            tdee = rng.uniform(1800, 3200)
+            intake = tdee - rng.uniform(-300, 700) + rng.normal(0, 150, days)
+            weight = rng.uniform(60, 110) + np.concatenate(([0.0], np.cumsum(intake[:-1] - tdee) / 7700))
+            weighed = rng.random(days) < 0.7
+            weighed[0] = True
+            logs.append(ClientLogs(
+                client_id=client_id,
+                weight_data=[
+                    WeightDataPoint(date=d, weight_kg=float(w + rng.normal(0, 0.5)))
+                    for d, w, keep in zip(dates, weight, weighed) if keep
+                ],
+                intake_data=[
+                    IntakeDataPoint(date=d, calories=float(c), protein_g=0, carbs_g=0, fat_g=0)
+                    for d, c in zip(dates, intake)
+                ],
+            ))
+        return logs
+
+
+class NutritionStateBackend(Protocol):
+    """Where the pipeline writes results and checkpoints"""
+
+    def get(self, client_id: str) -> Optional[dict[str, Any]]:
+        """Latest precomputed state for a client, or None"""
+        ...
+
+    def get_checkpoint(self, run_id: str) -> Optional[dict[str, Any]]:
+        ...
+
+    def commit_page(
+        self, run_id: str, as_of: date, rows: list[dict[str, Any]], cursor: str, clients_read: int
+    ) -> None:
+        """Write a page of results, then advance the run checkpoint"""
+        ...
+
+    def finish_run(self, run_id: str, as_of: date) -> None:
+        ...
+
+
+_CHECKPOINT_FIELDS = ("as_of", "cursor", "clients_read", "clients_written", "pages", "finished_at")
+
+
+class SupabaseNutritionStateStore:
+    """
+    Precomputed state and run checkpoints in Supabase.
+
+    A page's results are upserted in bulk before its checkpoint advances,
+    so a crash can at worst recompute a page, never skip one.
+    """
+
+    STATE_TABLE = 'nutrition_client_state'
+    CHECKPOINT_TABLE = 'nutrition_pipeline_checkpoints'
+    WRITE_BATCH = 500  # rows per upsert request
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+
+    def get(self, client_id: str) -> Optional[dict[str, Any]]:
+        result = (self.supabase.table(self.STATE_TABLE)
+                  .select('payload')
+                  .eq('client_id', client_id)
+                  .limit(1)
+                  .execute())
+        return result.data[0]['payload'] if result.data else None
+
+    def get_checkpoint(self, run_id: str) -> Optional[dict[str, Any]]:
+        result = (self.supabase.table(self.CHECKPOINT_TABLE)
+                  .select(', '.join(_CHECKPOINT_FIELDS))
+                  .eq('run_id', run_id)
+                  .limit(1)
+                  .execute())
+        if not result.data:
+            return None
+        return {field: result.data[0].get(field) for field in _CHECKPOINT_FIELDS}
+
+    def commit_page(
+        self, run_id: str, as_of: date, rows: list[dict[str, Any]], cursor: str, clients_read: int
+    ) -> None:
+        computed_at = datetime.now().isoformat()
+        records = [
+            {
+                'client_id': row['client_id'],
+                'as_of': as_of.isoformat(),
+                'computed_at': computed_at,
+                'payload': row,
+            }
+            for row in rows
+        ]
+        for i in range(0, len(records), self.WRITE_BATCH):
+            (self.supabase.table(self.STATE_TABLE)
+             .upsert(records[i:i + self.WRITE_BATCH], on_conflict='client_id')
+             .execute())
+
+        previous = self.get_checkpoint(run_id) or {}
+        (self.supabase.table(self.CHECKPOINT_TABLE)
+         .upsert({
+             'run_id': run_id,
+             'as_of': as_of.isoformat(),
+             'cursor': cursor,
+             'clients_read': (previous.get('clients_read') or 0) + clients_read,
+             'clients_written': (previous.get('clients_written') or 0) + len(rows),
+             'pages': (previous.get('pages') or 0) + 1,
+         }, on_conflict='run_id')
+         .execute())
+
+    def finish_run(self, run_id: str, as_of: date) -> None:
+        (self.supabase.table(self.CHECKPOINT_TABLE)
+         .upsert({
+             'run_id': run_id,
+             'as_of': as_of.isoformat(),
+             'finished_at': datetime.now().isoformat(),
+         }, on_conflict='run_id')
+         .execute())
+
+
+_STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nutrition_state (
+    client_id TEXT PRIMARY KEY,
+    as_of TEXT NOT NULL,
+    computed_at TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pipeline_checkpoints (
+    run_id TEXT PRIMARY KEY,
+    as_of TEXT NOT NULL,
+    cursor TEXT,
+    clients_read INTEGER NOT NULL DEFAULT 0,
+    clients_written INTEGER NOT NULL DEFAULT 0,
+    pages INTEGER NOT NULL DEFAULT 0,
+    finished_at TEXT
+);
+"""
+
+
+class NutritionStateStore:
+    """
+    SQLite store for precomputed per-client nutrition state and run checkpoints.
+
+    Local to one process; used for benchmarks and tests. Results and the checkpoint for a page are committed together, so a
+    crash never leaves a page half-written or a checkpoint ahead of its data.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_STATE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, client_id: str) -> Optional[dict[str, Any]]:
+        """Latest precomputed state for a client, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM nutrition_state WHERE client_id = ?", (client_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_checkpoint(self, run_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT as_of, cursor, clients_read, clients_written, pages, finished_at "
+                "FROM pipeline_checkpoints WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(
+            ("as_of", "cursor", "clients_read", "clients_written", "pages", "finished_at"), row
+        ))
+
+    def commit_page(
+        self, run_id: str, as_of: date, rows: list[dict[str, Any]], cursor: str, clients_read: int
+    ) -> None:
+        """Bulk-write a page of results and advance the run checkpoint atomically"""
+        computed_at = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO nutrition_state (client_id, as_of, computed_at, payload) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (client_id) DO UPDATE SET "
+                "as_of = excluded.as_of, computed_at = excluded.computed_at, "
+                "payload = excluded.payload",
+                [
+                    (row["client_id"], as_of.isoformat(), computed_at, json.dumps(row))
+                    for row in rows
+                ],
+            )
+            self._conn.execute(
+                "INSERT INTO pipeline_checkpoints (run_id, as_of, cursor, clients_read, "
+                "clients_written, pages) VALUES (?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT (run_id) DO UPDATE SET cursor = excluded.cursor, "
+                "clients_read = clients_read + excluded.clients_read, "
+                "clients_written = clients_written + excluded.clients_written, "
+                "pages = pages + 1",
+                (run_id, as_of.isoformat(), cursor, clients_read, len(rows)),
+            )
+
+    def finish_run(self, run_id: str, as_of: date) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO pipeline_checkpoints (run_id, as_of, finished_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (run_id) DO UPDATE SET finished_at = excluded.finished_at",
+                (run_id, as_of.isoformat(), datetime.now().isoformat()),
+            )
+
+
+def _trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean over the last `window` columns, ignoring NaN"""
+    present = ~np.isnan(values)
+    total = np.cumsum(np.where(present, values, 0.0), axis=1)
+    count = np.cumsum(present, axis=1).astype(np.float64)
+    total[:, window:] = total[:, window:] - total[:, :-window]
+    count[:, window:] = count[:, window:] - count[:, :-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+DEFICIT_THRESHOLD_KCAL = 100  # 7-day intake this far below TDEE counts as a deficit day
+PREDICTION_WEEKS = 4
+
+
+def compute_chunk(chunk: list[ClientLogs], as_of: date) -> list[dict[str, Any]]:
+    """
+    Evaluate one chunk of clients: a single TDEEEngine batch, then per-client
+    adaptation and diet-break checks. Runs inside pool workers.
+
+    Clients without any weigh-in in the window are skipped.
+    """
+    chunk = [c for c in chunk if c.weight_data]
+    if not chunk:
+        return []
+
+    weights, intake, confidence, _ = pack_logs(
+        [(c.weight_data, c.intake_data) for c in chunk], end_date=as_of
+    )
+    result = TDEEEngine().run(weights, intake, as_of, intake_confidence=confidence)
+
+    n_days = weights.shape[1]
+    columns = np.arange(n_days)
+
+    # Current deficit streak: trailing run of days with 7-day intake below TDEE
+    intake_7d = _trailing_mean(intake, 7)
+    in_deficit = (result.tdee_kcal - intake_7d) > DEFICIT_THRESHOLD_KCAL
+    in_deficit &= columns[None, :] >= result.first_day[:, None]
+    last_break = np.where(~in_deficit, columns[None, :], -1).max(axis=1)
+    deficit_start = np.clip(last_break + 1, 0, n_days - 1)
+    deficit_days = n_days - 1 - last_break
+    rows_idx = np.arange(len(chunk))
+    weight_at_deficit_start = result.trend_weight_kg[rows_idx, deficit_start]
+
+    detector = AdaptationDetector()
+    calculator = ExpenditureCalculator()
+
+    rows = []
+    for i, client in enumerate(chunk):
+        tdee = float(result.latest_tdee[i])
+        std = float(result.latest_std[i])
+        current_weight = float(result.trend_weight_kg[i, -1])
+        weeks_in_deficit = int(deficit_days[i]) // 7
+        recent_intake = float(intake_7d[i, -1]) if not np.isnan(intake_7d[i, -1]) else tdee
+
+        adaptation = detector.detect_adaptation(
+            current_weight_kg=current_weight,
+            starting_weight_kg=float(weight_at_deficit_start[i]) if weeks_in_deficit else current_weight,
+            current_tdee=tdee,
+            weeks_in_deficit=weeks_in_deficit,
+            activity_level=client.activity_level,
+            sex=client.sex,
+        )
+        prediction = calculator.predict_weight_change(
+            current_tdee=tdee,
+            target_calories=recent_intake,
+            weeks=PREDICTION_WEEKS,
+        )
+
+        rows.append({
+            "client_id": client.client_id,
+            "as_of": as_of.isoformat(),
+            "expenditure": {
+                "tdee_kcal": round(tdee),
+                "tdee_lower_kcal": round(tdee - TDEEEngine.BAND_Z * std),
+                "tdee_upper_kcal": round(tdee + TDEEEngine.BAND_Z * std),
+                "trend_weight_kg": round(current_weight, 2),
+                "weight_trend_kg_per_week": round(float(result.latest_weight_trend[i]), 2),
+                "avg_intake_7d_kcal": round(recent_intake),
+                "days_of_data": int(result.days_of_data[i]),
+            },
+            "adaptation": {
+                "severity": adaptation.severity.value,
+                "estimated_reduction_kcal": adaptation.estimated_reduction_kcal,
+                "weeks_in_deficit": adaptation.weeks_in_deficit,
+                "recommend_diet_break": adaptation.recommend_diet_break,
+                "diet_break_duration_days": adaptation.diet_break_duration_days,
+                "maintenance_calories": adaptation.maintenance_calories,
+                "notes": adaptation.notes,
+            },
+            "prediction": {
+                "weeks": PREDICTION_WEEKS,
+                "target_calories": round(recent_intake),
+                "predicted_weight_change_kg": prediction["predicted_weight_change_kg"],
+                "weekly_rate_kg": prediction["weekly_rate_kg"],
+            },
+        })
+    return rows
+
+
+class NightlyNutritionPipeline:
+    """
+    Paged, chunked, resumable recompute of nutrition intelligence state.
+
+    Args:
+        source: Where clients and logs are read from
+        store: Where results and checkpoints are written
+        page_size: Clients fetched per page (one log range query per page)
+        chunk_size: Clients per vectorized engine batch / pool task
+        workers: Process pool size; 0 evaluates chunks in-process
+        lookback_days: Days of logs fed to the filter
+    """
+
+    def __init__(
+        self,
+        source: NutritionLogSource,
+        store: NutritionStateBackend,
+        page_size: int = 2000,
+        chunk_size: int = 250,
+        workers: Optional[int] = None,
+        lookback_days: int = 120,
+    ):
+        self.source = source
+        self.store = store
+        self.page_size = page_size
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.lookback_days = lookback_days
+
+    def run(self, as_of: Optional[date] = None, run_id: Optional[str] = None) -> PipelineRunStats:
+        """
+        Run (or resume) the recompute for `as_of` (default: today).
+
+        Returns:
+            PipelineRunStats for this invocation (excluding resumed work)
+        """
+        as_of = as_of or date.today()
+        run_id = run_id or f"nightly-{as_of.isoformat()}"
+        stats = PipelineRunStats(run_id=run_id, as_of=as_of)
+
+        checkpoint = self.store.get_checkpoint(run_id)
+        if checkpoint and checkpoint["finished_at"]:
+            stats.already_complete = True
+            return stats
+        cursor = checkpoint["cursor"] if checkpoint else None
+        stats.resumed_after = cursor
+        if cursor:
+            logger.info(f"Resuming {run_id} after client {cursor}")
+
+        start = as_of - timedelta(days=self.lookback_days - 1)
+        started = time.perf_counter()
+
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers != 0 else None
+        try:
+            while True:
+                client_ids = self.source.list_active_clients(after=cursor, limit=self.page_size)
+                if not client_ids:
+                    break
+
+                fetch_started = time.perf_counter()
+                logs = self.source.fetch_logs(client_ids, start, as_of)
+                stats.fetch_seconds += time.perf_counter() - fetch_started
+                chunks = [
+                    logs[i:i + self.chunk_size] for i in range(0, len(logs), self.chunk_size)
+                ]
+                if pool is not None:
+                    results = pool.map(compute_chunk, chunks, [as_of] * len(chunks))
+                else:
+                    results = (compute_chunk(chunk, as_of) for chunk in chunks)
+                rows = [row for chunk_rows in results for row in chunk_rows]
+
+                cursor = client_ids[-1]
+                self.store.commit_page(run_id, as_of, rows, cursor, len(client_ids))
+
+                stats.pages += 1
+                stats.clients_read += len(client_ids)
+                stats.clients_written += len(rows)
+                logger.info(
+                    f"{run_id}: page {stats.pages} done ({stats.clients_read} clients, "
+                    f"cursor {cursor})"
+                )
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        self.store.finish_run(run_id, as_of)
+        stats.elapsed_seconds = time.perf_counter() - started
+        return stats
+
+
+# Global store instance
+_state_store: Optional[SupabaseNutritionStateStore] = None
+
+
+def get_nutrition_state_store() -> SupabaseNutritionStateStore:
+    """Get or create global nutrition state store"""
+    global _state_store
+    if _state_store is None:
+        from app.core.database import get_supabase_client
+
+        _state_store = SupabaseNutritionStateStore(get_supabase_client())
+    return _state_store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Nightly nutrition intelligence recompute")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None)
+    parser.add_argument("--page-size", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=250)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--benchmark", type=int, metavar="N", default=None,
+        help="Run against N synthetic clients into a throwaway store and report throughput",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.benchmark:
+        source: NutritionLogSource = SyntheticNutritionLogSource(args.benchmark)
+        store: NutritionStateBackend = NutritionStateStore(":memory:")
+    else:
+        from app.core.database import get_supabase_client
+
+        source = SupabaseNutritionLogSource(get_supabase_client())
+        store = get_nutrition_state_store()
+
+    pipeline = NightlyNutritionPipeline(
+        source,
+        store,
+        page_size=args.page_size,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    stats = pipeline.run(as_of=args.as_of)
+    print(
+        f"{stats.run_id}: {stats.clients_read} clients read, {stats.clients_written} written, "
+        f"{stats.pages} pages in {stats.elapsed_seconds:.2f}s "
+        f"({stats.clients_per_second:,.0f} clients/s, "
+        f"{stats.fetch_seconds:.2f}s reading the source)"
+        + (" [already complete]" if stats.already_complete else "")
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,16 +11,37 @@ Confidence scoring helps identify when manual review is needed.
 """
 
 from .verifier import OutcomeVerifier
+from .bulk import BulkOutcomeVerifier, BulkVerificationReport
 from .weight_tracker import WeightVerificationService
+from .weight_trend import WeightTrendAnalyzer, WeightTrend, WeightSeries
 from .strength_tracker import StrengthVerificationService
+from .strength_engine import StrengthProgressionEngine, StrengthAnalytics, LiftSummary
 from .consistency_tracker import ConsistencyVerificationService
+from .activity_bitmap import (
+    ActivityBitmap,
+    ActivityBitmapStore,
+    ConsistencySummary,
+    get_activity_bitmap_store,
+)
 from .models import VerificationResult, VerificationSource
 
 __all__ = [
     'OutcomeVerifier',
+    'BulkOutcomeVerifier',
+    'BulkVerificationReport',
     'WeightVerificationService',
+    'WeightTrendAnalyzer',
+    'WeightTrend',
+    'WeightSeries',
     'StrengthVerificationService',
+    'StrengthProgressionEngine',
+    'StrengthAnalytics',
+    'LiftSummary',
     'ConsistencyVerificationService',
+    'ActivityBitmap',
+    'ActivityBitmapStore',
+    'ConsistencySummary',
+    'get_activity_bitmap_store',
     'VerificationResult',
     'VerificationSource',
 ]
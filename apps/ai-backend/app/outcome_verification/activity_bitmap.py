@@ -0,0 +1,339 @@
+"""
+Activity Bitmaps
+
+Per-client day-level activity bitsets for consistency goals.
+
+Each (client, activity type) pair keeps one bit per calendar day that had
+a workout or nutrition log. Bitmaps are updated as activity arrives (or
+synced incrementally from a watermark) and stored compactly in SQLite, so
+consistent weeks, streaks and adherence are popcounts over 7-bit slices
+instead of re-bucketing the raw activity history.
+"""
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+ACTIVITY_TYPES = ('workout', 'nutrition')
+RECENT_RECORDS = 30  # Activity ids kept per bitmap for verification sources
+SYNC_OVERLAP_DAYS = 7  # Trailing days re-read on every sync (backdated or deleted logs)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity_bitmaps (
+    client_id TEXT NOT NULL,
+    activity_type TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    bits BLOB NOT NULL,
+    covered_from TEXT,
+    synced_through TEXT,
+    recent TEXT NOT NULL DEFAULT '[]',
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (client_id, activity_type)
+);
+"""
+
+
+@dataclass
+class ActivityBitmap:
+    """
+    Active days for one client and activity type.
+
+    Bit i of `bits` is set when there was activity on origin + i days.
+    """
+    origin: date
+    bits: int = 0
+    covered_from: Optional[date] = None  # Raw activity has been merged from this date
+    synced_through: Optional[date] = None  # ... up to this date
+    recent: List[Tuple[str, date]] = field(default_factory=list)  # (id, date), oldest first
+
+    def add(self, days: Iterable[date]) -> None:
+        """Mark days as active"""
+        days = list(days)
+        if not days:
+            return
+        earliest = min(days)
+        if earliest < self.origin:
+            # Rebase so every bit index stays non-negative
+            self.bits <<= (self.origin - earliest).days
+            self.origin = earliest
+        for day in days:
+            self.bits |= 1 << (day - self.origin).days
+
+    def add_records(self, records: Iterable[dict]) -> None:
+        """Mark activity records ({'id', 'date'}) as active and keep the latest ids"""
+        records = list(records)
+        self.add(r['date'] for r in records)
+        merged = {source_id: day for source_id, day in self.recent}
+        merged.update((r['id'], r['date']) for r in records)
+        self.recent = sorted(merged.items(), key=lambda item: (item[1], item[0]))[-RECENT_RECORDS:]
+
+    def replace_from(self, start: date, records: Iterable[dict]) -> None:
+        """
+        Replace activity from `start` on with `records`.
+
+        `records` must be every activity record dated `start` or later, so
+        days whose logs were deleted since the last sync are cleared.
+        """
+        offset = (start - self.origin).days
+        if offset <= 0:
+            self.bits = 0
+        else:
+            self.bits &= (1 << offset) - 1
+        self.recent = [(i, d) for i, d in self.recent if d < start]
+        self.add_records(records)
+
+    def discard(self, source_id: str, day: date) -> None:
+        """Clear a day whose activity record was deleted or voided"""
+        offset = (day - self.origin).days
+        if offset >= 0:
+            self.bits &= ~(1 << offset)
+        self.recent = [(i, d) for i, d in self.recent if i != source_id]
+
+    def is_active(self, day: date) -> bool:
+        offset = (day - self.origin).days
+        return offset >= 0 and bool(self.bits >> offset & 1)
+
+    def days(self, start: date, end: date) -> np.ndarray:
+        """Activity flags (uint8) for each day in [start, end)"""
+        n = max(0, (end - start).days)
+        offset = (start - self.origin).days
+        if offset >= 0:
+            window = self.bits >> offset
+            lead = 0
+        else:
+            window = self.bits
+            lead = min(n, -offset)
+        size = n - lead
+        window &= (1 << size) - 1
+        packed = np.frombuffer(window.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+        flags = np.unpackbits(packed, bitorder='little', count=size) if size else np.zeros(0, np.uint8)
+        return np.concatenate([np.zeros(lead, dtype=np.uint8), flags])
+
+    def active_days(self, start: date, end: date) -> int:
+        """Number of active days in [start, end)"""
+        offset = (start - self.origin).days
+        n = (end - start).days
+        if n <= 0:
+            return 0
+        if offset < 0:
+            n += offset
+            offset = 0
+        return ((self.bits >> offset) & ((1 << max(n, 0)) - 1)).bit_count()
+
+    def weekly_counts(self, start: date, end: date) -> np.ndarray:
+        """Active days in each 7-day week from `start` through the week containing `end`"""
+        weeks = (end - start).days // 7 + 1 if end >= start else 0
+        return self.days(start, start + timedelta(days=7 * weeks)).reshape(weeks, 7).sum(axis=1)
+
+    def recent_records(self, since: Optional[date] = None) -> List[Tuple[str, date]]:
+        return [(i, d) for i, d in self.recent if since is None or d >= since]
+
+
+@dataclass
+class ConsistencySummary:
+    """Week-level consistency for a goal window"""
+    weeks: int
+    consistent_weeks: int
+    current_streak: int  # Consecutive weeks meeting target, ending this week or last
+    longest_streak: int
+    active_days: int
+    adherence: float  # Target sessions achieved / target sessions, capped per week
+
+    def to_dict(self) -> dict:
+        return {
+            'weeks': self.weeks,
+            'consistent_weeks': self.consistent_weeks,
+            'current_streak': self.current_streak,
+            'longest_streak': self.longest_streak,
+            'active_days': self.active_days,
+            'adherence': round(self.adherence, 3),
+        }
+
+
+def summarize_consistency(
+    bitmap: ActivityBitmap,
+    start: date,
+    end: date,
+    target_per_week: int,
+) -> ConsistencySummary:
+    """
+    Consistent weeks, streaks and adherence from weekly popcounts.
+
+    Weeks run in 7-day blocks from `start`; the week containing `end` is
+    included (it counts once it meets the target).
+    """
+    counts = bitmap.weekly_counts(start, end)
+    met = counts >= target_per_week
+
+    # Run lengths of consecutive met weeks
+    edges = np.diff(np.concatenate([[0], met.astype(np.int8), [0]]))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    runs = run_ends - run_starts
+
+    # The current week is still in progress, so a streak ending last week is current
+    current = 0
+    if len(runs) and run_ends[-1] >= len(met) - 1:
+        current = int(runs[-1])
+
+    target_total = target_per_week * len(counts)
+    return ConsistencySummary(
+        weeks=len(counts),
+        consistent_weeks=int(met.sum()),
+        current_streak=current,
+        longest_streak=int(runs.max()) if len(runs) else 0,
+        active_days=int(counts.sum()),
+        adherence=float(np.minimum(counts, target_per_week).sum() / target_total) if target_total else 0.0,
+    )
+
+
+class ActivityBitmapStore:
+    """SQLite store for per-client activity bitmaps"""
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, client_id: str, activity_type: str) -> Optional[ActivityBitmap]:
+        """Stored bitmap, or None if nothing was recorded yet"""
+        with self._lock:
+            return self._get(client_id, activity_type)
+
+    def sync_start(self, client_id: str, activity_type: str, since: date) -> date:
+        """
+        First date whose raw activity still needs fetching.
+
+        The whole range when the bitmap doesn't cover `since` yet, otherwise
+        the last SYNC_OVERLAP_DAYS before the watermark onwards, so logs
+        entered late with an earlier date (or deleted) are picked up.
+        """
+        bitmap = self.get(client_id, activity_type)
+        if (bitmap is None or bitmap.covered_from is None or bitmap.synced_through is None
+                or bitmap.covered_from > since):
+            return since
+        return max(since, bitmap.synced_through - timedelta(days=SYNC_OVERLAP_DAYS))
+
+    def record(
+        self,
+        client_id: str,
+        activity_type: str,
+        records: Iterable[dict],
+        covered_from: Optional[date] = None,
+        synced_through: Optional[date] = None,
+    ) -> ActivityBitmap:
+        """
+        Merge activity records ({'id', 'date'}) into a client's bitmap.
+
+        Args:
+            client_id: Client
+            activity_type: 'workout' or 'nutrition'
+            records: New activity; days already set are unaffected
+            covered_from: Start of a fetched range that is now fully merged.
+                `records` are then all activity from this date on, and days
+                from it without a record are cleared.
+            synced_through: End of a fetched range that is now fully merged
+
+        Returns:
+            The updated bitmap
+        """
+        if activity_type not in ACTIVITY_TYPES:
+            raise ValueError(f"Unknown activity type: {activity_type}")
+        records = list(records)
+
+        with self._lock, self._conn:
+            bitmap = self._get(client_id, activity_type)
+            if bitmap is None:
+                origin = min([r['date'] for r in records] + [covered_from or date.today()])
+                bitmap = ActivityBitmap(origin=origin)
+            if covered_from:
+                bitmap.replace_from(covered_from, records)
+            else:
+                bitmap.add_records(records)
+            if covered_from and (bitmap.covered_from is None or covered_from < bitmap.covered_from):
+                bitmap.covered_from = covered_from
+            if synced_through and (bitmap.synced_through is None or synced_through > bitmap.synced_through):
+                bitmap.synced_through = synced_through
+
+            self._put(client_id, activity_type, bitmap)
+        return bitmap
+
+    def remove(self, client_id: str, activity_type: str, activity_id: str, day: date) -> None:
+        """
+        Drop a deleted or voided activity record.
+
+        The day is cleared and the watermark rewound to it, so the next sync
+        re-reads that day and sets it again if other activity remains.
+        """
+        with self._lock, self._conn:
+            bitmap = self._get(client_id, activity_type)
+            if bitmap is None:
+                return
+            bitmap.discard(activity_id, day)
+            if bitmap.synced_through and bitmap.synced_through > day:
+                bitmap.synced_through = day
+            self._put(client_id, activity_type, bitmap)
+
+    def _put(self, client_id: str, activity_type: str, bitmap: ActivityBitmap) -> None:
+        self._conn.execute(
+            "INSERT INTO activity_bitmaps (client_id, activity_type, origin, bits, "
+            "covered_from, synced_through, recent, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (client_id, activity_type) DO UPDATE SET origin = excluded.origin, "
+            "bits = excluded.bits, covered_from = excluded.covered_from, "
+            "synced_through = excluded.synced_through, recent = excluded.recent, "
+            "updated_at = excluded.updated_at",
+            (
+                client_id,
+                activity_type,
+                bitmap.origin.isoformat(),
+                bitmap.bits.to_bytes((bitmap.bits.bit_length() + 7) // 8, 'little'),
+                bitmap.covered_from.isoformat() if bitmap.covered_from else None,
+                bitmap.synced_through.isoformat() if bitmap.synced_through else None,
+                json.dumps([[i, d.isoformat()] for i, d in bitmap.recent]),
+                datetime.now().isoformat(),
+            ),
+        )
+
+    def _get(self, client_id: str, activity_type: str) -> Optional[ActivityBitmap]:
+        row = self._conn.execute(
+            "SELECT origin, bits, covered_from, synced_through, recent FROM activity_bitmaps "
+            "WHERE client_id = ? AND activity_type = ?",
+            (client_id, activity_type),
+        ).fetchone()
+        if row is None:
+            return None
+        origin, bits, covered_from, synced_through, recent = row
+        return ActivityBitmap(
+            origin=date.fromisoformat(origin),
+            bits=int.from_bytes(bits, 'little'),
+            covered_from=date.fromisoformat(covered_from) if covered_from else None,
+            synced_through=date.fromisoformat(synced_through) if synced_through else None,
+            recent=[(i, date.fromisoformat(d)) for i, d in json.loads(recent)],
+        )
+
+
+# Global store instance
+_activity_bitmap_store: Optional[ActivityBitmapStore] = None
+
+
+def get_activity_bitmap_store() -> ActivityBitmapStore:
+    """Get or create global activity bitmap store"""
+    global _activity_bitmap_store
+    if _activity_bitmap_store is None:
+        _activity_bitmap_store = ActivityBitmapStore(settings.ACTIVITY_BITMAP_PATH)
+    return _activity_bitmap_store
@@ -0,0 +1,399 @@
+"""
+Bulk Outcome Verification
+
+Verifies every active goal (e.g. before monthly outcome billing) without
+the per-goal round trips of OutcomeVerifier.verify_goal_progress:
+
+1. Page through active goals (keyset pagination on id)
+2. Prefetch each batch's nutrition_logs, workout_logs and workout_sets in
+   one range query per table for all clients in the batch (consistency
+   goals only read from their activity bitmap's watermark)
+3. Evaluate the batch's goals against the prefetched rows with the regular
+   verification services
+4. Insert the batch's verifications in one statement; milestones are
+   created by the outcome_verifications insert trigger, so the per-goal
+   check_and_create_milestones call is not needed
+
+Batches run concurrently up to max_concurrency.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from .activity_bitmap import get_activity_bitmap_store
+from .consistency_tracker import ConsistencyVerificationService
+from .models import VerificationResult
+from .strength_tracker import StrengthVerificationService
+from .verifier import OutcomeVerifier
+from .weight_tracker import WeightVerificationService
+from .weight_trend import WeightSeries
+
+logger = logging.getLogger(__name__)
+
+AUTOMATED_GOAL_TYPES = ('weight_loss', 'strength_gain', 'consistency')
+
+
+@dataclass
+class ClientActivity:
+    """Raw activity rows for one client, sorted by date"""
+    nutrition_logs: List[dict] = field(default_factory=list)
+    workout_logs: List[dict] = field(default_factory=list)
+    workout_sets: List[dict] = field(default_factory=list)
+
+
+@dataclass
+class BulkVerificationReport:
+    """Summary of a bulk verification run"""
+    goals_seen: int = 0
+    verified: int = 0
+    saved: int = 0
+    milestones_achieved: int = 0
+    batches: int = 0
+    skipped: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    failed: Dict[str, str] = field(default_factory=dict)  # goal_id -> error
+    elapsed_seconds: float = 0.0
+    fetch_seconds: float = 0.0  # Summed across concurrent batches
+    results: List[VerificationResult] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            'goals_seen': self.goals_seen,
+            'verified': self.verified,
+            'saved': self.saved,
+            'milestones_achieved': self.milestones_achieved,
+            'batches': self.batches,
+            'skipped': dict(self.skipped),
+            'failed': self.failed,
+            'requires_manual_review': sum(1 for r in self.results if r.requires_manual_review),
+            'elapsed_seconds': round(self.elapsed_seconds, 2),
+            'fetch_seconds': round(self.fetch_seconds, 2),
+        }
+
+
+class _PrefetchedWeightService(WeightVerificationService):
+    """WeightVerificationService reading from prefetched nutrition_logs"""
+
+    def __init__(self, activity: Dict[str, ClientActivity]):
+        super().__init__(supabase_client=None)
+        self.activity = activity
+
+    async def _fetch_weight_history(self, client_id: str, since: date) -> WeightSeries:
+        cutoff = since.isoformat()
+        rows = self.activity[client_id].nutrition_logs
+        return self._parse_weight_rows([
+            row for row in rows
+            if row.get('body_weight') is not None and str(row['logged_date']) >= cutoff
+        ])
+
+
+class _PrefetchedStrengthService(StrengthVerificationService):
+    """StrengthVerificationService reading from prefetched workout_sets"""
+
+    def __init__(self, activity: Dict[str, ClientActivity]):
+        super().__init__(supabase_client=None)
+        self.activity = activity
+
+    async def _fetch_strength_data(
+        self,
+        client_id: str,
+        exercise_id: Optional[str],
+        since_date: str
+    ) -> List[dict]:
+        rows = self.activity[client_id].workout_sets
+        return self._parse_set_rows([
+            row for row in rows
+            if (exercise_id is None or row['exercise_id'] == exercise_id)
+            and str(row['completed_at']) >= str(since_date)
+        ])
+
+
+class _PrefetchedConsistencyService(ConsistencyVerificationService):
+    """ConsistencyVerificationService reading from prefetched activity logs"""
+
+    def __init__(self, activity: Dict[str, ClientActivity]):
+        super().__init__(supabase_client=None)
+        self.activity = activity
+
+    async def _fetch_workout_activity(self, client_id: str, since_date: str) -> List[dict]:
+        rows = self.activity[client_id].workout_logs
+        return self._parse_activity_rows(
+            [row for row in rows if str(row['completed_at']) >= str(since_date)],
+            'completed_at'
+        )
+
+    async def _fetch_nutrition_activity(self, client_id: str, since_date: str) -> List[dict]:
+        rows = self.activity[client_id].nutrition_logs
+        return self._parse_activity_rows(
+            [row for row in rows if str(row['logged_date']) >= str(since_date)],
+            'logged_date'
+        )
+
+
+class BulkOutcomeVerifier:
+    """Verify many goals with batched reads and writes"""
+
+    CLIENT_BATCH = 50  # ids per in_() filter (keeps the URL short)
+
+    def __init__(
+        self,
+        supabase_client,
+        batch_size: int = 200,
+        max_concurrency: int = 4,
+        page_size: int = 1000,
+    ):
+        self.supabase = supabase_client
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.page_size = page_size
+
+    async def verify_active_goals(
+        self,
+        trainer_id: Optional[str] = None,
+        dry_run: bool = False,
+    ) -> BulkVerificationReport:
+        """
+        Verify every active goal, optionally limited to one trainer.
+
+        Args:
+            trainer_id: Only verify this trainer's goals
+            dry_run: Evaluate without saving verifications
+
+        Returns:
+            BulkVerificationReport
+        """
+        started = time.monotonic()
+        report = BulkVerificationReport()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = []
+
+        after = None
+        while True:
+            goals = await asyncio.to_thread(self._fetch_active_goals, trainer_id, after)
+            if not goals:
+                break
+            after = goals[-1]['id']
+            tasks.append(asyncio.create_task(
+                self._run_batch(goals, report, semaphore, dry_run)
+            ))
+            if len(goals) < self.batch_size:
+                break
+
+        await asyncio.gather(*tasks)
+        report.elapsed_seconds = time.monotonic() - started
+        logger.info(f"Bulk verification: {report.to_dict()}")
+        return report
+
+    async def verify_goals(self, goals: List[dict], dry_run: bool = False) -> BulkVerificationReport:
+        """Verify an explicit list of goal rows"""
+        started = time.monotonic()
+        report = BulkVerificationReport()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.gather(*(
+            self._run_batch(goals[i:i + self.batch_size], report, semaphore, dry_run)
+            for i in range(0, len(goals), self.batch_size)
+        ))
+        report.elapsed_seconds = time.monotonic() - started
+        return report
+
+    async def _run_batch(
+        self,
+        goals: List[dict],
+        report: BulkVerificationReport,
+        semaphore: asyncio.Semaphore,
+        dry_run: bool,
+    ) -> None:
+        async with semaphore:
+            report.goals_seen += len(goals)
+            report.batches += 1
+            batch_started = datetime.now()
+
+            fetch_started = time.monotonic()
+            activity = await asyncio.to_thread(self._prefetch, goals)
+            report.fetch_seconds += time.monotonic() - fetch_started
+
+            verifier = OutcomeVerifier(self.supabase)
+            verifier.weight_service = _PrefetchedWeightService(activity)
+            verifier.strength_service = _PrefetchedStrengthService(activity)
+            verifier.consistency_service = _PrefetchedConsistencyService(activity)
+
+            results = []
+            for goal in goals:
+                if goal['goal_type'] not in AUTOMATED_GOAL_TYPES:
+                    # body_comp / custom need a manual value and photos
+                    report.skipped['manual_verification_required'] += 1
+                    continue
+                try:
+                    results.append(await verifier.evaluate_goal(goal))
+                except Exception as e:
+                    logger.warning(f"Bulk verification failed for goal {goal['id']}: {e}")
+                    report.failed[goal['id']] = str(e)
+
+            report.verified += len(results)
+            report.results.extend(results)
+
+            if dry_run or not results:
+                return
+
+            saved = await asyncio.to_thread(self._save_verifications, results)
+            report.saved += saved
+            report.milestones_achieved += await asyncio.to_thread(
+                self._count_new_milestones,
+                [r.goal_id for r in results],
+                batch_started,
+            )
+
+    def _fetch_active_goals(self, trainer_id: Optional[str], after: Optional[str]) -> List[dict]:
+        """One keyset page of active goals"""
+        query = (self.supabase.table('client_outcome_goals')
+                 .select('*')
+                 .eq('status', 'active'))
+        if trainer_id:
+            query = query.eq('trainer_id', trainer_id)
+        if after is not None:
+            query = query.gt('id', after)
+        result = query.order('id', desc=False).limit(self.batch_size).execute()
+        return result.data or []
+
+    def _prefetch(self, goals: List[dict]) -> Dict[str, ClientActivity]:
+        """Fetch every activity row the batch's goals need, one range query per table"""
+        activity = {goal['client_id']: ClientActivity() for goal in goals}
+
+        nutrition_since: Dict[str, str] = {}
+        workout_since: Dict[str, str] = {}
+        sets_since: Dict[str, str] = {}
+        exercise_ids = set()
+        activity_store = get_activity_bitmap_store()
+        weight_cutoff = (
+            datetime.now() - timedelta(days=WeightVerificationService.RECENT_WINDOW_DAYS)
+        ).date().isoformat()
+
+        def widen(window: Dict[str, str], client_id: str, since: str) -> None:
+            window[client_id] = min(window.get(client_id, since), since)
+
+        for goal in goals:
+            client_id = goal['client_id']
+            start = str(goal['start_date'])[:10]
+            metadata = goal.get('metadata') or {}
+            if goal['goal_type'] == 'weight_loss':
+                # Trend uses the whole goal period, at least the recent window
+                widen(nutrition_since, client_id, min(start, weight_cutoff))
+            elif goal['goal_type'] == 'strength_gain' and metadata.get('exercise_id'):
+                widen(sets_since, client_id, start)
+                exercise_ids.add(metadata['exercise_id'])
+            elif goal['goal_type'] == 'consistency':
+                # Only activity the client's bitmap hasn't merged yet
+                activity_type = metadata.get('activity_type', 'workout')
+                since = activity_store.sync_start(
+                    client_id, activity_type, date.fromisoformat(start)
+                ).isoformat()
+                if activity_type == 'nutrition':
+                    widen(nutrition_since, client_id, since)
+                else:
+                    widen(workout_since, client_id, since)
+
+        if nutrition_since:
+            for row in self._select_range(
+                'nutrition_logs', 'id, client_id, logged_date, body_weight',
+                nutrition_since, 'logged_date',
+            ):
+                activity[row['client_id']].nutrition_logs.append(row)
+
+        if workout_since:
+            for row in self._select_range(
+                'workout_logs', 'id, client_id, completed_at',
+                workout_since, 'completed_at',
+            ):
+                activity[row['client_id']].workout_logs.append(row)
+
+        if sets_since:
+            for row in self._select_range(
+                'workout_sets', 'id, client_id, workout_log_id, exercise_id, weight, reps, rpe, completed_at',
+                sets_since, 'completed_at',
+                extra=lambda q: q.in_('exercise_id', sorted(exercise_ids)),
+            ):
+                activity[row['client_id']].workout_sets.append(row)
+
+        return activity
+
+    def _select_range(
+        self,
+        table: str,
+        columns: str,
+        since_by_client: Dict[str, str],
+        date_column: str,
+        extra: Optional[Callable] = None,
+    ) -> List[dict]:
+        """
+        All rows for the given clients since the earliest window start.
+
+        Clients are queried CLIENT_BATCH at a time. Rows before a client's
+        own window are dropped here; the services apply their exact
+        per-goal filters.
+        """
+        client_ids = sorted(since_by_client)
+        return [
+            row
+            for i in range(0, len(client_ids), self.CLIENT_BATCH)
+            for row in self._select_client_batch(
+                table, columns,
+                {cid: since_by_client[cid] for cid in client_ids[i:i + self.CLIENT_BATCH]},
+                date_column, extra,
+            )
+        ]
+
+    def _select_client_batch(
+        self,
+        table: str,
+        columns: str,
+        since_by_client: Dict[str, str],
+        date_column: str,
+        extra: Optional[Callable],
+    ) -> List[dict]:
+        """Every row for a small batch of clients, page by page"""
+        since = min(since_by_client.values())
+        rows = []
+        offset = 0
+        while True:
+            query = (self.supabase.table(table)
+                     .select(columns)
+                     .in_('client_id', sorted(since_by_client))
+                     .gte(date_column, since))
+            if extra:
+                query = extra(query)
+            result = (query
+                      .order(date_column, desc=False)
+                      .order('id', desc=False)
+                      .range(offset, offset + self.page_size - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(
+                row for row in page
+                if str(row[date_column]) >= since_by_client[row['client_id']]
+            )
+            if len(page) < self.page_size:
+                return rows
+            offset += self.page_size
+
+    def _save_verifications(self, results: List[VerificationResult]) -> int:
+        """Insert a batch of verifications in one statement"""
+        response = (self.supabase.table('outcome_verifications')
+                    .insert([OutcomeVerifier.verification_row(r) for r in results])
+                    .execute())
+        return len(response.data or [])
+
+    def _count_new_milestones(self, goal_ids: List[str], since: datetime) -> int:
+        """Milestones the insert trigger created for these goals"""
+        count = 0
+        for i in range(0, len(goal_ids), self.CLIENT_BATCH):
+            result = (self.supabase.table('outcome_milestones')
+                      .select('id')
+                      .in_('goal_id', goal_ids[i:i + self.CLIENT_BATCH])
+                      .gte('achieved_at', since.isoformat())
+                      .execute())
+            count += len(result.data or [])
+        return count
@@ -7,10 +7,14 @@ Verifies consistency-based goals such as:
 - "Maintain 90%+ adherence for 3 months"
 
 High confidence since based on verifiable timestamps.
+
+Active days are kept in per-client activity bitmaps that are synced
+incrementally, so weeks are counted with popcounts rather than by
+re-scanning every log since the goal started.
 """
 
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from datetime import date, datetime
 from decimal import Decimal
 import logging
 
@@ -21,6 +25,14 @@ from .models import (
     ConfidenceFactors,
     AnomalyDetection
 )
+from .activity_bitmap import (
+    ACTIVITY_TYPES,
+    ActivityBitmap,
+    ActivityBitmapStore,
+    ConsistencySummary,
+    get_activity_bitmap_store,
+    summarize_consistency,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +40,11 @@ logger = logging.getLogger(__name__)
 class ConsistencyVerificationService:
     """Service for verifying consistency goals"""
 
-    def __init__(self, supabase_client):
+    ROW_PAGE = 1000  # PostgREST's default max rows per response
+
+    def __init__(self, supabase_client, store: Optional[ActivityBitmapStore] = None):
         self.supabase = supabase_client
+        self.store = store or get_activity_bitmap_store()
 
     async def verify(
         self,
@@ -42,7 +57,7 @@ class ConsistencyVerificationService:
 
         Consistency goals track adherence over time:
         - target_value: number of weeks to maintain consistency
-        - metadata.target_per_week: required sessions per week
+        - metadata.target_per_week: required active days per week
         - metadata.activity_type: 'workout' or 'nutrition'
 
         Args:
@@ -61,36 +76,30 @@ class ConsistencyVerificationService:
         target_per_week = metadata.get('target_per_week', 3)
         activity_type = metadata.get('activity_type', 'workout')
 
-        # Fetch activity data
-        if activity_type == 'workout':
-            activity_data = await self._fetch_workout_activity(
-                client_id=client_id,
-                since_date=goal['start_date']
-            )
-        elif activity_type == 'nutrition':
-            activity_data = await self._fetch_nutrition_activity(
-                client_id=client_id,
-                since_date=goal['start_date']
-            )
-        else:
+        if activity_type not in ACTIVITY_TYPES:
             return self._create_low_confidence_result(
                 goal=goal,
                 reason=f"Unknown activity type: {activity_type}"
             )
 
-        if not activity_data:
+        # Bring the activity bitmap up to date (only new activity is fetched)
+        start = datetime.fromisoformat(str(goal['start_date'])).date()
+        bitmap = await self.sync_activity(client_id, activity_type, start)
+
+        # Calculate weeks of consistency achieved
+        summary = summarize_consistency(
+            bitmap=bitmap,
+            start=start,
+            end=datetime.now().date(),
+            target_per_week=target_per_week
+        )
+
+        if not summary.active_days:
             return self._create_low_confidence_result(
                 goal=goal,
                 reason="No activity data found"
             )
 
-        # Calculate weeks of consistency achieved
-        consistent_weeks = self._calculate_consistent_weeks(
-            activity_data=activity_data,
-            target_per_week=target_per_week,
-            start_date=goal['start_date']
-        )
-
         # Confidence is very high for consistency goals (based on timestamps)
         confidence_factors = ConfidenceFactors(
             data_completeness=Decimal('1.0'),  # All timestamps recorded
@@ -102,14 +111,14 @@ class ConsistencyVerificationService:
 
         confidence_score = Decimal('0.95')  # Very high confidence
 
-        sources = self._create_sources_from_data(activity_data[-30:])  # Last 30 activities
+        sources = self._create_sources_from_data(bitmap.recent_records(since=start))  # Last 30 activities
 
         return VerificationResult(
             goal_id=goal['id'],
             client_id=client_id,
             trainer_id=trainer_id,
             verification_type='consistency_check',
-            measured_value=Decimal(str(consistent_weeks)),
+            measured_value=Decimal(str(summary.consistent_weeks)),
             unit='weeks',
             verification_method=VerificationMethod.WORKOUT_DATA if activity_type == 'workout' else VerificationMethod.NUTRITION_DATA,
             confidence_score=confidence_score,
@@ -119,6 +128,38 @@ class ConsistencyVerificationService:
             anomaly_detected=False
         )
 
+    async def sync_activity(self, client_id: str, activity_type: str, since: date) -> ActivityBitmap:
+        """
+        Merge activity logged since the bitmap's watermark and return the bitmap.
+
+        The first sync for a client reads everything since `since`; later
+        syncs re-read a few days before the watermark, replacing those days
+        so backdated and deleted logs are reflected. The watermark only
+        advances after every page of the window has been read.
+        """
+        fetch_from = self.store.sync_start(client_id, activity_type, since)
+        fetch = (self._fetch_workout_activity if activity_type == 'workout'
+                 else self._fetch_nutrition_activity)
+        records = await fetch(client_id=client_id, since_date=fetch_from.isoformat())
+        return self.store.record(
+            client_id,
+            activity_type,
+            records,
+            covered_from=fetch_from,
+            synced_through=datetime.now().date()
+        )
+
+    async def summarize(
+        self,
+        client_id: str,
+        activity_type: str,
+        since: date,
+        target_per_week: int
+    ) -> ConsistencySummary:
+        """Consistent weeks, streaks and adherence since a date"""
+        bitmap = await self.sync_activity(client_id, activity_type, since)
+        return summarize_consistency(bitmap, since, datetime.now().date(), target_per_week)
+
     async def _fetch_workout_activity(
         self,
         client_id: str,
@@ -129,23 +170,8 @@ class ConsistencyVerificationService:
 
         Returns list of dicts with 'id', 'date'
         """
-        result = (self.supabase.table('workout_logs')
-                  .select('id, completed_at')
-                  .eq('client_id', client_id)
-                  .gte('completed_at', since_date)
-                  .order('completed_at', desc=False)
-                  .execute())
-
-        if not result.data:
-            return []
-
-        return [
-            {
-                'id': row['id'],
-                'date': datetime.fromisoformat(str(row['completed_at'])).date()
-            }
-            for row in result.data
-        ]
+        rows = self._select_activity('workout_logs', 'completed_at', client_id, since_date)
+        return self._parse_activity_rows(rows, 'completed_at')
 
     async def _fetch_nutrition_activity(
         self,
@@ -157,76 +183,54 @@ class ConsistencyVerificationService:
 
         Returns list of dicts with 'id', 'date'
         """
-        result = (self.supabase.table('nutrition_logs')
-                  .select('id, logged_date')
-                  .eq('client_id', client_id)
-                  .gte('logged_date', since_date)
-                  .order('logged_date', desc=False)
-                  .execute())
-
-        if not result.data:
-            return []
+        rows = self._select_activity('nutrition_logs', 'logged_date', client_id, since_date)
+        return self._parse_activity_rows(rows, 'logged_date')
 
+    def _select_activity(
+        self,
+        table: str,
+        date_column: str,
+        client_id: str,
+        since_date: str
+    ) -> List[dict]:
+        """Every log row for a client since a date, page by page"""
+        rows: List[dict] = []
+        offset = 0
+        while True:
+            result = (self.supabase.table(table)
+                      .select(f'id, {date_column}')
+                      .eq('client_id', client_id)
+                      .gte(date_column, since_date)
+                      .order(date_column, desc=False)
+                      .order('id', desc=False)
+                      .range(offset, offset + self.ROW_PAGE - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.ROW_PAGE:
+                return rows
+            offset += self.ROW_PAGE
+
+    @staticmethod
+    def _parse_activity_rows(rows: List[dict], date_column: str) -> List[dict]:
+        """Convert workout_logs / nutrition_logs rows to activity records"""
         return [
             {
                 'id': row['id'],
-                'date': datetime.fromisoformat(str(row['logged_date'])).date()
+                'date': datetime.fromisoformat(str(row[date_column])).date()
             }
-            for row in result.data
+            for row in rows
         ]
 
-    def _calculate_consistent_weeks(
-        self,
-        activity_data: List[dict],
-        target_per_week: int,
-        start_date: str
-    ) -> int:
-        """
-        Calculate number of weeks where target was met.
-
-        Args:
-            activity_data: List of activity records with dates
-            target_per_week: Required activities per week
-            start_date: Goal start date
-
-        Returns:
-            Number of consistent weeks achieved
-        """
-        if not activity_data:
-            return 0
-
-        # Group activities by week
-        start = datetime.fromisoformat(str(start_date)).date()
-        now = datetime.now().date()
-
-        weeks_consistent = 0
-        current_week_start = start
-
-        while current_week_start <= now:
-            week_end = current_week_start + timedelta(days=7)
-
-            # Count activities in this week
-            week_activities = [
-                a for a in activity_data
-                if current_week_start <= a['date'] < week_end
-            ]
-
-            if len(week_activities) >= target_per_week:
-                weeks_consistent += 1
-
-            current_week_start = week_end
-
-        return weeks_consistent
-
-    def _create_sources_from_data(self, activity_data: List[dict]) -> List[VerificationSource]:
-        """Convert activity records to VerificationSource objects"""
+    def _create_sources_from_data(self, records: List[Tuple[str, date]]) -> List[VerificationSource]:
+        """Convert (id, date) activity records to VerificationSource objects"""
         return [
             VerificationSource(
                 source_type='activity_log',
-                source_id=record['id'],
-                timestamp=datetime.combine(record['date'], datetime.min.time())
+                source_id=source_id,
+                timestamp=datetime.combine(day, datetime.min.time())
             )
-            for record in activity_data
+            for source_id, day in records
         ]
 
     def _create_low_confidence_result(
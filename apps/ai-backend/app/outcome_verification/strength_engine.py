@@ -0,0 +1,349 @@
+"""
+Strength Progression Engine
+
+Columnar analytics over all of a client's logged sets at once:
+- Per-set e1RM (Epley, Brzycki, RPE-adjusted)
+- Rolling best e1RM per lift over the most recent sets
+- Per-lift progression rate from daily best e1RM
+- PR detection
+- Anomaly z-scores on session-to-session e1RM changes
+
+Results are plain NumPy arrays plus one LiftSummary per lift, shared by
+strength verification, goal progress and trainer analytics.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class LiftSummary:
+    """Progression summary for one lift"""
+    exercise_id: str
+    set_count: int
+    session_count: int
+    first_at: datetime
+    last_at: datetime
+    current_e1rm: float  # Best e1RM over the most recent window of sets
+    best_e1rm: float
+    first_session_e1rm: float
+    progression_per_week: float  # Least-squares slope of daily best e1RM
+    pr_count: int
+    last_pr_at: Optional[datetime]
+    max_abs_z: float  # Largest session-to-session change z-score
+    max_recent_jump: float  # Largest weight jump between the last few sets
+
+    @property
+    def progression_per_month(self) -> float:
+        return self.progression_per_week * 30 / 7
+
+    def to_dict(self) -> dict:
+        return {
+            'exercise_id': self.exercise_id,
+            'set_count': self.set_count,
+            'session_count': self.session_count,
+            'first_at': self.first_at.isoformat(),
+            'last_at': self.last_at.isoformat(),
+            'current_e1rm': round(self.current_e1rm, 1),
+            'best_e1rm': round(self.best_e1rm, 1),
+            'first_session_e1rm': round(self.first_session_e1rm, 1),
+            'progression_per_week': round(self.progression_per_week, 2),
+            'progression_per_month': round(self.progression_per_month, 2),
+            'pr_count': self.pr_count,
+            'last_pr_at': self.last_pr_at.isoformat() if self.last_pr_at else None,
+            'max_abs_z': round(self.max_abs_z, 2),
+        }
+
+
+@dataclass
+class StrengthAnalytics:
+    """
+    Per-set columns sorted by (lift, time) plus per-lift summaries.
+
+    Row i of every array describes the same set.
+    """
+    exercise_ids: np.ndarray  # object, sorted
+    timestamps: np.ndarray  # float64 epoch seconds
+    weight: np.ndarray
+    reps: np.ndarray
+    rpe: np.ndarray  # NaN when not logged
+    e1rm_epley: np.ndarray
+    e1rm_brzycki: np.ndarray
+    e1rm_rpe: np.ndarray
+    e1rm: np.ndarray  # Estimate used for progression (NaN outside the rep range)
+    rolling_e1rm: np.ndarray  # Best e1rm over the last `window` sets of the lift
+    is_pr: np.ndarray  # bool
+    lifts: Dict[str, LiftSummary]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def lift(self, exercise_id: str) -> Optional[LiftSummary]:
+        return self.lifts.get(exercise_id)
+
+    def rows(self, exercise_id: str) -> slice:
+        """Row range for one lift"""
+        start = int(np.searchsorted(self.exercise_ids, exercise_id, side='left'))
+        end = int(np.searchsorted(self.exercise_ids, exercise_id, side='right'))
+        return slice(start, end)
+
+
+class StrengthProgressionEngine:
+    """Vectorized strength analytics over workout set logs"""
+
+    MIN_REPS = 1
+    MAX_REPS = 12  # e1RM formulas are unreliable above ~12 reps
+    ROLLING_WINDOW_SETS = 20
+    JUMP_WINDOW_SETS = 5
+    MIN_SESSIONS_FOR_Z = 4
+
+    def analyze(
+        self,
+        exercise_ids: Sequence[str],
+        timestamps: Sequence,
+        weight: Sequence[float],
+        reps: Sequence[int],
+        rpe: Optional[Sequence[Optional[float]]] = None,
+    ) -> StrengthAnalytics:
+        """
+        Analyze a batch of sets across any number of lifts.
+
+        Args:
+            exercise_ids: Lift for each set
+            timestamps: datetimes, ISO strings or epoch seconds
+            weight: Load for each set
+            reps: Reps completed
+            rpe: Optional RPE per set (None/NaN when not logged)
+
+        Returns:
+            StrengthAnalytics with per-set columns and per-lift summaries
+        """
+        n = len(weight)
+        ids = np.asarray(exercise_ids, dtype=object).astype(str)
+        ts = _epoch_seconds(timestamps)
+        w = np.asarray(weight, dtype=np.float64)
+        r = np.asarray(reps, dtype=np.float64)
+        p = (np.full(n, np.nan) if rpe is None
+             else np.array([np.nan if v is None else v for v in rpe], dtype=np.float64))
+
+        order = np.lexsort((ts, ids))
+        ids, ts, w, r, p = ids[order], ts[order], w[order], r[order], p[order]
+
+        # Per-set estimates
+        in_range = (r >= self.MIN_REPS) & (r <= self.MAX_REPS)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            epley = w * (1 + r / 30)
+            brzycki = w * 36 / (37 - r)
+            # Reps in reserve from RPE extend the set to failure
+            rpe_reps = r + (10 - np.clip(p, 1, 10))
+            rpe_based = w * (1 + rpe_reps / 30)
+        epley = np.where(in_range, epley, np.nan)
+        brzycki = np.where(in_range, brzycki, np.nan)
+        rpe_based = np.where(in_range & ~np.isnan(p), rpe_based, np.nan)
+        e1rm = epley
+
+        lift_names, lift_starts, lift_index = np.unique(ids, return_index=True, return_inverse=True)
+        lift_ends = np.append(lift_starts[1:], n)
+
+        rolling = _grouped_window_max(e1rm, lift_starts[lift_index], self.ROLLING_WINDOW_SETS)
+
+        # PR: beats every earlier estimate for the lift
+        is_pr = _grouped_records(e1rm, lift_index)
+        filled = np.where(np.isnan(e1rm), -np.inf, e1rm)
+
+        # Daily best e1RM per lift (sessions)
+        day = np.floor(ts / SECONDS_PER_DAY).astype(np.int64)
+        session_start = np.ones(n, dtype=bool)
+        session_start[1:] = (day[1:] != day[:-1]) | (lift_index[1:] != lift_index[:-1])
+        session_idx = np.flatnonzero(session_start)
+        session_lift = lift_index[session_idx]
+        session_day = day[session_idx]
+        session_best = (np.maximum.reduceat(filled, session_idx)
+                        if n else np.empty(0))
+        valid_session = np.isfinite(session_best)
+
+        slope = _grouped_slope(session_day[valid_session],
+                               session_best[valid_session],
+                               session_lift[valid_session],
+                               len(lift_names))
+        z = _grouped_change_z(session_best[valid_session],
+                              session_lift[valid_session],
+                              len(lift_names),
+                              self.MIN_SESSIONS_FOR_Z)
+
+        # First valid session per lift
+        first_session = np.full(len(lift_names), np.nan)
+        valid_lift = session_lift[valid_session]
+        if len(valid_lift):
+            firsts = np.flatnonzero(np.r_[True, valid_lift[1:] != valid_lift[:-1]])
+            first_session[valid_lift[firsts]] = session_best[valid_session][firsts]
+
+        lifts = {}
+        for k, name in enumerate(lift_names.tolist()):
+            start, end = int(lift_starts[k]), int(lift_ends[k])
+            lift_e1rm = e1rm[start:end]
+            has_estimate = not np.isnan(lift_e1rm).all()
+            tail = w[max(start, end - self.JUMP_WINDOW_SETS):end]
+            pr_rows = np.flatnonzero(is_pr[start:end])
+            lifts[name] = LiftSummary(
+                exercise_id=name,
+                set_count=end - start,
+                session_count=int(np.count_nonzero(session_lift == k)),
+                first_at=_to_datetime(ts[start]),
+                last_at=_to_datetime(ts[end - 1]),
+                # Fall back to heaviest weight when no set is in the rep range
+                current_e1rm=float(rolling[end - 1]) if not np.isnan(rolling[end - 1]) else float(w[start:end].max()),
+                best_e1rm=float(np.nanmax(lift_e1rm)) if has_estimate else float(w[start:end].max()),
+                first_session_e1rm=float(first_session[k]) if not np.isnan(first_session[k]) else float(w[start]),
+                progression_per_week=float(slope[k] * 7),
+                pr_count=len(pr_rows),
+                last_pr_at=_to_datetime(ts[start + pr_rows[-1]]) if len(pr_rows) else None,
+                max_abs_z=float(z[k]),
+                max_recent_jump=float(np.abs(np.diff(tail)).max()) if len(tail) > 1 else 0.0,
+            )
+
+        return StrengthAnalytics(
+            exercise_ids=ids,
+            timestamps=ts,
+            weight=w,
+            reps=r,
+            rpe=p,
+            e1rm_epley=epley,
+            e1rm_brzycki=brzycki,
+            e1rm_rpe=rpe_based,
+            e1rm=e1rm,
+            rolling_e1rm=rolling,
+            is_pr=is_pr,
+            lifts=lifts,
+        )
+
+    def analyze_logs(self, set_logs: List[dict], default_exercise_id: str = '') -> StrengthAnalytics:
+        """
+        Analyze set dicts as returned by the workout_sets fetchers.
+
+        Each log needs 'weight', 'reps' and 'date'; 'exercise_id' and 'rpe'
+        are optional.
+        """
+        return self.analyze(
+            exercise_ids=[log.get('exercise_id') or default_exercise_id for log in set_logs],
+            timestamps=[log['date'] for log in set_logs],
+            weight=[float(log['weight']) for log in set_logs],
+            reps=[log['reps'] for log in set_logs],
+            rpe=[None if log.get('rpe') is None else float(log['rpe']) for log in set_logs],
+        )
+
+
+def _epoch_seconds(timestamps: Sequence) -> np.ndarray:
+    values = list(timestamps)
+    if values and isinstance(values[0], (int, float, np.number)):
+        return np.asarray(values, dtype=np.float64)
+    return np.array(
+        [(v if isinstance(v, datetime) else datetime.fromisoformat(str(v))).timestamp()
+         for v in values],
+        dtype=np.float64,
+    )
+
+
+def _to_datetime(seconds: float) -> datetime:
+    return datetime.fromtimestamp(float(seconds))
+
+
+def _grouped_records(values: np.ndarray, group: np.ndarray) -> np.ndarray:
+    """True where a value beats every earlier non-NaN value of its contiguous group"""
+    finite = ~np.isnan(values)
+    if not finite.any():
+        return np.zeros(len(values), dtype=bool)
+    lo, hi = values[finite].min(), values[finite].max()
+    # Stack each group above the previous so the running max can't leak
+    # across groups; NaN sits just below the group's real values
+    offset = group * (hi - lo + 2)
+    lifted = np.where(finite, values, lo - 1) + offset
+    previous = np.empty_like(lifted)
+    previous[0] = -np.inf
+    previous[1:] = np.maximum.accumulate(lifted)[:-1]
+    return finite & (lifted > previous) & (previous >= lo + offset)
+
+
+def _grouped_window_max(values: np.ndarray, group_start: np.ndarray, window: int) -> np.ndarray:
+    """Max over the last `window` rows of each row's group, ignoring NaN"""
+    n = len(values)
+    if n == 0:
+        return values.copy()
+    filled = np.where(np.isnan(values), -np.inf, values)
+
+    # Sparse table: table[k][i] = max(filled[i:i + 2**k])
+    table = [filled]
+    k = 1
+    while (1 << k) <= min(window, n):
+        prev = table[-1]
+        half = 1 << (k - 1)
+        table.append(np.maximum(prev[:-half], prev[half:]))
+        k += 1
+
+    end = np.arange(n)
+    start = np.maximum(group_start, end - window + 1)
+    length = end - start + 1
+    level = np.floor(np.log2(length)).astype(np.int64)
+
+    result = np.empty(n)
+    for k in np.unique(level):
+        rows = level == k
+        t = table[k]
+        result[rows] = np.maximum(t[start[rows]], t[end[rows] - (1 << k) + 1])
+    return np.where(np.isinf(result), np.nan, result)
+
+
+def _grouped_slope(x: np.ndarray, y: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    """Least-squares slope of y on x per group (0 with fewer than 2 points)"""
+    count = np.bincount(group, minlength=n_groups).astype(np.float64)
+    if len(x) == 0:
+        return np.zeros(n_groups)
+    # Center x per group for numerical stability
+    x = x.astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.bincount(group, x, n_groups) / count
+        y_mean = np.bincount(group, y, n_groups) / count
+        dx = x - x_mean[group]
+        sxx = np.bincount(group, dx * dx, n_groups)
+        sxy = np.bincount(group, dx * (y - y_mean[group]), n_groups)
+        slope = sxy / sxx
+    return np.where((count >= 2) & (sxx > 0), slope, 0.0)
+
+
+def _grouped_change_z(values: np.ndarray, group: np.ndarray, n_groups: int, min_points: int) -> np.ndarray:
+    """Largest |z| of consecutive changes within each group"""
+    result = np.zeros(n_groups)
+    if len(values) < 2:
+        return result
+    same = group[1:] == group[:-1]
+    delta = np.diff(values)[same]
+    g = group[1:][same]
+    if len(delta) == 0:
+        return result
+
+    count = np.bincount(g, minlength=n_groups).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(g, delta, n_groups) / count
+        var = np.bincount(g, (delta - mean[g]) ** 2, n_groups) / count
+        z = np.abs(delta - mean[g]) / np.sqrt(var[g])
+    z = np.where(np.isfinite(z) & (count[g] + 1 >= min_points), z, 0.0)
+    np.maximum.at(result, g, z)
+    return result
+
+
+# Global engine instance
+_strength_engine: Optional[StrengthProgressionEngine] = None
+
+
+def get_strength_engine() -> StrengthProgressionEngine:
+    """Get or create global strength progression engine"""
+    global _strength_engine
+    if _strength_engine is None:
+        _strength_engine = StrengthProgressionEngine()
+    return _strength_engine
@@ -6,6 +6,9 @@ Verifies strength-related goals using workout log data with:
 - Progress tracking on compound movements
 - Minimum time window requirements
 - Volume and intensity analysis
+
+Set logs are analyzed once per verification by the columnar
+StrengthProgressionEngine; Decimal is only used for the reported values.
 """
 
 from typing import Optional, List, Dict
@@ -20,6 +23,7 @@ from .models import (
     ConfidenceFactors,
     AnomalyDetection
 )
+from .strength_engine import LiftSummary, StrengthAnalytics, get_strength_engine
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +33,12 @@ class StrengthVerificationService:
 
     MIN_WEEKS_FOR_VERIFICATION = 4  # Minimum training period
     MIN_WORKOUT_COUNT = 8  # Minimum workouts for confidence
+    MAX_SESSION_CHANGE_Z = 3.5  # Session-to-session e1RM change outlier
+    ROW_PAGE = 1000  # PostgREST's default max rows per response
 
     def __init__(self, supabase_client):
         self.supabase = supabase_client
+        self.engine = get_strength_engine()
 
     async def verify(
         self,
@@ -76,9 +83,14 @@ class StrengthVerificationService:
                 manual_value=manual_value
             )
 
-        # Calculate current 1RM from recent workouts
+        # Analyze all sets in one pass
+        lift = None
         if workout_logs:
-            current_1rm = self._calculate_estimated_1rm(workout_logs)
+            lift = self.engine.analyze_logs(workout_logs, exercise_id).lift(exercise_id)
+
+        # Calculate current 1RM from recent workouts
+        if lift:
+            current_1rm = self._calculate_estimated_1rm(lift)
             sources = self._create_sources_from_logs(workout_logs[-10:])
         else:
             current_1rm = manual_value
@@ -90,7 +102,7 @@ class StrengthVerificationService:
 
         # Calculate confidence factors
         confidence_factors = self._calculate_confidence(
-            workout_logs=workout_logs,
+            lift=lift,
             goal_start_date=goal['start_date'],
             has_manual_value=manual_value is not None
         )
@@ -98,7 +110,7 @@ class StrengthVerificationService:
         # Detect anomalies (unrealistic gains)
         anomaly = self._detect_anomalies(
             goal=goal,
-            workout_logs=workout_logs,
+            lift=lift,
             current_1rm=current_1rm
         )
 
@@ -115,7 +127,7 @@ class StrengthVerificationService:
             verification_type='1rm_test',
             measured_value=current_1rm,
             unit=goal.get('unit', 'lbs'),
-            verification_method=VerificationMethod.WORKOUT_DATA if workout_logs else VerificationMethod.MANUAL,
+            verification_method=VerificationMethod.WORKOUT_DATA if lift else VerificationMethod.MANUAL,
             confidence_score=confidence_score,
             confidence_factors=confidence_factors.dict(),
             sources=sources,
@@ -128,64 +140,78 @@ class StrengthVerificationService:
     async def _fetch_strength_data(
         self,
         client_id: str,
-        exercise_id: str,
+        exercise_id: Optional[str],
         since_date: str
     ) -> List[dict]:
         """
-        Fetch workout sets for a specific exercise.
-
-        Returns list of sets with weight, reps, date
-        """
-        result = (self.supabase.table('workout_sets')
-                  .select('id, workout_log_id, exercise_id, weight, reps, completed_at')
-                  .eq('client_id', client_id)
-                  .eq('exercise_id', exercise_id)
-                  .gte('completed_at', since_date)
-                  .order('completed_at', desc=False)
-                  .execute())
+        Fetch workout sets for a specific exercise (or every exercise).
 
-        if not result.data:
-            return []
+        Read page by page (ordered by completed_at, then id) so the newest
+        sets are never cut off by the per-response row cap.
 
+        Returns list of sets with exercise, weight, reps, RPE, date
+        """
+        rows: List[dict] = []
+        offset = 0
+        while True:
+            query = (self.supabase.table('workout_sets')
+                     .select('id, workout_log_id, exercise_id, weight, reps, rpe, completed_at')
+                     .eq('client_id', client_id))
+            if exercise_id:
+                query = query.eq('exercise_id', exercise_id)
+            result = (query
+                      .gte('completed_at', since_date)
+                      .order('completed_at', desc=False)
+                      .order('id', desc=False)
+                      .range(offset, offset + self.ROW_PAGE - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.ROW_PAGE:
+                break
+            offset += self.ROW_PAGE
+
+        return self._parse_set_rows(rows)
+
+    @staticmethod
+    def _parse_set_rows(rows: List[dict]) -> List[dict]:
+        """Convert workout_sets rows to set logs, skipping incomplete sets"""
         return [
             {
                 'id': row['id'],
+                'exercise_id': row['exercise_id'],
                 'weight': Decimal(str(row['weight'])),
                 'reps': int(row['reps']),
+                'rpe': row.get('rpe'),
                 'date': row['completed_at']
             }
-            for row in result.data
+            for row in rows
             if row['weight'] and row['reps']
         ]
 
-    def _calculate_estimated_1rm(self, workout_logs: List[dict]) -> Decimal:
+    async def analyze_client(self, client_id: str, since_date: str) -> StrengthAnalytics:
         """
-        Calculate estimated 1RM using Epley formula.
-
-        1RM = weight * (1 + reps/30)
+        Strength analytics for every lift a client has logged since a date.
 
-        Takes the highest 1RM from recent workouts (last 2 weeks)
+        One query and one engine pass, for goal progress and trainer views.
         """
-        if not workout_logs:
-            return Decimal('0')
-
-        # Calculate 1RM for each set
-        estimated_1rms = []
-        for log in workout_logs[-20:]:  # Last 20 sets
-            weight = log['weight']
-            reps = log['reps']
+        set_logs = await self._fetch_strength_data(
+            client_id=client_id,
+            exercise_id=None,
+            since_date=since_date
+        )
+        return self.engine.analyze_logs(set_logs)
 
-            # Only use sets with 1-12 reps (most accurate range)
-            if 1 <= reps <= 12:
-                one_rm = weight * (Decimal('1') + Decimal(str(reps)) / Decimal('30'))
-                estimated_1rms.append(one_rm)
+    def _calculate_estimated_1rm(self, lift: LiftSummary) -> Decimal:
+        """
+        Estimated 1RM using Epley formula.
 
-        if not estimated_1rms:
-            # Fallback: use max weight lifted
-            return max([log['weight'] for log in workout_logs])
+        1RM = weight * (1 + reps/30)
 
-        # Return the highest estimated 1RM
-        return max(estimated_1rms)
+        Best estimate over the last 20 sets with 1-12 reps (most accurate
+        range); falls back to the heaviest weight lifted.
+        """
+        return Decimal(str(round(lift.current_e1rm, 2)))
 
     def _create_sources_from_logs(self, workout_logs: List[dict]) -> List[VerificationSource]:
         """Convert workout logs to VerificationSource objects"""
@@ -201,7 +227,7 @@ class StrengthVerificationService:
 
     def _calculate_confidence(
         self,
-        workout_logs: List[dict],
+        lift: Optional[LiftSummary],
         goal_start_date: str,
         has_manual_value: bool
     ) -> ConfidenceFactors:
@@ -212,7 +238,7 @@ class StrengthVerificationService:
             ConfidenceFactors with scores for each factor
         """
         # Data completeness (number of workouts)
-        workout_count = len(workout_logs) if workout_logs else 0
+        workout_count = lift.set_count if lift else 0
         if workout_count >= self.MIN_WORKOUT_COUNT * 2:
             data_completeness = Decimal('1.0')
         elif workout_count >= self.MIN_WORKOUT_COUNT:
@@ -221,9 +247,8 @@ class StrengthVerificationService:
             data_completeness = Decimal('0.4')
 
         # Data recency
-        if workout_logs:
-            last_workout = datetime.fromisoformat(str(workout_logs[-1]['date']))
-            days_since = (datetime.now() - last_workout).days
+        if lift:
+            days_since = (datetime.now() - lift.last_at).days
             if days_since <= 7:
                 data_recency = Decimal('1.0')
             elif days_since <= 14:
@@ -236,7 +261,7 @@ class StrengthVerificationService:
             data_recency = Decimal('0.3')
 
         # Consistency (regular training)
-        if workout_logs and len(workout_logs) >= 4:
+        if workout_count >= 4:
             # Check workout frequency
             start_date = datetime.fromisoformat(str(goal_start_date))
             weeks_elapsed = (datetime.now() - start_date).days / 7
@@ -252,7 +277,7 @@ class StrengthVerificationService:
             consistency_score = Decimal('0.5')
 
         # Source reliability
-        if workout_logs and len(workout_logs) >= self.MIN_WORKOUT_COUNT:
+        if workout_count >= self.MIN_WORKOUT_COUNT:
             source_reliability = Decimal('0.90')
         elif has_manual_value:
             source_reliability = Decimal('0.75')
@@ -270,7 +295,7 @@ class StrengthVerificationService:
     def _detect_anomalies(
         self,
         goal: dict,
-        workout_logs: List[dict],
+        lift: Optional[LiftSummary],
         current_1rm: Decimal
     ) -> AnomalyDetection:
         """
@@ -284,7 +309,7 @@ class StrengthVerificationService:
         Returns:
             AnomalyDetection with flags
         """
-        if not workout_logs or len(workout_logs) < 4:
+        if not lift or lift.set_count < 4:
             return AnomalyDetection(is_anomaly=False)
 
         start_1rm = goal['start_value']
@@ -319,20 +344,23 @@ class StrengthVerificationService:
             )
 
         # Check for unrealistic single-session jumps
-        if len(workout_logs) >= 2:
-            recent_weights = [log['weight'] for log in workout_logs[-5:]]
-            max_jump = max([
-                abs(recent_weights[i] - recent_weights[i-1])
-                for i in range(1, len(recent_weights))
-            ])
-
-            if max_jump > start_1rm * Decimal('0.20'):  # 20%+ jump
-                return AnomalyDetection(
-                    is_anomaly=True,
-                    anomaly_type='suspicious_pattern',
-                    reason=f"Single workout jump of {max_jump:.1f} lbs is unusually large",
-                    severity='low'
-                )
+        max_jump = Decimal(str(lift.max_recent_jump))
+        if max_jump > start_1rm * Decimal('0.20'):  # 20%+ jump
+            return AnomalyDetection(
+                is_anomaly=True,
+                anomaly_type='suspicious_pattern',
+                reason=f"Single workout jump of {max_jump:.1f} lbs is unusually large",
+                severity='low'
+            )
+
+        # Check for a session far outside the lift's usual progression
+        if lift.max_abs_z > self.MAX_SESSION_CHANGE_Z:
+            return AnomalyDetection(
+                is_anomaly=True,
+                anomaly_type='inconsistent',
+                reason=f"Session-to-session 1RM change {lift.max_abs_z:.1f} standard deviations from typical",
+                severity='low'
+            )
 
         return AnomalyDetection(is_anomaly=False)
 
@@ -53,31 +53,50 @@ class OutcomeVerifier:
 
         logger.info(f"Verifying goal {goal_id} of type {goal['goal_type']}")
 
+        result = await self.evaluate_goal(goal, manual_value, photo_urls)
+
+        # Save verification to database
+        await self._save_verification(result)
+
+        # Check for milestone achievements
+        await self._check_milestones(goal_id)
+
+        return result
+
+    async def evaluate_goal(
+        self,
+        goal: dict,
+        manual_value: Optional[Decimal] = None,
+        photo_urls: Optional[list] = None
+    ) -> VerificationResult:
+        """
+        Run the verification service for a goal without saving the result.
+
+        Args:
+            goal: Goal dictionary from database
+            manual_value: Manually entered value (if provided)
+            photo_urls: URLs of supporting photos (if provided)
+
+        Returns:
+            VerificationResult with confidence score and sources
+        """
         # Route to appropriate verification service
         if goal['goal_type'] == 'weight_loss':
-            result = await self.weight_service.verify(goal, manual_value, photo_urls)
+            return await self.weight_service.verify(goal, manual_value, photo_urls)
 
         elif goal['goal_type'] == 'strength_gain':
-            result = await self.strength_service.verify(goal, manual_value, photo_urls)
+            return await self.strength_service.verify(goal, manual_value, photo_urls)
 
         elif goal['goal_type'] == 'consistency':
-            result = await self.consistency_service.verify(goal)
+            return await self.consistency_service.verify(goal)
 
         elif goal['goal_type'] in ('body_comp', 'custom'):
             # These require manual verification with photo evidence
-            result = await self._manual_verification(goal, manual_value, photo_urls)
+            return await self._manual_verification(goal, manual_value, photo_urls)
 
         else:
             raise ValueError(f"Unknown goal type: {goal['goal_type']}")
 
-        # Save verification to database
-        await self._save_verification(result)
-
-        # Check for milestone achievements
-        await self._check_milestones(goal_id)
-
-        return result
-
     async def calculate_goal_progress(self, goal_id: str) -> GoalProgress:
         """
         Calculate current progress for a goal.
@@ -94,20 +113,7 @@ class OutcomeVerifier:
 
         current_value = latest_verification['measured_value'] if latest_verification else goal['start_value']
 
-        # Calculate progress percentage
-        if goal['goal_type'] == 'weight_loss':
-            # Progress = (start - current) / (start - target) * 100
-            progress = ((goal['start_value'] - current_value) /
-                       (goal['start_value'] - goal['target_value'])) * 100
-        elif goal['goal_type'] == 'strength_gain':
-            # Progress = (current - start) / (target - start) * 100
-            progress = ((current_value - goal['start_value']) /
-                       (goal['target_value'] - goal['start_value'])) * 100
-        else:
-            # Simple percentage
-            progress = (current_value / goal['target_value']) * 100
-
-        progress = max(0, min(100, progress))  # Cap between 0-100
+        progress = self.progress_percent(goal, current_value)
 
         # Determine milestones achieved
         milestones_achieved = [m for m in [25, 50, 75, 100] if progress >= m]
@@ -124,6 +130,23 @@ class OutcomeVerifier:
             next_milestone=Decimal(str(next_milestone)) if next_milestone else None
         )
 
+    @staticmethod
+    def progress_percent(goal: dict, current_value) -> float:
+        """Progress toward a goal's target, capped between 0-100"""
+        if goal['goal_type'] == 'weight_loss':
+            # Progress = (start - current) / (start - target) * 100
+            progress = ((goal['start_value'] - current_value) /
+                       (goal['start_value'] - goal['target_value'])) * 100
+        elif goal['goal_type'] == 'strength_gain':
+            # Progress = (current - start) / (target - start) * 100
+            progress = ((current_value - goal['start_value']) /
+                       (goal['target_value'] - goal['start_value'])) * 100
+        else:
+            # Simple percentage
+            progress = (current_value / goal['target_value']) * 100
+
+        return max(0, min(100, progress))  # Cap between 0-100
+
     async def _fetch_goal(self, goal_id: str) -> Optional[dict]:
         """Fetch goal details from database"""
         result = self.supabase.table('client_outcome_goals').select('*').eq('id', goal_id).single().execute()
@@ -174,7 +197,16 @@ class OutcomeVerifier:
 
     async def _save_verification(self, result: VerificationResult) -> str:
         """Save verification result to database"""
-        data = {
+        data = self.verification_row(result)
+
+        response = self.supabase.table('outcome_verifications').insert(data).execute()
+        logger.info(f"Saved verification for goal {result.goal_id}")
+        return response.data[0]['id']
+
+    @staticmethod
+    def verification_row(result: VerificationResult) -> dict:
+        """outcome_verifications row for a verification result"""
+        return {
             'goal_id': result.goal_id,
             'client_id': result.client_id,
             'trainer_id': result.trainer_id,
@@ -195,10 +227,6 @@ class OutcomeVerifier:
             }
         }
 
-        response = self.supabase.table('outcome_verifications').insert(data).execute()
-        logger.info(f"Saved verification for goal {result.goal_id}")
-        return response.data[0]['id']
-
     async def _check_milestones(self, goal_id: str):
         """
         Check if any new milestones have been achieved.
@@ -2,17 +2,19 @@
 Weight Loss Verification Service
 
 Verifies weight loss goals using nutrition log data with:
-- 7-day moving average to smooth daily fluctuations
+- Outlier-filtered EWMA trend to smooth daily fluctuations
 - Minimum data requirements for confidence
 - Anomaly detection for suspicious changes
 - Cross-verification with wearable data when available
+
+Weigh-ins are analyzed as float64 arrays by the WeightTrendAnalyzer;
+Decimal is only used for the reported values.
 """
 
 from typing import Optional, List
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 import logging
-import statistics
 
 from .models import (
     VerificationResult,
@@ -21,6 +23,7 @@ from .models import (
     ConfidenceFactors,
     AnomalyDetection
 )
+from .weight_trend import WeightSeries, WeightTrend, get_weight_trend_analyzer
 
 logger = logging.getLogger(__name__)
 
@@ -30,12 +33,15 @@ class WeightVerificationService:
 
     # Confidence thresholds
     MIN_DATA_POINTS = 3  # Minimum weight entries needed
-    IDEAL_DATA_POINTS = 7  # Ideal for 7-day moving average
+    IDEAL_DATA_POINTS = 7  # Ideal for a stable trend
+    RECENT_WINDOW_DAYS = 30  # Window for completeness and sources
     MAX_HEALTHY_LOSS_PER_WEEK = 2.0  # lbs
     MAX_HEALTHY_GAIN_PER_WEEK = 0.5  # lbs (for weight gain goals)
+    ROW_PAGE = 1000  # PostgREST's default max rows per response
 
     def __init__(self, supabase_client):
         self.supabase = supabase_client
+        self.analyzer = get_weight_trend_analyzer()
 
     async def verify(
         self,
@@ -57,13 +63,13 @@ class WeightVerificationService:
         client_id = goal['client_id']
         trainer_id = goal['trainer_id']
 
-        # Fetch recent weight data
-        weight_data = await self._fetch_weight_history(
-            client_id,
-            days=30
-        )
+        # Fetch weigh-ins since the goal started (at least the recent window)
+        window_start = (datetime.now() - timedelta(days=self.RECENT_WINDOW_DAYS)).date()
+        goal_start = datetime.fromisoformat(str(goal.get('start_date') or window_start)[:10]).date()
+        history = await self._fetch_weight_history(client_id, since=min(goal_start, window_start))
+        recent = history.since(window_start)
 
-        if not weight_data and not manual_value:
+        if not len(recent) and not manual_value:
             # No data available
             return self._create_low_confidence_result(
                 goal=goal,
@@ -72,10 +78,11 @@ class WeightVerificationService:
                 photo_urls=photo_urls
             )
 
-        # Calculate moving average
-        if weight_data:
-            current_weight = self._calculate_moving_average(weight_data, days=7)
-            sources = self._create_sources_from_data(weight_data[-7:])  # Last 7 days
+        # Smoothed trend over the full history
+        trend = self.analyzer.analyze(history) if len(recent) else None
+        if trend:
+            current_weight = Decimal(str(round(trend.current, 1)))
+            sources = self._create_sources_from_data(recent[-7:])  # Last 7 entries
         else:
             current_weight = manual_value
             sources = []
@@ -86,17 +93,14 @@ class WeightVerificationService:
 
         # Calculate confidence factors
         confidence_factors = self._calculate_confidence(
-            weight_data=weight_data,
+            data_points=len(recent),
+            trend=trend,
             has_manual_value=manual_value is not None,
             has_photos=bool(photo_urls)
         )
 
         # Detect anomalies
-        anomaly = self._detect_anomalies(
-            goal=goal,
-            weight_data=weight_data,
-            current_weight=current_weight
-        )
+        anomaly = self._detect_anomalies(goal=goal, trend=trend)
 
         # Calculate final confidence score
         confidence_score = self._compute_confidence_score(
@@ -105,7 +109,7 @@ class WeightVerificationService:
         )
 
         # Determine verification method
-        if manual_value and weight_data:
+        if manual_value and trend:
             method = VerificationMethod.NUTRITION_DATA  # Has supporting data
         elif manual_value:
             method = VerificationMethod.MANUAL
@@ -129,83 +133,75 @@ class WeightVerificationService:
             anomaly_reason=anomaly.reason
         )
 
-    async def _fetch_weight_history(self, client_id: str, days: int = 30) -> List[dict]:
+    async def _fetch_weight_history(self, client_id: str, since: date) -> WeightSeries:
         """
-        Fetch weight entries from nutrition logs.
+        Fetch weigh-ins from nutrition logs on or after a date.
 
-        Returns list of dicts with 'date', 'weight', 'id'
+        Read page by page (ordered by logged_date, then id) so long
+        histories keep their latest weigh-ins.
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
-
         # Query nutrition_logs or body_weight_logs (adjust based on schema)
-        result = (self.supabase.table('nutrition_logs')
-                  .select('id, logged_date, body_weight')
-                  .eq('client_id', client_id)
-                  .gte('logged_date', cutoff_date.date())
-                  .not_.is_('body_weight', 'null')
-                  .order('logged_date', desc=False)
-                  .execute())
-
-        if not result.data:
-            return []
-
-        return [
-            {
-                'id': row['id'],
-                'date': row['logged_date'],
-                'weight': Decimal(str(row['body_weight']))
-            }
-            for row in result.data
-        ]
-
-    def _calculate_moving_average(self, weight_data: List[dict], days: int = 7) -> Decimal:
-        """
-        Calculate N-day moving average to smooth fluctuations.
-
-        Args:
-            weight_data: List of weight entries (sorted by date)
-            days: Number of days for moving average
-
-        Returns:
-            Moving average weight
-        """
-        if not weight_data:
-            return Decimal('0')
-
-        recent_weights = [entry['weight'] for entry in weight_data[-days:]]
-
-        if not recent_weights:
-            return Decimal('0')
-
-        avg = statistics.mean(recent_weights)
-        return Decimal(str(round(avg, 1)))
-
-    def _create_sources_from_data(self, weight_data: List[dict]) -> List[VerificationSource]:
-        """Convert weight data entries to VerificationSource objects"""
+        rows: List[dict] = []
+        offset = 0
+        while True:
+            result = (self.supabase.table('nutrition_logs')
+                      .select('id, logged_date, body_weight')
+                      .eq('client_id', client_id)
+                      .gte('logged_date', since)
+                      .not_.is_('body_weight', 'null')
+                      .order('logged_date', desc=False)
+                      .order('id', desc=False)
+                      .range(offset, offset + self.ROW_PAGE - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.ROW_PAGE:
+                break
+            offset += self.ROW_PAGE
+
+        return self._parse_weight_rows(rows)
+
+    @staticmethod
+    def _parse_weight_rows(rows: List[dict]) -> WeightSeries:
+        """Convert nutrition_logs rows to a weight series"""
+        return WeightSeries.from_rows(rows)
+
+    async def analyze_client(self, client_id: str, since: date) -> Optional[WeightTrend]:
+        """Weight trend over a client's weigh-ins since a date (None without data)"""
+        return self.analyzer.analyze(await self._fetch_weight_history(client_id, since))
+
+    def _create_sources_from_data(self, series: WeightSeries) -> List[VerificationSource]:
+        """Convert weigh-ins to VerificationSource objects"""
         return [
             VerificationSource(
                 source_type='nutrition_log',
-                source_id=entry['id'],
-                timestamp=datetime.fromisoformat(str(entry['date'])),
-                value=entry['weight']
+                source_id=source_id,
+                timestamp=datetime.combine(day, datetime.min.time()),
+                value=Decimal(str(weight))
+            )
+            for source_id, day, weight in zip(
+                series.ids.tolist(), series.dates(), series.weights.tolist()
             )
-            for entry in weight_data
         ]
 
     def _calculate_confidence(
         self,
-        weight_data: List[dict],
+        data_points: int,
+        trend: Optional[WeightTrend],
         has_manual_value: bool,
         has_photos: bool
     ) -> ConfidenceFactors:
         """
         Calculate confidence factors for verification.
 
+        Args:
+            data_points: Weigh-ins in the recent window
+            trend: Weight trend (None without weigh-ins)
+
         Returns:
             ConfidenceFactors with scores for each factor
         """
         # Data completeness (based on number of entries)
-        data_points = len(weight_data) if weight_data else 0
         if data_points >= self.IDEAL_DATA_POINTS:
             data_completeness = Decimal('1.0')
         elif data_points >= self.MIN_DATA_POINTS:
@@ -214,9 +210,8 @@ class WeightVerificationService:
             data_completeness = Decimal('0.3')
 
         # Data recency (when was last entry)
-        if weight_data:
-            last_entry_date = datetime.fromisoformat(str(weight_data[-1]['date']))
-            days_since = (datetime.now().date() - last_entry_date.date()).days
+        if trend:
+            days_since = (datetime.now().date() - trend.last_date).days
             if days_since <= 2:
                 data_recency = Decimal('1.0')
             elif days_since <= 7:
@@ -228,15 +223,13 @@ class WeightVerificationService:
         else:
             data_recency = Decimal('0.3')
 
-        # Consistency (variance in measurements)
-        if weight_data and len(weight_data) >= 3:
-            weights = [float(e['weight']) for e in weight_data[-14:]]  # Last 2 weeks
-            std_dev = statistics.stdev(weights) if len(weights) > 1 else 0
+        # Consistency (variance in measurements over the last 2 weeks of entries)
+        if trend and data_points >= 3:
             # Lower std dev = more consistent = higher score
             # Typical healthy fluctuation is 1-3 lbs
-            if std_dev <= 2.0:
+            if trend.recent_std <= 2.0:
                 consistency_score = Decimal('1.0')
-            elif std_dev <= 5.0:
+            elif trend.recent_std <= 5.0:
                 consistency_score = Decimal('0.8')
             else:
                 consistency_score = Decimal('0.6')
@@ -246,7 +239,7 @@ class WeightVerificationService:
         # Source reliability
         if has_photos:
             source_reliability = Decimal('0.95')
-        elif weight_data and len(weight_data) >= self.IDEAL_DATA_POINTS:
+        elif data_points >= self.IDEAL_DATA_POINTS:
             source_reliability = Decimal('0.90')
         elif has_manual_value:
             source_reliability = Decimal('0.75')
@@ -264,8 +257,7 @@ class WeightVerificationService:
     def _detect_anomalies(
         self,
         goal: dict,
-        weight_data: List[dict],
-        current_weight: Decimal
+        trend: Optional[WeightTrend]
     ) -> AnomalyDetection:
         """
         Detect suspicious or unhealthy weight changes.
@@ -273,29 +265,15 @@ class WeightVerificationService:
         Returns:
             AnomalyDetection with flags and reasons
         """
-        if not weight_data or len(weight_data) < 2:
-            return AnomalyDetection(is_anomaly=False)
-
-        # Calculate weekly rate of change
-        first_entry = weight_data[0]
-        last_entry = weight_data[-1]
-
-        first_weight = first_entry['weight']
-        first_date = datetime.fromisoformat(str(first_entry['date']))
-        last_date = datetime.fromisoformat(str(last_entry['date']))
-
-        days_elapsed = (last_date.date() - first_date.date()).days
-        if days_elapsed < 7:
+        if not trend or trend.weekly_rate is None:
             # Not enough time to assess rate
             return AnomalyDetection(is_anomaly=False)
 
-        weeks_elapsed = Decimal(str(days_elapsed / 7))
-        weight_change = current_weight - first_weight
-        weekly_rate = abs(weight_change / weeks_elapsed)
+        weekly_rate = abs(trend.weekly_rate)
 
         # Check if rate is too fast
         if goal['goal_type'] == 'weight_loss':
-            if weekly_rate > Decimal(str(self.MAX_HEALTHY_LOSS_PER_WEEK)):
+            if weekly_rate > self.MAX_HEALTHY_LOSS_PER_WEEK:
                 return AnomalyDetection(
                     is_anomaly=True,
                     anomaly_type='too_fast',
@@ -303,7 +281,7 @@ class WeightVerificationService:
                     severity='medium' if weekly_rate < 3.0 else 'high'
                 )
         elif goal['goal_type'] == 'weight_gain':
-            if weekly_rate > Decimal(str(self.MAX_HEALTHY_GAIN_PER_WEEK)):
+            if weekly_rate > self.MAX_HEALTHY_GAIN_PER_WEEK:
                 return AnomalyDetection(
                     is_anomaly=True,
                     anomaly_type='too_fast',
@@ -311,17 +289,24 @@ class WeightVerificationService:
                     severity='low'  # Not as concerning as rapid loss
                 )
 
+        # Weigh-ins far from their neighbours (typos, different scale)
+        outliers = trend.recent_outliers(days=7)
+        if outliers:
+            return AnomalyDetection(
+                is_anomaly=True,
+                anomaly_type='suspicious_pattern',
+                reason=f"{outliers} recent weigh-in(s) far outside the surrounding trend",
+                severity='low'
+            )
+
         # Check for inconsistent pattern (large swings)
-        if len(weight_data) >= 7:
-            recent_weights = [float(e['weight']) for e in weight_data[-7:]]
-            weight_range = max(recent_weights) - min(recent_weights)
-            if weight_range > 10.0:  # 10+ lb fluctuation in a week
-                return AnomalyDetection(
-                    is_anomaly=True,
-                    anomaly_type='inconsistent',
-                    reason=f"Large weight fluctuation of {weight_range:.1f} lbs in recent week",
-                    severity='low'
-                )
+        if trend.day_count >= 7 and trend.recent_range > 10.0:  # 10+ lb fluctuation in a week
+            return AnomalyDetection(
+                is_anomaly=True,
+                anomaly_type='inconsistent',
+                reason=f"Large weight fluctuation of {trend.recent_range:.1f} lbs in recent week",
+                severity='low'
+            )
 
         return AnomalyDetection(is_anomaly=False)
 
@@ -0,0 +1,234 @@
+"""
+Weight Trend Pipeline
+
+Float64 analysis of a client's weigh-ins in one pass:
+- Same-day weigh-ins collapsed to a daily mean
+- Hampel filter (rolling median / MAD) to flag outliers such as typos
+- Time-aware EWMA trend over the cleaned series
+- Weekly rate of change from a least-squares fit over the recent window
+
+Works on arrays end to end, so years of weigh-ins cost about the same as
+a month. Decimal is only used by callers for the values they report.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@dataclass
+class WeightSeries:
+    """Weigh-ins sorted by date; row i of every column is the same entry"""
+    ids: np.ndarray  # object
+    days: np.ndarray  # datetime64[D]
+    weights: np.ndarray  # float64
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[dict],
+        date_column: str = 'logged_date',
+        weight_column: str = 'body_weight',
+    ) -> 'WeightSeries':
+        """Build from database rows; rows without a weight are dropped"""
+        rows = [row for row in rows if row.get(weight_column) is not None]
+        days = np.array([str(row[date_column])[:10] for row in rows], dtype='datetime64[D]')
+        order = np.argsort(days, kind='stable')
+        return cls(
+            ids=np.array([row['id'] for row in rows], dtype=object)[order],
+            days=days[order],
+            weights=np.array([row[weight_column] for row in rows], dtype=np.float64)[order],
+        )
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def since(self, day: date) -> 'WeightSeries':
+        """Entries on or after a date"""
+        start = int(np.searchsorted(self.days, np.datetime64(day, 'D'), side='left'))
+        return self[start:]
+
+    def __getitem__(self, rows: slice) -> 'WeightSeries':
+        return WeightSeries(ids=self.ids[rows], days=self.days[rows], weights=self.weights[rows])
+
+    def dates(self) -> List[date]:
+        return self.days.astype(object).tolist()
+
+
+@dataclass
+class WeightTrend:
+    """Trend summary for one client's weigh-ins"""
+    entry_count: int
+    day_count: int  # Distinct weigh-in days
+    first_date: date
+    last_date: date
+    days: np.ndarray  # datetime64[D], one per weigh-in day
+    daily: np.ndarray  # Daily mean weight
+    is_outlier: np.ndarray  # bool per day
+    cleaned: np.ndarray  # Daily weight with outliers replaced by the rolling median
+    trend: np.ndarray  # EWMA of the cleaned series
+    weekly_rate: Optional[float]  # Signed, None when the window spans under a week
+    rate_window_days: int
+    recent_std: float  # Sample std of the last 14 entries (0 with fewer than 2)
+    recent_range: float  # Max - min of the last 7 cleaned days
+
+    @property
+    def current(self) -> float:
+        return float(self.trend[-1])
+
+    @property
+    def outlier_count(self) -> int:
+        return int(np.count_nonzero(self.is_outlier))
+
+    def recent_outliers(self, days: int = 7) -> int:
+        """Outliers among the last `days` weigh-in days"""
+        return int(np.count_nonzero(self.is_outlier[-days:]))
+
+    def to_dict(self) -> dict:
+        return {
+            'entry_count': self.entry_count,
+            'day_count': self.day_count,
+            'first_date': self.first_date.isoformat(),
+            'last_date': self.last_date.isoformat(),
+            'current_trend': round(self.current, 1),
+            'weekly_rate': None if self.weekly_rate is None else round(self.weekly_rate, 2),
+            'rate_window_days': self.rate_window_days,
+            'recent_std': round(self.recent_std, 2),
+            'outlier_count': self.outlier_count,
+            'outlier_dates': [d.isoformat() for d in self.days[self.is_outlier].astype(object)],
+        }
+
+
+class WeightTrendAnalyzer:
+    """Hampel-filtered EWMA trend over weigh-ins"""
+
+    TREND_TIME_CONSTANT_DAYS = 4.0  # Lag comparable to a 7-entry moving average
+    HAMPEL_HALF_WINDOW = 3  # 7 weigh-in days centered on each day
+    HAMPEL_THRESHOLD = 3.0  # Scaled MADs from the rolling median
+    HAMPEL_MIN_DEVIATION = 0.01  # Never flag deviations under 1% of body weight
+    MAD_SCALE = 1.4826  # MAD -> standard deviation for normal data
+    RATE_WINDOW_DAYS = 30
+    MIN_RATE_SPAN_DAYS = 7
+    CONSISTENCY_ENTRIES = 14
+    RANGE_DAYS = 7
+
+    def analyze(self, series: WeightSeries) -> Optional[WeightTrend]:
+        """
+        Analyze a client's weigh-ins.
+
+        Args:
+            series: Weigh-ins sorted by date
+
+        Returns:
+            WeightTrend, or None when there are no weigh-ins
+        """
+        if len(series) == 0:
+            return None
+
+        # Daily mean (several weigh-ins on one day count as one observation)
+        days, day_index = np.unique(series.days, return_inverse=True)
+        counts = np.bincount(day_index)
+        daily = np.bincount(day_index, series.weights) / counts
+
+        is_outlier, cleaned = self._hampel(daily)
+
+        t = (days - days[0]).astype(np.float64)
+        trend = _ewma(cleaned, t, self.TREND_TIME_CONSTANT_DAYS)
+
+        # Weekly rate: least-squares slope over the trailing window
+        in_window = t >= t[-1] - self.RATE_WINDOW_DAYS
+        x, y = t[in_window], cleaned[in_window]
+        weekly_rate = None
+        if len(x) >= 2 and x[-1] - x[0] >= self.MIN_RATE_SPAN_DAYS:
+            dx = x - x.mean()
+            weekly_rate = float((dx * (y - y.mean())).sum() / (dx * dx).sum() * 7)
+
+        recent = series.weights[-self.CONSISTENCY_ENTRIES:]
+        recent_std = float(recent.std(ddof=1)) if len(recent) > 1 else 0.0
+        tail = cleaned[-self.RANGE_DAYS:]
+
+        return WeightTrend(
+            entry_count=len(series),
+            day_count=len(days),
+            first_date=days[0].astype(object),
+            last_date=days[-1].astype(object),
+            days=days,
+            daily=daily,
+            is_outlier=is_outlier,
+            cleaned=cleaned,
+            trend=trend,
+            weekly_rate=weekly_rate,
+            rate_window_days=self.RATE_WINDOW_DAYS,
+            recent_std=recent_std,
+            recent_range=float(tail.max() - tail.min()),
+        )
+
+    def _hampel(self, values: np.ndarray):
+        """Outlier flags and the series with outliers replaced by the rolling median"""
+        half = self.HAMPEL_HALF_WINDOW
+        if len(values) < 3:
+            return np.zeros(len(values), dtype=bool), values.copy()
+
+        padded = np.pad(values, half, constant_values=np.nan)
+        windows = sliding_window_view(padded, 2 * half + 1)
+        median = np.nanmedian(windows, axis=1)
+        mad = np.nanmedian(np.abs(windows - median[:, None]), axis=1)
+
+        limit = np.maximum(
+            self.HAMPEL_THRESHOLD * self.MAD_SCALE * mad,
+            self.HAMPEL_MIN_DEVIATION * median,
+        )
+        is_outlier = np.abs(values - median) > limit
+        return is_outlier, np.where(is_outlier, median, values)
+
+
+def _ewma(values: np.ndarray, t: np.ndarray, tau: float) -> np.ndarray:
+    """
+    EWMA for irregularly spaced samples, seeded with the first value.
+
+    y[i] = y[i-1] + (1 - exp(-(t[i] - t[i-1]) / tau)) * (x[i] - y[i-1])
+
+    Solved in closed form with cumulative sums. exp(t / tau) is rebased
+    every BLOCK time constants so it can't overflow on long histories.
+    """
+    block = 500.0  # exp(500) is well inside float64 range
+    result = np.empty_like(values)
+    carry = values[0]
+    start = 0
+    n = len(values)
+    while start < n:
+        t0 = t[start]
+        end = int(np.searchsorted(t, t0 + block * tau, side='left'))
+        end = max(end, start + 1)
+        s = (t[start:end] - t0) / tau
+        x = values[start:end]
+
+        # Weight of each sample in the recursion, relative to time t0
+        alpha = np.empty(end - start)
+        alpha[0] = 1.0 if start == 0 else -np.expm1(-(t[start] - t[start - 1]) / tau)
+        alpha[1:] = -np.expm1(-np.diff(s))
+        growth = np.exp(s)
+        decay = np.exp(-s)
+
+        # y[j] = decay[j] * (carry_scaled + cumsum(alpha * x * growth))
+        # where carry_scaled reflects the previous block's last value at t0
+        carry_scaled = (1 - alpha[0]) * carry
+        result[start:end] = decay * (carry_scaled + np.cumsum(alpha * x * growth))
+        carry = result[end - 1]
+        start = end
+    return result
+
+
+# Global analyzer instance
+_weight_trend_analyzer: Optional[WeightTrendAnalyzer] = None
+
+
+def get_weight_trend_analyzer() -> WeightTrendAnalyzer:
+    """Get or create global weight trend analyzer"""
+    global _weight_trend_analyzer
+    if _weight_trend_analyzer is None:
+        _weight_trend_analyzer = WeightTrendAnalyzer()
+    return _weight_trend_analyzer
@@ -16,6 +16,7 @@ Sprint 34: HRV Recovery System
 from app.recovery.hrv_analyzer import HRVAnalyzer, HRVTrend, RecoveryState
 from app.recovery.recovery_score import RecoveryScoreCalculator, RecoveryScore
 from app.recovery.intensity_adjuster import IntensityAdjuster, IntensityRecommendation
+from app.recovery.adjusted_workout import AdjustedWorkout, serialize_workout
 
 __all__ = [
     "HRVAnalyzer",
@@ -25,4 +26,6 @@ __all__ = [
     "RecoveryScore",
     "IntensityAdjuster",
     "IntensityRecommendation",
+    "AdjustedWorkout",
+    "serialize_workout",
 ]
@@ -0,0 +1,217 @@
+"""
+Adjusted Workout
+
+Copy-on-write view over a planned workout.
+
+An adjustment only records what changed (per-exercise sets/RPE/rest,
+truncation, renamed session), so adjusting a workout allocates a handful
+of small dicts instead of a deep copy of every exercise. Planned and
+adjusted workouts serialize through the same function.
+
+Sprint 34: HRV Recovery System
+"""
+
+from typing import Any, Iterable, Optional
+
+from app.workout_gen.generator import Exercise, Workout
+
+
+# Exercise fields that adjustments may override
+ADJUSTABLE_FIELDS = ("sets", "rpe", "rest_seconds")
+
+# Fields serialized for each exercise by default
+DEFAULT_EXERCISE_FIELDS = ("name", "sets", "reps", "rpe", "rest_seconds")
+
+
+class AdjustedWorkout:
+    """
+    Thin delta over a base Workout.
+
+    Reads fall through to the base workout unless overridden. The base is
+    never modified.
+    """
+
+    __slots__ = (
+        "base",
+        "_overrides",
+        "_exercise_count",
+        "_replacement",
+        "_header",
+    )
+
+    def __init__(self, base: Workout):
+        self.base = base
+        # exercise index -> {field: value}
+        self._overrides: dict[int, dict[str, Any]] = {}
+        self._exercise_count = len(base.exercises)
+        self._replacement: Optional[list[Exercise]] = None
+        self._header: dict[str, Any] = {}
+
+    # Header fields
+
+    @property
+    def day_number(self) -> int:
+        return self.base.day_number
+
+    @property
+    def week_number(self) -> int:
+        return self.base.week_number
+
+    @property
+    def name(self) -> str:
+        return self._header.get("name", self.base.name)
+
+    @property
+    def warmup_notes(self) -> Optional[str]:
+        return self._header.get("warmup_notes", self.base.warmup_notes)
+
+    @property
+    def cooldown_notes(self) -> Optional[str]:
+        return self._header.get("cooldown_notes", self.base.cooldown_notes)
+
+    @property
+    def total_duration_minutes(self) -> int:
+        return self.base.total_duration_minutes
+
+    def set_header(self, **fields: Any) -> None:
+        """Override name, warmup_notes or cooldown_notes"""
+        self._header.update(fields)
+
+    # Exercises
+
+    def __len__(self) -> int:
+        if self._replacement is not None:
+            return len(self._replacement)
+        return self._exercise_count
+
+    def get(self, index: int, field: str) -> Any:
+        """Current value of an exercise field"""
+        if self._replacement is not None:
+            return getattr(self._replacement[index], field)
+        overrides = self._overrides.get(index)
+        if overrides and field in overrides:
+            return overrides[field]
+        return getattr(self.base.exercises[index], field)
+
+    def set(self, index: int, field: str, value: Any) -> None:
+        """Override an exercise field (sets, rpe or rest_seconds)"""
+        if field not in ADJUSTABLE_FIELDS:
+            raise ValueError(f"Cannot override exercise field: {field}")
+        if self._replacement is not None:
+            setattr(self._replacement[index], field, value)
+            return
+        if getattr(self.base.exercises[index], field) == value:
+            self._overrides.get(index, {}).pop(field, None)
+        else:
+            self._overrides.setdefault(index, {})[field] = value
+
+    def truncate(self, count: int) -> int:
+        """Keep only the first `count` exercises; returns how many were dropped"""
+        dropped = max(0, len(self) - count)
+        if self._replacement is not None:
+            del self._replacement[count:]
+        else:
+            self._exercise_count = min(self._exercise_count, count)
+            self._overrides = {i: o for i, o in self._overrides.items() if i < count}
+        return dropped
+
+    def replace_exercises(self, exercises: list[Exercise]) -> None:
+        """Swap the whole session for a different exercise list"""
+        self._replacement = list(exercises)
+        self._overrides = {}
+
+    @property
+    def is_modified(self) -> bool:
+        return bool(
+            self._header
+            or self._replacement is not None
+            or self._exercise_count != len(self.base.exercises)
+            or any(self._overrides.values())
+        )
+
+    @property
+    def exercises(self) -> list[Exercise]:
+        """Materialized exercises (fresh objects; edits don't write through)"""
+        return [self._materialize(i) for i in range(len(self))]
+
+    def _materialize(self, index: int) -> Exercise:
+        if self._replacement is not None:
+            e = self._replacement[index]
+        else:
+            e = self.base.exercises[index]
+        overrides = self._overrides.get(index, {}) if self._replacement is None else {}
+        return Exercise(
+            name=e.name,
+            sets=overrides.get("sets", e.sets),
+            reps=e.reps,
+            rpe=overrides.get("rpe", e.rpe),
+            rest_seconds=overrides.get("rest_seconds", e.rest_seconds),
+            tempo=e.tempo,
+            notes=e.notes,
+            substitutions=list(e.substitutions),
+        )
+
+    def to_workout(self) -> Workout:
+        """Independent Workout with the adjustments applied"""
+        return Workout(
+            day_number=self.day_number,
+            week_number=self.week_number,
+            name=self.name,
+            exercises=self.exercises,
+            warmup_notes=self.warmup_notes,
+            cooldown_notes=self.cooldown_notes,
+            total_duration_minutes=self.total_duration_minutes,
+        )
+
+    def to_dict(self, fields: Iterable[str] = DEFAULT_EXERCISE_FIELDS) -> dict:
+        """Serialize without materializing Exercise objects"""
+        return serialize_workout(self, fields)
+
+    def delta(self) -> dict:
+        """Only what differs from the base workout"""
+        result: dict[str, Any] = dict(self._header)
+        if self._replacement is not None:
+            result["exercises"] = [
+                _exercise_dict(e, {}, DEFAULT_EXERCISE_FIELDS) for e in self._replacement
+            ]
+            return result
+        if self._exercise_count != len(self.base.exercises):
+            result["exercise_count"] = self._exercise_count
+        changed = {str(i): dict(o) for i, o in sorted(self._overrides.items()) if o}
+        if changed:
+            result["exercise_changes"] = changed
+        return result
+
+
+def _exercise_dict(e: Exercise, overrides: dict[str, Any], fields: Iterable[str]) -> dict:
+    return {f: overrides[f] if f in overrides else getattr(e, f) for f in fields}
+
+
+def serialize_workout(
+    workout: "Workout | AdjustedWorkout",
+    fields: Iterable[str] = DEFAULT_EXERCISE_FIELDS,
+) -> dict:
+    """
+    Serialize a planned or adjusted workout for API responses.
+
+    Args:
+        workout: Workout or AdjustedWorkout
+        fields: Exercise fields to include
+
+    Returns:
+        {"name": ..., "exercises": [{field: value}, ...]}
+    """
+    fields = tuple(fields)
+    if isinstance(workout, AdjustedWorkout):
+        if workout._replacement is not None:
+            exercises = [_exercise_dict(e, {}, fields) for e in workout._replacement]
+        else:
+            overrides = workout._overrides
+            exercises = [
+                _exercise_dict(e, overrides.get(i, {}), fields)
+                for i, e in enumerate(workout.base.exercises[:workout._exercise_count])
+            ]
+    else:
+        exercises = [_exercise_dict(e, {}, fields) for e in workout.exercises]
+
+    return {"name": workout.name, "exercises": exercises}
@@ -15,6 +15,7 @@ from dataclasses import dataclass, field
 from typing import Optional, Literal
 from datetime import datetime
 
+from app.recovery.adjusted_workout import AdjustedWorkout
 from app.recovery.recovery_score import RecoveryScore, RecoveryCategory
 from app.workout_gen.generator import Workout, Exercise
 
@@ -26,8 +27,8 @@ class IntensityRecommendation:
     # Original workout
     original_workout: Workout
 
-    # Adjusted workout
-    adjusted_workout: Workout
+    # Adjusted workout (copy-on-write delta over original_workout)
+    adjusted_workout: AdjustedWorkout
 
     # Recovery context
     recovery_score: float  # 0-100
@@ -76,8 +77,8 @@ class IntensityAdjuster:
         Returns:
             IntensityRecommendation with adjusted workout
         """
-        # Create copy of workout for adjustment
-        adjusted = self._copy_workout(workout)
+        # Copy-on-write view: only changed fields are stored
+        adjusted = AdjustedWorkout(workout)
 
         sets_reduced = 0
         exercises_removed = 0
@@ -89,14 +90,15 @@ class IntensityAdjuster:
             # Push harder
             reasoning = "Excellent recovery. Increasing training stimulus for adaptation."
 
-            for exercise in adjusted.exercises:
+            for i in range(len(adjusted)):
                 # Option 1: Add 1 set to main lifts (first 3 exercises)
-                if adjusted.exercises.index(exercise) < 3:
-                    exercise.sets += 1
+                if i < 3:
+                    adjusted.set(i, "sets", adjusted.get(i, "sets") + 1)
 
                 # Option 2: Increase RPE by 0.5-1.0
-                if exercise.rpe:
-                    exercise.rpe = min(10.0, exercise.rpe + 0.5)
+                rpe = adjusted.get(i, "rpe")
+                if rpe:
+                    adjusted.set(i, "rpe", min(10.0, rpe + 0.5))
                     rpe_reduced = -0.5  # Negative because we increased
 
         elif recovery_score.category == RecoveryCategory.GOOD:
@@ -107,10 +109,11 @@ class IntensityAdjuster:
             # Slight reduction in volume
             reasoning = "Moderate recovery. Reducing volume 10-20% while maintaining intensity."
 
-            for exercise in adjusted.exercises:
-                if exercise.sets > 2:
+            for i in range(len(adjusted)):
+                sets = adjusted.get(i, "sets")
+                if sets > 2:
                     reduction = 1
-                    exercise.sets -= reduction
+                    adjusted.set(i, "sets", sets - reduction)
                     sets_reduced += reduction
 
         elif recovery_score.category == RecoveryCategory.POOR:
@@ -118,27 +121,28 @@ class IntensityAdjuster:
             reasoning = "Poor recovery. Reducing volume 30-40% and intensity 1-2 RPE."
 
             # Remove accessory exercises (keep first 4)
-            if len(adjusted.exercises) > 4:
-                exercises_removed = len(adjusted.exercises) - 4
-                adjusted.exercises = adjusted.exercises[:4]
+            exercises_removed = adjusted.truncate(4)
 
-            for exercise in adjusted.exercises:
+            for i in range(len(adjusted)):
                 # Reduce sets
-                if exercise.sets > 2:
-                    reduction = max(1, exercise.sets // 3)  # Reduce by ~33%
-                    exercise.sets -= reduction
+                sets = adjusted.get(i, "sets")
+                if sets > 2:
+                    reduction = max(1, sets // 3)  # Reduce by ~33%
+                    adjusted.set(i, "sets", sets - reduction)
                     sets_reduced += reduction
 
                 # Reduce RPE
-                if exercise.rpe:
+                rpe = adjusted.get(i, "rpe")
+                if rpe:
                     reduction = 1.5
-                    exercise.rpe = max(5.0, exercise.rpe - reduction)
+                    adjusted.set(i, "rpe", max(5.0, rpe - reduction))
                     rpe_reduced = max(rpe_reduced, reduction)
 
                 # Increase rest
-                if exercise.rest_seconds < 180:
+                rest = adjusted.get(i, "rest_seconds")
+                if rest < 180:
                     increase = 30
-                    exercise.rest_seconds += increase
+                    adjusted.set(i, "rest_seconds", rest + increase)
                     rest_increased = max(rest_increased, increase)
 
         else:  # CRITICAL
@@ -146,7 +150,7 @@ class IntensityAdjuster:
             reasoning = "Critical recovery state. Active recovery or rest recommended."
 
             # Replace entire workout with active recovery
-            adjusted.exercises = [
+            adjusted.replace_exercises([
                 Exercise(
                     name="Light Movement / Mobility Work",
                     sets=2,
@@ -155,11 +159,13 @@ class IntensityAdjuster:
                     rest_seconds=60,
                     notes="Very light activity: walking, cycling, stretching, foam rolling",
                 ),
-            ]
+            ])
             exercises_removed = len(workout.exercises) - 1
-            adjusted.name = "Active Recovery"
-            adjusted.warmup_notes = "5-10 min very light cardio"
-            adjusted.cooldown_notes = "15-20 min stretching and mobility"
+            adjusted.set_header(
+                name="Active Recovery",
+                warmup_notes="5-10 min very light cardio",
+                cooldown_notes="15-20 min stretching and mobility",
+            )
 
         # Add recovery-specific notes
         notes = []
@@ -200,30 +206,6 @@ class IntensityAdjuster:
             notes=notes,
         )
 
-    def _copy_workout(self, workout: Workout) -> Workout:
-        """Create deep copy of workout for modification"""
-        return Workout(
-            day_number=workout.day_number,
-            week_number=workout.week_number,
-            name=workout.name,
-            exercises=[
-                Exercise(
-                    name=e.name,
-                    sets=e.sets,
-                    reps=e.reps,
-                    rpe=e.rpe,
-                    rest_seconds=e.rest_seconds,
-                    tempo=e.tempo,
-                    notes=e.notes,
-                    substitutions=e.substitutions.copy() if e.substitutions else [],
-                )
-                for e in workout.exercises
-            ],
-            warmup_notes=workout.warmup_notes,
-            cooldown_notes=workout.cooldown_notes,
-            total_duration_minutes=workout.total_duration_minutes,
-        )
-
     def should_skip_workout(
         self,
         recovery_score: RecoveryScore,
@@ -13,11 +13,12 @@ Research:
 Sprint 38: 66-Day Habit Tracking
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import date, time
+from datetime import date, datetime, time
 
+from app.core.auth import get_token_claims, require_self_or_service, require_service_role
 from app.habits.habit_formation import (
     get_habit_formation,
     HabitType,
@@ -31,6 +32,7 @@ from app.habits.context_notifications import (
     NotificationContext,
     NotificationTiming,
 )
+from app.habits.notification_scheduler import get_notification_scheduler
 
 
 router = APIRouter(prefix="/api/v1/habits", tags=["habits"])
@@ -52,6 +54,21 @@ class HabitProgressRequest(BaseModel):
     current_date: Optional[date] = None
 
 
+class ClientHabitsRequest(BaseModel):
+    """All habits of one client"""
+
+    client_id: str
+    habits: List[HabitProgressRequest]
+
+
+class BatchHabitProgressRequest(BaseModel):
+    """Request for progress of every habit of many clients"""
+
+    clients: List[ClientHabitsRequest]
+    current_date: Optional[date] = None  # Default for habits without one
+    include_notes: bool = False  # Insight notes are per-habit text; off for dashboards
+
+
 class HabitStackingRequest(BaseModel):
     """Request for habit stacking suggestions"""
 
@@ -76,6 +93,34 @@ class NotificationStrategyRequest(BaseModel):
     typical_completion_time: Optional[str] = None  # ISO time format
 
 
+class ScheduleNotificationsRequest(NotificationStrategyRequest):
+    """Request to schedule a user's notifications for one habit"""
+
+    user_id: str
+
+
+class DueNotificationsRequest(BaseModel):
+    """Worker poll for notifications due now"""
+
+    now: Optional[datetime] = None
+
+
+class HabitCompletedRequest(BaseModel):
+    """A habit was completed (suppresses today's reminders)"""
+
+    user_id: str
+    habit_id: str
+    completed_on: Optional[date] = None
+
+
+class NotificationEventRequest(BaseModel):
+    """An event for event-driven triggers (e.g. location)"""
+
+    user_id: str
+    context: NotificationContext
+    now: Optional[datetime] = None
+
+
 class OptimalTimeRequest(BaseModel):
     """Request for optimal time suggestion"""
 
@@ -135,6 +180,62 @@ async def calculate_habit_progress(request: HabitProgressRequest):
             detail=f"Error calculating progress: {str(e)}",
         )
 
+    return _progress_to_dict(progress)
+
+
+@router.post("/progress/batch", response_model=dict)
+async def calculate_habit_progress_batch(request: BatchHabitProgressRequest):
+    """
+    Calculate progress for every habit of every client in one request.
+
+    All habits are evaluated together over day-indexed completion bits, so
+    trainer dashboards don't need one request per habit.
+
+    Returns:
+        Per-client habit progress plus a risk-level summary
+    """
+    habit_formation = get_habit_formation()
+
+    habits = [
+        habit.model_dump()
+        for client in request.clients
+        for habit in client.habits
+    ]
+
+    try:
+        progress = habit_formation.calculate_progress_batch(
+            habits,
+            current_date=request.current_date,
+            include_notes=request.include_notes,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error calculating progress: {str(e)}",
+        )
+
+    clients = []
+    risk_summary = {"low": 0, "medium": 0, "high": 0}
+    i = 0
+    for client in request.clients:
+        client_progress = progress[i:i + len(client.habits)]
+        i += len(client.habits)
+        for p in client_progress:
+            risk_summary[p.risk_level] += 1
+        clients.append({
+            "client_id": client.client_id,
+            "habits": [_progress_to_dict(p) for p in client_progress],
+        })
+
+    return {
+        "clients": clients,
+        "total_habits": len(progress),
+        "risk_summary": risk_summary,
+    }
+
+
+def _progress_to_dict(progress) -> dict:
+    """Serialize HabitProgress for API responses"""
     return {
         "habit_id": progress.habit_id,
         "habit_name": progress.habit_name,
@@ -230,6 +331,116 @@ async def create_notification_strategy(request: NotificationStrategyRequest):
     Returns:
         Notification strategy with context-aware triggers
     """
+    strategy = _build_notification_strategy(request)
+
+    # Format triggers
+    triggers_formatted = [_trigger_to_dict(t) for t in strategy.triggers]
+
+    return {
+        "habit_id": strategy.habit_id,
+        "habit_name": strategy.habit_name,
+        "triggers": triggers_formatted,
+        "max_daily_notifications": strategy.max_daily_notifications,
+        "quiet_hours": {
+            "start": strategy.quiet_hours[0].isoformat(),
+            "end": strategy.quiet_hours[1].isoformat(),
+        },
+        "research_note": "Context-aware interventions are 2.8x more effective than scheduled reminders",
+    }
+
+
+@router.post("/notifications/schedule", response_model=dict)
+async def schedule_notifications(
+    request: ScheduleNotificationsRequest,
+    claims: dict = Depends(get_token_claims),
+):
+    """
+    Create a habit's notification strategy and schedule its triggers.
+
+    Rescheduling the same habit replaces its previous triggers. Delivery
+    is capped at MAX_DAILY_INTERVENTIONS per user across all habits.
+    Users may only schedule their own notifications.
+
+    Returns:
+        Number of scheduled triggers and the next fire time
+    """
+    require_self_or_service(request.user_id, claims)
+    strategy = _build_notification_strategy(request)
+    scheduler = get_notification_scheduler()
+    scheduled = scheduler.register(request.user_id, strategy)
+
+    return {
+        "user_id": request.user_id,
+        "habit_id": strategy.habit_id,
+        "scheduled_triggers": scheduled,
+        "event_triggers": len(strategy.triggers) - scheduled,
+        "next_fire_at": scheduler.next_fire_at(),
+    }
+
+
+@router.post("/notifications/due", response_model=dict)
+async def get_due_notifications(
+    request: DueNotificationsRequest,
+    _: dict = Depends(require_service_role),
+):
+    """
+    Pop every notification due now (delivery worker only: service role).
+
+    Only triggers whose time has come are evaluated, so a poll costs the
+    same however many users are scheduled.
+
+    Returns:
+        Notifications to send and scheduler stats
+    """
+    scheduler = get_notification_scheduler()
+    deliveries = scheduler.due(request.now)
+
+    return {
+        "notifications": [_delivery_to_dict(d) for d in deliveries],
+        "count": len(deliveries),
+        "stats": {
+            "registered_habits": scheduler.stats.registered_habits,
+            "scheduled_triggers": scheduler.stats.scheduled_triggers,
+            "delivered": scheduler.stats.delivered,
+            "suppressed": scheduler.stats.suppressed,
+        },
+    }
+
+
+@router.post("/notifications/event", response_model=dict)
+async def fire_notification_event(
+    request: NotificationEventRequest,
+    claims: dict = Depends(get_token_claims),
+):
+    """
+    Evaluate a user's event-driven triggers (e.g. arrived at the gym).
+
+    Returns:
+        Notifications to send now
+    """
+    require_self_or_service(request.user_id, claims)
+    deliveries = get_notification_scheduler().fire_event(
+        request.user_id, request.context, request.now
+    )
+    return {
+        "notifications": [_delivery_to_dict(d) for d in deliveries],
+        "count": len(deliveries),
+    }
+
+
+@router.post("/notifications/completed", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_habit_completed(
+    request: HabitCompletedRequest,
+    claims: dict = Depends(get_token_claims),
+):
+    """Suppress today's remaining reminders for a completed habit"""
+    require_self_or_service(request.user_id, claims)
+    get_notification_scheduler().mark_completed(
+        request.user_id, request.habit_id, request.completed_on
+    )
+
+
+def _build_notification_strategy(request: NotificationStrategyRequest):
     notification_engine = get_notification_engine()
 
     # Parse typical completion time if provided
@@ -244,7 +455,7 @@ async def create_notification_strategy(request: NotificationStrategyRequest):
             )
 
     try:
-        strategy = notification_engine.create_notification_strategy(
+        return notification_engine.create_notification_strategy(
             habit_id=request.habit_id,
             habit_name=request.habit_name,
             habit_type=request.habit_type,
@@ -261,32 +472,27 @@ async def create_notification_strategy(request: NotificationStrategyRequest):
             detail=f"Error creating notification strategy: {str(e)}",
         )
 
-    # Format triggers
-    triggers_formatted = [
-        {
-            "context": t.context.value,
-            "timing": t.timing.value,
-            "priority": t.priority,
-            "title": t.title,
-            "message": t.message,
-            "action_text": t.action_text,
-            "trigger_conditions": t.trigger_conditions,
-            "reasoning": t.reasoning,
-            "expected_engagement": t.expected_engagement,
-        }
-        for t in strategy.triggers
-    ]
 
+def _trigger_to_dict(t) -> dict:
     return {
-        "habit_id": strategy.habit_id,
-        "habit_name": strategy.habit_name,
-        "triggers": triggers_formatted,
-        "max_daily_notifications": strategy.max_daily_notifications,
-        "quiet_hours": {
-            "start": strategy.quiet_hours[0].isoformat(),
-            "end": strategy.quiet_hours[1].isoformat(),
-        },
-        "research_note": "Context-aware interventions are 2.8x more effective than scheduled reminders",
+        "context": t.context.value,
+        "timing": t.timing.value,
+        "priority": t.priority,
+        "title": t.title,
+        "message": t.message,
+        "action_text": t.action_text,
+        "trigger_conditions": t.trigger_conditions,
+        "reasoning": t.reasoning,
+        "expected_engagement": t.expected_engagement,
+    }
+
+
+def _delivery_to_dict(delivery) -> dict:
+    return {
+        "user_id": delivery.user_id,
+        "habit_id": delivery.habit_id,
+        "fire_at": delivery.fire_at.isoformat(),
+        **_trigger_to_dict(delivery.trigger),
     }
 
 
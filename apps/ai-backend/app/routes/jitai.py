@@ -8,17 +8,29 @@ interventions at optimal moments based on:
 - Opportunity (context allows action)
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Request
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request
+from pydantic import BaseModel, Field
 from typing import Literal
 import logging
 from datetime import datetime, timedelta
-import random
 
-from app.core.auth import get_current_user_id
+from app.core.auth import get_current_user_id, get_token_claims, is_service, require_service_role
+from app.core.config import settings
 from app.core.rate_limit import limiter
-from app.core.llm import get_smart_llm
-from langchain_core.messages import HumanMessage, SystemMessage
+from app.jitai import (
+    JITAIEvent,
+    JITAIEventType,
+    epoch_day,
+    evaluate_users,
+    get_jitai_feature_store,
+)
+from app.jitai.templates import (
+    ACTIONS,
+    context_bucket,
+    count_phrase,
+    get_template_bank,
+    get_template_generator,
+)
 
 logger = logging.getLogger("fitos-ai")
 router = APIRouter()
@@ -41,6 +53,40 @@ class Intervention(BaseModel):
     action: dict | None = None
 
 
+class JITAIEventIn(BaseModel):
+    """User event that updates JITAI features"""
+    user_id: str
+    event_type: JITAIEventType
+    timestamp: datetime | None = None  # Defaults to now
+    value: float | None = None  # HRV in ms for hrv_reading
+
+
+class JITAIEventBatch(BaseModel):
+    """Events in the order they happened"""
+    events: list[JITAIEventIn] = Field(..., max_length=10000)
+
+
+class EvaluateRequest(BaseModel):
+    """Batch evaluation across all users"""
+    threshold: float | None = Field(None, ge=0.0, le=1.0)  # Defaults to INTERVENTION_THRESHOLD
+    limit: int = Field(500, ge=1, le=10000)
+
+
+class InterventionCandidate(BaseModel):
+    """A user whose context warrants an intervention now"""
+    user_id: str
+    context: JITAIContext
+    score: float
+    priority: int
+    intervention_type: Literal["nudge", "reminder", "celebration", "concern", "insight"]
+
+
+class EvaluateResponse(BaseModel):
+    evaluated: int
+    threshold: float
+    candidates: list[InterventionCandidate]
+
+
 @router.get("/context/{user_id}", response_model=JITAIContext)
 @limiter.limit("30/minute")
 async def get_jitai_context(request: Request, user_id: str, current_user_id: str = Depends(get_current_user_id)):
@@ -68,24 +114,15 @@ async def get_jitai_context(request: Request, user_id: str, current_user_id: str
     try:
         logger.info(f"Calculating JITAI context for user {user_id}")
 
-        # In production, fetch real data from Supabase:
-        # - workout_sessions (missed workouts)
-        # - wearable_data (HRV, sleep)
-        # - messages (sentiment analysis)
-        # - app_usage_logs (engagement)
-
-        # Mock calculation for now
-        vulnerability = calculate_vulnerability(user_id)
-        receptivity = calculate_receptivity(user_id)
-        opportunity = calculate_opportunity(user_id)
-
-        context = JITAIContext(
-            vulnerability=vulnerability,
-            receptivity=receptivity,
-            opportunity=opportunity
-        )
+        # Features are kept up to date by /events; users without events
+        # get neutral defaults
+        scores = evaluate_users(user_ids=[user_id])
+        context = _context_at(scores, 0)
 
-        logger.info(f"JITAI scores - V:{vulnerability:.2f} R:{receptivity:.2f} O:{opportunity:.2f}")
+        logger.info(
+            f"JITAI scores - V:{context.vulnerability:.2f} "
+            f"R:{context.receptivity:.2f} O:{context.opportunity:.2f}"
+        )
 
         return context
 
@@ -94,17 +131,85 @@ async def get_jitai_context(request: Request, user_id: str, current_user_id: str
         raise HTTPException(status_code=500, detail="Failed to calculate context")
 
 
+@router.post("/events")
+@limiter.limit("120/minute")
+async def ingest_events(request: Request, batch: JITAIEventBatch, claims: dict = Depends(get_token_claims)):
+    """
+    Update JITAI features from user events.
+
+    Events (workout started/completed/missed, HRV readings, app opens,
+    intervention responses) are applied incrementally; nothing is
+    recomputed from history. Users may only send their own events;
+    services may send anyone's.
+    """
+    if not is_service(claims) and any(e.user_id != claims.get("sub") for e in batch.events):
+        raise HTTPException(status_code=403, detail="Events must be for the authenticated user")
+    for event in batch.events:
+        if event.event_type == JITAIEventType.HRV_READING and event.value is None:
+            raise HTTPException(status_code=400, detail="hrv_reading events require a value")
+
+    now = datetime.now()
+    applied = get_jitai_feature_store().ingest(
+        JITAIEvent(e.user_id, e.event_type, e.timestamp or now, e.value)
+        for e in batch.events
+    )
+    return {"success": True, "applied": applied}
+
+
+@router.post("/evaluate", response_model=EvaluateResponse)
+@limiter.limit("10/minute")
+async def evaluate_interventions(request: Request, body: EvaluateRequest, _: dict = Depends(require_service_role)):
+    """
+    Score every user and return those due an intervention.
+
+    Intended for the intervention loop (every few minutes; service role
+    only): all users are scored in one vectorized pass and compared
+    against the threshold. Users at MAX_DAILY_INTERVENTIONS or mid-workout
+    are skipped.
+    """
+    try:
+        threshold = settings.INTERVENTION_THRESHOLD if body.threshold is None else body.threshold
+        scores = evaluate_users(get_jitai_feature_store())
+        rows = scores.candidates(threshold)[:body.limit]
+
+        candidates = []
+        for row in rows:
+            context = _context_at(scores, row)
+            candidates.append(InterventionCandidate(
+                user_id=scores.user_ids[row],
+                context=context,
+                score=float(scores.score[row]),
+                priority=int(scores.priority[row]),
+                intervention_type=determine_intervention_type(context),
+            ))
+
+        logger.info(f"JITAI evaluation: {len(candidates)} of {len(scores)} users above {threshold:.2f}")
+        return EvaluateResponse(evaluated=len(scores), threshold=threshold, candidates=candidates)
+
+    except Exception as e:
+        logger.error(f"Error evaluating interventions: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to evaluate interventions")
+
+
 @router.post("/generate", response_model=Intervention)
 @limiter.limit("20/minute")
-async def generate_intervention(request: Request, user_id: str, context: JITAIContext, current_user_id: str = Depends(get_current_user_id)):
+async def generate_intervention(
+    request: Request,
+    user_id: str,
+    context: JITAIContext,
+    background_tasks: BackgroundTasks,
+    voice: Literal["professional", "energetic", "calm"] = "professional",
+    first_name: str | None = None,
+    current_user_id: str = Depends(get_current_user_id),
+):
     """
-    Generate a personalized intervention using AI.
+    Generate a personalized intervention from the template bank.
 
-    Uses LLM to craft intervention based on:
-    - User's training history
-    - Current context scores
-    - Past intervention effectiveness
-    - Trainer's coaching style (if available)
+    Templates are keyed by intervention type, context bucket and the
+    trainer's coaching voice, and filled in locally with the user's recent
+    training. The best-performing templates (from /log-response) are
+    favoured. The LLM only runs when a context bucket has no templates yet,
+    in the background, while the voice's general templates are served.
 
     Intervention types:
     - nudge: Gentle reminder about upcoming workout
@@ -118,74 +223,44 @@ async def generate_intervention(request: Request, user_id: str, context: JITAICo
 
         # Determine intervention type based on context
         intervention_type = determine_intervention_type(context)
+        bucket = context_bucket(context.vulnerability, context.receptivity)
+
+        bank = get_template_bank()
+        generator = get_template_generator()
+        template, exact = bank.select(intervention_type, bucket, voice)
+        if template is None:
+            await generator.fill(intervention_type, bucket, voice)
+            template, exact = bank.select(intervention_type, bucket, voice)
+            if template is None:
+                raise RuntimeError(f"No {intervention_type} templates available")
+        if not exact:
+            background_tasks.add_task(generator.fill, intervention_type, bucket, voice)
+
+        # Slots from the user's last 7 days
+        features = get_jitai_feature_store().snapshot([user_id])
+        missed, completed = features.window_counts(epoch_day(datetime.now()))
+        title, message = template.render({
+            "name": first_name or "there",
+            "missed_workouts": count_phrase(int(missed[0])),
+            "completed_workouts": count_phrase(int(completed[0])),
+        })
 
-        # Fetch user context (mock for now)
-        user_data = {
-            "name": "Client",
-            "current_streak": 3,
-            "missed_workouts": 2,
-            "goals": ["lose_weight", "build_muscle"],
-            "recent_wins": ["Completed all sets last workout", "Hit protein target 5 days this week"]
-        }
-
-        # Generate personalized message using LLM
-        llm = get_smart_llm()
-
-        system_prompt = f"""You are crafting a personalized intervention for a fitness app user.
-
-Intervention Type: {intervention_type}
-User Context:
-- Current Streak: {user_data['current_streak']} days
-- Recent Missed Workouts: {user_data['missed_workouts']}
-- Goals: {', '.join(user_data['goals'])}
-- Recent Wins: {', '.join(user_data['recent_wins'])}
-
-Context Scores:
-- Vulnerability: {context.vulnerability:.2f} (1 = high risk of skipping)
-- Receptivity: {context.receptivity:.2f} (1 = very receptive)
-- Opportunity: {context.opportunity:.2f} (1 = great timing)
-
-Guidelines:
-1. Keep message under 50 words
-2. Be warm and encouraging, never guilt-inducing
-3. Reference specific recent wins when possible
-4. Provide one clear micro-action if appropriate
-5. Avoid clichés and toxic positivity
-
-Generate:
-- title: Short title (4-6 words)
-- message: Main intervention text
-- action_label: Optional CTA button text
-
-Format as JSON:
-{{
-  "title": "Your workout is ready",
-  "message": "You crushed last session! Today's workout builds on that momentum. Ready?",
-  "action_label": "Start Workout"
-}}
-"""
-
-        user_message = f"Generate a {intervention_type} intervention for this user."
-
-        response = llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_message)
-        ])
-
-        # Parse LLM response (simplified - should use structured output)
         intervention = Intervention(
             id=f"int_{user_id}_{datetime.utcnow().timestamp()}",
             type=intervention_type,
-            title=f"Time for your workout!",
-            message="You've been consistent this week. Keep that momentum going with today's session!",
+            title=title,
+            message=message,
             priority=calculate_priority(context),
             action={
-                "label": "Start Workout",
-                "route": "/tabs/workouts"
+                "label": template.action_label,
+                "route": ACTIONS[intervention_type][1]
             }
         )
 
-        logger.info(f"Generated {intervention_type} intervention")
+        bank.issue(intervention.id, template)
+        get_jitai_feature_store().record(user_id, JITAIEventType.INTERVENTION_SENT)
+
+        logger.info(f"Generated {intervention_type} intervention from template {template.template_id}")
 
         return intervention
 
@@ -194,6 +269,29 @@ Format as JSON:
         raise HTTPException(status_code=500, detail="Failed to generate intervention")
 
 
+@router.post("/templates/refresh")
+@limiter.limit("5/minute")
+async def refresh_templates(request: Request, max_keys: int = 20, current_user_id: str = Depends(get_current_user_id)):
+    """
+    Scheduled refresh of the intervention template bank.
+
+    Generated templates that are stale or clearly underperform the best
+    template for their key are replaced with new LLM-written ones.
+    """
+    try:
+        return await get_template_generator().refresh(max_keys=max_keys)
+    except Exception as e:
+        logger.error(f"Error refreshing templates: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to refresh templates")
+
+
+@router.get("/templates/stats")
+@limiter.limit("30/minute")
+async def get_template_stats(request: Request, current_user_id: str = Depends(get_current_user_id)):
+    """Engagement per template, as used for template selection"""
+    return {"templates": get_template_bank().stats()}
+
+
 @router.post("/log-response")
 @limiter.limit("60/minute")
 async def log_intervention_response(
@@ -217,14 +315,20 @@ async def log_intervention_response(
     try:
         logger.info(f"Logging intervention response: {intervention_id} -> {response}")
 
-        # In production:
-        # 1. Store in database
-        # 2. Update user's receptivity model
-        # 3. Train intervention effectiveness model
+        # Template effectiveness drives which template is sent next time
+        template_id = get_template_bank().record_response(intervention_id, response == "engaged")
+
+        # Feeds the response rate used for receptivity
+        get_jitai_feature_store().record(
+            user_id,
+            JITAIEventType.INTERVENTION_RESPONSE,
+            value=1.0 if response == "engaged" else 0.0,
+        )
 
         return {
             "success": True,
             "intervention_id": intervention_id,
+            "template_id": template_id,
             "response": response
         }
 
@@ -235,29 +339,12 @@ async def log_intervention_response(
 
 # Helper functions
 
-def calculate_vulnerability(user_id: str) -> float:
-    """Calculate risk of non-adherence (0-1)"""
-    # Mock implementation - replace with real data
-    # High vulnerability = many missed workouts, declining trend
-    return random.uniform(0.3, 0.8)
-
-
-def calculate_receptivity(user_id: str) -> float:
-    """Calculate willingness to engage (0-1)"""
-    # Mock implementation - replace with real data
-    # Consider time of day, recent app usage, notification history
-    hour = datetime.now().hour
-    if 6 <= hour <= 10 or 16 <= hour <= 20:  # Prime workout hours
-        return random.uniform(0.7, 0.95)
-    else:
-        return random.uniform(0.3, 0.6)
-
-
-def calculate_opportunity(user_id: str) -> float:
-    """Calculate contextual opportunity (0-1)"""
-    # Mock implementation - replace with real data
-    # High opportunity = near workout time, phone active, good location
-    return random.uniform(0.5, 0.9)
+def _context_at(scores, row: int) -> JITAIContext:
+    return JITAIContext(
+        vulnerability=float(scores.vulnerability[row]),
+        receptivity=float(scores.receptivity[row]),
+        opportunity=float(scores.opportunity[row]),
+    )
 
 
 def determine_intervention_type(context: JITAIContext) -> Literal["nudge", "reminder", "celebration", "concern", "insight"]:
@@ -7,11 +7,12 @@ chrono-nutrition, and workout nutrition.
 Sprint 36: Nutrition Intelligence
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import date, time as time_type
 
+from app.core.auth import get_current_user_id, require_client_access
 from app.nutrition_intelligence.expenditure import (
     get_expenditure_calculator,
     WeightDataPoint,
@@ -20,6 +21,8 @@ from app.nutrition_intelligence.expenditure import (
     ActivityLevel,
     Sex,
 )
+from app.nutrition_intelligence.tdee_engine import get_tdee_engine
+from app.nutrition_intelligence.nightly import get_nutrition_state_store
 from app.nutrition_intelligence.adaptation import (
     get_adaptation_detector,
     AdaptationStatus,
@@ -139,6 +142,33 @@ async def health_check():
     }
 
 
+@router.get("/state/{client_id}", response_model=dict)
+async def get_precomputed_state(
+    client_id: str,
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    Precomputed nutrition intelligence state for a client.
+
+    Written by the nightly recompute (app.nutrition_intelligence.nightly):
+    adaptive TDEE with 95% band, metabolic adaptation severity, diet-break
+    recommendation and a 4-week weight prediction at current intake.
+    Readable by the client and their trainer.
+
+    Returns:
+        Latest state, or 404 if the client hasn't been processed yet
+    """
+    store = get_nutrition_state_store()
+    require_client_access(user_id, client_id, store.supabase)
+    state = store.get(client_id)
+    if state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No precomputed nutrition state for this client yet",
+        )
+    return state
+
+
 @router.post("/expenditure/initial", response_model=dict)
 async def calculate_initial_expenditure(request: InitialExpenditureRequest):
     """
@@ -248,6 +278,57 @@ async def calculate_adaptive_expenditure(request: AdaptiveExpenditureRequest):
     }
 
 
+@router.post("/expenditure/adaptive/history", response_model=dict)
+async def get_adaptive_expenditure_history(request: AdaptiveExpenditureRequest):
+    """
+    Daily adaptive TDEE estimates with 95% confidence bands.
+
+    Runs the Kalman-filtered weight-trend model over the full history in one
+    pass and returns one estimate per calendar day from the first log.
+
+    Returns:
+        Daily dates, TDEE, confidence band, trend weight and weekly trend
+    """
+    weight_data = [
+        WeightDataPoint(date=w.date, weight_kg=w.weight_kg, source=w.source)
+        for w in request.weight_data
+    ]
+    intake_data = [
+        IntakeDataPoint(
+            date=i.date,
+            calories=i.calories,
+            protein_g=i.protein_g,
+            carbs_g=i.carbs_g,
+            fat_g=i.fat_g,
+            confidence=i.confidence,
+        )
+        for i in request.intake_data
+    ]
+
+    try:
+        history = get_tdee_engine().history(weight_data, intake_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error calculating expenditure history: {str(e)}",
+        )
+
+    return {
+        "dates": [d.isoformat() for d in history.dates],
+        "tdee_kcal": history.tdee_kcal.round().tolist(),
+        "tdee_lower_kcal": history.tdee_lower_kcal.round().tolist(),
+        "tdee_upper_kcal": history.tdee_upper_kcal.round().tolist(),
+        "trend_weight_kg": history.trend_weight_kg.round(2).tolist(),
+        "weight_trend_kg_per_week": history.weight_trend_kg_per_week.round(2).tolist(),
+        "days_of_data": history.days_of_data,
+    }
+
+
 @router.post("/expenditure/predict", response_model=dict)
 async def predict_weight_change(request: WeightPredictionRequest):
     """
@@ -328,8 +409,8 @@ async def detect_metabolic_adaptation(request: AdaptationRequest):
 
 @router.post("/adaptation/diet-break-calories", response_model=dict)
 async def calculate_diet_break_calories(
-    predicted_tdee: float = Field(..., gt=0, le=10000),
-    current_deficit_calories: float = Field(..., gt=0, le=5000),
+    predicted_tdee: float = Query(..., gt=0, le=10000),
+    current_deficit_calories: float = Query(..., gt=0, le=5000),
 ):
     """
     Calculate calories for diet break at maintenance.
@@ -7,12 +7,19 @@ Endpoints for managing outcome-based pricing tiers, goals, and verifications.
 from fastapi import APIRouter, HTTPException, Depends, Body
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from decimal import Decimal
 
 from app.core.auth import get_current_user, require_trainer
 from app.core.database import get_supabase_client
-from app.outcome_verification import OutcomeVerifier
+from app.outcome_verification import (
+    BulkOutcomeVerifier,
+    ConsistencyVerificationService,
+    OutcomeVerifier,
+    StrengthVerificationService,
+    WeightVerificationService,
+    get_activity_bitmap_store,
+)
 
 router = APIRouter(prefix="/outcome-pricing", tags=["outcome-pricing"])
 
@@ -51,6 +58,14 @@ class VerifyGoalRequest(BaseModel):
     photo_urls: Optional[List[str]] = None
 
 
+class RecordActivityRequest(BaseModel):
+    """A workout or nutrition log that was just saved, deleted or voided"""
+    client_id: str
+    activity_type: str = Field(..., regex="^(workout|nutrition)$")
+    activity_id: str
+    activity_date: date
+
+
 class GoalProgressResponse(BaseModel):
     """Response with goal progress details"""
     goal_id: str
@@ -407,6 +422,37 @@ async def verify_goal_progress(
     )
 
 
+@router.post("/verifications/bulk")
+async def bulk_verify_goals(
+    dry_run: bool = False,
+    current_user: dict = Depends(require_trainer),
+    supabase = Depends(get_supabase_client)
+):
+    """
+    Verify all of the trainer's active goals in one run.
+
+    Intended for the monthly billing cycle: activity data is prefetched per
+    batch of clients and verifications are saved with one insert per batch.
+    Body comp and custom goals still need manual verification and are skipped.
+
+    Requires: Trainer role
+    """
+    verifier = BulkOutcomeVerifier(supabase)
+    try:
+        report = await verifier.verify_active_goals(
+            trainer_id=current_user['id'],
+            dry_run=dry_run
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk verification failed: {str(e)}")
+
+    return {
+        'dry_run': dry_run,
+        **report.to_dict(),
+        'manual_review_goal_ids': [r.goal_id for r in report.results if r.requires_manual_review]
+    }
+
+
 @router.get("/goals/{goal_id}/verifications")
 async def list_verifications(
     goal_id: str,
@@ -509,6 +555,153 @@ async def get_client_analytics(
     }
 
 
+@router.get("/analytics/client/{client_id}/strength")
+async def get_client_strength_analytics(
+    client_id: str,
+    since: Optional[date] = None,
+    current_user: dict = Depends(get_current_user),
+    supabase = Depends(get_supabase_client)
+):
+    """
+    Per-lift strength progression for a client.
+
+    Estimated 1RM, progression rate, PRs and anomaly scores for every lift,
+    computed in one pass over the client's logged sets (default: last 180 days).
+    """
+    # Verify access
+    if current_user.get('role') != 'trainer' and current_user['id'] != client_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    since = since or (date.today() - timedelta(days=180))
+    analytics = await StrengthVerificationService(supabase).analyze_client(
+        client_id=client_id,
+        since_date=since.isoformat()
+    )
+
+    return {
+        'client_id': client_id,
+        'since': since.isoformat(),
+        'total_sets': len(analytics),
+        'lifts': [lift.to_dict() for lift in analytics.lifts.values()]
+    }
+
+
+@router.get("/analytics/client/{client_id}/weight")
+async def get_client_weight_trend(
+    client_id: str,
+    since: Optional[date] = None,
+    current_user: dict = Depends(get_current_user),
+    supabase = Depends(get_supabase_client)
+):
+    """
+    Weight trend for a client.
+
+    Outlier-filtered EWMA trend, weekly rate and flagged weigh-ins over the
+    client's weigh-ins (default: last 365 days).
+    """
+    # Verify access
+    if current_user.get('role') != 'trainer' and current_user['id'] != client_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    since = since or (date.today() - timedelta(days=365))
+    trend = await WeightVerificationService(supabase).analyze_client(
+        client_id=client_id,
+        since=since
+    )
+
+    return {
+        'client_id': client_id,
+        'since': since.isoformat(),
+        'trend': trend.to_dict() if trend else None
+    }
+
+
+@router.get("/analytics/client/{client_id}/consistency")
+async def get_client_consistency(
+    client_id: str,
+    activity_type: str = "workout",
+    target_per_week: int = 3,
+    since: Optional[date] = None,
+    current_user: dict = Depends(get_current_user),
+    supabase = Depends(get_supabase_client)
+):
+    """
+    Consistent weeks, streaks and adherence for a client.
+
+    Answered from the client's activity bitmap (default: last 12 weeks);
+    only activity since the last sync is read from the database.
+    """
+    # Verify access
+    if current_user.get('role') != 'trainer' and current_user['id'] != client_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    if activity_type not in ('workout', 'nutrition'):
+        raise HTTPException(status_code=400, detail=f"Unknown activity type: {activity_type}")
+
+    since = since or (date.today() - timedelta(weeks=12))
+    summary = await ConsistencyVerificationService(supabase).summarize(
+        client_id=client_id,
+        activity_type=activity_type,
+        since=since,
+        target_per_week=target_per_week
+    )
+
+    return {
+        'client_id': client_id,
+        'activity_type': activity_type,
+        'since': since.isoformat(),
+        'target_per_week': target_per_week,
+        **summary.to_dict()
+    }
+
+
+@router.post("/activity", status_code=204)
+async def record_activity(
+    request: RecordActivityRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Mark a workout or nutrition log in the client's activity bitmap.
+
+    Called when a log is saved, so consistency metrics stay current between
+    syncs; recording the same activity twice has no effect.
+
+    Requires: the client themselves or a trainer
+    """
+    if current_user.get('role') != 'trainer' and current_user['id'] != request.client_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    get_activity_bitmap_store().record(
+        request.client_id,
+        request.activity_type,
+        [{'id': request.activity_id, 'date': request.activity_date}]
+    )
+
+
+@router.delete("/activity", status_code=204)
+async def remove_activity(
+    request: RecordActivityRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Clear a deleted or voided workout or nutrition log from the client's
+    activity bitmap.
+
+    The day is re-read on the next sync, so it stays active if the client
+    logged other activity that day.
+
+    Requires: the client themselves or a trainer
+    """
+    if current_user.get('role') != 'trainer' and current_user['id'] != request.client_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    get_activity_bitmap_store().remove(
+        request.client_id,
+        request.activity_type,
+        request.activity_id,
+        request.activity_date
+    )
+
+
 # =============================================================================
 # MILESTONE ENDPOINTS
 # =============================================================================
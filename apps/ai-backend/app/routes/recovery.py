@@ -7,7 +7,7 @@ Sprint 34: HRV Recovery System
 """
 
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Query, Depends, Request
 from pydantic import BaseModel, Field
 
@@ -25,16 +25,26 @@ from app.recovery.recovery_score import (
     RecoveryScore,
     get_recovery_calculator,
 )
+from app.recovery.adjusted_workout import serialize_workout
 from app.recovery.intensity_adjuster import (
     IntensityAdjuster,
     IntensityRecommendation,
     get_intensity_adjuster,
 )
+from app.wearables.timeseries_store import (
+    Granularity,
+    WearableMetric,
+    from_epoch_seconds,
+    get_wearable_store,
+)
 from app.workout_gen.generator import Workout, Exercise
 
 
 router = APIRouter(prefix="/recovery", tags=["recovery"])
 
+# The planned workout is echoed back without rest periods
+ORIGINAL_EXERCISE_FIELDS = ("name", "sets", "reps", "rpe")
+
 
 # Request/Response Models
 
@@ -102,6 +112,52 @@ class OvertTrainingCheckRequest(BaseModel):
     )
 
 
+class WearableSampleRequest(BaseModel):
+    """Single wearable sample"""
+
+    timestamp: datetime
+    value: float
+
+
+class WearableSyncRequest(BaseModel):
+    """Batch of samples for one metric from a wearable sync"""
+
+    metric: WearableMetric
+    samples: list[WearableSampleRequest] = Field(..., min_length=1)
+
+
+def _trend_response(trend: HRVTrend) -> dict:
+    """Serialize an HRVTrend for API responses"""
+    return {
+        "success": True,
+        "current_value": trend.current_value,
+        "baseline": {
+            "mean_rmssd": trend.baseline.mean_rmssd,
+            "std_rmssd": trend.baseline.std_rmssd,
+            "coefficient_of_variation": trend.baseline.coefficient_of_variation,
+            "sample_size": trend.baseline.sample_size,
+            "normal_range": trend.baseline.normal_range,
+        },
+        "percent_from_baseline": trend.percent_from_baseline,
+        "recovery_state": trend.recovery_state.value,
+        "confidence": trend.confidence,
+        "trend_direction": trend.trend_direction,
+        "days_in_state": trend.days_in_state,
+        "training_recommendation": trend.training_recommendation,
+        "notes": trend.notes,
+        "visualization": {
+            "last_7_days": [
+                {"timestamp": d.timestamp.isoformat(), "rmssd": d.rmssd_ms}
+                for d in trend.last_7_days
+            ],
+            "last_30_days": [
+                {"timestamp": d.timestamp.isoformat(), "rmssd": d.rmssd_ms}
+                for d in trend.last_30_days
+            ],
+        },
+    }
+
+
 # Endpoints
 
 
@@ -140,34 +196,72 @@ async def analyze_hrv_trend(request: Request, body: HRVTrendRequest, user_id: st
         # Analyze trend
         trend = analyzer.analyze_trend(current, historical)
 
-        return {
-            "success": True,
-            "current_value": trend.current_value,
-            "baseline": {
-                "mean_rmssd": trend.baseline.mean_rmssd,
-                "std_rmssd": trend.baseline.std_rmssd,
-                "coefficient_of_variation": trend.baseline.coefficient_of_variation,
-                "sample_size": trend.baseline.sample_size,
-                "normal_range": trend.baseline.normal_range,
-            },
-            "percent_from_baseline": trend.percent_from_baseline,
-            "recovery_state": trend.recovery_state.value,
-            "confidence": trend.confidence,
-            "trend_direction": trend.trend_direction,
-            "days_in_state": trend.days_in_state,
-            "training_recommendation": trend.training_recommendation,
-            "notes": trend.notes,
-            "visualization": {
-                "last_7_days": [
-                    {"timestamp": d.timestamp.isoformat(), "rmssd": d.rmssd_ms}
-                    for d in trend.last_7_days
-                ],
-                "last_30_days": [
-                    {"timestamp": d.timestamp.isoformat(), "rmssd": d.rmssd_ms}
-                    for d in trend.last_30_days
-                ],
-            },
-        }
+        return _trend_response(trend)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"HRV analysis failed: {str(e)}")
+
+
+@router.post("/wearables/sync")
+@limiter.limit("60/minute")
+async def sync_wearable_data(request: Request, body: WearableSyncRequest, user_id: str = Depends(get_current_user_id)):
+    """
+    Store a batch of wearable samples (HRV, resting HR, sleep, steps, weight).
+
+    Samples are appended to the user's time-series store; daily and weekly
+    rollups are updated at ingest so later reads are pre-aggregated.
+
+    Returns:
+        Number of samples written
+    """
+    try:
+        written = get_wearable_store().append(
+            user_id,
+            body.metric,
+            [s.timestamp for s in body.samples],
+            [s.value for s in body.samples],
+        )
+        return {"success": True, "metric": body.metric.value, "samples_written": written}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Wearable sync failed: {str(e)}")
+
+
+@router.get("/hrv/analyze-stored")
+@limiter.limit("30/minute")
+async def analyze_stored_hrv_trend(
+    request: Request,
+    days: int = Query(30, ge=8, le=365, description="Days of stored history to use"),
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    Analyze HRV trend from the user's stored wearable data.
+
+    Uses one data point per day (daily mean RMSSD from the store's rollups);
+    the most recent day is treated as the current measurement.
+
+    Returns:
+        Same shape as /hrv/analyze
+    """
+    end = datetime.now()
+    block = get_wearable_store().read_rollups(
+        user_id, WearableMetric.HRV, end - timedelta(days=days), end, Granularity.DAY
+    )
+    if len(block) < 8:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Need at least 8 days of stored HRV data, found {len(block)}",
+        )
+
+    try:
+        daily = [
+            HRVDataPoint(timestamp=from_epoch_seconds(ts), rmssd_ms=value)
+            for ts, value in zip(block.last_ts.tolist(), block.mean.tolist())
+        ]
+        trend = get_hrv_analyzer().analyze_trend(daily[-1], daily[:-1])
+        return _trend_response(trend)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"HRV analysis failed: {str(e)}")
@@ -259,7 +353,12 @@ async def calculate_recovery_score(request: Request, body: RecoveryScoreRequest,
 
 @router.post("/adjust-workout")
 @limiter.limit("30/minute")
-async def adjust_workout(request: Request, body: WorkoutAdjustmentRequest, user_id: str = Depends(get_current_user_id)):
+async def adjust_workout(
+    request: Request,
+    body: WorkoutAdjustmentRequest,
+    compact: bool = Query(False, description="Return only the adjusted workout's changes"),
+    user_id: str = Depends(get_current_user_id),
+):
     """
     Auto-adjust workout based on recovery state.
 
@@ -270,6 +369,9 @@ async def adjust_workout(request: Request, body: WorkoutAdjustmentRequest, user_
     - POOR: Reduce volume 30-40%, reduce RPE
     - CRITICAL: Active recovery only
 
+    With compact=true the adjusted workout is returned as a delta over the
+    original (changed exercise fields by index, truncation, renamed session).
+
     Returns:
         Original and adjusted workout with explanation
     """
@@ -320,31 +422,14 @@ async def adjust_workout(request: Request, body: WorkoutAdjustmentRequest, user_
                 "category": recommendation.recovery_category.value,
                 "adjustment_factor": recommendation.adjustment_factor,
             },
-            "original_workout": {
-                "name": recommendation.original_workout.name,
-                "exercises": [
-                    {
-                        "name": e.name,
-                        "sets": e.sets,
-                        "reps": e.reps,
-                        "rpe": e.rpe,
-                    }
-                    for e in recommendation.original_workout.exercises
-                ],
-            },
-            "adjusted_workout": {
-                "name": recommendation.adjusted_workout.name,
-                "exercises": [
-                    {
-                        "name": e.name,
-                        "sets": e.sets,
-                        "reps": e.reps,
-                        "rpe": e.rpe,
-                        "rest_seconds": e.rest_seconds,
-                    }
-                    for e in recommendation.adjusted_workout.exercises
-                ],
-            },
+            "original_workout": serialize_workout(
+                recommendation.original_workout, ORIGINAL_EXERCISE_FIELDS
+            ),
+            "adjusted_workout": (
+                recommendation.adjusted_workout.delta()
+                if compact
+                else serialize_workout(recommendation.adjusted_workout)
+            ),
             "changes": {
                 "sets_reduced": recommendation.sets_reduced,
                 "exercises_removed": recommendation.exercises_removed,
@@ -419,6 +504,7 @@ async def health_check():
             "recovery_score": True,
             "auto_adjustment": True,
             "overtraining_detection": True,
+            "wearable_store": True,
         },
         "research_based": {
             "hrv_weighting": "Plews et al., 2013",
@@ -6,6 +6,7 @@ import logging
 
 from app.core.auth import get_current_user_id
 from app.core.rate_limit import limiter
+from app.voice.commands import match_command
 import asyncio
 import json
 
@@ -129,71 +130,16 @@ def parse_workout_intent(transcript: str) -> dict | None:
     """
     Parse workout-specific intents from transcript.
 
-    Supported commands:
+    Supported commands (see app/voice/commands.GRAMMAR):
     - "10 reps at 185" -> log_set
     - "repeat" -> repeat_set
     - "skip" -> skip_exercise
     - "next" -> next_exercise
     - "start timer" -> start_timer
-    """
-    lower = transcript.lower().strip()
-
-    # Repeat command
-    if lower in ["repeat", "same"]:
-        return {
-            "action": "repeat_set",
-            "parameters": {},
-            "confidence": 1.0
-        }
-
-    # Skip exercise
-    if "skip" in lower:
-        return {
-            "action": "skip_exercise",
-            "parameters": {},
-            "confidence": 0.95
-        }
-
-    # Next exercise
-    if any(word in lower for word in ["next", "done", "complete"]):
-        return {
-            "action": "next_exercise",
-            "parameters": {},
-            "confidence": 0.9
-        }
-
-    # Timer commands
-    if "start" in lower and ("timer" in lower or "rest" in lower):
-        return {
-            "action": "start_timer",
-            "parameters": {},
-            "confidence": 0.9
-        }
-
-    # Log set patterns
-    import re
-    patterns = [
-        r"(\d+)\s*(?:reps?)?\s*(?:at\s*)?(\d+)",  # "10 reps at 185" or "10 at 185"
-        r"(\d+)\s*for\s*(\d+)",  # "185 for 10"
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, lower)
-        if match:
-            nums = [int(n) for n in match.groups()]
-            # Heuristic: larger number is usually weight
-            weight = max(nums)
-            reps = min(nums)
-
-            return {
-                "action": "log_set",
-                "parameters": {
-                    "reps": reps,
-                    "weight": weight,
-                    "unit": "lbs"
-                },
-                "confidence": 0.85
-            }
+    - "rpe 8" -> log_rpe
 
-    # No intent matched
-    return None
+    Commands may be part of a longer utterance ("skip squats", "log 5 reps
+    please"); the first one found is returned.
+    """
+    command = match_command(transcript) or match_command(transcript, embedded=True)
+    return command.to_intent() if command else None
@@ -16,15 +16,27 @@ import json
 import base64
 from typing import Optional
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    WebSocketException,
+    status,
+)
 from pydantic import BaseModel
 
+from app.core.auth import get_current_user_id, get_websocket_user_id
+
 from app.voice.realtime import (
     create_voice_session,
     get_voice_session,
     end_voice_session,
     ConversationState,
 )
+from app.voice.session_manager import VoiceCapacityError, get_voice_session_manager
 from app.voice.stt import TranscriptionResult
 
 
@@ -43,13 +55,18 @@ class VoiceSessionConfig(BaseModel):
 @router.websocket("/realtime")
 async def voice_realtime_websocket(
     websocket: WebSocket,
-    user_id: str = Query(...),
+    user_id: Optional[str] = Query(None),
+    caller_id: str = Depends(get_websocket_user_id),
     trainer_id: Optional[str] = Query(None),
     voice_profile: str = Query("professional"),
 ):
     """
     Real-time voice coaching WebSocket.
 
+    Authenticated with the user's JWT (`token` query parameter or Bearer
+    header); the session always belongs to the caller, and a `user_id`
+    for anyone else is rejected.
+
     Protocol:
     - Client → Server: Audio chunks (base64 encoded PCM)
     - Server → Client: Transcripts, state changes, audio responses
@@ -59,8 +76,9 @@ async def voice_realtime_websocket(
     2. transcript: Transcription result
     3. state: Conversation state change
     4. response_audio: AI response audio
-    5. latency: Latency metrics
-    6. error: Error message
+    5. command: Recognized workout command (answered without the LLM)
+    6. latency: Latency metrics
+    7. error: Error message
 
     Example client messages:
     {
@@ -77,37 +95,75 @@ async def voice_realtime_websocket(
       "confidence": 0.95
     }
     """
+    if user_id is not None and user_id != caller_id:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Access denied")
+    user_id = caller_id
+
     await websocket.accept()
     print(f"🎤 Voice WebSocket connected: user={user_id}")
 
     try:
-        # Create voice session
         session = await create_voice_session(
             user_id=user_id,
             trainer_id=trainer_id,
             voice_profile=voice_profile,
         )
+    except VoiceCapacityError as e:
+        await websocket.send_json({
+            "type": "error",
+            "message": e.reason,
+            "retry_after_seconds": e.retry_after_seconds,
+        })
+        await websocket.close(code=1013)  # Try again later
+        return
 
+    try:
         # Register callbacks
-        session.on_state_change = lambda state: websocket.send_json({
-            "type": "state",
-            "state": state.value,
-            "timestamp": "now",
-        })
+        async def send_state(state: ConversationState):
+            await websocket.send_json({
+                "type": "state",
+                "state": state.value,
+                "timestamp": "now",
+            })
 
-        session.on_transcript = lambda result: websocket.send_json({
-            "type": "transcript",
-            "text": result.text,
-            "is_final": result.is_final,
-            "confidence": result.confidence,
-        })
+        session.on_state_change = send_state
+
+        async def send_transcript(result: TranscriptionResult):
+            await websocket.send_json({
+                "type": "transcript",
+                "text": result.text,
+                "is_final": result.is_final,
+                "confidence": result.confidence,
+            })
+
+        session.on_transcript = send_transcript
 
         session.on_response = lambda message: None  # Audio handled by on_audio_chunk
 
-        session.on_audio_chunk = lambda chunk: websocket.send_json({
-            "type": "response_audio",
-            "data": base64.b64encode(chunk).decode('utf-8'),
-        })
+        async def send_audio_chunk(chunk: bytes):
+            # Awaited by the session, so a slow client slows TTS reads
+            await websocket.send_json({
+                "type": "response_audio",
+                "data": base64.b64encode(chunk).decode('utf-8'),
+            })
+
+        session.on_audio_chunk = send_audio_chunk
+
+        async def send_command(command):
+            # Client applies the command (log the set, start the timer)
+            await websocket.send_json({
+                "type": "command",
+                "text": command.text,
+                "intent": command.to_intent(),
+            })
+
+        session.on_command = send_command
+
+        async def close_for(reason: str):
+            await websocket.send_json({"type": "closed", "reason": reason})
+            await websocket.close(code=1000, reason=reason)
+
+        session.on_close = close_for
 
         # Start session
         await session.start_conversation()
@@ -182,8 +238,8 @@ async def voice_realtime_websocket(
         })
 
     finally:
-        # End session
-        await end_voice_session(user_id)
+        # End session (unless it was already replaced or evicted)
+        await end_voice_session(user_id, session)
         try:
             await websocket.close()
         except:
@@ -191,16 +247,22 @@ async def voice_realtime_websocket(
 
 
 @router.get("/sessions/{user_id}/status")
-async def get_voice_session_status(user_id: str):
+async def get_voice_session_status(
+    user_id: str,
+    current_user_id: str = Depends(get_current_user_id),
+):
     """
     Get status of active voice session.
 
     Args:
-        user_id: User ID
+        user_id: User ID (must be the caller)
 
     Returns:
         Session status and metrics
     """
+    if user_id != current_user_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
     session = get_voice_session(user_id)
 
     if not session:
@@ -215,20 +277,29 @@ async def get_voice_session_status(user_id: str):
         "state": session.state.value,
         "message_count": len(session.conversation_history),
         "average_latency": session.get_average_latency(),
+        "tts_latency": session.tts.get_latency_stats(),
+        "audio_buffer": session.audio_store.info(),
+        "speculation": session.speculation_policy.stats,
     }
 
 
 @router.delete("/sessions/{user_id}")
-async def end_voice_session_endpoint(user_id: str):
+async def end_voice_session_endpoint(
+    user_id: str,
+    current_user_id: str = Depends(get_current_user_id),
+):
     """
     End active voice session.
 
     Args:
-        user_id: User ID
+        user_id: User ID (must be the caller)
 
     Returns:
         Final session summary
     """
+    if user_id != current_user_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
     session = get_voice_session(user_id)
 
     if not session:
@@ -265,4 +336,5 @@ async def voice_health_check():
             "tts": "ElevenLabs Turbo v2.5",
         },
         "target_latency_ms": 500,
+        "sessions": get_voice_session_manager().metrics(),
     }
@@ -30,6 +30,11 @@ from app.workout_gen.autoregulation import (
     ReadinessScore,
     get_load_manager,
 )
+from app.workout_gen.program_autoregulation import (
+    ProgramTable,
+    get_program_autoregulator,
+)
+from app.workout_gen.generator import Workout, Exercise
 
 
 router = APIRouter(prefix="/workout-gen", tags=["workout-generation"])
@@ -108,6 +113,19 @@ class RPELoadRequest(BaseModel):
     current_load_kg: float = Field(..., ge=0)
 
 
+class ProgramAutoregulationRequest(BaseModel):
+    """Request to auto-regulate the remaining block of a program"""
+
+    workouts: list[dict] = Field(..., min_length=1)  # Workout objects as dicts
+    start_index: int = Field(default=0, ge=0)  # First workout not yet trained
+    readiness: list[ReadinessRequest] = Field(
+        default_factory=list,
+        description="Daily readiness inputs from start_index onwards; "
+        "the last entry carries forward to workouts without one",
+    )
+    loads_kg: dict[str, float] = Field(default_factory=dict)
+
+
 # Endpoints
 
 
@@ -406,6 +424,79 @@ async def calculate_rpe_load(request: Request, body: RPELoadRequest, user_id: st
         )
 
 
+@limiter.limit("30/minute")
+@router.post("/autoregulate-program")
+async def autoregulate_program(request: Request, body: ProgramAutoregulationRequest, user_id: str = Depends(get_current_user_id)):
+    """
+    Auto-regulate every remaining workout of a program in one pass.
+
+    Readiness for each upcoming day becomes a load multiplier (same bands
+    as /readiness); sets and RPE across the remaining block are adjusted
+    together.
+
+    Returns:
+        Adjusted workouts from start_index onwards with per-day readiness
+    """
+    if body.start_index >= len(body.workouts):
+        raise HTTPException(status_code=400, detail="start_index is past the last workout")
+
+    try:
+        workouts = [
+            Workout(
+                day_number=w.get("day_number", 1),
+                week_number=w.get("week_number", 1),
+                name=w.get("name", "Workout"),
+                exercises=[
+                    Exercise(
+                        name=e["name"],
+                        sets=e["sets"],
+                        reps=e["reps"],
+                        rpe=e.get("rpe"),
+                        rest_seconds=e.get("rest_seconds", 90),
+                    )
+                    for e in w.get("exercises", [])
+                ],
+            )
+            for w in body.workouts
+        ]
+
+        autoregulator = get_program_autoregulator()
+        table = ProgramTable.from_workouts(workouts, body.loads_kg)
+
+        remaining = len(workouts) - body.start_index
+        readiness = (body.readiness or [ReadinessRequest()])[:remaining]
+        readiness += [readiness[-1]] * (remaining - len(readiness))
+
+        def column(field: str) -> list:
+            return [getattr(r, field) for r in readiness]
+
+        composite = autoregulator.composite_scores(
+            hrv_score=column("hrv_score"),
+            sleep_quality=column("sleep_quality"),
+            sleep_duration_hours=column("sleep_duration_hours"),
+            resting_heart_rate=column("resting_heart_rate"),
+            subjective_readiness=column("subjective_readiness"),
+            baseline_rhr=column("baseline_rhr"),
+        )
+        adjustments = autoregulator.adjustments(composite)
+        adjusted = autoregulator.adjust_program(table, adjustments, start=body.start_index)
+
+        return {
+            "success": True,
+            "start_index": body.start_index,
+            "readiness": [
+                {"composite_score": round(float(c), 1), "adjustment": float(a)}
+                for c, a in zip(composite, adjustments)
+            ],
+            "workouts": adjusted.to_records(start=body.start_index),
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Program autoregulation failed: {str(e)}"
+        )
+
+
 @router.get("/health")
 async def health_check():
     """Health check for workout generation service"""
@@ -417,6 +508,7 @@ async def health_check():
             "structured_config": True,
             "periodization": ["linear", "block", "undulating"],
             "autoregulation": ["rpe", "hrv", "readiness"],
+            "program_autoregulation": True,
         },
         "models": {
             "llm": "Claude Sonnet 4.5",
@@ -0,0 +1,196 @@
+"""
+Session Audio Buffer
+
+Bounded storage for the audio a voice session has spoken, so memory stays
+flat however long a workout lasts.
+
+Audio is treated as one append-only byte log per session. The most recent
+`memory_bytes` live in a fixed bytearray ring; with spilling enabled the
+most recent `spill_bytes` are also written through to a fixed-size file
+ring on disk. Older audio is simply gone. Replies keep an AudioSegment
+(an offset range into the log) instead of their own copy of the audio.
+
+Chunks are copied into the ring through memoryviews - no per-chunk bytes
+objects are retained and nothing is re-joined.
+
+Sprint 32: Voice AI Sub-500ms
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from app.core.config import settings
+
+
+class AudioRing:
+    """Fixed-capacity byte ring over a bytearray"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+
+    def write(self, offset: int, data: memoryview) -> None:
+        """Write data at a log offset (wrapping); only the tail fits if data > capacity"""
+        if len(data) > self.capacity:
+            offset += len(data) - self.capacity
+            data = data[-self.capacity:]
+        pos = offset % self.capacity
+        first = min(len(data), self.capacity - pos)
+        self._view[pos:pos + first] = data[:first]
+        self._view[:len(data) - first] = data[first:]
+
+    def views(self, start: int, end: int) -> Iterator[memoryview]:
+        """Zero-copy views of log range [start, end) (at most two, around the wrap)"""
+        while start < end:
+            pos = start % self.capacity
+            n = min(end - start, self.capacity - pos)
+            yield self._view[pos:pos + n]
+            start += n
+
+
+class FileRing:
+    """Fixed-size byte ring in a temporary file"""
+
+    def __init__(self, capacity: int, directory: Optional[str] = None):
+        self.capacity = capacity
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd, self.path = tempfile.mkstemp(prefix="voice-", suffix=".audio", dir=directory)
+
+    def write(self, offset: int, data: memoryview) -> None:
+        if len(data) > self.capacity:
+            offset += len(data) - self.capacity
+            data = data[-self.capacity:]
+        pos = offset % self.capacity
+        first = min(len(data), self.capacity - pos)
+        os.pwrite(self._fd, data[:first], pos)
+        if first < len(data):
+            os.pwrite(self._fd, data[first:], 0)
+
+    def read(self, start: int, end: int) -> bytes:
+        parts = []
+        while start < end:
+            pos = start % self.capacity
+            n = min(end - start, self.capacity - pos)
+            parts.append(os.pread(self._fd, n, pos))
+            start += n
+        return b"".join(parts)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+            os.unlink(self.path)
+
+
+@dataclass(frozen=True)
+class AudioSegment:
+    """A reply's audio: a range of the session's audio log"""
+
+    store: "SessionAudioStore"
+    start: int
+    end: int
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    @property
+    def available(self) -> bool:
+        """Audio hasn't been overwritten by newer audio yet"""
+        return self.store.retained(self.start, self.end)
+
+    def read(self) -> Optional[bytes]:
+        """Copy of the audio, or None once it has been evicted"""
+        return self.store.read(self.start, self.end)
+
+
+class SessionAudioStore:
+    """
+    Bounded audio log for one voice session.
+
+    Write with append() between begin() and end(); end() returns the
+    AudioSegment for everything appended since begin().
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int,
+        spill_bytes: int = 0,
+        spill_dir: Optional[str] = None,
+    ):
+        self.memory = AudioRing(memory_bytes)
+        # Disk only helps if it holds more than memory
+        self.spill = FileRing(spill_bytes, spill_dir) if spill_bytes > memory_bytes else None
+        self.written = 0  # Total bytes ever appended (log end offset)
+        self._segment_start = 0
+
+    @property
+    def floor(self) -> int:
+        """Oldest log offset still retained"""
+        capacity = self.spill.capacity if self.spill else self.memory.capacity
+        return max(0, self.written - capacity)
+
+    def begin(self) -> None:
+        self._segment_start = self.written
+
+    def append(self, chunk: bytes | memoryview) -> None:
+        data = memoryview(chunk).cast("B")
+        self.memory.write(self.written, data)
+        if self.spill:
+            self.spill.write(self.written, data)
+        self.written += len(data)
+
+    def end(self) -> AudioSegment:
+        return AudioSegment(self, self._segment_start, self.written)
+
+    def retained(self, start: int, end: int) -> bool:
+        return start >= self.floor and end <= self.written
+
+    def views(self, start: int, end: int) -> Optional[list[memoryview]]:
+        """
+        Zero-copy views of an in-memory range (None if not in memory).
+
+        Views are only valid until the next append().
+        """
+        if start < self.written - self.memory.capacity or end > self.written:
+            return None
+        return list(self.memory.views(start, end))
+
+    def read(self, start: int, end: int) -> Optional[bytes]:
+        """Copy of a log range, from memory or disk (None if evicted)"""
+        views = self.views(start, end)
+        if views is not None:
+            audio = bytearray(end - start)
+            pos = 0
+            for view in views:
+                audio[pos:pos + len(view)] = view
+                pos += len(view)
+            return bytes(audio)
+        if self.spill and self.retained(start, end):
+            return self.spill.read(start, end)
+        return None
+
+    def info(self) -> dict:
+        return {
+            "bytes_written": self.written,
+            "memory_bytes": self.memory.capacity,
+            "spill_bytes": self.spill.capacity if self.spill else 0,
+            "retained_bytes": self.written - self.floor,
+        }
+
+    def close(self) -> None:
+        """Release the spill file"""
+        if self.spill:
+            self.spill.close()
+
+
+def create_session_audio_store() -> SessionAudioStore:
+    """Session audio store sized from settings"""
+    return SessionAudioStore(
+        memory_bytes=settings.VOICE_AUDIO_RETENTION_KB * 1024,
+        spill_bytes=settings.VOICE_AUDIO_SPILL_MB * 1024 * 1024,
+        spill_dir=settings.VOICE_AUDIO_SPILL_DIR,
+    )
@@ -0,0 +1,228 @@
+"""
+Voice Command Grammar
+
+Fast path for workout-logging commands ("next set", "10 reps at 185",
+"rest 90 seconds"). The whole utterance has to match one compiled
+grammar, so anything open-ended still goes to the coach graph. Matching
+and the templated reply take microseconds instead of an LLM round trip.
+
+Sprint 32: Voice AI Sub-500ms
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+ONES = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+TENS = {
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+
+_NUMBER_WORDS = re.compile(
+    r"\b(?:(?P<tens>{tens})(?:[\s-](?P<ones>{ones_1_9}))?|(?P<small>{ones}))\b".format(
+        tens="|".join(TENS),
+        ones_1_9="|".join(w for w, n in ONES.items() if 1 <= n <= 9),
+        ones="|".join(sorted(ONES, key=len, reverse=True)),
+    )
+)
+
+# Said before/after a command without changing it
+_FILLER = re.compile(
+    r"^(?:(?:ok(?:ay)?|alright|all right|um+|uh+|so|hey coach|coach|yeah)\b[\s,]*)+"
+    r"|[\s,]*\b(?:please|thanks|thank you)$"
+)
+
+_UNIT = r"(?P<unit>lbs?|pounds?|kgs?|kilos?|kilograms?)"
+_N = r"\d{1,4}(?:\.\d+)?"
+
+# Intent → alternatives; each must match the whole normalized utterance.
+# Group names are slots; w_/r_ prefixes mark weight/reps in fixed positions.
+GRAMMAR: dict[str, list[str]] = {
+    "log_set": [
+        rf"(?:i )?(?:did |got )?(?P<r_reps>{_N}) reps?(?: at| with| of)? (?P<w_weight>{_N})(?: {_UNIT})?",
+        rf"(?:i )?(?:did |got )?(?P<w_weight>{_N})(?: {_UNIT})? for (?P<r_reps>{_N})(?: reps?)?",
+        rf"(?P<a>{_N}) (?:at|by|x|times) (?P<b>{_N})(?: {_UNIT})?",
+        rf"(?:i )?(?:did |got )?(?P<r_reps>{_N}) reps?",
+    ],
+    "log_rpe": [
+        rf"(?:rpe|rate of perceived exertion) (?P<rpe>{_N})",
+        rf"that (?:was|felt like) (?:an? )?(?:rpe )?(?P<rpe>{_N})",
+    ],
+    "repeat_set": [
+        r"repeat(?: that| the set| last set)?",
+        r"same(?: again| as last (?:set|time))?",
+        r"(?:1|one) more(?: set)?",
+    ],
+    "skip_exercise": [
+        r"skip(?: it| this(?: (?:1|one)| exercise)?| the exercise| exercise)?",
+    ],
+    "next_exercise": [
+        r"next(?: set| (?:1|one)| exercise)?",
+        r"(?:i'?m |i am )?(?:done|finished|complete|completed)(?: with (?:that|this|the) set)?",
+        r"set (?:done|complete|completed|finished)",
+    ],
+    "start_timer": [
+        rf"(?:start |set )?(?:the |a )?(?:rest|timer|rest timer)(?: for)?(?: (?P<seconds>{_N}) ?(?:s|sec|secs|seconds?))?",
+        rf"(?:start |set )?(?:the |a )?(?:rest|timer|rest timer)(?: for)? (?P<minutes>{_N}) ?(?:min|mins|minutes?)",
+        rf"(?:start |set )?(?:a )?(?P<seconds>{_N}) ?(?:s|sec|second) (?:rest|timer)",
+    ],
+}
+
+# Spoken replies; short ones are shared with the TTS phrase cache
+TEMPLATES = {
+    "log_set": "Logged {reps} reps at {weight} {unit}.",
+    "log_reps": "Logged {reps} reps.",
+    "log_rpe": "Got it, RPE {rpe}.",
+    "repeat_set": "Same again. You've got this.",
+    "skip_exercise": "Skipping it. On to the next one.",
+    "next_exercise": "Nice work, next set.",
+    "start_timer": "Rest for {duration}.",
+}
+
+# Confidence reported with parse_workout_intent
+CONFIDENCE = {
+    "log_set": 0.85,
+    "log_rpe": 0.9,
+    "repeat_set": 1.0,
+    "skip_exercise": 0.95,
+    "next_exercise": 0.9,
+    "start_timer": 0.9,
+}
+
+DEFAULT_REST_SECONDS = 90
+
+UNIT_WORDS = {"lbs": "pounds", "kg": "kilos"}
+
+
+def _compile(grammar: dict[str, list[str]]) -> re.Pattern:
+    """One alternation over every intent; alternative i is group <intent>__i"""
+    alternatives = []
+    for intent, patterns in grammar.items():
+        for i, pattern in enumerate(patterns):
+            # Slot names repeat across alternatives; suffix them to keep them unique
+            unique = re.sub(r"\(\?P<(\w+)>", rf"(?P<\1__{intent}{i}>", pattern)
+            alternatives.append(f"(?P<{intent}__{i}>{unique})")
+    return re.compile("|".join(alternatives))
+
+
+_COMPILED = _compile(GRAMMAR)
+# The same grammar as whole words anywhere in an utterance ("skip squats")
+_EMBEDDED = re.compile(rf"\b(?:{_COMPILED.pattern})\b")
+
+
+@dataclass
+class VoiceCommand:
+    """A recognized command with its slots"""
+
+    intent: str
+    slots: dict = field(default_factory=dict)
+    text: str = ""
+
+    @property
+    def reply(self) -> str:
+        """Templated spoken reply"""
+        if self.intent == "log_set":
+            if "weight" not in self.slots:
+                return TEMPLATES["log_reps"].format(**self.slots)
+            return TEMPLATES["log_set"].format(**{**self.slots, "unit": UNIT_WORDS[self.slots["unit"]]})
+        if self.intent == "start_timer":
+            return TEMPLATES["start_timer"].format(duration=_spoken_duration(self.slots["seconds"]))
+        return TEMPLATES[self.intent].format(**self.slots)
+
+    def to_intent(self) -> dict:
+        """Intent dict as returned by routes/voice.parse_workout_intent"""
+        return {
+            "action": self.intent,
+            "parameters": self.slots,
+            "confidence": CONFIDENCE[self.intent],
+        }
+
+
+def normalize_utterance(text: str) -> str:
+    """Lowercase, punctuation and fillers stripped, number words as digits"""
+    text = text.lower().replace("’", "'")
+    text = re.sub(r"[^\w\s'.-]|(?<!\d)\.|\.(?!\d)", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    text = _NUMBER_WORDS.sub(_number_word_value, text)
+    text = re.sub(r"(\d)\s*-\s*(\d)", r"\1 \2", text)
+    previous = None
+    while previous != text:
+        previous, text = text, _FILLER.sub("", text).strip()
+    return text
+
+
+def _number_word_value(match: re.Match) -> str:
+    if match["small"]:
+        return str(ONES[match["small"]])
+    return str(TENS[match["tens"]] + (ONES[match["ones"]] if match["ones"] else 0))
+
+
+def _number(value: str) -> int | float:
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _spoken_duration(seconds: int | float) -> str:
+    if isinstance(seconds, float) and seconds.is_integer():
+        seconds = int(seconds)  # "150", not "150.0"
+    words = {n: w for w, n in {**ONES, **TENS}.items()}
+    if seconds >= 120 and seconds % 60 == 0:
+        return f"{words.get(seconds // 60, seconds // 60)} minutes"
+    return f"{words.get(seconds, seconds)} seconds"
+
+
+def match_command(text: str, embedded: bool = False) -> Optional[VoiceCommand]:
+    """
+    Match an utterance against the command grammar.
+
+    Returns None for anything that isn't entirely a command. With
+    `embedded`, the first command found anywhere in the utterance is
+    returned instead ("skip squats", "log 5 reps").
+    """
+    normalized = normalize_utterance(text)
+    if not normalized:
+        return None
+    match = _EMBEDDED.search(normalized) if embedded else _COMPILED.fullmatch(normalized)
+    if match is None:
+        return None
+
+    name = match.lastgroup  # Outermost group that matched: "<intent>__<i>"
+    intent, index = name.rsplit("__", 1)
+    suffix = f"__{intent}{index}"
+    raw = {
+        key[:-len(suffix)]: value
+        for key, value in match.groupdict().items()
+        if key.endswith(suffix) and value is not None
+    }
+    return VoiceCommand(intent=intent, slots=_slots(intent, raw), text=text)
+
+
+def _slots(intent: str, raw: dict) -> dict:
+    if intent == "log_set":
+        slots = {}
+        if "a" in raw:
+            # "10 at 185": the larger number is usually the weight
+            small, large = sorted((_number(raw["a"]), _number(raw["b"])))
+            slots = {"reps": small, "weight": large}
+        else:
+            slots["reps"] = _number(raw["r_reps"])
+            if "w_weight" in raw:
+                slots["weight"] = _number(raw["w_weight"])
+        if "weight" in slots:
+            unit = raw.get("unit", "lbs")
+            slots["unit"] = "kg" if unit.startswith(("k", "kilo")) else "lbs"
+        return slots
+    if intent == "log_rpe":
+        return {"rpe": _number(raw["rpe"])}
+    if intent == "start_timer":
+        if "minutes" in raw:
+            return {"seconds": _number(raw["minutes"]) * 60}
+        return {"seconds": _number(raw["seconds"]) if "seconds" in raw else DEFAULT_REST_SECONDS}
+    return {}
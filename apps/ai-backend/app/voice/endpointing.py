@@ -0,0 +1,233 @@
+"""
+Adaptive Turn Endpointing
+
+Decides when the user has finished speaking. Instead of a fixed 700ms of
+silence after every utterance, it combines:
+- Deepgram's speech_final (short silence detected) and UtteranceEnd
+  (long silence) signals
+- A local text-completeness score: "Ten reps at 185." is done, "I want
+  to work on my" is not
+- Running statistics of each user's mid-turn pauses, so slow, thoughtful
+  speakers aren't cut off and quick ones aren't kept waiting
+
+A syntactically complete utterance commits as soon as Deepgram reports
+speech_final. An incomplete one waits for the user's usual pause length
+(capped by the silence threshold) before committing.
+
+Sprint 32: Voice AI Sub-500ms
+"""
+
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.voice.commands import match_command
+
+if TYPE_CHECKING:
+    from app.voice.stt import TranscriptionResult
+
+
+# Silence Deepgram waits before reporting speech_final (LiveOptions.endpointing)
+DEEPGRAM_ENDPOINTING_MS = 200
+
+# Words that leave a sentence hanging
+TRAILING_WORDS = frozenset({
+    "a", "an", "the", "and", "but", "or", "so", "because", "if", "then",
+    "to", "of", "for", "with", "at", "in", "on", "from", "about", "like",
+    "my", "your", "his", "her", "their", "our", "its", "um", "uh", "er",
+    "is", "are", "was", "were", "be", "i", "i'm", "we", "you", "should",
+    "can", "could", "would", "will", "do", "does", "how", "what", "when",
+    "which", "that", "than", "some", "any", "more", "really", "just",
+})
+
+# Logistic model over surface features (hand-fit on coaching transcripts)
+COMPLETENESS_WEIGHTS = {
+    "bias": -0.4,
+    "terminal_punctuation": 2.2,  # . ! ? (Deepgram smart_format)
+    "trailing_comma": -2.0,
+    "trailing_word": -2.6,
+    "command": 3.5,  # Whole utterance is a workout command
+    "short": -0.6,  # One or two words (outside commands)
+    "question_without_mark": -0.8,
+}
+
+QUESTION_START = re.compile(r"^(?:what|how|why|when|where|which|who|can|could|should|is|are|do|does)\b")
+
+
+def text_completeness(text: str) -> float:
+    """Probability that the text is a finished utterance (0-1)"""
+    text = text.strip()
+    if not text:
+        return 0.0
+    words = text.lower().rstrip(".!?,;:").split()
+    last_word = words[-1] if words else ""
+    features = {
+        "bias": 1.0,
+        "terminal_punctuation": float(text[-1] in ".!?"),
+        "trailing_comma": float(text[-1] in ",;:-"),
+        "trailing_word": float(last_word in TRAILING_WORDS),
+        "command": float(match_command(text) is not None),
+        "short": float(len(words) <= 2),
+        "question_without_mark": float(
+            bool(QUESTION_START.match(text.lower())) and not text.endswith("?")
+        ),
+    }
+    if features["command"]:
+        features["short"] = 0.0
+    z = sum(COMPLETENESS_WEIGHTS[name] * value for name, value in features.items())
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+class PauseStats:
+    """Recent mid-turn pauses (speech_final followed by more speech) for one user"""
+
+    def __init__(self, window: int = 50, min_samples: int = 5):
+        self.pauses_ms: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def add(self, pause_ms: float) -> None:
+        self.pauses_ms.append(pause_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Pause length below which q of this user's pauses fall (None until warmed up)"""
+        if len(self.pauses_ms) < self.min_samples:
+            return None
+        return float(np.quantile(np.fromiter(self.pauses_ms, float), q))
+
+
+# Pause statistics by user, shared across that user's sessions (LRU)
+_pause_stats: OrderedDict[str, PauseStats] = OrderedDict()
+
+
+def get_pause_stats(user_id: str) -> PauseStats:
+    """Get or create pause statistics for a user"""
+    stats = _pause_stats.get(user_id)
+    if stats is None:
+        stats = _pause_stats[user_id] = PauseStats()
+        while len(_pause_stats) > settings.VOICE_PAUSE_STATS_USERS:
+            _pause_stats.popitem(last=False)
+    else:
+        _pause_stats.move_to_end(user_id)
+    return stats
+
+
+class TurnDetector:
+    """
+    Adaptive end-of-turn detection over Deepgram results.
+
+    add_transcription() commits a turn right away when it can. Otherwise
+    `pending_until` (epoch seconds) says when check_timeout() should be
+    called to commit it, unless more speech arrives first.
+    """
+
+    def __init__(
+        self,
+        silence_threshold_ms: int = 700,
+        user_id: Optional[str] = None,
+        min_hold_ms: int = 0,
+        completeness_threshold: float = 0.6,
+        pause_quantile: float = 0.8,
+        deepgram_endpointing_ms: int = DEEPGRAM_ENDPOINTING_MS,
+    ):
+        self.silence_threshold_ms = silence_threshold_ms
+        self.min_hold_ms = min_hold_ms
+        self.completeness_threshold = completeness_threshold
+        self.pause_quantile = pause_quantile
+        self.deepgram_endpointing_ms = deepgram_endpointing_ms
+        self.pause_stats = get_pause_stats(user_id) if user_id else PauseStats()
+
+        self.last_speech_time = None
+        self.current_utterance: list[str] = []  # Finalized segments
+        self.interim = ""
+        self.pending_until: Optional[float] = None
+        self._speech_end: Optional[float] = None  # Estimated, epoch seconds
+
+        # Last committed turn
+        self.last_endpointing_ms = 0.0  # End of speech → commit
+        self.last_reason = ""
+
+    @property
+    def utterance(self) -> str:
+        return " ".join([*self.current_utterance, self.interim]).strip()
+
+    def add_transcription(self, result: "TranscriptionResult") -> tuple[bool, str]:
+        """
+        Add transcription and detect turn completion.
+
+        Args:
+            result: Transcription result from STT
+
+        Returns:
+            Tuple of (turn_complete, full_utterance)
+        """
+        now = result.timestamp.timestamp()
+
+        if result.text:
+            if self._speech_end is not None:
+                # Speech resumed after an endpoint: that was a mid-turn pause
+                self.pause_stats.add((now - self._speech_end) * 1000)
+                self._speech_end = None
+                self.pending_until = None
+            self.last_speech_time = result.timestamp
+            if result.is_final:
+                self.current_utterance.append(result.text)
+                self.interim = ""
+            else:
+                self.interim = result.text
+
+        if getattr(result, "utterance_end", False):
+            if self._speech_end is None:
+                self._speech_end = now - self.deepgram_endpointing_ms / 1000
+            return self._commit(now, "utterance_end")
+
+        if getattr(result, "speech_final", False) and self.utterance:
+            # Deepgram already waited its endpointing silence
+            self._speech_end = now - self.deepgram_endpointing_ms / 1000
+            if text_completeness(self.utterance) >= self.completeness_threshold:
+                hold_ms = self.min_hold_ms
+            else:
+                hold_ms = self.hold_ms()
+            if hold_ms <= 0:
+                return self._commit(now, "complete")
+            self.pending_until = now + hold_ms / 1000
+
+        return False, ""
+
+    def hold_ms(self) -> float:
+        """Extra wait after speech_final for an incomplete utterance"""
+        ceiling = self.silence_threshold_ms - self.deepgram_endpointing_ms
+        typical = self.pause_stats.quantile(self.pause_quantile)
+        if typical is None:
+            return ceiling
+        # Wait a little longer than this user usually pauses mid-turn
+        return float(np.clip(typical * 1.1 - self.deepgram_endpointing_ms, self.min_hold_ms, ceiling))
+
+    def check_timeout(self, now: Optional[float] = None) -> tuple[bool, str]:
+        """Commit the pending turn if its hold time has passed"""
+        now = time.time() if now is None else now
+        if self.pending_until is None or now < self.pending_until:
+            return False, ""
+        return self._commit(now, "silence")
+
+    def _commit(self, now: float, reason: str) -> tuple[bool, str]:
+        utterance = self.utterance
+        speech_end = self._speech_end
+        self.reset()
+        if not utterance:
+            return False, ""
+        self.last_endpointing_ms = max(0.0, (now - speech_end) * 1000) if speech_end else 0.0
+        self.last_reason = reason
+        return True, utterance
+
+    def reset(self):
+        """Reset turn detection state"""
+        self.current_utterance = []
+        self.interim = ""
+        self.last_speech_time = None
+        self.pending_until = None
+        self._speech_end = None
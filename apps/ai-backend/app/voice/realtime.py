@@ -11,6 +11,14 @@ Latency Breakdown (Target):
 
 Optimizations:
 - Streaming at every stage
+- LLM tokens are cut into sentences/clauses and each fragment goes to TTS
+  while the model keeps generating, so first audio follows the first
+  sentence rather than the whole reply
+- Adaptive endpointing: complete utterances commit as soon as Deepgram
+  hears a pause, instead of after a fixed 700ms of silence
+- Workout commands are answered from templates without the LLM
+- Speculative generation: the LLM starts on a stable interim transcript
+  during the endpointing silence and is kept if the final text agrees
 - Parallel processing where possible
 - Connection pooling
 - Audio buffering
@@ -19,6 +27,7 @@ Sprint 32: Voice AI Sub-500ms
 """
 
 import asyncio
+import inspect
 import time
 from typing import AsyncIterator, Callable, Optional
 from dataclasses import dataclass, field
@@ -27,11 +36,31 @@ from enum import Enum
 
 from langchain_core.messages import HumanMessage, AIMessage
 
+from app.voice.commands import VoiceCommand, match_command
+from app.voice.audio_buffer import AudioSegment, create_session_audio_store
+from app.core.config import settings
+from app.voice.session_manager import get_voice_session_manager
+from app.voice.speculation import Speculation, SpeculationPolicy
+from app.voice.segmenter import SentenceSegmenter, split_for_speech
 from app.voice.stt import DeepgramSTT, TranscriptionResult, TurnDetector
-from app.voice.tts import ElevenLabsTTS
+from app.voice.tts import ElevenLabsTTS, tts_config_for_profile
+from app.voice.tts_cache import get_tts_cache
 from app.agents.supervisor import get_coach_graph, CoachState
 
 
+# Graph nodes whose model output is the spoken reply (not the supervisor's
+# routing call)
+SPOKEN_NODES = frozenset({"workout", "nutrition", "recovery", "motivation"})
+
+# Fragments synthesized ahead of the one being played
+TTS_LOOKAHEAD = 1
+
+# Audio chunks buffered per fragment before TTS is paused
+TTS_CHUNK_QUEUE = 32
+
+FALLBACK_REPLY = "I'm sorry, I didn't quite catch that. Could you repeat?"
+
+
 class ConversationState(str, Enum):
     """Voice conversation states"""
 
@@ -48,29 +77,42 @@ class VoiceMessage:
 
     text: str
     role: str  # "user" or "assistant"
-    audio_data: Optional[bytes] = None
+    audio: Optional[AudioSegment] = None  # Range of the session's audio buffer
     latency_ms: Optional[float] = None
     timestamp: datetime = field(default_factory=datetime.now)
 
+    @property
+    def audio_data(self) -> Optional[bytes]:
+        """Spoken audio, while the session buffer still retains it"""
+        return self.audio.read() if self.audio else None
+
 
 @dataclass
 class LatencyMetrics:
     """Latency tracking for voice pipeline"""
 
+    endpointing_ms: float = 0.0  # End of speech until the turn was committed
     stt_ms: float = 0.0
-    llm_ms: float = 0.0
-    tts_ms: float = 0.0
-    total_ms: float = 0.0
+    llm_ms: float = 0.0  # Until the first speakable fragment
+    tts_ms: float = 0.0  # First fragment to its first audio chunk
+    first_audio_ms: float = 0.0  # What the user waits for
+    total_ms: float = 0.0  # Until the reply finished streaming
+    fast_path: bool = False  # Answered by the command grammar, not the LLM
+    speculative: bool = False  # Reply started before the turn was committed
 
     @property
     def breakdown(self) -> dict:
         """Get latency breakdown"""
         return {
+            "endpointing_ms": round(self.endpointing_ms, 2),
             "stt_ms": round(self.stt_ms, 2),
             "llm_ms": round(self.llm_ms, 2),
             "tts_ms": round(self.tts_ms, 2),
+            "first_audio_ms": round(self.first_audio_ms, 2),
             "total_ms": round(self.total_ms, 2),
-            "under_500ms": self.total_ms < 500,
+            "under_500ms": self.first_audio_ms < 500,
+            "fast_path": self.fast_path,
+            "speculative": self.speculative,
         }
 
 
@@ -93,25 +135,41 @@ class RealtimeVoiceService:
 
         # Services
         self.stt = DeepgramSTT()
-        self.tts = ElevenLabsTTS()
-        self.turn_detector = TurnDetector()
+        self.tts = ElevenLabsTTS(
+            config=tts_config_for_profile(voice_profile), cache=get_tts_cache()
+        )
+        self.turn_detector = TurnDetector(user_id=user_id)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # Set by start_conversation
+        self._transcripts: Optional[asyncio.Queue] = None  # Results handed over by STT
+        self._transcript_task: Optional[asyncio.Task] = None
+        self._turn_timer: Optional[asyncio.TimerHandle] = None
+        self.speculation_policy = SpeculationPolicy()
+        self._speculation: Optional[Speculation] = None
         self.coach_graph = get_coach_graph()
 
         # State
         self.state = ConversationState.IDLE
         self.conversation_history: list[VoiceMessage] = []
+        self.audio_store = create_session_audio_store()
         self.latency_history: list[LatencyMetrics] = []
+        self.last_activity = time.monotonic()
+        self._fragment_queue: Optional[asyncio.Queue] = None  # Current reply
+        self._chunk_queue: Optional[asyncio.Queue] = None  # Fragment being played
 
         # Callbacks
         self.on_state_change: Optional[Callable] = None
         self.on_transcript: Optional[Callable] = None
         self.on_response: Optional[Callable] = None
         self.on_audio_chunk: Optional[Callable] = None
+        self.on_command: Optional[Callable] = None  # Recognized voice commands
+        self.on_close: Optional[Callable] = None  # Ended by the server (e.g. idle)
 
     async def start_conversation(self):
         """Start voice conversation session"""
         print("🎙️ Starting real-time voice session")
-        self.state = ConversationState.LISTENING
+        self._loop = asyncio.get_running_loop()
+        self._transcripts = asyncio.Queue()
+        self._transcript_task = asyncio.create_task(self._consume_transcripts())
 
         # Start STT stream
         await self.stt.start_stream(
@@ -119,18 +177,23 @@ class RealtimeVoiceService:
             interim_results=True,
         )
 
-        if self.on_state_change:
-            self.on_state_change(self.state)
+        await self._set_state(ConversationState.LISTENING)
 
     async def stop_conversation(self):
         """Stop voice conversation session"""
         print("🎙️ Stopping voice session")
 
+        if self._turn_timer:
+            self._turn_timer.cancel()
+            self._turn_timer = None
+        self._discard_speculation()
+        if self._transcript_task:
+            self._transcript_task.cancel()
+            self._transcript_task = None
         await self.stt.stop_stream()
-        self.state = ConversationState.IDLE
-
-        if self.on_state_change:
-            self.on_state_change(self.state)
+        await self.tts.close()
+        self.audio_store.close()
+        await self._set_state(ConversationState.IDLE)
 
     async def send_audio(self, audio_data: bytes):
         """
@@ -139,71 +202,193 @@ class RealtimeVoiceService:
         Args:
             audio_data: Raw audio bytes (PCM, 16-bit, 16kHz)
         """
+        self.last_activity = time.monotonic()
         if self.state != ConversationState.LISTENING:
             return
 
         await self.stt.send_audio(audio_data)
 
+    async def _set_state(self, state: ConversationState):
+        self.state = state
+        if self.on_state_change:
+            await self._notify(self.on_state_change, state)
+
+    async def _notify(self, callback: Callable, *args):
+        """Call a sync or async callback; a failed send doesn't stop the session"""
+        try:
+            sent = callback(*args)
+            if inspect.isawaitable(sent):
+                await sent
+        except Exception as e:
+            print(f"❌ Error in {getattr(callback, '__name__', 'callback')}: {e}")
+
+    def is_idle(self) -> bool:
+        """Not processing or speaking a reply"""
+        return self.state not in (ConversationState.PROCESSING, ConversationState.SPEAKING)
+
+    def queue_depths(self) -> dict:
+        """Items waiting in the reply pipeline"""
+        return {
+            "fragments": self._fragment_queue.qsize() if self._fragment_queue else 0,
+            "audio_chunks": self._chunk_queue.qsize() if self._chunk_queue else 0,
+        }
+
     def _on_transcription(self, result: TranscriptionResult):
         """
-        Handle transcription result from STT.
+        Receive a transcription result from STT.
 
-        Checks for turn completion and triggers LLM response.
+        The Deepgram client calls this on its own thread, so results are
+        queued on the session's event loop and handled there in order.
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._transcripts.put_nowait, result)
+
+    async def _consume_transcripts(self):
+        """Forward each queued result to the client, then handle it"""
+        while True:
+            result = await self._transcripts.get()
+            if self.on_transcript and result.text:
+                await self._notify(self.on_transcript, result)
+            self._handle_transcription(result)
+
+    def _handle_transcription(self, result: TranscriptionResult):
         """
-        # Notify transcript callback
-        if self.on_transcript:
-            self.on_transcript(result)
+        Handle transcription result from STT (on the event loop).
 
+        Checks for turn completion and triggers LLM response.
+        """
         # Check if turn is complete
         turn_complete, utterance = self.turn_detector.add_transcription(result)
 
         if turn_complete and utterance:
-            print(f"👤 User: {utterance}")
-
-            # Save user message
-            user_message = VoiceMessage(
-                text=utterance,
-                role="user",
-                latency_ms=result.duration_ms,
+            self._commit_turn(utterance)
+        else:
+            self._schedule_turn_check()
+            if result.text:
+                self._update_speculation()
+
+    def _update_speculation(self):
+        """Start, keep or drop the speculative reply for the turn so far"""
+        if not settings.VOICE_SPECULATION_ENABLED or self.state != ConversationState.LISTENING:
+            return
+        text = self.turn_detector.utterance
+        policy = self.speculation_policy
+        policy.observe(text)
+
+        if self._speculation and not policy.matches(self._speculation.text, text):
+            self._discard_speculation()
+
+        if (
+            self._speculation is None
+            and policy.should_start(text, self.turn_detector.pending_until is not None)
+            and match_command(text) is None  # Commands don't need the LLM
+        ):
+            started_at = time.time()
+            metrics = LatencyMetrics()
+            fragments: asyncio.Queue[Optional[str]] = asyncio.Queue()
+            task = asyncio.create_task(
+                self._produce_fragments(text, fragments, metrics, started_at)
             )
-            self.conversation_history.append(user_message)
-
-            # Process with LLM
-            asyncio.create_task(self._process_and_respond(utterance))
-
-    async def _process_and_respond(self, user_text: str):
+            self._speculation = Speculation(text, fragments, task, metrics, started_at)
+            policy.started()
+
+    def _discard_speculation(self):
+        if self._speculation:
+            self._speculation.cancel()
+            self._speculation = None
+            self.speculation_policy.stats["discarded"] += 1
+
+    def _schedule_turn_check(self):
+        """Re-check the turn when the detector's hold time runs out"""
+        if self._turn_timer:
+            self._turn_timer.cancel()
+            self._turn_timer = None
+        if self.turn_detector.pending_until is not None:
+            delay = max(0.0, self.turn_detector.pending_until - time.time())
+            self._turn_timer = asyncio.get_running_loop().call_later(delay, self._on_turn_timeout)
+
+    def _on_turn_timeout(self):
+        self._turn_timer = None
+        turn_complete, utterance = self.turn_detector.check_timeout()
+        if turn_complete and utterance:
+            self._commit_turn(utterance)
+        else:
+            self._schedule_turn_check()
+
+    def _commit_turn(self, utterance: str):
+        """Save the user's turn and start the reply"""
+        if self._turn_timer:
+            self._turn_timer.cancel()
+            self._turn_timer = None
+        endpointing_ms = self.turn_detector.last_endpointing_ms
+        print(f"👤 User: {utterance} ({self.turn_detector.last_reason}, {endpointing_ms:.0f}ms)")
+
+        # Save user message
+        user_message = VoiceMessage(
+            text=utterance,
+            role="user",
+            latency_ms=endpointing_ms,
+        )
+        self.conversation_history.append(user_message)
+
+        # Use the speculative reply if it answers what was finally said
+        speculation = self._speculation
+        if speculation and self.speculation_policy.matches(speculation.text, utterance):
+            self._speculation = None
+            self.speculation_policy.stats["used"] += 1
+        else:
+            self._discard_speculation()
+            speculation = None
+        self.speculation_policy.new_turn()
+
+        # Process with LLM
+        asyncio.create_task(self._process_and_respond(utterance, endpointing_ms, speculation))
+
+    async def _process_and_respond(
+        self,
+        user_text: str,
+        endpointing_ms: float = 0.0,
+        speculation: Optional[Speculation] = None,
+    ):
         """
-        Process user input with LLM and generate speech response.
+        Process user input with LLM and stream the spoken response.
+
+        The LLM stream is cut into fragments that are queued for TTS as soon
+        as they complete, so synthesis overlaps generation.
 
         Args:
             user_text: User's transcribed text
+            endpointing_ms: Time the turn detector took to commit the turn
+            speculation: Reply already being generated for this text
         """
         start_time = time.time()
-        metrics = LatencyMetrics()
+        metrics = LatencyMetrics(endpointing_ms=endpointing_ms)
+        if speculation:
+            metrics.speculative = True
+            fragments, producer = speculation.fragments, speculation.task
+        else:
+            fragments = asyncio.Queue()
+            producer = asyncio.create_task(
+                self._produce_fragments(user_text, fragments, metrics, start_time)
+            )
+        self._fragment_queue = fragments
 
         try:
             # Update state
-            self.state = ConversationState.PROCESSING
-            if self.on_state_change:
-                self.on_state_change(self.state)
+            await self._set_state(ConversationState.PROCESSING)
 
             # Measure STT latency (already completed)
             stt_time = time.time()
             metrics.stt_ms = (stt_time - start_time) * 1000
 
-            # Get LLM response
-            llm_start = time.time()
-            response_text = await self._get_llm_response(user_text)
-            llm_end = time.time()
-            metrics.llm_ms = (llm_end - llm_start) * 1000
-
-            print(f"🤖 Assistant: {response_text}")
-
-            # Generate speech
-            tts_start = time.time()
-            await self._generate_and_stream_speech(response_text)
-            tts_end = time.time()
-            metrics.tts_ms = (tts_end - tts_start) * 1000
+            # Speak fragments as they arrive
+            await self._speak_fragments(fragments, metrics, start_time)
+            await producer
+            if speculation and speculation.metrics.llm_ms:
+                # First fragment relative to the commit (0 if it was already there)
+                first_fragment = speculation.started_at + speculation.metrics.llm_ms / 1000
+                metrics.llm_ms = max(0.0, first_fragment - start_time) * 1000
+                metrics.fast_path = speculation.metrics.fast_path
 
             # Calculate total latency
             end_time = time.time()
@@ -216,23 +401,111 @@ class RealtimeVoiceService:
             print(f"⚡ Latency: {metrics.breakdown}")
 
             # Check if under target
-            if metrics.total_ms > 500:
-                print(f"⚠️  Warning: Latency {metrics.total_ms:.0f}ms exceeds 500ms target")
+            if metrics.first_audio_ms > 500:
+                print(f"⚠️  Warning: First audio after {metrics.first_audio_ms:.0f}ms exceeds 500ms target")
 
             # Return to listening
-            self.state = ConversationState.LISTENING
-            if self.on_state_change:
-                self.on_state_change(self.state)
+            await self._set_state(ConversationState.LISTENING)
 
         except Exception as e:
             print(f"❌ Error processing: {e}")
-            self.state = ConversationState.ERROR
-            if self.on_state_change:
-                self.on_state_change(self.state)
+            await self._set_state(ConversationState.ERROR)
+
+        finally:
+            self._fragment_queue = self._chunk_queue = None
+            self.last_activity = time.monotonic()
+            if not producer.done():
+                producer.cancel()
+
+    async def _produce_fragments(
+        self,
+        user_text: str,
+        fragments: asyncio.Queue,
+        metrics: LatencyMetrics,
+        start_time: float,
+    ):
+        """
+        Stream the reply into speakable fragments (None marks the end).
+
+        Workout commands ("next set", "10 reps at 185") are answered from
+        templates without calling the coach graph.
+        """
+        segmenter = SentenceSegmenter()
+        try:
+            command = match_command(user_text)
+            if command:
+                await self._handle_command(command, fragments, metrics, start_time)
+                return
+
+            async for token in self._stream_llm_response(user_text):
+                for fragment in segmenter.feed(token):
+                    if not metrics.llm_ms:
+                        metrics.llm_ms = (time.time() - start_time) * 1000
+                    await fragments.put(fragment)
+            tail = segmenter.flush()
+            if tail:
+                if not metrics.llm_ms:
+                    metrics.llm_ms = (time.time() - start_time) * 1000
+                await fragments.put(tail)
+        finally:
+            await fragments.put(None)
+
+    async def _handle_command(
+        self,
+        command: VoiceCommand,
+        fragments: asyncio.Queue,
+        metrics: LatencyMetrics,
+        start_time: float,
+    ):
+        """Report a recognized command and queue its templated reply"""
+        metrics.fast_path = True
+        metrics.llm_ms = (time.time() - start_time) * 1000
+        print(f"⚡ Command: {command.intent} {command.slots}")
+
+        if self.on_command:
+            handled = self.on_command(command)
+            if inspect.isawaitable(handled):
+                await handled
+
+        for fragment in split_for_speech(command.reply):
+            await fragments.put(fragment)
+
+    async def _stream_llm_response(self, user_text: str) -> AsyncIterator[str]:
+        """
+        Stream the reply from the LLM agent.
+
+        Yields the specialist's tokens as the model produces them. If the
+        reply wasn't streamed (e.g. a canned escalation message), the final
+        message is yielded whole.
+
+        Args:
+            user_text: User's message
+
+        Yields:
+            Reply text pieces
+        """
+        streamed = False
+        final_state = None
+
+        async for event in self.coach_graph.astream_events(
+            self._build_coach_state(user_text), version="v2"
+        ):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                if event.get("metadata", {}).get("langgraph_node") in SPOKEN_NODES:
+                    text = _chunk_text(event["data"]["chunk"])
+                    if text:
+                        streamed = True
+                        yield text
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                final_state = event["data"].get("output")
+
+        if not streamed:
+            yield _final_reply(final_state)
 
     async def _get_llm_response(self, user_text: str) -> str:
         """
-        Get response from LLM agent.
+        Get the complete response from the LLM agent.
 
         Args:
             user_text: User's message
@@ -240,8 +513,10 @@ class RealtimeVoiceService:
         Returns:
             Assistant's response text
         """
-        # Build state for coach graph
-        coach_state: CoachState = {
+        return "".join([text async for text in self._stream_llm_response(user_text)])
+
+    def _build_coach_state(self, user_text: str) -> CoachState:
+        return {
             "messages": [HumanMessage(content=user_text)],
             "user_id": self.user_id,
             "trainer_id": self.trainer_id,
@@ -258,50 +533,107 @@ class RealtimeVoiceService:
             "user_context": {},
         }
 
-        # Invoke coach graph
-        result = await self.coach_graph.ainvoke(coach_state)
-
-        # Extract response
-        messages = result.get("messages", [])
-        if messages:
-            last_message = messages[-1]
-            if hasattr(last_message, 'content'):
-                return last_message.content
-
-        return "I'm sorry, I didn't quite catch that. Could you repeat?"
-
-    async def _generate_and_stream_speech(self, text: str):
+    async def _speak_fragments(
+        self,
+        fragments: asyncio.Queue,
+        metrics: LatencyMetrics,
+        start_time: float,
+    ):
         """
-        Generate and stream speech audio.
+        Synthesize fragments in order and stream their audio.
 
-        Args:
-            text: Text to convert to speech
+        Up to TTS_LOOKAHEAD fragments are synthesized ahead of the one
+        playing so there is no gap between sentences.
         """
-        self.state = ConversationState.SPEAKING
-        if self.on_state_change:
-            self.on_state_change(self.state)
+        ready: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(1 + TTS_LOOKAHEAD)
+        scheduler = asyncio.create_task(self._schedule_synthesis(fragments, ready, slots))
+        synth_tasks: list[asyncio.Task] = []
 
-        # Stream TTS audio
-        audio_chunks = []
-        async for chunk in self.tts.stream_text_to_speech(text):
-            audio_chunks.append(chunk)
-
-            # Send chunk to callback if provided
-            if self.on_audio_chunk:
-                self.on_audio_chunk(chunk)
+        texts = []
+        self.audio_store.begin()
+        try:
+            while (item := await ready.get()) is not None:
+                text, chunks, task, queued_at = item
+                self._chunk_queue = chunks
+                synth_tasks.append(task)
+                try:
+                    while (chunk := await chunks.get()) is not None:
+                        if not metrics.first_audio_ms:
+                            now = time.time()
+                            metrics.first_audio_ms = (now - start_time) * 1000
+                            metrics.tts_ms = (now - queued_at) * 1000
+                            await self._set_state(ConversationState.SPEAKING)
+
+                        self.audio_store.append(chunk)
+
+                        # Send chunk to callback if provided; awaiting an
+                        # async callback paces TTS to the client connection
+                        if self.on_audio_chunk:
+                            sent = self.on_audio_chunk(chunk)
+                            if inspect.isawaitable(sent):
+                                await sent
+                    await task  # Surface TTS errors
+                finally:
+                    slots.release()
+                texts.append(text)
+            await scheduler
+        finally:
+            for task in [scheduler, *synth_tasks]:
+                if not task.done():
+                    task.cancel()
+
+        if not texts:
+            return
 
-        # Save complete audio
-        complete_audio = b"".join(audio_chunks)
+        # Reference the reply's audio in the bounded session buffer
         assistant_message = VoiceMessage(
-            text=text,
+            text=" ".join(texts),
             role="assistant",
-            audio_data=complete_audio,
+            audio=self.audio_store.end(),
         )
         self.conversation_history.append(assistant_message)
 
         if self.on_response:
             self.on_response(assistant_message)
 
+    async def _schedule_synthesis(
+        self,
+        fragments: asyncio.Queue,
+        ready: asyncio.Queue,
+        slots: asyncio.Semaphore,
+    ):
+        """Start TTS for each fragment as soon as a lookahead slot is free"""
+        try:
+            while (text := await fragments.get()) is not None:
+                await slots.acquire()
+                chunks: asyncio.Queue = asyncio.Queue(maxsize=TTS_CHUNK_QUEUE)
+                task = asyncio.create_task(self._synthesize(text, chunks))
+                await ready.put((text, chunks, task, time.time()))
+        finally:
+            await ready.put(None)
+
+    async def _synthesize(self, text: str, chunks: asyncio.Queue):
+        """Stream one fragment's audio into its queue (None marks the end)"""
+        try:
+            async for chunk in self.tts.stream_text_to_speech(text):
+                await chunks.put(chunk)
+        finally:
+            await chunks.put(None)
+
+    async def _generate_and_stream_speech(self, text: str):
+        """
+        Generate and stream speech audio for a complete text.
+
+        Args:
+            text: Text to convert to speech
+        """
+        fragments: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        for fragment in split_for_speech(text):
+            fragments.put_nowait(fragment)
+        fragments.put_nowait(None)
+        await self._speak_fragments(fragments, LatencyMetrics(), time.time())
+
     def get_average_latency(self) -> dict:
         """
         Get average latency metrics across conversation.
@@ -311,22 +643,26 @@ class RealtimeVoiceService:
         """
         if not self.latency_history:
             return {
+                "endpointing_ms": 0,
                 "stt_ms": 0,
                 "llm_ms": 0,
                 "tts_ms": 0,
+                "first_audio_ms": 0,
                 "total_ms": 0,
                 "count": 0,
             }
 
         n = len(self.latency_history)
         return {
+            "endpointing_ms": round(sum(m.endpointing_ms for m in self.latency_history) / n, 2),
             "stt_ms": round(sum(m.stt_ms for m in self.latency_history) / n, 2),
             "llm_ms": round(sum(m.llm_ms for m in self.latency_history) / n, 2),
             "tts_ms": round(sum(m.tts_ms for m in self.latency_history) / n, 2),
+            "first_audio_ms": round(sum(m.first_audio_ms for m in self.latency_history) / n, 2),
             "total_ms": round(sum(m.total_ms for m in self.latency_history) / n, 2),
             "count": n,
             "under_500ms_percent": round(
-                sum(1 for m in self.latency_history if m.total_ms < 500) / n * 100, 1
+                sum(1 for m in self.latency_history if m.first_audio_ms < 500) / n * 100, 1
             ),
         }
 
@@ -343,8 +679,23 @@ class RealtimeVoiceService:
         ]
 
 
-# Active voice sessions
-_active_sessions: dict[str, RealtimeVoiceService] = {}
+def _chunk_text(chunk) -> str:
+    """Text of a streamed message chunk (content may be a list of blocks)"""
+    content = getattr(chunk, "content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") for block in content
+        if isinstance(block, dict) and block.get("type") == "text"
+    )
+
+
+def _final_reply(state: Optional[dict]) -> str:
+    """Last message of the graph's final state"""
+    messages = (state or {}).get("messages", []) if isinstance(state, dict) else []
+    if messages and getattr(messages[-1], "content", None):
+        return messages[-1].content
+    return FALLBACK_REPLY
 
 
 async def create_voice_session(
@@ -362,31 +713,22 @@ async def create_voice_session(
 
     Returns:
         RealtimeVoiceService instance
-    """
-    # End existing session if any
-    if user_id in _active_sessions:
-        await _active_sessions[user_id].stop_conversation()
 
-    # Create new session
-    session = RealtimeVoiceService(
-        user_id=user_id,
+    Raises:
+        VoiceCapacityError: Worker is full or shedding load
+    """
+    return await get_voice_session_manager().create(
+        user_id,
         trainer_id=trainer_id,
         voice_profile=voice_profile,
     )
 
-    _active_sessions[user_id] = session
-
-    return session
-
 
 def get_voice_session(user_id: str) -> Optional[RealtimeVoiceService]:
     """Get active voice session for user"""
-    return _active_sessions.get(user_id)
+    return get_voice_session_manager().get(user_id)
 
 
-async def end_voice_session(user_id: str):
-    """End active voice session"""
-    session = _active_sessions.get(user_id)
-    if session:
-        await session.stop_conversation()
-        del _active_sessions[user_id]
+async def end_voice_session(user_id: str, session: Optional[RealtimeVoiceService] = None):
+    """End active voice session (only if it is still `session`, when given)"""
+    await get_voice_session_manager().end(user_id, session)
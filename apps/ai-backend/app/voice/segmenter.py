@@ -0,0 +1,116 @@
+"""
+Speech Fragment Segmenter
+
+Cuts a stream of LLM tokens into fragments that can be spoken on their
+own, so TTS can start on the first sentence while the model is still
+generating the rest.
+
+Fragments end at sentence boundaries (. ! ?), or at clause boundaries
+(, ; : and dashes) once they are long enough to sound natural. The first
+fragment may be cut at a shorter clause so the first audio arrives sooner.
+
+Sprint 32: Voice AI Sub-500ms
+"""
+
+import re
+from typing import Optional
+
+
+# Don't end a sentence after these (lowercased, without the period)
+ABBREVIATIONS = frozenset({
+    "dr", "mr", "mrs", "ms", "st", "vs", "etc", "e.g", "i.e", "approx",
+    "min", "max", "sec", "hr", "hrs", "lb", "lbs", "kg", "oz", "no",
+})
+
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*(?=\s)")
+CLAUSE_END = re.compile(r"(?:[,;:]|\s[-–—])(?=\s)")
+
+
+class SentenceSegmenter:
+    """
+    Incremental token → speakable fragment splitter.
+
+    feed() returns the fragments completed by a token; flush() returns
+    whatever is left at the end of the response.
+    """
+
+    def __init__(
+        self,
+        min_clause_chars: int = 40,
+        first_clause_chars: int = 20,
+        max_chars: int = 200,
+    ):
+        self.min_clause_chars = min_clause_chars
+        self.first_clause_chars = first_clause_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+        self._emitted = 0
+
+    def feed(self, token: str) -> list[str]:
+        """Add a token; returns fragments that are ready to speak"""
+        self._buffer += token
+        fragments = []
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            fragment = self._buffer[:cut].strip()
+            self._buffer = self._buffer[cut:].lstrip()
+            if fragment:
+                fragments.append(fragment)
+                self._emitted += 1
+        return fragments
+
+    def flush(self) -> Optional[str]:
+        """Remaining text at the end of the stream"""
+        fragment = self._buffer.strip()
+        self._buffer = ""
+        if fragment:
+            self._emitted += 1
+            return fragment
+        return None
+
+    def _find_cut(self) -> Optional[int]:
+        """Earliest boundary in the buffer (the same cut a token stream would make)"""
+        text = self._buffer
+        cuts = []
+
+        for match in SENTENCE_END.finditer(text):
+            if not self._is_abbreviation(text, match.start()):
+                cuts.append(match.end())
+                break
+
+        min_clause = self.first_clause_chars if self._emitted == 0 else self.min_clause_chars
+        for match in CLAUSE_END.finditer(text):
+            if match.end() >= min_clause:
+                cuts.append(match.end())
+                break
+
+        if cuts and min(cuts) <= self.max_chars:
+            return min(cuts)
+
+        if len(text) > self.max_chars:
+            # No punctuation in sight: cut at the last word boundary
+            space = text.rfind(" ", 0, self.max_chars)
+            return space if space > 0 else self.max_chars
+
+        return None
+
+    @staticmethod
+    def _is_abbreviation(text: str, period: int) -> bool:
+        if text[period] != ".":
+            return False
+        word_start = max(text.rfind(" ", 0, period), text.rfind("\n", 0, period)) + 1
+        word = text[word_start:period].lower()
+        if word in ABBREVIATIONS:
+            return True
+        # Single initials ("J. Smith")
+        return len(word) == 1 and word.isalpha()
+
+
+def split_for_speech(text: str, **kwargs) -> list[str]:
+    """Split a complete response the same way a token stream would be"""
+    segmenter = SentenceSegmenter(**kwargs)
+    fragments = segmenter.feed(text + " ")
+    tail = segmenter.flush()
+    return fragments + ([tail] if tail else [])
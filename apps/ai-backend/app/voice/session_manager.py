@@ -0,0 +1,237 @@
+"""
+Voice Session Manager
+
+Registry for active realtime voice sessions (one per user) with:
+- A per-worker cap on concurrent sessions
+- Idle-timeout eviction (no audio and no reply in progress)
+- Load shedding: while TTS or end-to-end latency is degraded, new
+  sessions are only admitted up to a reduced capacity so the ones already
+  running keep their latency
+- Metrics: active sessions by state, p50/p95 per latency stage over
+  recent turns, and pipeline queue depths (served by /voice/health)
+
+Sprint 32: Voice AI Sub-500ms
+"""
+
+import asyncio
+import inspect
+import time
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+
+LATENCY_STAGES = ("endpointing_ms", "stt_ms", "llm_ms", "tts_ms", "first_audio_ms", "total_ms")
+LATENCY_WINDOW = 500  # Recent turns (all sessions) used for stage percentiles
+MIN_SHED_SAMPLES = 10  # Don't judge latency on a handful of turns
+
+
+class VoiceCapacityError(RuntimeError):
+    """New session refused (worker full or shedding load)"""
+
+    def __init__(self, reason: str, retry_after_seconds: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+def _default_factory(**kwargs):
+    from app.voice.realtime import RealtimeVoiceService
+
+    return RealtimeVoiceService(**kwargs)
+
+
+class VoiceSessionManager:
+    """Tracks, admits and evicts realtime voice sessions"""
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        idle_timeout_seconds: Optional[float] = None,
+        shed_capacity_fraction: Optional[float] = None,
+        shed_tts_p95_ms: Optional[float] = None,
+        shed_first_audio_p95_ms: Optional[float] = None,
+        session_factory: Callable = _default_factory,
+    ):
+        self.max_sessions = max_sessions or settings.VOICE_MAX_SESSIONS
+        self.idle_timeout_seconds = idle_timeout_seconds or settings.VOICE_SESSION_IDLE_SECONDS
+        self.shed_capacity_fraction = (
+            settings.VOICE_SHED_CAPACITY_FRACTION if shed_capacity_fraction is None else shed_capacity_fraction
+        )
+        self.shed_tts_p95_ms = shed_tts_p95_ms or settings.VOICE_SHED_TTS_P95_MS
+        self.shed_first_audio_p95_ms = shed_first_audio_p95_ms or settings.VOICE_SHED_FIRST_AUDIO_P95_MS
+        self.session_factory = session_factory
+
+        self._sessions: dict[str, object] = {}
+        self._create_lock = asyncio.Lock()  # Replace-then-admit is one step
+        self._latency: deque = deque(maxlen=LATENCY_WINDOW)  # Turns of ended sessions
+        self._reaper: Optional[asyncio.Task] = None
+        self.counters = {"created": 0, "ended": 0, "evicted_idle": 0, "rejected_full": 0, "rejected_shed": 0}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def create(self, user_id: str, **kwargs):
+        """
+        Admit a new session for the user (replacing any existing one).
+
+        Raises:
+            VoiceCapacityError: Worker is full or shedding load
+        """
+        async with self._create_lock:
+            await self.end(user_id)
+
+            if len(self._sessions) >= self.max_sessions:
+                self.counters["rejected_full"] += 1
+                raise VoiceCapacityError("Voice capacity reached", retry_after_seconds=30)
+            if self.is_degraded() and len(self._sessions) >= self.shed_capacity:
+                self.counters["rejected_shed"] += 1
+                raise VoiceCapacityError("Voice latency degraded, shedding load", retry_after_seconds=60)
+
+            session = self.session_factory(user_id=user_id, **kwargs)
+            self._sessions[user_id] = session
+            self.counters["created"] += 1
+        self._ensure_reaper()
+        return session
+
+    def get(self, user_id: str):
+        return self._sessions.get(user_id)
+
+    async def end(self, user_id: str, session=None, reason: str = "ended"):
+        """End the user's session (only if it is still `session`, when given)"""
+        current = self._sessions.get(user_id)
+        if current is None or (session is not None and current is not session):
+            return
+        del self._sessions[user_id]
+        self._latency.extend(current.latency_history)
+        self.counters["ended"] += 1
+
+        await current.stop_conversation()
+        if reason != "ended" and getattr(current, "on_close", None):
+            closed = current.on_close(reason)
+            if inspect.isawaitable(closed):
+                await closed
+
+    async def reap_idle(self, now: Optional[float] = None) -> list[str]:
+        """End sessions with no activity for idle_timeout_seconds"""
+        now = time.monotonic() if now is None else now
+        idle = [
+            user_id for user_id, session in self._sessions.items()
+            if session.is_idle() and now - session.last_activity > self.idle_timeout_seconds
+        ]
+        for user_id in idle:
+            self.counters["evicted_idle"] += 1
+            await self.end(user_id, reason="idle_timeout")
+        return idle
+
+    def _ensure_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_forever())
+
+    async def _reap_forever(self):
+        interval = max(1.0, self.idle_timeout_seconds / 4)
+        while self._sessions:
+            await asyncio.sleep(interval)
+            try:
+                await self.reap_idle()
+            except Exception as e:
+                print(f"Error reaping voice sessions: {e}")
+
+    # ------------------------------------------------------------------
+    # Load shedding
+    # ------------------------------------------------------------------
+
+    @property
+    def shed_capacity(self) -> int:
+        return max(1, int(self.max_sessions * self.shed_capacity_fraction))
+
+    def _tts_first_byte_ms(self) -> np.ndarray:
+        return np.array([
+            m.first_byte_ms
+            for session in self._sessions.values()
+            for m in session.tts.request_metrics
+            if m.first_byte_ms is not None and m.status != "cached"
+        ])
+
+    def is_degraded(self) -> bool:
+        """Recent TTS first-byte or first-audio p95 over its threshold"""
+        first_byte = self._tts_first_byte_ms()
+        if len(first_byte) >= MIN_SHED_SAMPLES and np.percentile(first_byte, 95) > self.shed_tts_p95_ms:
+            return True
+        first_audio = np.array([m.first_audio_ms for m in self._recent_turns()])
+        return bool(
+            len(first_audio) >= MIN_SHED_SAMPLES
+            and np.percentile(first_audio, 95) > self.shed_first_audio_p95_ms
+        )
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _recent_turns(self) -> list:
+        turns = list(self._latency)
+        for session in self._sessions.values():
+            turns.extend(session.latency_history)
+        return turns[-LATENCY_WINDOW:]
+
+    def latency_percentiles(self) -> dict:
+        """p50/p95 per stage over recent turns"""
+        turns = self._recent_turns()
+        if not turns:
+            return {"count": 0}
+        values = np.array([[getattr(m, stage) for stage in LATENCY_STAGES] for m in turns])
+        p50, p95 = np.percentile(values, [50, 95], axis=0)
+        return {
+            "count": len(turns),
+            **{
+                stage: {"p50": round(float(p50[i]), 2), "p95": round(float(p95[i]), 2)}
+                for i, stage in enumerate(LATENCY_STAGES)
+            },
+            "fast_path_percent": round(sum(m.fast_path for m in turns) / len(turns) * 100, 1),
+            "speculative_percent": round(
+                sum(getattr(m, "speculative", False) for m in turns) / len(turns) * 100, 1
+            ),
+        }
+
+    def metrics(self) -> dict:
+        """Sessions, latency percentiles, queue depths and load-shedding state"""
+        states: dict[str, int] = {}
+        queues: dict[str, int] = {}
+        for session in self._sessions.values():
+            state = getattr(session.state, "value", str(session.state))
+            states[state] = states.get(state, 0) + 1
+            for name, depth in session.queue_depths().items():
+                queues[name] = queues.get(name, 0) + depth
+
+        first_byte = self._tts_first_byte_ms()
+        degraded = self.is_degraded()
+        return {
+            "active_sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "admitting": len(self._sessions) < (self.shed_capacity if degraded else self.max_sessions),
+            "degraded": degraded,
+            "states": states,
+            "queue_depths": queues,
+            "latency": self.latency_percentiles(),
+            "tts_first_byte_p95_ms": round(float(np.percentile(first_byte, 95)), 2) if len(first_byte) else None,
+            "counters": dict(self.counters),
+        }
+
+
+# Global instance
+_session_manager: Optional[VoiceSessionManager] = None
+
+
+def get_voice_session_manager() -> VoiceSessionManager:
+    """Get or create global voice session manager"""
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = VoiceSessionManager()
+    return _session_manager
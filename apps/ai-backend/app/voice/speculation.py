@@ -0,0 +1,116 @@
+"""
+Speculative Response Generation
+
+Starts the LLM on an interim transcript once it has stopped changing, so
+the work overlaps the endpointing silence instead of following it. When
+the turn is committed, the speculative reply is used if the final
+transcript still says the same thing; otherwise it's cancelled and the
+reply is generated from the final text.
+
+Only fragments are produced speculatively - nothing is synthesized or
+played until the turn is committed.
+
+Sprint 32: Voice AI Sub-500ms
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+# Words that flip the meaning however similar the rest is
+NEGATIONS = frozenset({
+    "not", "no", "never", "don't", "doesn't", "didn't", "can't", "cannot",
+    "won't", "shouldn't", "isn't", "aren't", "without",
+})
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[\w']+", text.lower())
+
+
+def transcript_similarity(a: str, b: str) -> float:
+    """Word-level similarity (0-1), ignoring case and punctuation"""
+    wa, wb = _words(a), _words(b)
+    if not wa and not wb:
+        return 1.0
+    return SequenceMatcher(None, wa, wb, autojunk=False).ratio()
+
+
+@dataclass
+class Speculation:
+    """An LLM reply being generated for an uncommitted transcript"""
+
+    text: str
+    fragments: asyncio.Queue
+    task: asyncio.Task
+    metrics: Any  # LatencyMetrics of the speculative run
+    started_at: float = field(default_factory=time.time)
+
+    def cancel(self) -> None:
+        if not self.task.done():
+            self.task.cancel()
+
+
+class SpeculationPolicy:
+    """
+    When to speculate and whether a speculation still fits the final text.
+
+    A transcript is stable once the same words came back in
+    `stable_updates` consecutive results, or when the turn detector is
+    holding an endpoint. At most `max_per_turn` speculations run per turn,
+    which bounds the extra LLM spend.
+    """
+
+    def __init__(
+        self,
+        min_similarity: Optional[float] = None,
+        stable_updates: int = 2,
+        min_words: int = 3,
+        max_per_turn: Optional[int] = None,
+    ):
+        self.min_similarity = (
+            settings.VOICE_SPECULATION_MIN_SIMILARITY if min_similarity is None else min_similarity
+        )
+        self.stable_updates = stable_updates
+        self.min_words = min_words
+        self.max_per_turn = settings.VOICE_SPECULATION_MAX_PER_TURN if max_per_turn is None else max_per_turn
+
+        self._last_words: list[str] = []
+        self._repeats = 0
+        self._started_this_turn = 0
+        self.stats = {"started": 0, "used": 0, "discarded": 0}
+
+    def observe(self, text: str) -> None:
+        """Record the latest transcript of the turn"""
+        words = _words(text)
+        self._repeats = self._repeats + 1 if words == self._last_words else 1
+        self._last_words = words
+
+    def should_start(self, text: str, endpoint_pending: bool = False) -> bool:
+        """Speculate on this transcript now?"""
+        if self._started_this_turn >= self.max_per_turn:
+            return False
+        if len(_words(text)) < self.min_words:
+            return False
+        return endpoint_pending or self._repeats >= self.stable_updates
+
+    def matches(self, speculated: str, text: str) -> bool:
+        """The speculative reply still answers this transcript"""
+        if NEGATIONS.intersection(_words(speculated)) != NEGATIONS.intersection(_words(text)):
+            return False
+        return transcript_similarity(speculated, text) >= self.min_similarity
+
+    def started(self) -> None:
+        self._started_this_turn += 1
+        self.stats["started"] += 1
+
+    def new_turn(self) -> None:
+        self._last_words = []
+        self._repeats = 0
+        self._started_this_turn = 0
@@ -4,7 +4,8 @@ Speech-to-Text Service using Deepgram Nova-3
 Features:
 - Nova-3 model: 5.26% WER (best-in-class accuracy)
 - Streaming recognition with <300ms latency
-- Deepgram Flux for turn detection
+- Adaptive turn detection (app/voice/endpointing.py) on Deepgram's
+  speech_final / UtteranceEnd signals
 - Multi-language support (11+ languages)
 - Punctuation and formatting
 
@@ -25,6 +26,7 @@ from deepgram import (
 )
 
 from app.core.config import settings
+from app.voice.endpointing import DEEPGRAM_ENDPOINTING_MS, TurnDetector  # noqa: F401
 
 
 @dataclass
@@ -38,6 +40,8 @@ class TranscriptionResult:
     timestamp: datetime
     language: str = "en"
     speaker_id: Optional[int] = None
+    speech_final: bool = False  # Deepgram endpointing detected a pause
+    utterance_end: bool = False  # UtteranceEnd event (no text)
 
 
 class DeepgramSTT:
@@ -47,7 +51,7 @@ class DeepgramSTT:
     Provides real-time streaming transcription with:
     - Sub-300ms latency
     - High accuracy (5.26% WER)
-    - Turn detection via Flux
+    - Endpointing events (speech_final, UtteranceEnd) for turn detection
     - Punctuation and formatting
     """
 
@@ -94,6 +98,7 @@ class DeepgramSTT:
             punctuate=True,
             smart_format=True,
             interim_results=interim_results,
+            endpointing=DEEPGRAM_ENDPOINTING_MS,  # speech_final after a short pause
             utterance_end_ms="1000",  # End utterance after 1s silence
             vad_events=True,  # Voice activity detection events
             diarize=False,  # Disable for speed (can enable for multi-speaker)
@@ -107,6 +112,7 @@ class DeepgramSTT:
             # Register event handlers
             self.connection.on(LiveTranscriptionEvents.Open, self._on_open)
             self.connection.on(LiveTranscriptionEvents.Transcript, self._on_transcript)
+            self.connection.on(LiveTranscriptionEvents.UtteranceEnd, self._on_utterance_end)
             self.connection.on(LiveTranscriptionEvents.Error, self._on_error)
             self.connection.on(LiveTranscriptionEvents.Close, self._on_close)
 
@@ -163,7 +169,8 @@ class DeepgramSTT:
         alternative = channel.alternatives[0]
         transcript = alternative.transcript
 
-        if not transcript:  # Skip empty transcripts
+        speech_final = bool(getattr(result, "speech_final", False))
+        if not transcript and not speech_final:  # Skip empty transcripts
             return
 
         # Create transcription result
@@ -174,12 +181,26 @@ class DeepgramSTT:
             duration_ms=result.duration * 1000 if result.duration else 0,
             timestamp=datetime.now(),
             language=self.language,
+            speech_final=speech_final,
         )
 
         # Call callback
         if self.transcription_callback:
             self.transcription_callback(transcription)
 
+    def _on_utterance_end(self, *args, **kwargs):
+        """Handle UtteranceEnd (no words for utterance_end_ms)"""
+        if self.transcription_callback:
+            self.transcription_callback(TranscriptionResult(
+                text="",
+                is_final=True,
+                confidence=1.0,
+                duration_ms=0,
+                timestamp=datetime.now(),
+                language=self.language,
+                utterance_end=True,
+            ))
+
     def _on_error(self, *args, **kwargs):
         """Handle connection error"""
         error = kwargs.get("error")
@@ -191,49 +212,6 @@ class DeepgramSTT:
         self.is_connected = False
 
 
-class TurnDetector:
-    """
-    Detect speaker turns using Deepgram Flux.
-
-    Flux uses ML to detect when user has finished speaking,
-    enabling natural conversation flow without explicit "stop" commands.
-    """
-
-    def __init__(self, silence_threshold_ms: int = 700):
-        self.silence_threshold_ms = silence_threshold_ms
-        self.last_speech_time: Optional[datetime] = None
-        self.current_utterance: list[str] = []
-
-    def add_transcription(self, result: TranscriptionResult) -> tuple[bool, str]:
-        """
-        Add transcription and detect turn completion.
-
-        Args:
-            result: Transcription result from STT
-
-        Returns:
-            Tuple of (turn_complete, full_utterance)
-        """
-        # Update last speech time
-        if result.text:
-            self.last_speech_time = result.timestamp
-            self.current_utterance.append(result.text)
-
-        # Check if turn is complete (final result)
-        if result.is_final:
-            utterance = " ".join(self.current_utterance)
-            self.current_utterance = []
-            return True, utterance
-
-        # Turn not complete yet
-        return False, ""
-
-    def reset(self):
-        """Reset turn detection state"""
-        self.current_utterance = []
-        self.last_speech_time = None
-
-
 # Global STT instance
 _stt_service: Optional[DeepgramSTT] = None
 
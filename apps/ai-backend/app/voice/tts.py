@@ -3,7 +3,11 @@ Text-to-Speech Service using ElevenLabs Turbo v2
 
 Features:
 - Turbo v2 model: 50-250ms latency
-- Streaming audio generation
+- Streaming audio generation over an async HTTP stream (never blocks
+  the event loop), with bounded read-ahead and per-request first-byte
+  latency metrics
+- Phrase cache: short repeated utterances are served from disk/memory
+  without calling ElevenLabs
 - Natural, conversational voice
 - Emotion and tone control
 - High quality audio (24kHz)
@@ -12,15 +16,21 @@ Sprint 32: Voice AI Sub-500ms
 """
 
 import asyncio
+import time
+import uuid
+from collections import deque
 from typing import AsyncIterator, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-import io
 
-from elevenlabs import VoiceSettings
-from elevenlabs.client import ElevenLabs
+import httpx
+import numpy as np
 
 from app.core.config import settings
+from app.voice.tts_cache import TTSAudioCache, cache_key, get_tts_cache
+
+
+ELEVENLABS_API_URL = "https://api.elevenlabs.io"
 
 
 @dataclass
@@ -33,6 +43,48 @@ class TTSConfig:
     similarity_boost: float = 0.75  # 0-1, voice similarity to original
     style: float = 0.0  # 0-1, style exaggeration
     use_speaker_boost: bool = True
+    output_format: str = "mp3_44100_128"
+    optimize_streaming_latency: int = 3  # 0-4, higher = faster first byte
+    chunk_size: int = 4096  # Bytes per read from the HTTP stream
+    queue_chunks: int = 16  # Chunks read ahead of the consumer
+    timeout_seconds: float = 10.0
+
+    @property
+    def voice_settings(self) -> dict:
+        return {
+            "stability": self.stability,
+            "similarity_boost": self.similarity_boost,
+            "style": self.style,
+            "use_speaker_boost": self.use_speaker_boost,
+        }
+
+
+@dataclass
+class TTSRequestMetrics:
+    """Timing for one TTS request"""
+
+    request_id: str
+    voice_id: str
+    text_chars: int
+    started_at: datetime = field(default_factory=datetime.now)
+    first_byte_ms: Optional[float] = None
+    total_ms: Optional[float] = None
+    bytes_received: int = 0
+    chunks: int = 0
+    status: str = "streaming"  # streaming, completed, cached, cancelled, error
+
+    def to_dict(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "voice_id": self.voice_id,
+            "text_chars": self.text_chars,
+            "started_at": self.started_at.isoformat(),
+            "first_byte_ms": round(self.first_byte_ms, 2) if self.first_byte_ms is not None else None,
+            "total_ms": round(self.total_ms, 2) if self.total_ms is not None else None,
+            "bytes_received": self.bytes_received,
+            "chunks": self.chunks,
+            "status": self.status,
+        }
 
 
 class ElevenLabsTTS:
@@ -41,18 +93,62 @@ class ElevenLabsTTS:
 
     Provides streaming TTS with sub-250ms latency for natural
     conversational AI.
+
+    Audio is read from the HTTP streaming endpoint with an async client, so
+    waiting on the network never blocks the event loop. A bounded queue sits
+    between the network reader and the consumer: when the consumer (e.g. a
+    client WebSocket) falls behind, reading pauses and TCP flow control
+    pushes back on ElevenLabs.
+
+    With a cache, short utterances are looked up before any request is made
+    and stored once a request completes in full.
     """
 
+    METRICS_HISTORY = 200  # Recent requests kept for latency stats
+
     def __init__(
         self,
         api_key: str | None = None,
         config: TTSConfig | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        cache: TTSAudioCache | None = None,
     ):
         self.api_key = api_key or settings.ELEVENLABS_API_KEY
         self.config = config or TTSConfig()
-
-        # Initialize ElevenLabs client
-        self.client = ElevenLabs(api_key=self.api_key)
+        self.cache = cache
+
+        # One pooled client per service, created on first use
+        self._client = http_client
+        self.request_metrics: deque[TTSRequestMetrics] = deque(maxlen=self.METRICS_HISTORY)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=ELEVENLABS_API_URL,
+                headers={"xi-api-key": self.api_key or ""},
+                timeout=httpx.Timeout(self.config.timeout_seconds, read=None),
+            )
+        return self._client
+
+    async def close(self):
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def cache_key(self, text: str, voice_id: Optional[str] = None) -> str:
+        """Cache key for this text with the current voice configuration"""
+        return cache_key(
+            voice_id or self.config.voice_id,
+            self.config.model,
+            {
+                **self.config.voice_settings,
+                "optimize_streaming_latency": self.config.optimize_streaming_latency,
+            },
+            self.config.output_format,
+            text,
+        )
 
     async def stream_text_to_speech(
         self,
@@ -63,6 +159,8 @@ class ElevenLabsTTS:
         Stream text-to-speech audio.
 
         Yields audio chunks as they're generated for minimal latency.
+        Cached phrases are yielded straight from the cache. Timing for the
+        request is appended to `request_metrics`.
 
         Args:
             text: Text to convert to speech
@@ -72,34 +170,103 @@ class ElevenLabsTTS:
             Audio data chunks (bytes)
         """
         voice_id = voice_id or self.config.voice_id
-
-        # Configure voice settings
-        voice_settings = VoiceSettings(
-            stability=self.config.stability,
-            similarity_boost=self.config.similarity_boost,
-            style=self.config.style,
-            use_speaker_boost=self.config.use_speaker_boost,
+        metrics = TTSRequestMetrics(
+            request_id=uuid.uuid4().hex[:12], voice_id=voice_id, text_chars=len(text)
         )
+        self.request_metrics.append(metrics)
+
+        key = None
+        if self.cache is not None and self.cache.cacheable(text):
+            key = self.cache_key(text, voice_id)
+            start = time.perf_counter()
+            cached = await self.cache.get(key)
+            if cached is not None:
+                metrics.first_byte_ms = metrics.total_ms = (time.perf_counter() - start) * 1000
+                metrics.bytes_received = len(cached)
+                metrics.status = "cached"
+                view = memoryview(cached)
+                for offset in range(0, len(view), self.config.chunk_size):
+                    metrics.chunks += 1
+                    yield bytes(view[offset:offset + self.config.chunk_size])
+                return
+
+        audio = bytearray() if key else None
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.queue_chunks)
+        reader = asyncio.create_task(self._read_stream(text, voice_id, queue, metrics))
 
         try:
-            # Stream audio generation
-            audio_stream = self.client.generate(
-                text=text,
-                voice=voice_id,
-                model=self.config.model,
-                stream=True,
-                voice_settings=voice_settings,
-            )
-
-            # Yield audio chunks
-            for chunk in audio_stream:
-                if chunk:
-                    yield chunk
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                if audio is not None:
+                    audio += chunk
+                yield chunk
+            await reader  # Surface HTTP errors
+            metrics.status = "completed"
+            if audio:
+                await self.cache.put(key, bytes(audio))
+
+        except asyncio.CancelledError:
+            metrics.status = "cancelled"
+            raise
 
         except Exception as e:
+            metrics.status = "error"
             print(f"Error in TTS streaming: {e}")
             raise
 
+        finally:
+            if not reader.done():
+                # Consumer stopped early (e.g. barge-in): drop the request
+                metrics.status = "cancelled"
+                reader.cancel()
+
+    async def _read_stream(
+        self,
+        text: str,
+        voice_id: str,
+        queue: asyncio.Queue,
+        metrics: TTSRequestMetrics,
+    ):
+        """Read the HTTP audio stream into the bounded queue (None marks the end)"""
+        start = time.perf_counter()
+        cancelled = False
+        try:
+            async with self.client.stream(
+                "POST",
+                f"/v1/text-to-speech/{voice_id}/stream",
+                params={
+                    "output_format": self.config.output_format,
+                    "optimize_streaming_latency": self.config.optimize_streaming_latency,
+                },
+                json={
+                    "text": text,
+                    "model_id": self.config.model,
+                    "voice_settings": self.config.voice_settings,
+                },
+            ) as response:
+                if response.status_code != 200:
+                    body = await response.aread()
+                    raise RuntimeError(
+                        f"ElevenLabs returned {response.status_code}: {body[:200]!r}"
+                    )
+                async for chunk in response.aiter_bytes(self.config.chunk_size):
+                    if not chunk:
+                        continue
+                    if metrics.first_byte_ms is None:
+                        metrics.first_byte_ms = (time.perf_counter() - start) * 1000
+                    metrics.bytes_received += len(chunk)
+                    metrics.chunks += 1
+                    await queue.put(chunk)  # Blocks while the consumer is behind
+        except asyncio.CancelledError:
+            cancelled = True  # Consumer is gone; nobody waits for the end marker
+            raise
+        finally:
+            metrics.total_ms = (time.perf_counter() - start) * 1000
+            if not cancelled:
+                await queue.put(None)
+
     async def generate_speech(
         self,
         text: str,
@@ -117,30 +284,11 @@ class ElevenLabsTTS:
         Returns:
             Complete audio data (bytes)
         """
-        voice_id = voice_id or self.config.voice_id
-
-        voice_settings = VoiceSettings(
-            stability=self.config.stability,
-            similarity_boost=self.config.similarity_boost,
-            style=self.config.style,
-            use_speaker_boost=self.config.use_speaker_boost,
-        )
-
         try:
-            audio = self.client.generate(
-                text=text,
-                voice=voice_id,
-                model=self.config.model,
-                voice_settings=voice_settings,
-            )
-
-            # Convert generator to bytes if needed
-            if hasattr(audio, '__iter__'):
-                audio_bytes = b"".join(audio)
-            else:
-                audio_bytes = audio
-
-            return audio_bytes
+            audio = bytearray()
+            async for chunk in self.stream_text_to_speech(text, voice_id):
+                audio += chunk
+            return bytes(audio)
 
         except Exception as e:
             print(f"Error generating speech: {e}")
@@ -154,20 +302,53 @@ class ElevenLabsTTS:
             List of voice info dicts
         """
         try:
-            voices = self.client.voices.get_all()
+            response = await self.client.get("/v1/voices")
+            response.raise_for_status()
             return [
                 {
-                    "voice_id": voice.voice_id,
-                    "name": voice.name,
-                    "category": voice.category,
-                    "labels": voice.labels,
+                    "voice_id": voice["voice_id"],
+                    "name": voice.get("name"),
+                    "category": voice.get("category"),
+                    "labels": voice.get("labels"),
                 }
-                for voice in voices.voices
+                for voice in response.json().get("voices", [])
             ]
         except Exception as e:
             print(f"Error fetching voices: {e}")
             return []
 
+    def get_latency_stats(self) -> dict:
+        """
+        First-byte and total latency over recent requests.
+
+        Returns:
+            Percentiles (ms) and request counts by status
+        """
+        # Cache hits would hide ElevenLabs latency; they show up in statuses
+        finished = [
+            m for m in self.request_metrics
+            if m.first_byte_ms is not None and m.status != "cached"
+        ]
+        statuses: dict[str, int] = {}
+        for m in self.request_metrics:
+            statuses[m.status] = statuses.get(m.status, 0) + 1
+
+        cache = {"cache": self.cache.info()} if self.cache is not None else {}
+        if not finished:
+            return {"count": 0, "statuses": statuses, **cache}
+
+        first_byte = np.array([m.first_byte_ms for m in finished])
+        total = np.array([m.total_ms for m in finished if m.total_ms is not None])
+        return {
+            "count": len(finished),
+            "first_byte_p50_ms": round(float(np.percentile(first_byte, 50)), 2),
+            "first_byte_p95_ms": round(float(np.percentile(first_byte, 95)), 2),
+            "total_p50_ms": round(float(np.percentile(total, 50)), 2) if len(total) else None,
+            "statuses": statuses,
+            "last_request": self.request_metrics[-1].to_dict(),
+            **cache,
+        }
+
 
 # Coaching-optimized voice configurations
 COACHING_VOICES = {
@@ -195,6 +376,16 @@ COACHING_VOICES = {
 }
 
 
+def tts_config_for_profile(voice_profile: str) -> TTSConfig:
+    """TTS configuration for a coaching voice profile (default: professional)"""
+    voice_config = COACHING_VOICES.get(voice_profile, COACHING_VOICES["professional"])
+    return TTSConfig(
+        voice_id=voice_config["voice_id"],
+        stability=voice_config["stability"],
+        similarity_boost=voice_config["similarity_boost"],
+    )
+
+
 # Global TTS instance
 _tts_service: Optional[ElevenLabsTTS] = None
 
@@ -211,15 +402,15 @@ def get_tts_service(voice_profile: str = "professional") -> ElevenLabsTTS:
     """
     global _tts_service
 
-    voice_config = COACHING_VOICES.get(voice_profile, COACHING_VOICES["professional"])
-
-    config = TTSConfig(
-        voice_id=voice_config["voice_id"],
-        stability=voice_config["stability"],
-        similarity_boost=voice_config["similarity_boost"],
-    )
+    config = tts_config_for_profile(voice_profile)
 
-    if _tts_service is None or _tts_service.config.voice_id != config.voice_id:
-        _tts_service = ElevenLabsTTS(config=config)
+    if _tts_service is None:
+        _tts_service = ElevenLabsTTS(config=config, cache=get_tts_cache())
+    elif _tts_service.config.voice_id != config.voice_id:
+        # Keep the pooled connections: the previous instance may still be
+        # streaming, so its client is shared rather than closed
+        _tts_service = ElevenLabsTTS(
+            config=config, http_client=_tts_service.client, cache=_tts_service.cache
+        )
 
     return _tts_service
@@ -0,0 +1,296 @@
+"""
+TTS Phrase Cache
+
+Encoded TTS audio for short, frequently repeated utterances ("Nice work,
+next set", rep counts, rest-timer callouts, the "didn't quite catch that"
+fallback), kept on disk with an in-memory LRU in front.
+
+Entries are keyed by everything that changes the audio: voice, model,
+voice settings, output format and the normalized text. A hit streams from
+memory with no ElevenLabs request; a disk hit costs one file read.
+
+Sprint 32: Voice AI Sub-500ms
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.voice.segmenter import split_for_speech
+
+
+# Utterances every voice profile says constantly
+COMMON_PHRASES = [
+    "Nice work, next set.",
+    "Great set!",
+    "Last rep!",
+    "Halfway there.",
+    "Take a breath.",
+    "Rest for sixty seconds.",
+    "Rest for ninety seconds.",
+    "Rest for two minutes.",
+    "Thirty seconds left.",
+    "Ten seconds.",
+    "Three, two, one, go!",
+    "Time's up, let's go.",
+    *[f"{n}." for n in (
+        "One", "Two", "Three", "Four", "Five", "Six",
+        "Seven", "Eight", "Nine", "Ten", "Eleven", "Twelve",
+    )],
+    "Same again. You've got this.",  # commands.TEMPLATES
+    "Skipping it. On to the next one.",
+    "I'm sorry, I didn't quite catch that. Could you repeat?",  # realtime.FALLBACK_REPLY
+]
+
+# Extra phrases per voice profile (on top of COMMON_PHRASES and
+# settings.TTS_PREWARM_PHRASES)
+PROFILE_PHRASES: dict[str, list[str]] = {
+    "professional": ["Good form. Keep it controlled."],
+    "energetic": ["Let's go! You've got this!", "Crushing it!"],
+    "calm": ["Nice and steady.", "Breathe in, and breathe out."],
+}
+
+
+def normalize_text(text: str) -> str:
+    """Text as it matters for audio: NFKC, case-folded, single spaces"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+
+def cache_key(voice_id: str, model: str, voice_settings: dict, output_format: str, text: str) -> str:
+    """Stable key for one utterance's audio"""
+    payload = json.dumps(
+        [voice_id, model, voice_settings, output_format, normalize_text(text)],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class TTSCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+
+class TTSAudioCache:
+    """
+    Disk-backed audio cache with an in-memory LRU front.
+
+    Both tiers are bounded in bytes. Disk entries are evicted oldest-used
+    first (file mtime is bumped on every disk hit).
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        memory_bytes: int = 64 * 1024 * 1024,
+        disk_bytes: int = 1024 * 1024 * 1024,
+        max_chars: int = 120,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.max_chars = max_chars
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_used = 0
+        self._disk_used = sum(f.stat().st_size for f in self.directory.glob("*/*.audio"))
+        self._lock = threading.Lock()
+        self.stats = TTSCacheStats()
+
+    def cacheable(self, text: str) -> bool:
+        """Only short utterances repeat often enough to be worth caching"""
+        return 0 < len(text.strip()) <= self.max_chars
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.audio"
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        """Memory tier only (never blocks on IO)"""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+            return audio
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Memory tier, then disk (read off the event loop)"""
+        audio = self.get_memory(key)
+        if audio is not None:
+            return audio
+
+        audio = await asyncio.to_thread(self._read_disk, key)
+        with self._lock:
+            if audio is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+        self._remember(key, audio)
+        return audio
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+            os.utime(path)  # Mark as recently used
+            return audio
+        except FileNotFoundError:
+            return None
+
+    # ------------------------------------------------------------------
+    # Store
+    # ------------------------------------------------------------------
+
+    async def put(self, key: str, audio: bytes) -> None:
+        """Store audio in both tiers"""
+        if not audio:
+            return
+        self._remember(key, audio)
+        await asyncio.to_thread(self._write_disk, key, audio)
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_used -= len(previous)
+            self._memory[key] = audio
+            self._memory_used += len(audio)
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= len(evicted)
+
+    def _write_disk(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(audio)
+        tmp.replace(path)
+        with self._lock:
+            self._disk_used += len(audio)
+            self.stats.writes += 1
+            over = self._disk_used > self.disk_bytes
+        if over:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used files down to 90% of the budget"""
+        files = sorted(
+            ((f.stat().st_mtime, f.stat().st_size, f) for f in self.directory.glob("*/*.audio")),
+            key=lambda item: item[0],
+        )
+        target = int(self.disk_bytes * 0.9)
+        with self._lock:
+            used = sum(size for _, size, _ in files)
+            for _, size, f in files:
+                if used <= target:
+                    break
+                f.unlink(missing_ok=True)
+                used -= size
+                self.stats.evictions += 1
+            self._disk_used = used
+
+    def info(self) -> dict:
+        """Sizes and hit counts"""
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "disk_bytes": self._disk_used,
+                **self.stats.to_dict(),
+            }
+
+
+def prewarm_phrases(voice_profile: str) -> list[str]:
+    """
+    Fragments to pre-generate for a voice profile.
+
+    Phrases are split the way replies are spoken, so the cached entries
+    are the ones sessions actually request.
+    """
+    phrases = [
+        *COMMON_PHRASES,
+        *PROFILE_PHRASES.get(voice_profile, []),
+        *settings.TTS_PREWARM_PHRASES.get(voice_profile, []),
+    ]
+    return list(dict.fromkeys(f for phrase in phrases for f in split_for_speech(phrase)))
+
+
+async def prewarm_tts_cache(voice_profiles: Optional[list[str]] = None) -> dict[str, int]:
+    """
+    Synthesize each profile's phrase list into the cache.
+
+    Phrases already cached are skipped, so this is cheap after the first
+    run as long as TTS_CACHE_DIR survives restarts (an instance's local disk
+    doesn't on Cloud Run). Returns the number of phrases generated per profile.
+    """
+    from app.voice.tts import COACHING_VOICES, ElevenLabsTTS, tts_config_for_profile
+
+    cache = get_tts_cache()
+    generated = {}
+    for profile in voice_profiles or list(COACHING_VOICES):
+        tts = ElevenLabsTTS(config=tts_config_for_profile(profile), cache=cache)
+        count = 0
+        start = time.time()
+        try:
+            for phrase in prewarm_phrases(profile):
+                if await cache.get(tts.cache_key(phrase)) is None:
+                    await tts.generate_speech(phrase)
+                    count += 1
+        except Exception as e:
+            print(f"TTS cache prewarm failed for {profile}: {e}")
+        finally:
+            await tts.close()
+        generated[profile] = count
+        print(f"🔊 TTS cache prewarmed {profile}: {count} new phrases in {time.time() - start:.1f}s")
+    return generated
+
+
+# Global instance
+_tts_cache: Optional[TTSAudioCache] = None
+
+
+def get_tts_cache() -> TTSAudioCache:
+    """Get or create global TTS audio cache"""
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TTSAudioCache(
+            settings.TTS_CACHE_DIR,
+            memory_bytes=settings.TTS_CACHE_MEMORY_MB * 1024 * 1024,
+            disk_bytes=settings.TTS_CACHE_DISK_MB * 1024 * 1024,
+            max_chars=settings.TTS_CACHE_MAX_CHARS,
+        )
+    return _tts_cache
@@ -0,0 +1,26 @@
+"""
+Wearable Data Storage
+
+Local time-series storage for synced wearable metrics (HRV, resting HR,
+sleep, steps, body weight) with daily and weekly rollups computed at ingest.
+
+Consumers:
+- Recovery endpoints (stored HRV history instead of client-posted history)
+- Health MCP server (range queries and summaries)
+"""
+
+from app.wearables.timeseries_store import (
+    WearableTimeSeriesStore,
+    WearableMetric,
+    Granularity,
+    RollupBlock,
+    get_wearable_store,
+)
+
+__all__ = [
+    "WearableTimeSeriesStore",
+    "WearableMetric",
+    "Granularity",
+    "RollupBlock",
+    "get_wearable_store",
+]
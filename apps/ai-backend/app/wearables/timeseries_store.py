@@ -0,0 +1,682 @@
+"""
+Wearable Time-Series Store
+
+Local storage layer for synced wearable metrics (HRV, resting HR, sleep,
+steps, body weight).
+
+Layout:
+- Raw samples are written as append-only columnar segments per
+  (user, metric): one row holds a packed float64 timestamp column and a
+  packed float64 value column for a whole ingest batch.
+- Daily and weekly rollups (count, sum, sum of squares, min, max, last)
+  are merged into the rollup table at ingest time.
+- A sample is identified by (user, metric, timestamp). Re-syncing an
+  overlapping window replaces the stored samples at those timestamps and
+  rebuilds the affected rollups instead of counting them twice.
+
+Range queries, summaries and correlations read the pre-aggregated rollup
+blocks, so they cost O(days) instead of O(raw samples).
+
+Every ingest bumps a per-(user, metric) data version, which query caches
+use to drop results computed before a sync.
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+
+SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+
+class WearableMetric(str, Enum):
+    """Metrics kept in the store (values match HealthMetric in the MCP server)"""
+
+    HRV = "hrv"
+    RESTING_HR = "resting_heart_rate"
+    SLEEP_DURATION = "sleep_duration"
+    STEPS = "steps"
+    BODY_WEIGHT = "body_weight"
+
+
+class Granularity(str, Enum):
+    """Rollup bucket sizes"""
+
+    DAY = "day"
+    WEEK = "week"  # ISO weeks, starting Monday
+
+
+METRIC_UNITS: dict[WearableMetric, str] = {
+    WearableMetric.HRV: "ms",
+    WearableMetric.RESTING_HR: "bpm",
+    WearableMetric.SLEEP_DURATION: "hours",
+    WearableMetric.STEPS: "steps",
+    WearableMetric.BODY_WEIGHT: "lbs",
+}
+
+# Metrics whose bucket value is a total (steps, sleep sessions incl. naps);
+# every other metric reports the bucket mean.
+SUMMED_METRICS = frozenset({WearableMetric.STEPS, WearableMetric.SLEEP_DURATION})
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    user_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    sample_count INTEGER NOT NULL,
+    ts_column BLOB NOT NULL,
+    value_column BLOB NOT NULL,
+    PRIMARY KEY (user_id, metric, seq)
+);
+CREATE TABLE IF NOT EXISTS rollups (
+    user_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    sample_count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    total_sq REAL NOT NULL,
+    min_value REAL NOT NULL,
+    max_value REAL NOT NULL,
+    last_value REAL NOT NULL,
+    last_ts REAL NOT NULL,
+    PRIMARY KEY (user_id, metric, granularity, bucket)
+);
+CREATE TABLE IF NOT EXISTS data_versions (
+    user_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (user_id, metric)
+);
+"""
+
+_UPSERT_ROLLUP = """
+INSERT INTO rollups (
+    user_id, metric, granularity, bucket, sample_count, total, total_sq,
+    min_value, max_value, last_value, last_ts
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (user_id, metric, granularity, bucket) DO UPDATE SET
+    sample_count = sample_count + excluded.sample_count,
+    total = total + excluded.total,
+    total_sq = total_sq + excluded.total_sq,
+    min_value = MIN(min_value, excluded.min_value),
+    max_value = MAX(max_value, excluded.max_value),
+    last_value = CASE WHEN excluded.last_ts >= last_ts
+        THEN excluded.last_value ELSE last_value END,
+    last_ts = MAX(last_ts, excluded.last_ts)
+"""
+
+_REPLACE_ROLLUP = """
+INSERT OR REPLACE INTO rollups (
+    user_id, metric, granularity, bucket, sample_count, total, total_sq,
+    min_value, max_value, last_value, last_ts
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def to_epoch_seconds(timestamp: datetime) -> float:
+    """Convert a datetime to store seconds (naive local time; aware values go to UTC)"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH).total_seconds()
+
+
+def from_epoch_seconds(seconds: float) -> datetime:
+    """Inverse of to_epoch_seconds"""
+    return _EPOCH + timedelta(seconds=float(seconds))
+
+
+def day_index(day: date) -> int:
+    """Days since 1970-01-01"""
+    return day.toordinal() - _EPOCH_ORDINAL
+
+
+def day_from_index(index: int) -> date:
+    """Inverse of day_index"""
+    return date.fromordinal(int(index) + _EPOCH_ORDINAL)
+
+
+def week_start_index(days: np.ndarray) -> np.ndarray:
+    """Map day indices to the day index of their ISO week's Monday (1970-01-01 was a Thursday)"""
+    return days - (days + 3) % 7
+
+
+@dataclass
+class RollupBlock:
+    """Pre-aggregated buckets for one (user, metric) over a range, oldest first"""
+
+    metric: WearableMetric
+    granularity: Granularity
+    buckets: np.ndarray  # int64 day index of bucket start
+    count: np.ndarray
+    total: np.ndarray
+    total_sq: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    last: np.ndarray
+    last_ts: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.buckets.size)
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean of raw samples per bucket"""
+        return self.total / np.maximum(self.count, 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        """Population standard deviation of raw samples per bucket"""
+        n = np.maximum(self.count, 1)
+        variance = self.total_sq / n - (self.total / n) ** 2
+        return np.sqrt(np.clip(variance, 0.0, None))
+
+    @property
+    def values(self) -> np.ndarray:
+        """Bucket value for the metric: total for summed metrics, mean otherwise"""
+        if self.metric in SUMMED_METRICS:
+            return self.total
+        return self.mean
+
+    @property
+    def dates(self) -> list[date]:
+        """Bucket start dates"""
+        return [day_from_index(b) for b in self.buckets]
+
+
+def _empty_block(metric: WearableMetric, granularity: Granularity) -> RollupBlock:
+    empty_i = np.empty(0, dtype=np.int64)
+    empty_f = np.empty(0, dtype=np.float64)
+    return RollupBlock(
+        metric=metric,
+        granularity=granularity,
+        buckets=empty_i,
+        count=empty_i,
+        total=empty_f,
+        total_sq=empty_f,
+        minimum=empty_f,
+        maximum=empty_f,
+        last=empty_f,
+        last_ts=empty_f,
+    )
+
+
+def summarize_block(block: RollupBlock) -> dict[str, Any]:
+    """
+    Summary statistics over a block of daily rollups.
+
+    Returns the summary the MCP health server reports:
+    count, average, min, max, latest, trend, trend_slope, unit, time_range.
+    """
+    if not len(block):
+        return {}
+
+    values = block.values
+    # Least-squares slope per day, on the real calendar axis (gaps allowed)
+    x = (block.buckets - block.buckets[0]).astype(np.float64)
+    x_centered = x - x.mean()
+    denominator = float(np.dot(x_centered, x_centered))
+    slope = float(np.dot(x_centered, values - values.mean()) / denominator) if denominator else 0.0
+
+    trend = "increasing" if slope > 0.5 else "decreasing" if slope < -0.5 else "stable"
+
+    return {
+        "count": len(block),
+        "average": round(float(values.mean()), 2),
+        "min": round(float(values.min()), 2),
+        "max": round(float(values.max()), 2),
+        "latest": round(float(values[-1]), 2),
+        "trend": trend,
+        "trend_slope": round(slope, 4),
+        "unit": METRIC_UNITS[block.metric],
+        "time_range": {
+            "start": day_from_index(block.buckets[0]).isoformat(),
+            "end": day_from_index(block.buckets[-1]).isoformat(),
+        },
+    }
+
+
+def _aggregate(
+    buckets: np.ndarray, timestamps: np.ndarray, values: np.ndarray
+) -> list[tuple[int, int, float, float, float, float, float, float]]:
+    """
+    Reduce time-sorted samples into per-bucket aggregates.
+
+    Returns rows of (bucket, count, total, total_sq, min, max, last, last_ts).
+    """
+    keys, starts, counts = np.unique(buckets, return_index=True, return_counts=True)
+    ends = starts + counts - 1
+    totals = np.add.reduceat(values, starts)
+    totals_sq = np.add.reduceat(values * values, starts)
+    mins = np.minimum.reduceat(values, starts)
+    maxs = np.maximum.reduceat(values, starts)
+    return list(
+        zip(
+            keys.tolist(),
+            counts.tolist(),
+            totals.tolist(),
+            totals_sq.tolist(),
+            mins.tolist(),
+            maxs.tolist(),
+            values[ends].tolist(),
+            timestamps[ends].tolist(),
+        )
+    )
+
+
+def _rollup_rows(
+    user_id: str, metric: WearableMetric, ts: np.ndarray, vals: np.ndarray
+) -> list[tuple]:
+    """Day and week rollup rows for time-sorted samples"""
+    days = np.floor(ts / SECONDS_PER_DAY).astype(np.int64)
+    rows = [
+        (user_id, metric.value, Granularity.DAY.value, *row)
+        for row in _aggregate(days, ts, vals)
+    ]
+    rows.extend(
+        (user_id, metric.value, Granularity.WEEK.value, *row)
+        for row in _aggregate(week_start_index(days), ts, vals)
+    )
+    return rows
+
+
+class WearableTimeSeriesStore:
+    """
+    SQLite-backed wearable time-series store.
+
+    One connection is shared per store and guarded by a lock, so the store
+    can be used from FastAPI handlers and background sync jobs alike.
+    Pass ":memory:" as the path for an ephemeral store.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        user_id: str,
+        metric: WearableMetric,
+        timestamps: Sequence[datetime],
+        values: Sequence[float],
+    ) -> int:
+        """
+        Append a batch of samples as a new segment and merge its rollups.
+
+        Samples at timestamps that are already stored (a re-synced window)
+        replace the stored ones, and the rollups of their weeks are rebuilt
+        from raw samples. Within a batch, the last value for a timestamp wins.
+
+        Args:
+            user_id: User ID
+            metric: Wearable metric
+            timestamps: Sample timestamps (any order)
+            values: Sample values, aligned with timestamps
+
+        Returns:
+            Number of samples written
+        """
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values must have the same length")
+        if not timestamps:
+            return 0
+
+        metric = WearableMetric(metric)
+        ts = np.fromiter((to_epoch_seconds(t) for t in timestamps), dtype=np.float64)
+        vals = np.asarray(values, dtype=np.float64)
+        if not np.all(np.isfinite(vals)):
+            raise ValueError("values must be finite")
+
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+        vals = vals[order]
+        # Duplicate timestamps within the batch: keep the last one sent
+        keep = np.append(ts[1:] != ts[:-1], True)
+        ts = ts[keep]
+        vals = vals[keep]
+
+        with self._lock, self._conn:
+            replaced = self._drop_stored_samples(user_id, metric, ts)
+            (next_seq,) = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM segments WHERE user_id = ? AND metric = ?",
+                (user_id, metric.value),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    user_id,
+                    metric.value,
+                    next_seq,
+                    float(ts[0]),
+                    float(ts[-1]),
+                    int(ts.size),
+                    ts.tobytes(),
+                    vals.tobytes(),
+                ),
+            )
+            if replaced:
+                # Rebuild every bucket the batch touches from raw samples
+                days = np.floor(ts / SECONDS_PER_DAY).astype(np.int64)
+                weeks = np.unique(week_start_index(days))
+                all_ts, all_vals = self._raw_between(
+                    user_id, metric,
+                    float(weeks[0]) * SECONDS_PER_DAY,
+                    float(weeks[-1] + 7) * SECONDS_PER_DAY,
+                )
+                days = np.floor(all_ts / SECONDS_PER_DAY).astype(np.int64)
+                in_weeks = np.isin(week_start_index(days), weeks)
+                self._conn.executemany(
+                    _REPLACE_ROLLUP,
+                    _rollup_rows(user_id, metric, all_ts[in_weeks], all_vals[in_weeks]),
+                )
+            else:
+                self._conn.executemany(_UPSERT_ROLLUP, _rollup_rows(user_id, metric, ts, vals))
+            self._conn.execute(
+                "INSERT INTO data_versions VALUES (?, ?, 1) "
+                "ON CONFLICT (user_id, metric) DO UPDATE SET version = version + 1",
+                (user_id, metric.value),
+            )
+
+        return int(ts.size)
+
+    def _drop_stored_samples(self, user_id: str, metric: WearableMetric, ts: np.ndarray) -> int:
+        """
+        Remove stored samples at any of the (sorted) timestamps `ts`.
+
+        Runs inside append's transaction. Returns the number removed.
+        """
+        segments = self._conn.execute(
+            "SELECT seq, ts_column, value_column FROM segments "
+            "WHERE user_id = ? AND metric = ? AND end_ts >= ? AND start_ts <= ?",
+            (user_id, metric.value, float(ts[0]), float(ts[-1])),
+        ).fetchall()
+        removed = 0
+        for seq, ts_column, value_column in segments:
+            seg_ts = np.frombuffer(ts_column, dtype=np.float64)
+            stale = np.isin(seg_ts, ts)
+            if not stale.any():
+                continue
+            removed += int(stale.sum())
+            seg_ts = seg_ts[~stale]
+            seg_vals = np.frombuffer(value_column, dtype=np.float64)[~stale]
+            if not seg_ts.size:
+                self._conn.execute(
+                    "DELETE FROM segments WHERE user_id = ? AND metric = ? AND seq = ?",
+                    (user_id, metric.value, seq),
+                )
+                continue
+            self._conn.execute(
+                "UPDATE segments SET start_ts = ?, end_ts = ?, sample_count = ?, "
+                "ts_column = ?, value_column = ? WHERE user_id = ? AND metric = ? AND seq = ?",
+                (
+                    float(seg_ts.min()),
+                    float(seg_ts.max()),
+                    int(seg_ts.size),
+                    seg_ts.tobytes(),
+                    seg_vals.tobytes(),
+                    user_id,
+                    metric.value,
+                    seq,
+                ),
+            )
+        return removed
+
+    def _raw_between(
+        self, user_id: str, metric: WearableMetric, start_s: float, end_s: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Time-sorted raw samples in [start_s, end_s) (caller holds the lock)"""
+        segments = self._conn.execute(
+            "SELECT ts_column, value_column FROM segments "
+            "WHERE user_id = ? AND metric = ? AND end_ts >= ? AND start_ts < ?",
+            (user_id, metric.value, start_s, end_s),
+        ).fetchall()
+        if not segments:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+        ts = np.concatenate([np.frombuffer(seg[0], dtype=np.float64) for seg in segments])
+        vals = np.concatenate([np.frombuffer(seg[1], dtype=np.float64) for seg in segments])
+        mask = (ts >= start_s) & (ts < end_s)
+        order = np.argsort(ts[mask], kind="stable")
+        return ts[mask][order], vals[mask][order]
+
+    def append_samples(
+        self,
+        user_id: str,
+        metric: WearableMetric,
+        samples: Iterable[tuple[datetime, float]],
+    ) -> int:
+        """Append (timestamp, value) pairs; see append()"""
+        pairs = list(samples)
+        return self.append(user_id, metric, [p[0] for p in pairs], [p[1] for p in pairs])
+
+    def compact(self, user_id: str, metric: WearableMetric) -> int:
+        """
+        Merge all segments of a (user, metric) into a single time-sorted segment.
+
+        Rollups are unaffected. Returns the number of segments merged.
+        """
+        metric = WearableMetric(metric)
+        with self._lock, self._conn:
+            segments = self._conn.execute(
+                "SELECT ts_column, value_column FROM segments "
+                "WHERE user_id = ? AND metric = ? ORDER BY seq",
+                (user_id, metric.value),
+            ).fetchall()
+            if len(segments) <= 1:
+                return len(segments)
+
+            ts = np.concatenate([np.frombuffer(s[0], dtype=np.float64) for s in segments])
+            vals = np.concatenate([np.frombuffer(s[1], dtype=np.float64) for s in segments])
+            order = np.argsort(ts, kind="stable")
+            ts = ts[order]
+            vals = vals[order]
+
+            self._conn.execute(
+                "DELETE FROM segments WHERE user_id = ? AND metric = ?",
+                (user_id, metric.value),
+            )
+            self._conn.execute(
+                "INSERT INTO segments VALUES (?, ?, 0, ?, ?, ?, ?, ?)",
+                (
+                    user_id,
+                    metric.value,
+                    float(ts[0]),
+                    float(ts[-1]),
+                    int(ts.size),
+                    ts.tobytes(),
+                    vals.tobytes(),
+                ),
+            )
+        return len(segments)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def read_raw(
+        self,
+        user_id: str,
+        metric: WearableMetric,
+        start: datetime,
+        end: datetime,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Read raw samples in [start, end].
+
+        Returns:
+            (timestamps as epoch seconds, values), both float64 and time-sorted
+        """
+        metric = WearableMetric(metric)
+        start_s = to_epoch_seconds(start)
+        end_s = to_epoch_seconds(end)
+        with self._lock:
+            segments = self._conn.execute(
+                "SELECT ts_column, value_column FROM segments "
+                "WHERE user_id = ? AND metric = ? AND end_ts >= ? AND start_ts <= ? "
+                "ORDER BY seq",
+                (user_id, metric.value, start_s, end_s),
+            ).fetchall()
+
+        if not segments:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+
+        ts = np.concatenate([np.frombuffer(s[0], dtype=np.float64) for s in segments])
+        vals = np.concatenate([np.frombuffer(s[1], dtype=np.float64) for s in segments])
+        mask = (ts >= start_s) & (ts <= end_s)
+        ts = ts[mask]
+        vals = vals[mask]
+        order = np.argsort(ts, kind="stable")
+        return ts[order], vals[order]
+
+    def read_rollups(
+        self,
+        user_id: str,
+        metric: WearableMetric,
+        start: date | datetime,
+        end: date | datetime,
+        granularity: Granularity = Granularity.DAY,
+    ) -> RollupBlock:
+        """
+        Read pre-aggregated buckets whose start falls in [start, end].
+
+        For weekly rollups, `start` is snapped back to its week's Monday.
+        """
+        metric = WearableMetric(metric)
+        granularity = Granularity(granularity)
+        start_day = day_index(start.date() if isinstance(start, datetime) else start)
+        end_day = day_index(end.date() if isinstance(end, datetime) else end)
+        if granularity == Granularity.WEEK:
+            start_day = int(week_start_index(np.int64(start_day)))
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket, sample_count, total, total_sq, min_value, max_value, "
+                "last_value, last_ts FROM rollups "
+                "WHERE user_id = ? AND metric = ? AND granularity = ? "
+                "AND bucket BETWEEN ? AND ? ORDER BY bucket",
+                (user_id, metric.value, granularity.value, start_day, end_day),
+            ).fetchall()
+
+        if not rows:
+            return _empty_block(metric, granularity)
+
+        columns = np.array(rows, dtype=np.float64).T
+        return RollupBlock(
+            metric=metric,
+            granularity=granularity,
+            buckets=columns[0].astype(np.int64),
+            count=columns[1].astype(np.int64),
+            total=columns[2],
+            total_sq=columns[3],
+            minimum=columns[4],
+            maximum=columns[5],
+            last=columns[6],
+            last_ts=columns[7],
+        )
+
+    def has_data(self, user_id: str, metric: WearableMetric) -> bool:
+        """Whether any samples have been stored for (user, metric)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM segments WHERE user_id = ? AND metric = ? LIMIT 1",
+                (user_id, WearableMetric(metric).value),
+            ).fetchone()
+        return row is not None
+
+    def data_version(self, user_id: str, metric: WearableMetric) -> int:
+        """Counter bumped by every ingest for (user, metric); 0 before the first"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM data_versions WHERE user_id = ? AND metric = ?",
+                (user_id, WearableMetric(metric).value),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def summarize(
+        self,
+        user_id: str,
+        metric: WearableMetric,
+        start: date | datetime,
+        end: date | datetime,
+    ) -> dict[str, Any]:
+        """
+        Summary statistics over daily rollups.
+
+        Returns the summary the MCP health server reports:
+        count, average, min, max, latest, trend, trend_slope, unit, time_range.
+        """
+        return summarize_block(self.read_rollups(user_id, metric, start, end, Granularity.DAY))
+
+    def correlate(
+        self,
+        user_id: str,
+        metric_a: WearableMetric,
+        metric_b: WearableMetric,
+        start: date | datetime,
+        end: date | datetime,
+        lag_days: int = 0,
+    ) -> dict[str, Any]:
+        """
+        Pearson correlation between two metrics' daily values.
+
+        Days are aligned on the calendar; with lag_days=N, metric_a on day d
+        is paired with metric_b on day d+N. Days missing from either series
+        are dropped.
+        """
+        block_a = self.read_rollups(user_id, metric_a, start, end, Granularity.DAY)
+        block_b = self.read_rollups(user_id, metric_b, start, end, Granularity.DAY)
+
+        _, idx_a, idx_b = np.intersect1d(
+            block_a.buckets + lag_days, block_b.buckets, return_indices=True
+        )
+        a = block_a.values[idx_a]
+        b = block_b.values[idx_b]
+
+        coefficient: Optional[float] = None
+        if a.size >= 3 and a.std() > 0 and b.std() > 0:
+            coefficient = round(float(np.corrcoef(a, b)[0, 1]), 4)
+
+        return {
+            "metric_a": WearableMetric(metric_a).value,
+            "metric_b": WearableMetric(metric_b).value,
+            "lag_days": lag_days,
+            "paired_days": int(a.size),
+            "correlation": coefficient,
+        }
+
+
+# Singleton instance
+_store: Optional[WearableTimeSeriesStore] = None
+
+
+def get_wearable_store() -> WearableTimeSeriesStore:
+    """Get singleton WearableTimeSeriesStore instance"""
+    global _store
+    if _store is None:
+        _store = WearableTimeSeriesStore(settings.WEARABLE_STORE_PATH)
+    return _store
@@ -13,6 +13,7 @@ Sprint 33: AI Workout Generation
 from app.workout_gen.generator import WorkoutGenerator, GenerationConfig
 from app.workout_gen.periodization import Periodizer, PeriodizationBlock
 from app.workout_gen.autoregulation import LoadManager, ReadinessScore
+from app.workout_gen.program_autoregulation import ProgramAutoregulator, ProgramTable
 
 __all__ = [
     "WorkoutGenerator",
@@ -21,4 +22,6 @@ __all__ = [
     "PeriodizationBlock",
     "LoadManager",
     "ReadinessScore",
+    "ProgramAutoregulator",
+    "ProgramTable",
 ]
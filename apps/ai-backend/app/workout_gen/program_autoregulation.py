@@ -0,0 +1,322 @@
+"""
+Program-Level Auto-Regulation
+
+Applies LoadManager's readiness rules to an entire program in one pass.
+
+A program is flattened into a structured NumPy array with one row per
+exercise (sets, RPE, load, rest, position in the program). Daily readiness
+becomes an adjustment multiplier per workout, and the remaining block is
+re-planned with array operations instead of adjusting and copying one
+Exercise at a time. Workout objects are only rebuilt at the API edge.
+
+Sprint 33: AI Workout Generation
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.workout_gen.autoregulation import LoadManager
+from app.workout_gen.generator import Exercise, Workout
+
+
+# One row per exercise. RPE and load are NaN when not prescribed.
+EXERCISE_DTYPE = np.dtype([
+    ("workout", np.int32),  # Index into ProgramTable.workouts
+    ("week", np.int16),
+    ("day", np.int16),
+    ("sets", np.int16),
+    ("rpe", np.float64),
+    ("load_kg", np.float64),
+    ("rest_seconds", np.int32),
+])
+
+
+@dataclass
+class ProgramTable:
+    """
+    Columnar view of a program's exercises.
+
+    Text fields (names, reps, notes) stay on the original Workout objects and
+    are looked up by row index; autoregulation never changes them.
+    """
+
+    workouts: list[Workout]
+    rows: np.ndarray  # EXERCISE_DTYPE, ordered by workout then exercise
+    offsets: np.ndarray  # rows[offsets[i]:offsets[i + 1]] belong to workout i
+
+    @classmethod
+    def from_workouts(
+        cls,
+        workouts: Sequence[Workout],
+        loads_kg: Optional[dict[str, float]] = None,
+    ) -> "ProgramTable":
+        """
+        Flatten workouts into a table.
+
+        Args:
+            workouts: Program workouts in training order
+            loads_kg: Optional working load per exercise name
+
+        Returns:
+            ProgramTable sharing the given Workout objects
+        """
+        loads_kg = loads_kg or {}
+        workouts = list(workouts)
+        counts = np.array([len(w.exercises) for w in workouts], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        rows = np.empty(int(offsets[-1]), dtype=EXERCISE_DTYPE)
+        rows["workout"] = np.repeat(np.arange(len(workouts)), counts)
+        rows["week"] = np.repeat([w.week_number for w in workouts], counts)
+        rows["day"] = np.repeat([w.day_number for w in workouts], counts)
+
+        exercises = [e for w in workouts for e in w.exercises]
+        rows["sets"] = [e.sets for e in exercises]
+        rows["rpe"] = [np.nan if e.rpe is None else e.rpe for e in exercises]
+        rows["load_kg"] = [loads_kg.get(e.name, np.nan) for e in exercises]
+        rows["rest_seconds"] = [e.rest_seconds for e in exercises]
+
+        return cls(workouts=workouts, rows=rows, offsets=offsets)
+
+    def __len__(self) -> int:
+        return len(self.workouts)
+
+    def exercise(self, row: int) -> Exercise:
+        """Original Exercise for a row"""
+        w = int(self.rows["workout"][row])
+        return self.workouts[w].exercises[row - int(self.offsets[w])]
+
+    def to_workouts(self, start: int = 0, end: Optional[int] = None) -> list[Workout]:
+        """Rebuild Workout objects with this table's numbers"""
+        end = len(self.workouts) if end is None else end
+        result = []
+        for w in range(start, end):
+            original = self.workouts[w]
+            block = self.rows[self.offsets[w]:self.offsets[w + 1]]
+            result.append(
+                Workout(
+                    day_number=original.day_number,
+                    week_number=original.week_number,
+                    name=original.name,
+                    exercises=[
+                        Exercise(
+                            name=e.name,
+                            sets=int(row["sets"]),
+                            reps=e.reps,
+                            rpe=None if np.isnan(row["rpe"]) else float(row["rpe"]),
+                            rest_seconds=int(row["rest_seconds"]),
+                            tempo=e.tempo,
+                            notes=e.notes,
+                            substitutions=e.substitutions,
+                        )
+                        for e, row in zip(original.exercises, block)
+                    ],
+                    warmup_notes=original.warmup_notes,
+                    cooldown_notes=original.cooldown_notes,
+                    total_duration_minutes=original.total_duration_minutes,
+                )
+            )
+        return result
+
+    def to_records(self, start: int = 0, end: Optional[int] = None) -> list[dict]:
+        """Serialize workouts (with load_kg) straight from the arrays"""
+        end = len(self.workouts) if end is None else end
+        rows = self.rows[self.offsets[start]:self.offsets[end]]
+        sets = rows["sets"].tolist()
+        rpe = [None if np.isnan(v) else v for v in rows["rpe"].tolist()]
+        load = [None if np.isnan(v) else v for v in rows["load_kg"].tolist()]
+        rest = rows["rest_seconds"].tolist()
+
+        records = []
+        i = 0
+        for w in self.workouts[start:end]:
+            exercises = []
+            for e in w.exercises:
+                exercises.append({
+                    "name": e.name,
+                    "sets": sets[i],
+                    "reps": e.reps,
+                    "rpe": rpe[i],
+                    "load_kg": load[i],
+                    "rest_seconds": rest[i],
+                })
+                i += 1
+            records.append({
+                "day_number": w.day_number,
+                "week_number": w.week_number,
+                "name": w.name,
+                "exercises": exercises,
+            })
+        return records
+
+
+class ProgramAutoregulator:
+    """
+    Vectorized LoadManager rules over a whole program.
+
+    Per-day inputs are arrays (NaN = not measured); results match calling
+    LoadManager.calculate_readiness / adjust_workout_load /
+    calculate_rpe_based_load once per workout and exercise.
+    """
+
+    # Composite score cutoffs and the load multiplier for each band,
+    # matching LoadManager.calculate_readiness
+    READINESS_CUTOFFS = np.array([90.0, 75.0, 60.0, 40.0])
+    READINESS_ADJUSTMENTS = np.array([1.10, 1.0, 0.90, 0.70, 0.50])
+    DEFAULT_COMPOSITE = 75.0
+
+    def __init__(self):
+        weights = LoadManager.READINESS_WEIGHTS
+        self._weights = np.array([
+            weights["hrv"],
+            weights["sleep_quality"],
+            weights["sleep_duration"],
+            weights["rhr"],
+            weights["subjective"],
+        ])
+
+    def composite_scores(
+        self,
+        hrv_score=None,
+        sleep_quality=None,
+        sleep_duration_hours=None,
+        resting_heart_rate=None,
+        subjective_readiness=None,
+        baseline_rhr=None,
+    ) -> np.ndarray:
+        """
+        Composite readiness (0-100) for many days at once.
+
+        Each argument is an array-like of per-day values (or a scalar),
+        NaN/None where the metric wasn't recorded.
+        """
+        inputs = [hrv_score, sleep_quality, sleep_duration_hours,
+                  resting_heart_rate, subjective_readiness, baseline_rhr]
+        arrays = [
+            None if x is None else np.asarray(x, dtype=np.float64)
+            for x in inputs
+        ]
+        shape = np.broadcast_shapes(*(a.shape for a in arrays if a is not None))
+        hrv, quality, duration, rhr, subjective, baseline = (
+            np.full(shape, np.nan) if a is None else np.broadcast_to(a, shape)
+            for a in arrays
+        )
+
+        with np.errstate(invalid="ignore"):
+            duration_score = np.where(
+                duration < 7,
+                np.maximum(0, duration / 7 * 100),
+                np.where(duration <= 9, 100.0, np.maximum(0, 100 - (duration - 9) * 10)),
+            )
+            rhr_diff = rhr - baseline
+            rhr_score = np.where(rhr_diff <= 0, 100.0, np.maximum(0, 100 - rhr_diff * 5))
+
+        components = np.stack([
+            hrv,
+            quality / 10 * 100,
+            np.where(np.isnan(duration), np.nan, duration_score),
+            np.where(np.isnan(rhr_diff), np.nan, rhr_score),
+            subjective / 10 * 100,
+        ], axis=-1)
+
+        present = ~np.isnan(components)
+        total_weight = (present * self._weights).sum(axis=-1)
+        weighted = np.where(present, components, 0.0) @ self._weights
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total_weight > 0, weighted / total_weight, self.DEFAULT_COMPOSITE)
+
+    def adjustments(self, composite: np.ndarray) -> np.ndarray:
+        """Recommended load multiplier for each composite score"""
+        band = (np.asarray(composite, dtype=np.float64)[..., None] < self.READINESS_CUTOFFS).sum(axis=-1)
+        return self.READINESS_ADJUSTMENTS[band]
+
+    def adjust_program(
+        self,
+        table: ProgramTable,
+        adjustments: np.ndarray,
+        start: int = 0,
+    ) -> ProgramTable:
+        """
+        Apply per-workout readiness multipliers to the remaining block.
+
+        Args:
+            table: Planned program
+            adjustments: Multiplier per workout from `start` onwards
+                (scalar applies to every remaining workout)
+            start: Index of the first workout still to be trained;
+                completed workouts are left as planned
+
+        Returns:
+            New ProgramTable sharing the original Workout objects
+        """
+        adjustments = np.broadcast_to(
+            np.asarray(adjustments, dtype=np.float64), (len(table) - start,)
+        )
+        per_workout = np.ones(len(table))
+        per_workout[start:] = adjustments
+
+        rows = table.rows.copy()
+        remaining = rows["workout"] >= start
+        factor = per_workout[rows["workout"]]
+
+        # Sets scale with readiness, never below one
+        sets = np.maximum(1, np.trunc(rows["sets"] * factor))
+        rows["sets"] = np.where(remaining, sets, rows["sets"])
+
+        # RPE: +0.5 when ready, unchanged for minor, -1.0 for significant reductions
+        rpe = rows["rpe"]
+        rows["rpe"] = np.select(
+            [~remaining, factor >= 1.0, factor >= 0.9],
+            [rpe, np.minimum(10.0, rpe + 0.5), rpe],
+            np.maximum(5.0, rpe - 1.0),
+        )
+
+        return ProgramTable(workouts=table.workouts, rows=rows, offsets=table.offsets)
+
+    def apply_rpe_feedback(
+        self,
+        table: ProgramTable,
+        actual_rpe: np.ndarray,
+    ) -> ProgramTable:
+        """
+        Re-plan loads from logged RPE.
+
+        Args:
+            table: Program with load_kg filled in
+            actual_rpe: Per-row actual RPE, NaN where nothing was logged
+
+        Returns:
+            New ProgramTable with loads adjusted ~2.5% per RPE point
+        """
+        rows = table.rows.copy()
+        rows["load_kg"] = np.where(
+            np.isnan(actual_rpe),
+            rows["load_kg"],
+            self.rpe_based_loads(rows["rpe"], actual_rpe, rows["load_kg"]),
+        )
+        return ProgramTable(workouts=table.workouts, rows=rows, offsets=table.offsets)
+
+    @staticmethod
+    def rpe_based_loads(
+        target_rpe: np.ndarray,
+        actual_rpe: np.ndarray,
+        current_load_kg: np.ndarray,
+    ) -> np.ndarray:
+        """Vectorized LoadManager.calculate_rpe_based_load"""
+        rpe_diff = np.asarray(actual_rpe) - np.asarray(target_rpe)
+        return np.round(np.asarray(current_load_kg) * (1 + rpe_diff * 2.5 / 100), 1)
+
+
+# Global autoregulator instance
+_program_autoregulator: Optional[ProgramAutoregulator] = None
+
+
+def get_program_autoregulator() -> ProgramAutoregulator:
+    """Get or create global program autoregulator"""
+    global _program_autoregulator
+    if _program_autoregulator is None:
+        _program_autoregulator = ProgramAutoregulator()
+    return _program_autoregulator
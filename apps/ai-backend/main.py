@@ -3,6 +3,8 @@ FitOS AI Backend - FastAPI + LangGraph
 Multi-agent coaching system with voice, photo, and JITAI features
 """
 
+import asyncio
+
 import sentry_sdk
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,7 +16,7 @@ import uvicorn
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.core.rate_limit import limiter
-from app.routes import coach, nutrition, voice, jitai, health, coach_brain, workout_generation, recovery, chronotype, nutrition_intelligence, wellness, habits, integrations, franchise, sso, scim, support_ticket
+from app.routes import coach, nutrition, voice, voice_realtime, jitai, health, coach_brain, workout_generation, recovery, chronotype, nutrition_intelligence, wellness, habits, integrations, franchise, sso, scim, support_ticket
 
 # Setup logging
 logger = setup_logging()
@@ -57,6 +59,7 @@ app.include_router(coach.router, prefix="/api/v1/coach", tags=["AI Coach"])
 app.include_router(coach_brain.router, prefix="/api/v1", tags=["Coach Brain"])
 app.include_router(nutrition.router, prefix="/api/v1/nutrition", tags=["Nutrition AI"])
 app.include_router(voice.router, prefix="/api/v1/voice", tags=["Voice AI"])
+app.include_router(voice_realtime.router, prefix="/api/v1", tags=["Voice AI"])
 app.include_router(jitai.router, prefix="/api/v1/jitai", tags=["JITAI"])
 app.include_router(workout_generation.router, prefix="/api/v1", tags=["Workout Generation"])
 app.include_router(recovery.router, prefix="/api/v1", tags=["Recovery"])
@@ -82,6 +85,26 @@ async def root():
     }
 
 
+@app.on_event("startup")
+async def prewarm_voice_cache():
+    """Fill the TTS phrase cache in the background (doesn't delay startup)"""
+    if settings.TTS_PREWARM_ON_STARTUP and settings.ELEVENLABS_API_KEY:
+        from app.voice.tts_cache import prewarm_tts_cache
+
+        app.state.tts_prewarm = asyncio.create_task(prewarm_tts_cache())
+
+
+@app.on_event("startup")
+async def load_notification_schedule():
+    """Rebuild the habit notification heap from Supabase in the background"""
+    if settings.SUPABASE_SERVICE_ROLE_KEY:
+        from app.habits.notification_scheduler import get_notification_scheduler
+
+        app.state.notification_load = asyncio.create_task(
+            asyncio.to_thread(get_notification_scheduler)
+        )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
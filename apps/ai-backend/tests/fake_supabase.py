@@ -0,0 +1,125 @@
+"""In-memory stand-in for the supabase-py query builder used by tests
+
+Supports the filters the services use and, like PostgREST, never returns
+more than `max_rows` rows per request. Database functions called through
+rpc() are Python callables passed as `functions`.
+"""
+
+from types import SimpleNamespace
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.orders = []
+        self.start, self.stop = 0, None
+        self.to_insert = None
+        self.conflict_keys = None
+        self.ignore_duplicates = False
+        self.negate_next = False
+
+    def select(self, columns, **kwargs):
+        return self
+
+    def _filter(self, column, test):
+        self.filters.append(lambda row: row.get(column) is not None and test(row[column]))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, lambda v: v == value)
+
+    def gt(self, column, value):
+        return self._filter(column, lambda v: str(v) > str(value))
+
+    def gte(self, column, value):
+        return self._filter(column, lambda v: str(v) >= str(value))
+
+    def lt(self, column, value):
+        return self._filter(column, lambda v: str(v) < str(value))
+
+    def lte(self, column, value):
+        return self._filter(column, lambda v: str(v) <= str(value))
+
+    @property
+    def not_(self):
+        self.negate_next = True
+        return self
+
+    def is_(self, column, value):
+        negate, self.negate_next = self.negate_next, False
+        expected = None if value == "null" else value
+        self.filters.append(lambda row: (row.get(column) == expected) != negate)
+        return self
+
+    def in_(self, column, values):
+        self.client.in_sizes.append(len(values))
+        values = set(values)
+        return self._filter(column, lambda v: v in values)
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def range(self, start, stop):
+        self.start, self.stop = start, stop + 1
+        return self
+
+    def limit(self, n):
+        self.stop = self.start + n
+        return self
+
+    def insert(self, rows):
+        self.to_insert = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False):
+        self.insert(rows)
+        self.ignore_duplicates = ignore_duplicates
+        self.conflict_keys = [key.strip() for key in on_conflict.split(",") if key.strip()]
+        return self
+
+    def _merge(self):
+        table = self.client.tables.setdefault(self.table, [])
+        for row in self.to_insert:
+            key = [row.get(k) for k in self.conflict_keys]
+            existing = next((r for r in table if [r.get(k) for k in self.conflict_keys] == key), None)
+            if existing is None:
+                table.append(dict(row))
+            elif not self.ignore_duplicates:
+                existing.update(row)
+        return SimpleNamespace(data=self.to_insert)
+
+    def execute(self):
+        self.client.requests += 1
+        if self.conflict_keys:
+            return self._merge()
+        if self.to_insert is not None:
+            self.client.tables.setdefault(self.table, []).extend(self.to_insert)
+            return SimpleNamespace(data=self.to_insert)
+        rows = [r for r in self.client.tables.get(self.table, []) if all(f(r) for f in self.filters)]
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda r: str(r.get(column)), reverse=desc)
+        stop = self.stop if self.stop is not None else len(rows)
+        stop = min(stop, self.start + self.client.max_rows)
+        return SimpleNamespace(data=rows[self.start:stop])
+
+
+class FakeSupabase:
+    def __init__(self, tables=None, max_rows=1000, functions=None):
+        self.tables = tables or {}
+        self.functions = functions or {}
+        self.max_rows = max_rows
+        self.requests = 0
+        self.in_sizes = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        def execute():
+            self.requests += 1
+            return SimpleNamespace(data=self.functions[name](self, params))
+
+        return SimpleNamespace(execute=execute)
@@ -0,0 +1,123 @@
+"""Tests for per-client activity bitmaps"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.outcome_verification.activity_bitmap import (
+    ActivityBitmap,
+    ActivityBitmapStore,
+    summarize_consistency,
+)
+from app.outcome_verification.consistency_tracker import ConsistencyVerificationService
+from tests.fake_supabase import FakeSupabase
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ActivityBitmapStore(tmp_path / "activity.sqlite3")
+    yield s
+    s.close()
+
+
+def test_weekly_popcounts_match_rebucketing():
+    """Consistent weeks and streaks equal counting active days week by week"""
+    start = date(2026, 1, 1)
+    active = {start + timedelta(days=d) for d in range(0, 120) if d % 7 in (0, 2, 4) or 50 <= d < 60}
+    active -= {start + timedelta(days=d) for d in (70, 72, 74)}  # One missed week
+    bitmap = ActivityBitmap(origin=start + timedelta(days=3))
+    bitmap.add(sorted(active, reverse=True))  # Earlier days rebase the origin
+
+    end = start + timedelta(days=119)
+    summary = summarize_consistency(bitmap, start, end, target_per_week=3)
+
+    expected = []
+    week = start
+    while week <= end:
+        expected.append(sum(1 for d in active if week <= d < week + timedelta(days=7)) >= 3)
+        week += timedelta(days=7)
+    assert summary.weeks == len(expected)
+    assert summary.consistent_weeks == sum(expected)
+    assert summary.longest_streak == 10
+    assert summary.current_streak == 6  # Weeks 11-16; week 17 is still in progress
+    assert summary.active_days == bitmap.active_days(start, end + timedelta(days=1)) == len(active)
+
+
+def test_store_merges_activity_and_tracks_sync_window(store):
+    """Recorded activity survives a round trip and later syncs start at the watermark"""
+    since = date(2026, 2, 1)
+    assert store.sync_start("client-1", "workout", since) == since
+
+    store.record(
+        "client-1", "workout",
+        [{'id': 'w1', 'date': date(2026, 2, 3)}, {'id': 'w2', 'date': date(2026, 2, 5)}],
+        covered_from=since, synced_through=date(2026, 2, 10),
+    )
+    # Realtime activity, then the same day again from a sync
+    store.record("client-1", "workout", [{'id': 'w3', 'date': date(2026, 1, 20)}])
+    bitmap = store.record("client-1", "workout", [{'id': 'w3', 'date': date(2026, 1, 20)}])
+
+    loaded = store.get("client-1", "workout")
+    assert loaded.bits == bitmap.bits
+    assert loaded.origin == date(2026, 1, 20)
+    assert [i for i, _ in loaded.recent] == ['w3', 'w1', 'w2']
+    assert loaded.is_active(date(2026, 2, 5)) and not loaded.is_active(date(2026, 2, 4))
+    # Later syncs re-read the week before the watermark
+    assert store.sync_start("client-1", "workout", since) == date(2026, 2, 3)
+    # Earlier than the covered range: full re-read
+    assert store.sync_start("client-1", "workout", date(2026, 1, 1)) == date(2026, 1, 1)
+    with pytest.raises(ValueError):
+        store.record("client-1", "steps", [])
+
+
+async def test_sync_picks_up_backdated_logs_and_clears_deleted_ones(store):
+    """Re-reading the trailing window catches late entries; deletions clear their day"""
+    today = date.today()
+    since = today - timedelta(days=28)
+    logs = [
+        {'id': f'w{d}', 'client_id': 'client-1', 'completed_at': (today - timedelta(days=d)).isoformat()}
+        for d in (20, 10, 4, 2)
+    ]
+    supabase = FakeSupabase({'workout_logs': logs})
+    service = ConsistencyVerificationService(supabase, store=store)
+
+    bitmap = await service.sync_activity('client-1', 'workout', since)
+    assert bitmap.active_days(since, today + timedelta(days=1)) == 4
+
+    # Logged today for three days ago, and an earlier log deleted
+    logs.append({'id': 'w3', 'client_id': 'client-1', 'completed_at': (today - timedelta(days=3)).isoformat()})
+    logs.remove(logs[2])
+    bitmap = await service.sync_activity('client-1', 'workout', since)
+    assert bitmap.is_active(today - timedelta(days=3))
+    assert not bitmap.is_active(today - timedelta(days=4))
+    assert [i for i, _ in bitmap.recent] == ['w20', 'w10', 'w3', 'w2']
+
+    # Voided between syncs: cleared now, restored by the next sync if the day has other logs
+    logs.append({'id': 'w10b', 'client_id': 'client-1', 'completed_at': (today - timedelta(days=10)).isoformat()})
+    logs.remove(logs[1])
+    store.remove('client-1', 'workout', 'w10', today - timedelta(days=10))
+    assert not store.get('client-1', 'workout').is_active(today - timedelta(days=10))
+    assert store.sync_start('client-1', 'workout', since) == today - timedelta(days=17)
+
+    bitmap = await service.sync_activity('client-1', 'workout', since)
+    assert bitmap.is_active(today - timedelta(days=10))
+    assert bitmap.is_active(today - timedelta(days=20))
+    assert bitmap.active_days(since, today + timedelta(days=1)) == 4
+
+
+async def test_first_sync_reads_every_page_before_advancing(store):
+    """A long history past the 1000-row cap still marks its newest days"""
+    today = date.today()
+    since = today - timedelta(days=399)
+    logs = [
+        {'id': f'n{d:03d}-{meal}', 'client_id': 'client-1', 'logged_date': (today - timedelta(days=d)).isoformat()}
+        for d in range(400)
+        for meal in range(3)
+    ]
+    service = ConsistencyVerificationService(FakeSupabase({'nutrition_logs': logs}), store=store)
+
+    bitmap = await service.sync_activity('client-1', 'nutrition', since)
+
+    assert len(logs) > 1000
+    assert bitmap.is_active(today)
+    assert bitmap.active_days(since, today + timedelta(days=1)) == 400
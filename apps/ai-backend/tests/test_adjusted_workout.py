@@ -0,0 +1,102 @@
+"""Tests for copy-on-write adjusted workouts and recovery-based adjustment"""
+
+import pytest
+
+from app.recovery.adjusted_workout import AdjustedWorkout, serialize_workout
+from app.recovery.intensity_adjuster import IntensityAdjuster
+from app.recovery.recovery_score import RecoveryCategory, RecoveryScore
+from app.workout_gen.generator import Exercise, Workout
+
+
+def make_workout() -> Workout:
+    return Workout(
+        day_number=1,
+        week_number=2,
+        name="Lower Strength",
+        exercises=[
+            Exercise(name="Squat", sets=5, reps="5", rpe=8.0, rest_seconds=180),
+            Exercise(name="RDL", sets=4, reps="8", rpe=7.5, rest_seconds=120),
+            Exercise(name="Split Squat", sets=3, reps="10", rpe=None, rest_seconds=90),
+            Exercise(name="Leg Curl", sets=3, reps="12", rpe=7.0, rest_seconds=60),
+            Exercise(name="Calf Raise", sets=2, reps="15", rpe=7.0, rest_seconds=60),
+        ],
+    )
+
+
+def score(category: RecoveryCategory) -> RecoveryScore:
+    composite = {"excellent": 90, "good": 75, "moderate": 60, "poor": 45, "critical": 30}
+    return RecoveryScore(composite_score=composite[category.value], category=category)
+
+
+def test_delta_records_only_changes_and_leaves_base_untouched():
+    """Overrides, truncation and reverted edits show up correctly in delta()"""
+    base = make_workout()
+    adjusted = AdjustedWorkout(base)
+    assert not adjusted.is_modified and adjusted.delta() == {}
+
+    adjusted.set(0, "sets", 4)
+    adjusted.set(1, "rpe", 7.0)
+    adjusted.set(1, "rpe", 7.5)  # Back to the planned value: no override
+    adjusted.truncate(4)
+
+    assert adjusted.delta() == {"exercise_count": 4, "exercise_changes": {"0": {"sets": 4}}}
+    assert adjusted.is_modified and len(adjusted) == 4
+    assert base.exercises[0].sets == 5 and len(base.exercises) == 5
+    with pytest.raises(ValueError):
+        adjusted.set(0, "reps", "3")
+
+    adjusted.replace_exercises([Exercise(name="Walk", sets=1, reps="20 min", rpe=3.0, rest_seconds=0)])
+    adjusted.set_header(name="Active Recovery")
+    assert adjusted.delta() == {
+        "name": "Active Recovery",
+        "exercises": [{"name": "Walk", "sets": 1, "reps": "20 min", "rpe": 3.0, "rest_seconds": 0}],
+    }
+
+
+def test_serialization_matches_the_materialized_workout():
+    """to_dict() and serialize_workout(to_workout()) agree, for chosen fields too"""
+    adjusted = AdjustedWorkout(make_workout())
+    adjusted.set(2, "rest_seconds", 120)
+    adjusted.truncate(3)
+
+    materialized = adjusted.to_workout()
+    assert adjusted.to_dict() == serialize_workout(materialized)
+    assert adjusted.to_dict(fields=("name", "rest_seconds")) == {
+        "name": "Lower Strength",
+        "exercises": [
+            {"name": "Squat", "rest_seconds": 180},
+            {"name": "RDL", "rest_seconds": 120},
+            {"name": "Split Squat", "rest_seconds": 120},
+        ],
+    }
+    # Materialized exercises are copies
+    materialized.exercises[0].sets = 99
+    assert adjusted.get(0, "sets") == 5
+
+
+@pytest.mark.parametrize(
+    "category, sets, rpe, rest, removed",
+    [
+        (RecoveryCategory.EXCELLENT, [6, 5, 4, 3, 2], [8.5, 8.0, None, 7.5, 7.5], [180, 120, 90, 60, 60], 0),
+        (RecoveryCategory.GOOD, [5, 4, 3, 3, 2], [8.0, 7.5, None, 7.0, 7.0], [180, 120, 90, 60, 60], 0),
+        (RecoveryCategory.MODERATE, [4, 3, 2, 2, 2], [8.0, 7.5, None, 7.0, 7.0], [180, 120, 90, 60, 60], 0),
+        (RecoveryCategory.POOR, [4, 3, 2, 2], [6.5, 6.0, None, 5.5], [180, 150, 120, 90], 1),
+        (RecoveryCategory.CRITICAL, [2], [3.0], [60], 4),
+    ],
+)
+def test_recovery_categories_adjust_the_planned_workout(category, sets, rpe, rest, removed):
+    """Each recovery category applies its own sets/RPE/rest/exercise changes"""
+    base = make_workout()
+    recommendation = IntensityAdjuster().adjust_workout(base, score(category))
+    adjusted = recommendation.adjusted_workout
+
+    exercises = adjusted.to_dict()["exercises"]
+    assert [e["sets"] for e in exercises] == sets
+    assert [e["rpe"] for e in exercises] == rpe
+    assert [e["rest_seconds"] for e in exercises] == rest
+    assert recommendation.exercises_removed == removed
+    assert recommendation.original_workout is base
+    assert [e.sets for e in base.exercises] == [5, 4, 3, 3, 2]
+    assert adjusted.is_modified == (category != RecoveryCategory.GOOD)
+    if category == RecoveryCategory.CRITICAL:
+        assert adjusted.name == "Active Recovery" and recommendation.warnings
@@ -0,0 +1,44 @@
+"""Tests for the bounded session audio buffer"""
+
+from app.voice.audio_buffer import SessionAudioStore
+
+
+def _reply(store, *chunks):
+    store.begin()
+    for chunk in chunks:
+        store.append(chunk)
+    return store.end()
+
+
+def test_memory_stays_bounded_and_old_replies_expire():
+    """Replies wrap around the ring; evicted ones read as None instead of growing memory"""
+    store = SessionAudioStore(memory_bytes=10)
+    first = _reply(store, b"abc", b"def")
+    second = _reply(store, b"ghij")
+    assert first.read() == b"abcdef" and second.read() == b"ghij"
+
+    third = _reply(store, bytearray(b"klmno"))
+    assert third.read() == b"klmno" and second.read() == b"ghij"
+    assert not first.available and first.read() is None
+
+    fourth = _reply(store, memoryview(b"pqrstu"))  # Wraps the ring
+    assert [bytes(v) for v in store.views(fourth.start, fourth.end)] == [b"pqrst", b"u"]
+    assert fourth.read() == b"pqrstu" and second.read() is None
+
+    huge = _reply(store, b"0123456789ABCD")  # Larger than the ring: only its tail fits
+    assert huge.read() is None and store.read(huge.end - 10, huge.end) == b"456789ABCD"
+    assert len(store.memory._buffer) == 10
+
+
+def test_spill_keeps_older_audio_on_disk(tmp_path):
+    """With spilling, audio evicted from memory is still readable from the file ring"""
+    store = SessionAudioStore(memory_bytes=4, spill_bytes=12, spill_dir=str(tmp_path))
+    replies = [_reply(store, bytes([65 + i]) * 3) for i in range(5)]
+
+    assert replies[-1].read() == b"EEE"  # Memory
+    assert replies[2].read() == b"CCC"  # Disk
+    assert replies[1].read() == b"BBB" and replies[0].read() is None
+    assert store.info()["retained_bytes"] == 12
+
+    store.close()
+    assert list(tmp_path.iterdir()) == []
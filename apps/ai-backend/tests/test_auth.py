@@ -0,0 +1,115 @@
+"""Tests for JWT authentication dependencies"""
+
+import time
+
+import jwt
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, WebSocket
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.auth import get_websocket_user_id, require_client_access
+from app.core.config import settings
+from tests.fake_supabase import FakeSupabase
+
+SECRET = "test-secret-with-at-least-32-bytes!!"
+
+
+def _token(sub: str) -> str:
+    return jwt.encode({"sub": sub, "exp": time.time() + 60}, SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", SECRET)
+    app = FastAPI()
+
+    @app.websocket("/ws")
+    async def whoami(websocket: WebSocket, user_id: str = Depends(get_websocket_user_id)):
+        await websocket.accept()
+        await websocket.send_json({"user_id": user_id})
+        await websocket.close()
+
+    return TestClient(app)
+
+
+def test_websocket_token_from_query_or_header(client):
+    """Either the token query parameter or a Bearer header authenticates"""
+    with client.websocket_connect(f"/ws?token={_token('u1')}") as ws:
+        assert ws.receive_json() == {"user_id": "u1"}
+    with client.websocket_connect("/ws", headers={"Authorization": f"Bearer {_token('u2')}"}) as ws:
+        assert ws.receive_json() == {"user_id": "u2"}
+
+
+@pytest.mark.parametrize("url", ["/ws", "/ws?token=not-a-jwt"])
+def test_websocket_without_valid_token_is_rejected(client, url):
+    with pytest.raises(WebSocketDisconnect) as rejected:
+        with client.websocket_connect(url):
+            pass
+    assert rejected.value.code == 1008
+
+
+def test_client_data_is_readable_by_owner_and_trainer_only():
+    supabase = FakeSupabase({"client_profiles": [{"id": "c1", "trainer_id": "t1"}]})
+
+    require_client_access("c1", "c1", supabase)
+    require_client_access("t1", "c1", supabase)
+    for intruder in ("c2", "t2"):
+        with pytest.raises(HTTPException) as denied:
+            require_client_access(intruder, "c1", supabase)
+        assert denied.value.status_code == 403
+
+
+def test_habit_notification_routes_check_caller(client, monkeypatch):
+    """Users act only on their own notifications; only services poll /due"""
+    from app.habits import notification_scheduler
+    from app.routes import habits
+
+    monkeypatch.setattr(
+        notification_scheduler, "_notification_scheduler", notification_scheduler.NotificationScheduler()
+    )
+
+    app = FastAPI()
+    app.include_router(habits.router)
+    http = TestClient(app)
+    user = {"Authorization": f"Bearer {_token('u1')}"}
+    service = {"Authorization": "Bearer " + jwt.encode(
+        {"role": "service_role", "exp": time.time() + 60}, SECRET, algorithm="HS256"
+    )}
+
+    assert http.post("/api/v1/habits/notifications/due", json={}).status_code in (401, 403)
+    assert http.post("/api/v1/habits/notifications/due", json={}, headers=user).status_code == 403
+    other = {"user_id": "u2", "habit_id": "walk"}
+    assert http.post("/api/v1/habits/notifications/completed", json=other, headers=user).status_code == 403
+    assert http.post(
+        "/api/v1/habits/notifications/event", json={"user_id": "u2", "context": "location"}, headers=user
+    ).status_code == 403
+    assert http.post(
+        "/api/v1/habits/notifications/event", json={"user_id": "u2", "context": "location"}, headers=service
+    ).status_code == 200
+
+
+def test_jitai_evaluate_is_service_only_and_events_are_self_only(client, monkeypatch):
+    from app.core.rate_limit import limiter
+    from app.jitai import feature_store
+    from app.routes import jitai
+
+    monkeypatch.setattr(feature_store, "_feature_store", feature_store.JITAIFeatureStore())
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(jitai.router)
+    http = TestClient(app)
+    user = {"Authorization": f"Bearer {_token('u1')}"}
+    service = {"Authorization": "Bearer " + jwt.encode(
+        {"role": "service_role", "exp": time.time() + 60}, SECRET, algorithm="HS256"
+    )}
+
+    assert http.post("/evaluate", json={}, headers=user).status_code == 403
+    assert http.post("/evaluate", json={}, headers=service).status_code == 200
+    events = {"events": [
+        {"user_id": "u1", "event_type": "app_open"},
+        {"user_id": "u2", "event_type": "app_open"},
+    ]}
+    assert http.post("/events", json=events, headers=user).status_code == 403
+    assert http.post("/events", json=events, headers=service).json()["applied"] == 2
+    assert http.post("/events", json={"events": events["events"][:1]}, headers=user).status_code == 200
@@ -0,0 +1,81 @@
+"""Tests for batched outcome verification"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.outcome_verification.bulk import BulkOutcomeVerifier
+from tests.fake_supabase import FakeSupabase
+
+
+def weight_goal(goal_id: str, client_id: str, start_date: str) -> dict:
+    return {
+        'id': goal_id,
+        'client_id': client_id,
+        'trainer_id': 'trainer-1',
+        'goal_type': 'weight_loss',
+        'status': 'active',
+        'start_date': start_date,
+        'start_value': 200,
+        'target_value': 185,
+        'metadata': {},
+    }
+
+
+@pytest.fixture
+def supabase():
+    today = date.today()
+    logs = [
+        {
+            'id': f'{client}-{d:03d}',
+            'client_id': client,
+            'logged_date': (today - timedelta(days=d)).isoformat(),
+            'body_weight': 196.0 - 0.1 * (30 - d),
+        }
+        for client in ('client-a', 'client-b', 'client-c')
+        for d in range(30)
+    ]
+    return FakeSupabase({'nutrition_logs': logs})
+
+
+async def test_batches_verify_mixed_results_across_chunk_boundaries(supabase):
+    """Goals split over several batches and pages; failures and skips are reported per goal"""
+    start = (date.today() - timedelta(days=60)).isoformat()
+    goals = [
+        weight_goal('g1', 'client-a', start),
+        weight_goal('g2', 'client-b', start),
+        weight_goal('g3', 'client-c', start),
+        weight_goal('g4', 'client-d', start),  # No weigh-ins: low confidence
+        weight_goal('g5', 'client-a', 'not-a-date'),  # Evaluation error
+        {**weight_goal('g6', 'client-b', start), 'goal_type': 'body_comp'},
+    ]
+    verifier = BulkOutcomeVerifier(supabase, batch_size=4, max_concurrency=2, page_size=25)
+    verifier.CLIENT_BATCH = 2
+
+    report = await verifier.verify_goals(goals)
+
+    assert report.goals_seen == 6 and report.batches == 2
+    assert report.verified == 4 and report.saved == 4
+    assert sorted(r.goal_id for r in report.results) == ['g1', 'g2', 'g3', 'g4']
+    assert list(report.failed) == ['g5']
+    assert report.skipped == {'manual_verification_required': 1}
+
+    by_goal = {r.goal_id: r for r in report.results}
+    for goal_id, client_id in (('g1', 'client-a'), ('g2', 'client-b'), ('g3', 'client-c')):
+        # The latest weigh-ins are on the last page of each 25-row read
+        sources = by_goal[goal_id].sources
+        assert len(sources) == 7
+        assert sources[-1].source_id == f'{client_id}-000'
+        assert not by_goal[goal_id].requires_manual_review
+    assert by_goal['g4'].requires_manual_review
+    assert len(supabase.tables['outcome_verifications']) == 4
+    assert max(supabase.in_sizes) == 2
+
+
+async def test_empty_input_does_no_work(supabase):
+    """No goals: nothing read, nothing written"""
+    report = await BulkOutcomeVerifier(supabase).verify_goals([])
+
+    assert report.to_dict()['goals_seen'] == 0
+    assert report.batches == 0 and report.results == []
+    assert supabase.requests == 0
@@ -0,0 +1,53 @@
+"""Tests for the memoized chrono-nutrition meal plans"""
+
+import itertools
+from datetime import time
+
+from app.nutrition_intelligence.chrono_nutrition import ChronoNutritionOptimizer
+from tests.chrono_nutrition_reference import LegacyChronoNutritionOptimizer
+
+WAKE_TIMES = [time(5, 30), time(6, 0), time(7, 15)]
+SLEEP_TIMES = [time(21, 30), time(22, 0), time(23, 45)]
+MEAL_FREQUENCIES = [3, 4, 5, 6]
+WORKOUT_TIMES = [None, time(7, 0), time(12, 30), time(17, 45), time(19, 0)]
+TARGETS = [(2000, 150, 200, 67), (2750, 180, 310, 85), (1800, 140, 150, 70)]
+
+
+def test_template_plans_match_the_previous_implementation():
+    """Same meals, timing and context; macros within 1 g/kcal (1080 cases)"""
+    optimizer = ChronoNutritionOptimizer()
+    legacy = LegacyChronoNutritionOptimizer()
+    cases = 0
+
+    for wake, sleep, frequency, workout, fasting, targets in itertools.product(
+        WAKE_TIMES, SLEEP_TIMES, MEAL_FREQUENCIES, WORKOUT_TIMES, (False, True), TARGETS
+    ):
+        kwargs = dict(
+            meal_frequency=frequency,
+            workout_time=workout,
+            wake_time=wake,
+            sleep_time=sleep,
+            intermittent_fasting=fasting,
+        )
+        expected = legacy.create_meal_plan(*targets, **kwargs)
+        plan = optimizer.create_meal_plan(*targets, **kwargs)
+        cases += 1
+
+        assert plan.eating_window_hours == expected.eating_window_hours
+        assert plan.notes == expected.notes
+        assert len(plan.meals) == len(expected.meals)
+        for meal, old in zip(plan.meals, expected.meals):
+            assert (
+                meal.meal_type, meal.optimal_time, meal.time_window_start, meal.time_window_end,
+                meal.reasoning, meal.priority, meal.considerations,
+            ) == (
+                old.meal_type, old.optimal_time, old.time_window_start, old.time_window_end,
+                old.reasoning, old.priority, old.considerations,
+            )
+            for new_value, old_value in zip(
+                (meal.calories, meal.protein_g, meal.carbs_g, meal.fat_g),
+                (old.calories, old.protein_g, old.carbs_g, old.fat_g),
+            ):
+                assert abs(new_value - old_value) <= 1, (kwargs, targets, meal.meal_type)
+
+    assert cases == 1080
@@ -0,0 +1,81 @@
+"""Tests for adaptive turn endpointing"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.voice import endpointing
+from app.voice.endpointing import PauseStats, TurnDetector, get_pause_stats, text_completeness
+
+
+T0 = datetime(2026, 3, 10, 17, 0)
+
+
+def _result(text, ms, is_final=False, speech_final=False, utterance_end=False):
+    return SimpleNamespace(
+        text=text,
+        is_final=is_final,
+        speech_final=speech_final,
+        utterance_end=utterance_end,
+        timestamp=T0 + timedelta(milliseconds=ms),
+    )
+
+
+def test_complete_utterances_commit_on_speech_final():
+    """A finished sentence commits immediately; a hanging one waits for silence"""
+    assert text_completeness("Ten reps at 185") > 0.9
+    assert text_completeness("What should I focus on today?") > 0.6
+    assert text_completeness("I want to work on my") < 0.2
+
+    detector = TurnDetector(deepgram_endpointing_ms=200)
+    assert detector.add_transcription(_result("What should", 0)) == (False, "")
+    done = detector.add_transcription(
+        _result("What should I focus on today?", 600, is_final=True, speech_final=True)
+    )
+    assert done == (True, "What should I focus on today?")
+    assert round(detector.last_endpointing_ms) == 200 and detector.last_reason == "complete"
+
+    # Incomplete: held for the rest of the 700ms silence budget
+    assert detector.add_transcription(
+        _result("I want to work on my", 1000, is_final=True, speech_final=True)
+    ) == (False, "")
+    assert detector.pending_until == (T0 + timedelta(milliseconds=1500)).timestamp()
+    assert detector.check_timeout(detector.pending_until - 0.1) == (False, "")
+    assert detector.check_timeout(detector.pending_until) == (True, "I want to work on my")
+    assert round(detector.last_endpointing_ms) == 700
+
+
+def test_hold_adapts_to_users_mid_turn_pauses():
+    """Pauses that were followed by more speech shorten or lengthen the hold"""
+    stats = PauseStats(min_samples=3)
+    detector = TurnDetector(deepgram_endpointing_ms=200)
+    detector.pause_stats = stats
+
+    t = 0
+    for _ in range(3):
+        detector.add_transcription(_result("so I was thinking about", t, is_final=True, speech_final=True))
+        t += 100  # Resumed 300ms after the end of speech (100ms after speech_final)
+        detector.add_transcription(_result("my knee", t, is_final=True))
+        t += 400
+    assert [round(p) for p in stats.pauses_ms] == [300, 300, 300]
+    assert round(detector.hold_ms()) == 130  # 300 * 1.1 - 200
+
+    detector.reset()
+    detector.add_transcription(_result("and then", t, is_final=True, speech_final=True))
+    assert abs(detector.pending_until - (T0 + timedelta(milliseconds=t + 130)).timestamp()) < 1e-3
+
+    # UtteranceEnd commits whatever is pending
+    assert detector.add_transcription(_result("", t + 50, utterance_end=True)) == (True, "and then")
+
+
+def test_pause_stats_keep_only_recent_users(monkeypatch):
+    """Per-user statistics are shared across sessions, least recently used dropped first"""
+    monkeypatch.setattr(endpointing, "_pause_stats", endpointing.OrderedDict())
+    monkeypatch.setattr(endpointing.settings, "VOICE_PAUSE_STATS_USERS", 2)
+
+    first = get_pause_stats("u1")
+    get_pause_stats("u2")
+    assert get_pause_stats("u1") is first  # u1 is now the most recent
+    get_pause_stats("u3")
+
+    assert list(endpointing._pause_stats) == ["u1", "u3"]
+    assert TurnDetector(user_id="u1").pause_stats is first
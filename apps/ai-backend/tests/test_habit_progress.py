@@ -0,0 +1,92 @@
+"""Tests for vectorized habit progress"""
+
+import math
+from datetime import date
+
+import pytest
+
+from app.habits.completion_history import CompletionHistory
+from app.habits.habit_formation import (
+    HabitDifficulty,
+    HabitFormation,
+    HabitTimePreference,
+    HabitType,
+)
+
+
+def test_streaks_do_not_join_across_habits():
+    """Back-to-back habits keep their own runs, duplicates count once"""
+    today = date(2026, 3, 10)
+    history = CompletionHistory.from_logs(
+        start_dates=[date(2026, 3, 1), date(2026, 3, 1), date(2026, 3, 5)],
+        completion_logs=[
+            # Ends today: current streak 3, longest 4
+            [date(2026, 3, d) for d in (1, 2, 3, 4, 8, 9, 10, 10)],
+            # Starts at its origin, missed today; logged tomorrow is ignored
+            [date(2026, 3, d) for d in (1, 2, 11)],
+            [],
+        ],
+        current_dates=[today, today, today],
+    )
+
+    current, longest = history.streaks()
+
+    assert current.tolist() == [3, 0, 0]
+    assert longest.tolist() == [4, 2, 0]
+    assert history.completed_days().tolist() == [7, 2, 0]
+    assert history.last_completed() == [today, date(2026, 3, 2), None]
+
+
+def habit(habit_id, difficulty, start_date, completion_log):
+    return {
+        "habit_id": habit_id,
+        "habit_name": "Morning walk",
+        "habit_type": HabitType.EXERCISE,
+        "difficulty": difficulty,
+        "time_preference": HabitTimePreference.MORNING,
+        "start_date": start_date,
+        "completion_log": completion_log,
+    }
+
+
+def march(*days):
+    return [date(2026, 3, d) for d in days]
+
+
+def test_progress_ignores_completions_outside_the_tracking_window():
+    """Streaks, counts and last_completed only see start_date..today"""
+    today = date(2026, 3, 10)
+    habits = [
+        # Two completions before the start and one tomorrow are ignored
+        habit("a", HabitDifficulty.MODERATE, date(2026, 3, 1),
+              [date(2026, 2, 26), date(2026, 2, 28)] + march(1, 2, 3, 5, 8, 9, 10, 10, 11)),
+        # Only logged before it started
+        habit("b", HabitDifficulty.SIMPLE, date(2026, 3, 1),
+              [date(2026, 2, 20), date(2026, 2, 27), date(2026, 2, 28)]),
+        # Pre-start days don't extend the streak
+        habit("c", HabitDifficulty.SIMPLE, date(2026, 3, 4), march(2, 3, 4, 5, 6, 7, 8, 9, 10)),
+        # Not started yet
+        habit("d", HabitDifficulty.COMPLEX, date(2026, 3, 12), march(12)),
+    ]
+
+    a, b, c, d = HabitFormation().calculate_progress_batch(habits, current_date=today)
+
+    assert (a.days_completed, a.days_missed, a.completion_rate) == (7, 3, 0.7)
+    assert (a.current_streak, a.longest_streak, a.last_completed) == (3, 3, today)
+    assert a.automaticity_score == pytest.approx(1 - math.exp(-0.05 * 7))
+    assert a.formation_progress == pytest.approx(7 / 66)
+    assert (a.formation_stage, a.risk_level, a.estimated_days_remaining) == ("learning", "low", 59)
+
+    assert (b.days_completed, b.days_missed, b.completion_rate) == (0, 10, 0.0)
+    assert (b.current_streak, b.longest_streak, b.last_completed) == (0, 0, None)
+    assert (b.automaticity_score, b.risk_level) == (0.0, "high")
+
+    assert (c.days_completed, c.days_missed, c.completion_rate) == (7, 0, 1.0)
+    assert (c.current_streak, c.longest_streak, c.last_completed) == (7, 7, today)
+    assert c.on_track
+
+    assert (d.days_completed, d.days_missed, d.completion_rate) == (0, 0, 0.0)
+    assert (d.current_streak, d.last_completed) == (0, None)
+
+    single = HabitFormation().calculate_progress(**habits[0], current_date=today)
+    assert single.days_completed == 7 and single.last_completed == today
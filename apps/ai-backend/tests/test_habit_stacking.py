@@ -0,0 +1,34 @@
+"""Tests for indexed habit stacking suggestions"""
+
+from app.habits.habit_formation import HabitDifficulty, HabitTimePreference, HabitType
+from app.habits.habit_stacking import AnchorType, HabitStackingEngine
+
+
+def test_existing_anchors_merge_into_indexed_candidates():
+    """User anchors join the pre-sorted candidates, respecting time preference"""
+    engine = HabitStackingEngine()
+
+    plain = engine.suggest_stacks("stretch", HabitType.RECOVERY, HabitDifficulty.MODERATE)
+    assert [s.anchor_type for s in plain] == [AnchorType.FINISH_WORKOUT, AnchorType.EVENING_ROUTINE]
+    assert plain[0].success_probability == 0.7 * 0.85 + 0.2 - 0.05
+
+    with_existing = engine.suggest_stacks(
+        "stretch",
+        HabitType.RECOVERY,
+        HabitDifficulty.MODERATE,
+        existing_anchors=[AnchorType.WAKE_UP, AnchorType.EVENING_ROUTINE],
+    )
+    assert [s.anchor_type for s in with_existing] == [
+        AnchorType.FINISH_WORKOUT, AnchorType.WAKE_UP, AnchorType.EVENING_ROUTINE
+    ]
+    probabilities = [s.success_probability for s in with_existing]
+    assert probabilities == sorted(probabilities, reverse=True)
+
+    evening = engine.suggest_stacks(
+        "stretch",
+        HabitType.RECOVERY,
+        HabitDifficulty.MODERATE,
+        time_preference=HabitTimePreference.NIGHT,
+        existing_anchors=[AnchorType.WAKE_UP, AnchorType.BEDTIME_ROUTINE],
+    )
+    assert [s.anchor_type for s in evening] == [AnchorType.BEDTIME_ROUTINE, AnchorType.EVENING_ROUTINE]
@@ -0,0 +1,133 @@
+"""Tests for the health ↔ performance correlation engine"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.mcp import tools
+from app.mcp.correlation import (
+    CorrelationEngine,
+    CorrelationResult,
+    LagCorrelation,
+    SupabaseWorkoutSetSource,
+    rank_average,
+)
+from app.wearables.timeseries_store import WearableMetric, WearableTimeSeriesStore
+from tests.fake_supabase import FakeSupabase
+
+
+class ListWorkoutSource:
+    """Workout sets held in memory"""
+
+    def __init__(self, sets):
+        self.sets = sets
+        self.calls = 0
+
+    def fetch_sets(self, user_id, start, end):
+        self.calls += 1
+        return [s for s in self.sets if start <= s['completed_at'].date() <= end]
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = WearableTimeSeriesStore(tmp_path / "wearables.sqlite3")
+    yield s
+    s.close()
+
+
+def test_rank_average_shares_ranks_between_ties():
+    """Tied values get their average rank, row by row"""
+    ranks = rank_average(np.array([[3.0, 1.0, 3.0, 2.0], [5.0, 5.0, 5.0, 1.0]]))
+
+    assert ranks.tolist() == [[3.5, 1.0, 3.5, 2.0], [3.0, 3.0, 3.0, 1.0]]
+
+
+def test_sleep_predicts_next_day_volume_and_results_are_cached(store):
+    """Lag 1 finds the next-day relationship; a new sync invalidates the cache"""
+    rng = np.random.default_rng(7)
+    start = date(2026, 3, 1)
+    sleep = rng.uniform(5.5, 9.0, size=30)
+    nights = [datetime.combine(start + timedelta(days=i), datetime.min.time()) + timedelta(hours=7)
+              for i in range(30)]
+    store.append("u1", WearableMetric.SLEEP_DURATION, nights, sleep.tolist())
+
+    # Train every other day; volume follows the previous night's sleep
+    sets = [
+        {
+            'exercise_id': 'squat',
+            'weight': 100.0,
+            'reps': int(round(sleep[i - 1] * 2)),
+            'rpe': 8,
+            'completed_at': nights[i] + timedelta(hours=10),
+        }
+        for i in range(1, 30, 2)
+    ]
+    source = ListWorkoutSource(sets)
+    engine = CorrelationEngine(store=store, workout_source=source, bootstrap_samples=500)
+
+    result = engine.analyze("u1", "sleep", "workout_volume", start, start + timedelta(days=29))
+    same_day, next_day = result.lags
+
+    assert result.performance_days == 15 and next_day.paired_days == 15
+    assert next_day.pearson > 0.95 and next_day.spearman > 0.95
+    assert next_day.pearson_ci[0] > 0.8 and next_day.significant
+    assert abs(same_day.pearson) < next_day.pearson
+    assert result.best.lag_days == 1
+
+    again = engine.analyze("u1", "sleep", "volume", start, start + timedelta(days=29))
+    assert again.cached and source.calls == 1
+
+    store.append("u1", WearableMetric.SLEEP_DURATION, [nights[-1] + timedelta(days=1)], [8.0])
+    refreshed = engine.analyze("u1", "sleep", "workout_volume", start, start + timedelta(days=29))
+    assert not refreshed.cached and source.calls == 2
+
+
+def test_supabase_source_pages_past_the_row_cap():
+    """More sets than one response holds: the most recent ones are still read"""
+    start = datetime(2026, 1, 1, 6, 0)
+    rows = [
+        {
+            'id': f's{i:05d}',
+            'client_id': 'u1',
+            'exercise_id': 'squat',
+            'weight': 100 + i % 10,
+            'reps': 5,
+            'rpe': 8,
+            'completed_at': (start + timedelta(minutes=30 * i)).isoformat(),
+        }
+        for i in range(2500)
+    ]
+    rows.append({**rows[0], 'id': 'warmup', 'weight': None})  # Skipped: no load
+    supabase = FakeSupabase({'workout_sets': rows})
+
+    sets = SupabaseWorkoutSetSource(supabase).fetch_sets('u1', start.date(), date(2026, 3, 1))
+
+    assert len(sets) == 2500 and supabase.requests == 3
+    assert sets[0]['id'] == 's00000' and sets[-1]['id'] == 's02499'
+
+
+@pytest.mark.parametrize(
+    "pearson, ci, phrase",
+    [
+        (0.25, (0.05, 0.45), "consistent but small"),
+        (0.25, (-0.1, 0.5), "includes zero"),
+        (-0.7, (-0.85, -0.5), "useful signal"),
+        (0.7, (-0.05, 0.9), "includes zero"),
+    ],
+)
+async def test_recommendation_follows_the_interval(monkeypatch, pearson, ci, phrase):
+    """Interval wording comes from significance, not the strength label"""
+    result = CorrelationResult(
+        user_id="u1", health_metric="sleep_duration", performance_metric="workout_volume",
+        start=date(2026, 3, 1), end=date(2026, 3, 30), health_days=30, performance_days=15,
+        lags=[LagCorrelation(lag_days=1, paired_days=15, pearson=pearson, spearman=pearson, pearson_ci=ci)],
+    )
+    engine = type("Engine", (), {"analyze": lambda self, *args: result})()
+    monkeypatch.setattr(tools, "get_correlation_engine", lambda: engine)
+
+    answer = await tools.correlate_health_and_performance.ainvoke(
+        {"health_metric": "sleep", "performance_metric": "workout_volume", "user_id": "u1"}
+    )
+
+    assert phrase in answer["recommendation"]
@@ -0,0 +1,63 @@
+"""Tests for the health MCP server's query parsing and cached query engine"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.mcp.health_server import (
+    HealthMetric,
+    HealthQueryEngine,
+    detect_metric,
+    parse_time_range,
+)
+from app.wearables.timeseries_store import WearableMetric, WearableTimeSeriesStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = WearableTimeSeriesStore(tmp_path / "wearables.sqlite3")
+    yield s
+    s.close()
+
+
+def test_parsing_prefers_specific_metrics_and_reads_ranges():
+    """Longer keywords win and 'last N weeks' becomes a day range"""
+    now = datetime(2026, 3, 20, 15, 30)
+
+    assert detect_metric("How is my heart rate variability?") == HealthMetric.HRV
+    assert detect_metric("Show my sleep quality") == HealthMetric.SLEEP_QUALITY
+    assert detect_metric("How many hours have I been sleeping") == HealthMetric.SLEEP_DURATION
+    assert detect_metric("resting heart rate this month") == HealthMetric.RESTING_HR
+    assert detect_metric("tell me a joke") is None
+
+    start, end = parse_time_range("average HRV over the last 2 weeks", now)
+    assert (start, end) == (now - timedelta(days=14), now)
+    start, end = parse_time_range("steps yesterday", now)
+    assert start == datetime(2026, 3, 19) and end.date() == start.date()
+    start, _ = parse_time_range("sleep this quarter", now)
+    assert start == now - timedelta(days=90)
+
+
+def test_query_results_are_cached_until_the_next_sync(store):
+    """A repeat query hits the cache; appending data makes it stale"""
+    engine = HealthQueryEngine(store=store, max_entries=8)
+    days = [datetime(2026, 3, d, 7) for d in range(1, 8)]
+    store.append("u1", WearableMetric.HRV, days, [50.0 + d for d in range(7)])
+    start, end = datetime(2026, 3, 1), datetime(2026, 3, 10)
+
+    first = engine.query("u1", HealthMetric.HRV, start, end)
+    second = engine.query("u1", HealthMetric.HRV, start, end + timedelta(hours=3))
+
+    assert not first.cached and second.cached
+    assert [p.value for p in second.points] == [50.0 + d for d in range(7)]
+    assert second.summary["count"] == 7 and second.summary["trend"] == "increasing"
+
+    store.append("u1", WearableMetric.HRV, [datetime(2026, 3, 8, 7)], [40.0])
+    third = engine.query("u1", HealthMetric.HRV, start, end)
+
+    assert not third.cached
+    assert third.summary["count"] == 8 and third.summary["latest"] == 40.0
+    assert engine.info()["stale"] == 1
+
+    unstored = engine.query("u1", HealthMetric.BLOOD_OXYGEN, start, end)
+    assert unstored.points == [] and not unstored.data_available
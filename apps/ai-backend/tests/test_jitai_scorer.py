@@ -0,0 +1,67 @@
+"""Tests for the JITAI feature store and batch scorer"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.jitai.feature_store import JITAIEvent, JITAIEventType, JITAIFeatureStore, SupabaseFeatureTable
+from app.jitai.scorer import JITAIScorer
+from tests.fake_supabase import FakeSupabase
+
+
+def test_batch_scoring_flags_struggling_users_until_daily_cap():
+    """A user missing workouts at their usual time clears the threshold; a steady one doesn't"""
+    now = datetime(2026, 3, 10, 17, 0)
+    store = JITAIFeatureStore(capacity=1)  # Forces growth
+    events = []
+    for d in range(14, 0, -1):
+        day = now - timedelta(days=d)
+        for user in ("steady", "slipping"):
+            if user == "steady" or d > 4:
+                events.append(JITAIEvent(user, JITAIEventType.WORKOUT_STARTED, day))
+                events.append(JITAIEvent(user, JITAIEventType.WORKOUT_COMPLETED, day + timedelta(hours=1)))
+            else:
+                events.append(JITAIEvent(user, JITAIEventType.WORKOUT_MISSED, day))
+            hrv = 60 + d % 3 if user == "steady" or d > 1 else 40
+            events.append(JITAIEvent(user, JITAIEventType.HRV_READING, day.replace(hour=6), hrv))
+    events.append(JITAIEvent("slipping", JITAIEventType.APP_OPEN, now - timedelta(minutes=5)))
+    store.ingest(events)
+
+    scorer = JITAIScorer(max_daily=1)
+    scores = scorer.score(store.snapshot(), now)
+    missed, _ = store.snapshot().window_counts(int((now - datetime(1970, 1, 1)).days))
+
+    assert missed.tolist() == [0, 4]
+    assert scores.vulnerability[1] > 0.8 > scores.vulnerability[0]
+    assert [scores.user_ids[i] for i in scores.candidates(0.7)] == ["slipping"]
+    assert scores.score[1] > 0.8 and scores.priority[1] == 5
+
+    # Unknown users score from defaults without being added
+    single = scorer.score(store.snapshot(["slipping", "new-user"]), now)
+    assert single.score[0] == scores.score[1]
+    assert len(store) == 2
+
+    store.record("slipping", JITAIEventType.INTERVENTION_SENT, now)
+    assert len(scorer.score(store.snapshot(), now + timedelta(minutes=1)).candidates(0.7)) == 0
+
+
+def test_features_are_shared_across_instances_through_the_table():
+    """Events ingested on one instance are scored by another and survive a restart"""
+    supabase = FakeSupabase()
+    day = datetime(2026, 3, 9, 7, 0)
+    api = JITAIFeatureStore(table=SupabaseFeatureTable(supabase))
+    worker = JITAIFeatureStore(table=SupabaseFeatureTable(supabase))
+
+    api.ingest([JITAIEvent("u1", JITAIEventType.WORKOUT_MISSED, day)])
+    worker.ingest([JITAIEvent("u1", JITAIEventType.WORKOUT_MISSED, day + timedelta(days=1))])
+    api.ingest([JITAIEvent("u2", JITAIEventType.HRV_READING, day, 55.0)])
+
+    today = int((day - datetime(1970, 1, 1)).days) + 1
+    snapshot = worker.snapshot()
+    missed, _ = snapshot.window_counts(today)
+    assert dict(zip(snapshot.user_ids, missed.tolist())) == {"u1": 2, "u2": 0}
+
+    restarted = JITAIFeatureStore(table=SupabaseFeatureTable(supabase)).snapshot(["u2", "u1"])
+    assert restarted["hrv_mean"].tolist()[0] == 55.0
+    assert np.isnan(restarted["hrv_mean"][1])
+    assert restarted.window_counts(today)[0].tolist() == [0, 2]
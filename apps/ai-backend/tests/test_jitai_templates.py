@@ -0,0 +1,125 @@
+"""Tests for the JITAI intervention template bank"""
+
+import pytest
+
+from app.jitai.templates import (
+    InterventionTemplateBank,
+    InterventionTemplateGenerator,
+    SQLiteTemplateStore,
+    SupabaseTemplateStore,
+    context_bucket,
+)
+from tests.fake_supabase import FakeSupabase
+
+
+class _FakeLLMResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class _FakeLLM:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return _FakeLLMResponse(self.content)
+
+
+@pytest.fixture
+def bank(tmp_path):
+    store = SQLiteTemplateStore(tmp_path / "templates.sqlite3")
+    yield InterventionTemplateBank(store, seed=7)
+    store.close()
+
+
+def test_responses_steer_selection_and_persist(bank, tmp_path):
+    """Engaged templates win the sampling, and counts survive a reload"""
+    bucket = context_bucket(0.8, 0.9)
+    template, exact = bank.select("reminder", bucket, "calm")
+    assert template.voice == "calm" and template.bucket == "any" and not exact
+
+    good, bad = bank._index[("reminder", "any", "calm")]
+    for i in range(40):
+        bank.issue(f"good-{i}", good)
+        bank.record_response(f"good-{i}", engaged=True)
+        bank.issue(f"bad-{i}", bad)
+        bank.record_response(f"bad-{i}", engaged=False)
+    assert bank.record_response("good-0", engaged=True) is None  # Counted once
+
+    picks = [bank.select("reminder", bucket, "calm")[0].template_id for _ in range(50)]
+    assert picks.count(good.template_id) >= 48
+
+    title, message = good.render({"name": "Sam", "missed_workouts": "1 workout", "completed_workouts": "3 workouts"})
+    assert "Sam" in message and "{" not in title + message
+
+    store = SQLiteTemplateStore(tmp_path / "templates.sqlite3")
+    stats = {s["template_id"]: s for s in InterventionTemplateBank(store).stats()}
+    assert stats[good.template_id]["engaged"] == 40 and stats[bad.template_id]["sent"] == 40
+    store.close()
+
+
+async def test_cache_miss_generates_valid_templates_once(bank):
+    """Generated templates with unknown placeholders are dropped; the key then hits"""
+    llm = _FakeLLM(
+        'Here you go:\n[{"title": "Back at it", "message": "{name}, {missed_workouts} missed. Ten minutes today?"},'
+        ' {"title": "Bad", "message": "{streak} days!"}]'
+    )
+    generator = InterventionTemplateGenerator(bank, llm=llm)
+    bucket = context_bucket(0.6, 0.3)
+
+    added = await generator.fill("concern", bucket, "energetic")
+
+    assert [t.title for t in added] == ["Back at it"]
+    template, exact = bank.select("concern", bucket, "energetic")
+    assert exact and template.template_id == added[0].template_id
+    assert template.action_label == "Message Coach"
+    assert llm.calls == 1
+
+
+def _issue_intervention(db, params):
+    """Python mirror of the issue_jitai_intervention() database function"""
+    template = next(t for t in db.tables["jitai_templates"] if t["template_id"] == params["template_id_param"])
+    template["sent"] += 1
+    db.tables.setdefault("jitai_issued_interventions", []).append({
+        "intervention_id": params["intervention_id_param"],
+        "template_id": params["template_id_param"],
+        "issued_at": params["issued_at_param"],
+    })
+
+
+def _record_response(db, params):
+    """Python mirror of the record_jitai_response() database function"""
+    issued = db.tables.get("jitai_issued_interventions", [])
+    row = next((r for r in issued if r["intervention_id"] == params["intervention_id_param"]), None)
+    if row is None:
+        return None
+    issued.remove(row)
+    if params["engaged_param"]:
+        template = next(t for t in db.tables["jitai_templates"] if t["template_id"] == row["template_id"])
+        template["engaged"] += 1
+    return row["template_id"]
+
+
+def test_response_on_another_instance_is_attributed():
+    """The instance logging a response finds the template another instance sent"""
+    db = FakeSupabase(functions={
+        "issue_jitai_intervention": _issue_intervention,
+        "record_jitai_response": _record_response,
+    })
+    sender = InterventionTemplateBank(SupabaseTemplateStore(db), seed=7)
+    receiver = InterventionTemplateBank(SupabaseTemplateStore(db), seed=7)
+    builtins = len(db.tables["jitai_templates"])
+    assert builtins == len(sender.stats())  # Seeding twice doesn't duplicate
+
+    template, _ = sender.select("reminder", context_bucket(0.8, 0.9), "calm")
+    sender.issue("iv-1", template)
+
+    assert receiver.record_response("iv-1", engaged=True) == template.template_id
+    assert receiver.record_response("iv-1", engaged=True) is None  # Counted once
+
+    restarted = InterventionTemplateBank(SupabaseTemplateStore(db))
+    stats = {s["template_id"]: s for s in restarted.stats()}
+    assert stats[template.template_id]["sent"] == 1
+    assert stats[template.template_id]["engaged"] == 1
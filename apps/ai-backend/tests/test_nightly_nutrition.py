@@ -0,0 +1,113 @@
+"""Tests for the nightly nutrition intelligence recompute"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.nutrition_intelligence.nightly import (
+    NightlyNutritionPipeline,
+    NutritionStateStore,
+    SupabaseNutritionLogSource,
+    SupabaseNutritionStateStore,
+    SyntheticNutritionLogSource,
+)
+from tests.fake_supabase import FakeSupabase
+
+
+class FlakySource(SyntheticNutritionLogSource):
+    """Synthetic source whose second log fetch fails once"""
+
+    def __init__(self, n_clients: int):
+        super().__init__(n_clients, days=60)
+        self.fetches = 0
+
+    def fetch_logs(self, client_ids, start, end):
+        self.fetches += 1
+        if self.fetches == 2:
+            raise RuntimeError("connection reset")
+        return super().fetch_logs(client_ids, start, end)
+
+
+@pytest.fixture(params=["sqlite", "supabase"])
+def store(request, tmp_path):
+    if request.param == "supabase":
+        yield SupabaseNutritionStateStore(FakeSupabase())
+        return
+    s = NutritionStateStore(tmp_path / "nutrition_state.sqlite3")
+    yield s
+    s.close()
+
+
+def test_run_writes_state_for_every_client(store):
+    """Every client gets a precomputed state row"""
+    pipeline = NightlyNutritionPipeline(
+        SyntheticNutritionLogSource(120, days=60), store, page_size=50, chunk_size=20, workers=0
+    )
+
+    stats = pipeline.run(as_of=date(2026, 3, 1))
+
+    assert stats.clients_read == 120
+    assert stats.clients_written == 120
+    assert stats.pages == 3
+    state = store.get("client-00000042")
+    assert state["as_of"] == "2026-03-01"
+    assert state["expenditure"]["tdee_lower_kcal"] < state["expenditure"]["tdee_kcal"]
+    assert state["adaptation"]["severity"] in ("none", "mild", "moderate", "severe")
+
+
+def test_interrupted_run_resumes_after_last_page(store):
+    """A crashed run resumes from its checkpoint and then reports complete"""
+    pipeline = NightlyNutritionPipeline(
+        FlakySource(120), store, page_size=50, chunk_size=20, workers=0
+    )
+
+    with pytest.raises(RuntimeError):
+        pipeline.run(as_of=date(2026, 3, 1))
+    assert store.get_checkpoint("nightly-2026-03-01")["cursor"] == "client-00000049"
+    assert store.get("client-00000060") is None
+
+    resumed = pipeline.run(as_of=date(2026, 3, 1))
+
+    assert resumed.resumed_after == "client-00000049"
+    assert resumed.clients_read == 70
+    assert store.get("client-00000119") is not None
+    assert pipeline.run(as_of=date(2026, 3, 1)).already_complete
+
+
+def test_supabase_source_reads_past_the_row_cap():
+    """Logs are fetched in client batches and pages, not one capped request"""
+    clients = [f"c{i:03d}" for i in range(30)]
+    rows = [
+        {"id": f"{cid}-{d}", "client_id": cid, "logged_date": (date(2026, 1, 1) + timedelta(days=d)).isoformat(),
+         "body_weight": 180.0, "calories": 2200, "protein_g": 150, "carbs_g": 200, "fat_g": 70}
+        for cid in clients for d in range(59)
+    ]
+    supabase = FakeSupabase({"nutrition_logs": rows})
+    source = SupabaseNutritionLogSource(supabase)
+    source.CLIENT_BATCH = 20
+
+    logs = source.fetch_logs(clients, date(2026, 1, 1), date(2026, 3, 31))
+
+    assert len(rows) > 1000
+    assert [len(c.intake_data) for c in logs] == [59] * 30
+    assert all(len(c.weight_data) == 59 for c in logs)
+    assert max(supabase.in_sizes) == 20
+
+
+def test_supabase_store_upserts_state_in_bulk():
+    """A page of results is one upsert per batch, and re-runs overwrite"""
+    supabase = FakeSupabase()
+    store = SupabaseNutritionStateStore(supabase)
+    store.WRITE_BATCH = 40
+    pipeline = NightlyNutritionPipeline(
+        SyntheticNutritionLogSource(100, days=60), store, page_size=100, chunk_size=50, workers=0
+    )
+
+    pipeline.run(as_of=date(2026, 3, 1))
+    pipeline.run(as_of=date(2026, 3, 2))
+
+    rows = supabase.tables["nutrition_client_state"]
+    assert len(rows) == 100
+    assert {row["as_of"] for row in rows} == {"2026-03-02"}
+    assert store.get("client-00000007")["as_of"] == "2026-03-02"
+    assert store.get_checkpoint("nightly-2026-03-02")["clients_written"] == 100
@@ -0,0 +1,124 @@
+"""Tests for the heap-based notification scheduler"""
+
+from datetime import datetime, time
+
+from app.habits.context_notifications import (
+    ContextNotificationEngine,
+    NotificationContext,
+    NotificationStrategy,
+    NotificationTiming,
+    NotificationTrigger,
+)
+from app.habits.notification_scheduler import NotificationScheduler, SupabaseNotificationStore
+from tests.fake_supabase import FakeSupabase
+
+
+def _trigger(context, at, priority=5):
+    return NotificationTrigger(
+        context=context,
+        timing=NotificationTiming.START_HABIT_WINDOW,
+        priority=priority,
+        title="Reminder",
+        message="Time for your habit",
+        action_text="Log it",
+        trigger_conditions={"time": at},
+        reasoning="",
+        expected_engagement=0.5,
+    )
+
+
+def _strategy(habit_id, *triggers):
+    return NotificationStrategy(
+        habit_id=habit_id,
+        habit_name=habit_id,
+        triggers=list(triggers),
+        max_daily_notifications=2,
+        quiet_hours=(time(22, 0), time(7, 0)),
+    )
+
+
+def test_due_enforces_limits_and_rearms_daily():
+    """Higher priority wins the per-user cap; completed habits stay quiet"""
+    scheduler = NotificationScheduler(engine=ContextNotificationEngine(), max_daily_per_user=2)
+    morning = datetime(2026, 3, 2, 6, 0)
+    scheduler.register("u1", _strategy("walk", _trigger(NotificationContext.TIME_OF_DAY, "08:00", 3)), morning)
+    scheduler.register("u1", _strategy("water", _trigger(NotificationContext.TIME_OF_DAY, "08:00", 5)), morning)
+    scheduler.register("u1", _strategy("read", _trigger(NotificationContext.STREAK_RISK, "07:30", 4)), morning)
+    scheduler.register("u2", _strategy("walk", _trigger(NotificationContext.STREAK_RISK, "08:00")), morning)
+    scheduler.mark_completed("u2", "walk", morning.date())
+
+    assert scheduler.due(datetime(2026, 3, 2, 7, 0)) == []
+    due = scheduler.due(datetime(2026, 3, 2, 8, 0))
+
+    assert [(d.user_id, d.habit_id) for d in due] == [("u1", "water"), ("u1", "read")]
+    assert scheduler.sent_today("u1", morning.date()) == 2
+    assert scheduler.stats.suppressed == {"user_daily_limit": 1, "completed": 1}
+
+    # Re-armed for tomorrow; rescheduling "water" drops its 08:00 entry
+    noon = datetime(2026, 3, 2, 12, 0)
+    scheduler.register("u1", _strategy("water", _trigger(NotificationContext.TIME_OF_DAY, "09:00", 5)), noon)
+    tomorrow = scheduler.due(datetime(2026, 3, 3, 8, 30))
+    assert sorted((d.user_id, d.habit_id) for d in tomorrow) == [("u1", "read"), ("u1", "walk"), ("u2", "walk")]
+    assert scheduler.due(datetime(2026, 3, 3, 9, 0)) == []  # "water" hits the cap
+    # Polling resumes after an outage: overdue triggers are skipped, not sent
+    assert scheduler.due(datetime(2026, 3, 6, 12, 0)) == []
+    assert scheduler.stats.suppressed["missed"] == 4
+    assert scheduler.next_fire_at() == datetime(2026, 3, 7, 7, 30)
+
+
+def test_fire_event_only_reaches_the_users_registered_habits():
+    """Events use the per-user habit index; unregistered habits and old counters drop out"""
+    scheduler = NotificationScheduler(engine=ContextNotificationEngine(), max_daily_per_user=3)
+    morning = datetime(2026, 3, 2, 6, 0)
+    for user_id, habit_id in (("u1", "gym"), ("u1", "stretch"), ("u2", "gym")):
+        scheduler.register(user_id, _strategy(habit_id, _trigger(NotificationContext.LOCATION, "08:00")), morning)
+    scheduler.unregister("u1", "stretch")
+
+    fired = scheduler.fire_event("u1", NotificationContext.LOCATION, datetime(2026, 3, 2, 17, 0))
+    assert [(d.user_id, d.habit_id) for d in fired] == [("u1", "gym")]
+    scheduler.fire_event("u2", NotificationContext.LOCATION, datetime(2026, 3, 2, 17, 0))
+    assert set(scheduler._counters) == {"u1", "u2"}
+
+    scheduler.unregister("u2", "gym")
+    assert scheduler.fire_event("u2", NotificationContext.LOCATION, datetime(2026, 3, 3, 17, 0)) == []
+    scheduler.fire_event("u1", NotificationContext.LOCATION, datetime(2026, 3, 3, 17, 0))
+    assert set(scheduler._counters) == {"u1"}
+    assert scheduler.sent_today("u1", datetime(2026, 3, 3).date()) == 1
+
+
+def test_registrations_and_counters_are_shared_through_the_store():
+    """A worker sees API-instance registrations; a restart rebuilds the heap"""
+    supabase = FakeSupabase()
+
+    def instance():
+        return NotificationScheduler(
+            engine=ContextNotificationEngine(),
+            max_daily_per_user=1,
+            store=SupabaseNotificationStore(supabase),
+        )
+
+    api, worker = instance(), instance()
+    morning = datetime(2026, 3, 2, 6, 0)
+    worker.load(morning)
+    api.register("u1", _strategy("walk", _trigger(NotificationContext.TIME_OF_DAY, "08:00")), morning)
+    api.register("u1", _strategy("read", _trigger(NotificationContext.STREAK_RISK, "08:00", 3)), morning)
+    api.register("u2", _strategy("gym", _trigger(NotificationContext.LOCATION, "08:00")), morning)
+    api.mark_completed("u1", "read", morning.date())
+
+    due = worker.due(datetime(2026, 3, 2, 8, 0))
+    assert [(d.user_id, d.habit_id) for d in due] == [("u1", "walk")]
+
+    # The worker's delivery counts against u1's daily cap on the API instance too
+    api.register("u1", _strategy("stretch", _trigger(NotificationContext.LOCATION, "08:00")), morning)
+    assert api.fire_event("u1", NotificationContext.LOCATION, datetime(2026, 3, 2, 9, 0)) == []
+    counters = supabase.tables["habit_notification_counters"]
+    assert [(c["user_id"], c["day"], c["sent"]) for c in counters] == [("u1", "2026-03-02", 1)]
+    assert worker.stats.suppressed == {"completed": 1}
+
+    # A fresh instance rebuilds from the store; unregistered habits stay gone
+    api.unregister("u1", "read")
+    restarted = instance()
+    assert restarted.load(datetime(2026, 3, 2, 12, 0)) == 3
+    assert restarted.next_fire_at() == datetime(2026, 3, 3, 8, 0)
+    fired = restarted.fire_event("u2", NotificationContext.LOCATION, datetime(2026, 3, 2, 17, 0))
+    assert [(d.user_id, d.habit_id) for d in fired] == [("u2", "gym")]
@@ -0,0 +1,69 @@
+"""Tests for program-level auto-regulation"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.workout_gen.autoregulation import LoadManager, ReadinessScore
+from app.workout_gen.generator import Exercise, Workout
+from app.workout_gen.program_autoregulation import ProgramAutoregulator, ProgramTable
+
+
+def make_program(n_workouts: int) -> list[Workout]:
+    return [
+        Workout(
+            day_number=d % 4 + 1,
+            week_number=d // 4 + 1,
+            name="Full Body",
+            exercises=[
+                Exercise(name="Squat", sets=5, reps="5", rpe=8.0),
+                Exercise(name="Bench Press", sets=4, reps="6-8", rpe=9.8),
+                Exercise(name="Plank", sets=3, reps="60s"),
+            ],
+        )
+        for d in range(n_workouts)
+    ]
+
+
+def test_composite_scores_match_load_manager():
+    """Vectorized readiness equals the scalar calculation, missing metrics included"""
+    hrv = [95.0, 30.0, np.nan, 70.0]
+    sleep = [8.0, 5.0, 10.5, np.nan]
+    rhr = [55, 70, np.nan, 62]
+    baseline = [58, 58, 58, 58]
+
+    composite = ProgramAutoregulator().composite_scores(
+        hrv_score=hrv, sleep_duration_hours=sleep, resting_heart_rate=rhr, baseline_rhr=baseline
+    )
+
+    manager = LoadManager()
+    for i in range(4):
+        expected = asyncio.run(manager.calculate_readiness(
+            hrv_score=None if np.isnan(hrv[i]) else hrv[i],
+            sleep_duration_hours=None if np.isnan(sleep[i]) else sleep[i],
+            resting_heart_rate=None if np.isnan(rhr[i]) else int(rhr[i]),
+            baseline_rhr=baseline[i],
+        ))
+        assert composite[i] == pytest.approx(expected.composite_score)
+
+
+def test_adjust_program_matches_per_exercise_rules():
+    """Only the remaining block is adjusted, with adjust_workout_load's rules"""
+    autoregulator = ProgramAutoregulator()
+    table = ProgramTable.from_workouts(make_program(12), {"Squat": 140.0})
+    adjustments = autoregulator.adjustments([95.0, 80.0, 65.0, 50.0, 20.0, 85.0, 85.0, 85.0])
+
+    adjusted = autoregulator.adjust_program(table, adjustments, start=4)
+    workouts = adjusted.to_workouts()
+
+    assert workouts[0].exercises[0].sets == 5
+    manager = LoadManager()
+    for i, adjustment in enumerate(adjustments, start=4):
+        readiness = ReadinessScore(recommended_adjustment=adjustment)
+        for planned, actual in zip(table.workouts[i].exercises[:2], workouts[i].exercises):
+            sets, _, rpe = manager.adjust_workout_load(planned.sets, planned.reps, planned.rpe, readiness)
+            assert (actual.sets, actual.rpe) == (sets, rpe)
+        assert workouts[i].exercises[2].rpe is None
+    assert table.rows["sets"][12] == 5  # Original table untouched
+    assert adjusted.to_records(4, 5)[0]["exercises"][0]["load_kg"] == 140.0
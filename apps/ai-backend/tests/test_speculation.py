@@ -0,0 +1,30 @@
+"""Tests for speculative response generation policy"""
+
+from app.voice.speculation import SpeculationPolicy, transcript_similarity
+
+
+def test_speculates_on_stable_transcripts_and_rejects_divergent_finals():
+    policy = SpeculationPolicy(min_similarity=0.9, stable_updates=2, min_words=3, max_per_turn=1)
+
+    policy.observe("how should I")
+    assert not policy.should_start("how should I")  # Changed since the last result
+    policy.observe("How should I warm up for squats")
+    assert not policy.should_start("How should I warm up for squats")
+    policy.observe("how should I warm up for squats?")  # Same words again
+    assert policy.should_start("how should I warm up for squats?")
+    assert not policy.should_start("ok go")  # Too short to be worth it
+
+    # Punctuation/case don't matter; real changes do
+    assert transcript_similarity("How should I warm up for squats", "how should i warm up for squats?") == 1.0
+    assert policy.matches("how should I warm up for squats", "how should I warm up for my squats")
+    assert not policy.matches("how should I warm up", "how should I cool down")
+    assert not policy.matches(
+        "should I do squats and lunges on my leg day this week",
+        "should I not do squats and lunges on my leg day this week",
+    )
+
+    policy.started()
+    assert not policy.should_start("how should I warm up for squats", endpoint_pending=True)
+    policy.new_turn()
+    assert policy.should_start("what about deadlifts then", endpoint_pending=True)
+    assert policy.stats["started"] == 1
@@ -0,0 +1,85 @@
+"""Tests for the columnar strength progression engine"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.outcome_verification.strength_engine import StrengthProgressionEngine
+from app.outcome_verification.strength_tracker import StrengthVerificationService
+from tests.fake_supabase import FakeSupabase
+
+
+def test_lifts_are_analyzed_independently():
+    """Interleaved lifts get their own rolling e1RM, PRs and fallbacks"""
+    start = datetime(2026, 1, 5, 18, 0)
+    sets = [
+        # (lift, day, weight, reps)
+        ('squat', 0, 200, 5),
+        ('bench', 0, 150, 5),
+        ('squat', 2, 210, 5),
+        ('bench', 2, 150, 5),  # Ties are not PRs
+        ('squat', 4, 205, 5),
+        ('curl', 4, 40, 20),  # Outside the e1RM rep range
+    ]
+
+    analytics = StrengthProgressionEngine().analyze(
+        exercise_ids=[s[0] for s in sets],
+        timestamps=[start + timedelta(days=s[1]) for s in sets],
+        weight=[s[2] for s in sets],
+        reps=[s[3] for s in sets],
+    )
+
+    squat = analytics.lift('squat')
+    assert squat.set_count == 3
+    assert squat.current_e1rm == pytest.approx(210 * (1 + 5 / 30))
+    assert squat.first_session_e1rm == pytest.approx(200 * (1 + 5 / 30))
+    assert squat.pr_count == 1
+    assert squat.max_recent_jump == 10
+    assert analytics.lift('bench').pr_count == 0
+    assert analytics.lift('curl').current_e1rm == 40
+    assert analytics.is_pr[analytics.rows('squat')].tolist() == [False, True, False]
+
+
+def test_progression_rate_and_session_outliers():
+    """Daily best e1RM drives the weekly slope; a single spike gets a high z-score"""
+    start = datetime(2026, 1, 1, 7, 0)
+    days = np.arange(0, 60, 2)
+    weights = 100 + days * 0.5
+    weights[20] += 40  # One implausible session
+
+    analytics = StrengthProgressionEngine().analyze(
+        exercise_ids=['deadlift'] * len(days),
+        timestamps=[start + timedelta(days=int(d)) for d in days],
+        weight=weights,
+        reps=[3] * len(days),
+        rpe=[8.0] * len(days),
+    )
+
+    lift = analytics.lift('deadlift')
+    assert lift.session_count == len(days)
+    assert lift.progression_per_week == pytest.approx(0.5 * 1.1 * 7, rel=0.3)
+    assert lift.max_abs_z > 3.5
+    assert np.all(analytics.e1rm_rpe > analytics.e1rm_epley)
+
+
+async def test_client_analysis_reads_every_page_of_sets():
+    """Sets past the 1000-row response cap (the newest ones) are still analyzed"""
+    start = datetime(2026, 1, 1, 18, 0)
+    rows = [
+        {
+            'id': f'set-{i:05d}', 'client_id': 'c1', 'workout_log_id': f'log-{i // 10}',
+            'exercise_id': 'squat', 'weight': 200 + (i // 10), 'reps': 5, 'rpe': None,
+            # Ten sets per session share a timestamp, so paging relies on the id tiebreak
+            'completed_at': (start + timedelta(hours=12 * (i // 10))).isoformat(),
+        }
+        for i in range(1500)
+    ]
+    supabase = FakeSupabase({'workout_sets': rows})
+
+    analytics = await StrengthVerificationService(supabase).analyze_client('c1', start.date().isoformat())
+
+    squat = analytics.lift('squat')
+    assert len(analytics) == 1500
+    assert squat.last_at == datetime.fromisoformat(rows[-1]['completed_at'])
+    assert squat.best_e1rm == pytest.approx(349 * (1 + 5 / 30))
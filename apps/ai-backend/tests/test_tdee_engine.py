@@ -0,0 +1,79 @@
+"""Tests for the Kalman-filtered adaptive TDEE engine"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.nutrition_intelligence.expenditure import IntakeDataPoint, WeightDataPoint
+from app.nutrition_intelligence.tdee_engine import TDEEEngine
+
+
+def simulate(n_clients: int, n_days: int, seed: int = 7):
+    """Energy-balance simulation with noisy scale weights and missing days"""
+    rng = np.random.default_rng(seed)
+    true_tdee = rng.uniform(1800, 3200, n_clients)
+    intake = true_tdee[:, None] - rng.uniform(-300, 700, n_clients)[:, None]
+    intake = intake + rng.normal(0, 150, (n_clients, n_days))
+
+    weight = np.empty((n_clients, n_days))
+    weight[:, 0] = rng.uniform(60, 110, n_clients)
+    for t in range(1, n_days):
+        weight[:, t] = weight[:, t - 1] + (intake[:, t - 1] - true_tdee) / 7700
+
+    scale = weight + rng.normal(0, 0.5, (n_clients, n_days))
+    scale[:, 1:][rng.random((n_clients, n_days - 1)) < 0.3] = np.nan
+    intake[rng.random((n_clients, n_days)) < 0.1] = np.nan
+    return true_tdee, scale, intake
+
+
+def test_batch_recovers_true_tdee():
+    """Batch estimates converge near the simulated TDEE, inside the 95% band"""
+    true_tdee, scale, intake = simulate(200, 56)
+
+    result = TDEEEngine().run(scale, intake, date(2026, 3, 1))
+
+    error = result.latest_tdee - true_tdee
+    assert np.abs(error).mean() < 100
+    assert (np.abs(error) <= 1.96 * result.latest_std).mean() > 0.9
+    assert result.tdee_kcal.shape == (200, 56)
+
+
+def test_staggered_starts_are_independent():
+    """A client's estimates don't depend on which other clients share the batch"""
+    _, scale, intake = simulate(3, 40)
+    scale[1, :15] = np.nan
+    intake[1, :15] = np.nan
+    scale[1, 15] = 80.0
+
+    engine = TDEEEngine()
+    batch = engine.run(scale, intake, date(2026, 3, 1))
+    alone = engine.run(scale[1:2, 15:], intake[1:2, 15:], date(2026, 3, 1))
+
+    assert batch.first_day[1] == 15
+    assert np.isnan(batch.tdee_kcal[1, :15]).all()
+    np.testing.assert_allclose(batch.tdee_kcal[1, 15:], alone.tdee_kcal[0])
+    assert batch.history(1).dates[0] == date(2026, 3, 1) - timedelta(days=24)
+
+
+def test_history_from_unsorted_logs():
+    """Log lists are scattered onto the day grid regardless of order"""
+    start = date(2026, 1, 1)
+    weights = [
+        WeightDataPoint(date=start + timedelta(days=i), weight_kg=80 - 0.05 * i)
+        for i in range(28)
+    ]
+    intake = [
+        IntakeDataPoint(
+            date=start + timedelta(days=i), calories=2200, protein_g=150, carbs_g=200, fat_g=70
+        )
+        for i in range(28)
+    ]
+
+    history = TDEEEngine().history(list(reversed(weights)), intake)
+
+    # 0.35 kg/week loss at 2200 kcal in -> ~2585 kcal out
+    assert history.dates[-1] == start + timedelta(days=27)
+    assert history.latest_tdee == pytest.approx(2585, abs=75)
+    assert history.latest_weight_trend == pytest.approx(-0.35, abs=0.1)
+    assert (history.tdee_lower_kcal < history.tdee_kcal).all()
@@ -0,0 +1,43 @@
+"""Tests for the TTS phrase cache"""
+
+import httpx
+
+from app.voice.tts import ElevenLabsTTS, TTSConfig
+from app.voice.tts_cache import TTSAudioCache
+
+
+async def test_cached_phrase_skips_elevenlabs_and_survives_restart(tmp_path):
+    """Second request is served from memory, a new process from disk; settings change the key"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, content=b"mp3" * 10)
+
+    def tts(cache, **config):
+        client = httpx.AsyncClient(
+            base_url="https://tts.test", transport=httpx.MockTransport(handler)
+        )
+        return ElevenLabsTTS(
+            api_key="key", config=TTSConfig(chunk_size=8, **config), http_client=client, cache=cache
+        )
+
+    cache = TTSAudioCache(tmp_path, max_chars=40)
+    service = tts(cache)
+    assert await service.generate_speech("Nice work, next set.") == b"mp3" * 10
+    # Same phrase modulo case/whitespace
+    assert await service.generate_speech("nice  work,\nnext set.") == b"mp3" * 10
+    assert len(calls) == 1
+    assert service.request_metrics[-1].status == "cached"
+    assert service.request_metrics[-1].chunks == 4
+    assert service.get_latency_stats()["count"] == 1
+
+    restarted = TTSAudioCache(tmp_path, max_chars=40)
+    assert await tts(restarted).generate_speech("Nice work, next set.") == b"mp3" * 10
+    assert len(calls) == 1 and restarted.stats.disk_hits == 1
+
+    # Different voice settings or long text always go to ElevenLabs
+    await tts(restarted, stability=0.9).generate_speech("Nice work, next set.")
+    await tts(restarted).generate_speech("A much longer answer that is not worth caching at all.")
+    assert len(calls) == 3
+    assert restarted.info()["misses"] == 1
@@ -0,0 +1,87 @@
+"""Tests for async ElevenLabs TTS streaming"""
+
+import asyncio
+import json
+
+import httpx
+
+from app.voice import tts as tts_module
+from app.voice.tts import ElevenLabsTTS, TTSConfig, get_tts_service
+
+
+def _tts(handler, **config):
+    client = httpx.AsyncClient(
+        base_url="https://tts.test", transport=httpx.MockTransport(handler)
+    )
+    return ElevenLabsTTS(api_key="key", config=TTSConfig(**config), http_client=client)
+
+
+async def test_stream_reads_ahead_boundedly_and_records_first_byte():
+    """Audio streams in order, reading pauses for a slow consumer, and timing is recorded"""
+    requests = []
+    produced = []
+
+    async def body():
+        for i in range(12):
+            produced.append(i)
+            yield bytes([i]) * 8
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=body())
+
+    tts = _tts(handler, chunk_size=8, queue_chunks=2)
+    received = []
+    async for chunk in tts.stream_text_to_speech("Nice work, next set", voice_id="v1"):
+        received.append(chunk[0])
+        await asyncio.sleep(0)
+        # Reader stays within the queue bound (+1 in hand, +1 being produced)
+        assert len(produced) - len(received) <= 4
+
+    assert received == list(range(12))
+    payload = json.loads(requests[0].content)
+    assert requests[0].url.path == "/v1/text-to-speech/v1/stream"
+    assert payload["text"] == "Nice work, next set" and payload["model_id"] == "eleven_turbo_v2_5"
+
+    metrics = tts.request_metrics[-1]
+    assert metrics.status == "completed"
+    assert metrics.bytes_received == 96 and metrics.chunks == 12
+    assert 0 <= metrics.first_byte_ms <= metrics.total_ms
+    assert tts.get_latency_stats()["count"] == 1
+
+
+async def test_early_stop_cancels_request_and_errors_surface():
+    """Closing the stream early cancels the read; HTTP errors raise to the consumer"""
+    async def endless():
+        while True:
+            await asyncio.sleep(0)
+            yield b"x" * 8
+
+    tts = _tts(lambda request: httpx.Response(200, content=endless()), chunk_size=8)
+    stream = tts.stream_text_to_speech("Rest for ninety seconds")
+    assert await stream.__anext__() == b"x" * 8
+    await stream.aclose()
+    assert tts.request_metrics[-1].status == "cancelled"
+
+    failing = _tts(lambda request: httpx.Response(401, content=b"bad key"))
+    try:
+        async for _ in failing.stream_text_to_speech("Hello"):
+            pass
+        raise AssertionError("expected an error")
+    except RuntimeError as e:
+        assert "401" in str(e)
+    assert failing.request_metrics[-1].status == "error"
+
+
+def test_switching_voice_profile_reuses_the_pooled_client(monkeypatch):
+    """A new profile gets its own config but keeps the one HTTP client"""
+    monkeypatch.setattr(tts_module, "_tts_service", None)
+
+    professional = get_tts_service("professional")
+    client = professional.client
+    energetic = get_tts_service("energetic")
+
+    assert energetic is not professional
+    assert energetic.config.voice_id != professional.config.voice_id
+    assert energetic.client is client and not client.is_closed
+    assert get_tts_service("energetic") is energetic
@@ -0,0 +1,61 @@
+"""Tests for the voice command grammar"""
+
+import pytest
+
+from app.routes.voice import parse_workout_intent
+from app.voice.commands import match_command
+
+
+@pytest.mark.parametrize(
+    "utterance, intent, slots, reply",
+    [
+        ("Okay, next set.", "next_exercise", {}, "Nice work, next set."),
+        ("ten reps at 185 pounds", "log_set", {"reps": 10, "weight": 185, "unit": "lbs"},
+         "Logged 10 reps at 185 pounds."),
+        ("100 kg for 8", "log_set", {"reps": 8, "weight": 100, "unit": "kg"},
+         "Logged 8 reps at 100 kilos."),
+        ("12 at 135", "log_set", {"reps": 12, "weight": 135, "unit": "lbs"},
+         "Logged 12 reps at 135 pounds."),
+        ("did twelve reps", "log_set", {"reps": 12}, "Logged 12 reps."),
+        ("Rest for 2 minutes please", "start_timer", {"seconds": 120}, "Rest for two minutes."),
+        ("start the timer", "start_timer", {"seconds": 90}, "Rest for ninety seconds."),
+        ("That felt like an 8.5", "log_rpe", {"rpe": 8.5}, "Got it, RPE 8.5."),
+        ("skip this one", "skip_exercise", {}, "Skipping it. On to the next one."),
+        ("rest 2.5 minutes", "start_timer", {"seconds": 150.0}, "Rest for 150 seconds."),
+    ],
+)
+def test_commands_match_with_slots(utterance, intent, slots, reply):
+    command = match_command(utterance)
+    assert (command.intent, command.slots, command.reply) == (intent, slots, reply)
+
+
+def test_open_ended_utterances_go_to_the_coach():
+    """Only whole-utterance commands take the fast path"""
+    for utterance in (
+        "What should I do next for my shoulder?",
+        "How many reps should I do at 185?",
+        "I'm done for today, how did I do",
+        "",
+    ):
+        assert match_command(utterance) is None
+
+
+@pytest.mark.parametrize(
+    "transcript, action, parameters",
+    [
+        ("skip squats", "skip_exercise", {}),
+        ("log 5 reps please", "log_set", {"reps": 5}),
+        ("okay I'm done with that, next", "next_exercise", {}),
+        ("can you start the rest timer", "start_timer", {"seconds": 90}),
+        ("log 10 reps at 185 on bench", "log_set", {"reps": 10, "weight": 185, "unit": "lbs"}),
+        ("repeat", "repeat_set", {}),
+        ("how's my form looking", None, None),
+    ],
+)
+def test_stream_intents_still_match_inside_longer_transcripts(transcript, action, parameters):
+    """/voice/stream keeps matching commands that are part of a sentence"""
+    intent = parse_workout_intent(transcript)
+    if action is None:
+        assert intent is None
+    else:
+        assert (intent["action"], intent["parameters"]) == (action, parameters)
@@ -0,0 +1,35 @@
+"""Tests for cutting LLM token streams into speakable fragments"""
+
+import re
+
+from app.voice.segmenter import SentenceSegmenter, split_for_speech
+
+
+def test_token_stream_cuts_at_sentences_and_long_clauses():
+    """Fragments end at sentence/clause boundaries, never inside numbers or abbreviations"""
+    text = (
+        "Nice work! Your squat was 2.5 kg heavier than last week, which is great "
+        "progress for a deload block. Dr. Smith said rest 90 sec. between sets, "
+        "e.g. after the third one. Ready for the next set? Let's go"
+    )
+    segmenter = SentenceSegmenter()
+    fragments = []
+    for token in re.findall(r"\S+|\s+", text):
+        fragments += segmenter.feed(token)
+    fragments.append(segmenter.flush())
+
+    assert fragments == [
+        "Nice work!",
+        "Your squat was 2.5 kg heavier than last week,",
+        "which is great progress for a deload block.",
+        "Dr. Smith said rest 90 sec. between sets,",
+        "e.g. after the third one.",
+        "Ready for the next set?",
+        "Let's go",
+    ]
+    assert split_for_speech(text) == fragments
+    assert segmenter.flush() is None
+
+    # Unpunctuated runs are cut at a word boundary
+    long_run = split_for_speech("rep " * 100, max_chars=50)
+    assert all(len(f) <= 50 for f in long_run) and " ".join(long_run) == ("rep " * 100).strip()
@@ -0,0 +1,101 @@
+"""Tests for the voice session manager"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.voice.session_manager import VoiceCapacityError, VoiceSessionManager
+
+
+class FakeSession:
+    def __init__(self, user_id, **kwargs):
+        self.user_id = user_id
+        self.state = SimpleNamespace(value="listening")
+        self.latency_history = []
+        self.tts = SimpleNamespace(request_metrics=[])
+        self.last_activity = 0.0
+        self.stopped = False
+        self.closed_for = None
+
+    def is_idle(self):
+        return True
+
+    def queue_depths(self):
+        return {"fragments": 1, "audio_chunks": 2}
+
+    async def stop_conversation(self):
+        self.stopped = True
+
+    async def on_close(self, reason):
+        self.closed_for = reason
+
+
+def _turn(first_audio_ms):
+    return SimpleNamespace(
+        endpointing_ms=200.0, stt_ms=1.0, llm_ms=150.0, tts_ms=100.0,
+        first_audio_ms=first_audio_ms, total_ms=first_audio_ms * 2, fast_path=False,
+    )
+
+
+async def test_capacity_idle_eviction_and_shedding():
+    manager = VoiceSessionManager(
+        max_sessions=3,
+        idle_timeout_seconds=60,
+        shed_capacity_fraction=0.5,
+        shed_first_audio_p95_ms=1000,
+        session_factory=FakeSession,
+    )
+    a = await manager.create("a")
+    b = await manager.create("b")
+    # Reconnecting replaces the user's session
+    b2 = await manager.create("b")
+    assert b.stopped and manager.get("b") is b2 and len(manager) == 2
+
+    # Ending a stale handle leaves the new session alone
+    await manager.end("b", b)
+    assert manager.get("b") is b2
+
+    await manager.create("x")
+    with pytest.raises(VoiceCapacityError) as rejected:
+        await manager.create("y")
+    assert rejected.value.retry_after_seconds == 30
+    await manager.end("x")
+
+    # Slow turns: only admit up to half capacity (1 session)
+    a.latency_history.extend(_turn(1500) for _ in range(10))
+    assert manager.is_degraded()
+    with pytest.raises(VoiceCapacityError) as rejected:
+        await manager.create("c")
+    assert rejected.value.retry_after_seconds == 60
+
+    metrics = manager.metrics()
+    assert metrics["active_sessions"] == 2 and not metrics["admitting"] and metrics["degraded"]
+    assert metrics["queue_depths"] == {"fragments": 2, "audio_chunks": 4}
+    assert metrics["latency"]["first_audio_ms"]["p95"] == 1500
+    assert metrics["counters"]["rejected_shed"] == 1
+
+    # Idle sessions are evicted and told why; their turns still count
+    b2.last_activity = 100.0
+    assert await manager.reap_idle(now=120.0) == ["a"]
+    assert a.stopped and a.closed_for == "idle_timeout"
+    assert manager.metrics()["latency"]["count"] == 10
+    assert manager.metrics()["counters"]["evicted_idle"] == 1
+
+
+async def test_concurrent_reconnects_leave_one_session():
+    """Creates for the same user run one at a time; only the last one survives"""
+
+    class SlowStopSession(FakeSession):
+        async def stop_conversation(self):
+            await asyncio.sleep(0.01)  # Replacing yields to the other create
+            self.stopped = True
+
+    manager = VoiceSessionManager(max_sessions=5, session_factory=SlowStopSession)
+    first = await manager.create("a")
+
+    second, third = await asyncio.gather(manager.create("a"), manager.create("a"))
+
+    assert first.stopped and second.stopped and not third.stopped
+    assert manager.get("a") is third and len(manager) == 1
+    assert manager.counters["ended"] == 2
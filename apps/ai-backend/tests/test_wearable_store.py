@@ -0,0 +1,131 @@
+"""Tests for the wearable time-series store"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.wearables.timeseries_store import (
+    Granularity,
+    WearableMetric,
+    WearableTimeSeriesStore,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store backed by a SQLite file on disk"""
+    s = WearableTimeSeriesStore(tmp_path / "wearables.sqlite3")
+    yield s
+    s.close()
+
+
+def test_daily_rollups_merge_across_batches(store):
+    """Rollups from separate ingest batches merge into the same day bucket"""
+    day = datetime(2026, 3, 2, 7, 0)
+    store.append("u1", WearableMetric.HRV, [day], [50.0])
+    store.append("u1", WearableMetric.HRV, [day + timedelta(hours=12)], [70.0])
+
+    block = store.read_rollups("u1", WearableMetric.HRV, day, day, Granularity.DAY)
+
+    assert len(block) == 1
+    assert block.count.tolist() == [2]
+    assert block.mean.tolist() == [60.0]
+    assert block.minimum.tolist() == [50.0]
+    assert block.maximum.tolist() == [70.0]
+    assert block.last.tolist() == [70.0]
+
+
+def test_steps_are_summed_per_day_and_week(store):
+    """Summed metrics report daily and weekly totals"""
+    monday = datetime(2026, 3, 2, 9, 0)  # A Monday
+    timestamps = [monday + timedelta(days=d, hours=h) for d in range(7) for h in (0, 6)]
+    store.append("u1", WearableMetric.STEPS, timestamps, [1000.0] * len(timestamps))
+
+    daily = store.read_rollups("u1", WearableMetric.STEPS, monday, monday + timedelta(days=6))
+    weekly = store.read_rollups(
+        "u1", WearableMetric.STEPS, monday + timedelta(days=3), monday + timedelta(days=6),
+        Granularity.WEEK,
+    )
+
+    assert daily.values.tolist() == [2000.0] * 7
+    assert weekly.dates == [date(2026, 3, 2)]
+    assert weekly.values.tolist() == [14000.0]
+
+
+def test_resync_of_overlapping_window_replaces_samples(store):
+    """Re-syncing an overlapping window does not count samples twice"""
+    monday = datetime(2026, 3, 2, 9, 0)
+    first = [monday + timedelta(days=d) for d in range(4)]
+    store.append("u1", WearableMetric.STEPS, first, [1000.0] * 4)
+    # Client re-sends days 2-3 (day 3 revised upward) plus a new day 4
+    resync = [monday + timedelta(days=d) for d in (2, 3, 4)]
+    store.append("u1", WearableMetric.STEPS, resync, [1000.0, 1500.0, 2000.0])
+
+    daily = store.read_rollups("u1", WearableMetric.STEPS, monday, monday + timedelta(days=4))
+    weekly = store.read_rollups("u1", WearableMetric.STEPS, monday, monday, Granularity.WEEK)
+    ts, values = store.read_raw("u1", WearableMetric.STEPS, monday, monday + timedelta(days=5))
+
+    assert daily.values.tolist() == [1000.0, 1000.0, 1000.0, 1500.0, 2000.0]
+    assert daily.count.tolist() == [1] * 5
+    assert weekly.values.tolist() == [6500.0]
+    assert weekly.count.tolist() == [5]
+    assert values.tolist() == [1000.0, 1000.0, 1000.0, 1500.0, 2000.0]
+    assert len(np.unique(ts)) == len(ts)
+
+
+def test_read_raw_spans_segments_in_time_order(store):
+    """Raw reads concatenate segments and filter to the requested range"""
+    start = datetime(2026, 1, 1)
+    store.append("u1", WearableMetric.RESTING_HR, [start + timedelta(days=2)], [58.0])
+    store.append("u1", WearableMetric.RESTING_HR, [start, start + timedelta(days=5)], [60.0, 55.0])
+
+    ts, values = store.read_raw(
+        "u1", WearableMetric.RESTING_HR, start, start + timedelta(days=3)
+    )
+
+    assert values.tolist() == [60.0, 58.0]
+    assert np.all(np.diff(ts) > 0)
+    assert store.compact("u1", WearableMetric.RESTING_HR) == 2
+    assert store.read_raw("u1", WearableMetric.RESTING_HR, start, start + timedelta(days=6))[1].tolist() == [
+        60.0, 58.0, 55.0
+    ]
+
+
+def test_summarize_reports_mcp_summary_fields(store):
+    """Summaries come from daily rollups with the MCP summary fields"""
+    start = datetime(2026, 1, 1, 6, 0)
+    timestamps = [start + timedelta(days=d) for d in range(10)]
+    store.append("u1", WearableMetric.BODY_WEIGHT, timestamps, [180.0 - d for d in range(10)])
+
+    summary = store.summarize("u1", WearableMetric.BODY_WEIGHT, start, start + timedelta(days=9))
+
+    assert summary["count"] == 10
+    assert summary["latest"] == 171.0
+    assert summary["trend"] == "decreasing"
+    assert summary["trend_slope"] == pytest.approx(-1.0)
+    assert summary["unit"] == "lbs"
+
+
+def test_correlate_aligns_calendar_with_lag(store):
+    """Lagged correlation pairs day d of metric A with day d+lag of metric B"""
+    start = datetime(2026, 1, 1, 8, 0)
+    sleep = [6.0, 8.0, 7.0, 5.0, 9.0, 6.5, 7.5]
+    store.append(
+        "u1", WearableMetric.SLEEP_DURATION,
+        [start + timedelta(days=d) for d in range(7)], sleep,
+    )
+    # HRV tracks the previous night's sleep; one day is missing
+    hrv_days = [d for d in range(1, 8) if d != 4]
+    store.append(
+        "u1", WearableMetric.HRV,
+        [start + timedelta(days=d) for d in hrv_days], [sleep[d - 1] * 10 for d in hrv_days],
+    )
+
+    result = store.correlate(
+        "u1", WearableMetric.SLEEP_DURATION, WearableMetric.HRV,
+        start, start + timedelta(days=7), lag_days=1,
+    )
+
+    assert result["paired_days"] == 6
+    assert result["correlation"] == pytest.approx(1.0)
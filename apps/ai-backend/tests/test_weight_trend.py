@@ -0,0 +1,62 @@
+"""Tests for the weight trend pipeline"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.outcome_verification.weight_tracker import WeightVerificationService
+from app.outcome_verification.weight_trend import WeightSeries, WeightTrendAnalyzer, _ewma
+from tests.fake_supabase import FakeSupabase
+
+
+def _rows(start: date, weights):
+    return [
+        {'id': f'log-{i}', 'logged_date': (start + timedelta(days=i)).isoformat(), 'body_weight': w}
+        for i, w in enumerate(weights)
+    ]
+
+
+def test_typo_is_flagged_and_excluded_from_trend():
+    """A mistyped weigh-in is flagged and does not move the trend or rate"""
+    weights = [200 - 0.2 * i for i in range(28)]
+    weights[20] = 1864.0  # 186.4 typed without the decimal point
+    series = WeightSeries.from_rows(_rows(date(2026, 3, 1), weights))
+
+    trend = WeightTrendAnalyzer().analyze(series)
+
+    assert trend.outlier_count == 1
+    assert trend.days[trend.is_outlier][0] == np.datetime64('2026-03-21')
+    assert trend.weekly_rate == pytest.approx(-1.4, abs=0.01)
+    assert 194 < trend.current < 195.5
+    assert trend.recent_range < 2
+
+
+def test_ewma_matches_recursion_on_irregular_long_history():
+    """Closed-form EWMA equals the step-by-step recursion across rebased blocks"""
+    rng = np.random.default_rng(7)
+    t = np.cumsum(rng.integers(0, 5, 4000)).astype(np.float64)
+    x = 180 + rng.normal(0, 1.5, len(t))
+
+    expected = np.empty_like(x)
+    expected[0] = x[0]
+    for i in range(1, len(x)):
+        alpha = 1 - np.exp(-(t[i] - t[i - 1]) / 4.0)
+        expected[i] = expected[i - 1] + alpha * (x[i] - expected[i - 1])
+
+    assert t[-1] > 500 * 4.0 * 3  # Spans several blocks
+    np.testing.assert_allclose(_ewma(x, t, 4.0), expected, rtol=1e-9)
+
+
+async def test_client_history_reads_every_page_of_weigh_ins():
+    """Years of weigh-ins past the 1000-row response cap keep the latest ones"""
+    start = date(2023, 1, 1)
+    rows = [{**row, 'client_id': 'c1'} for row in _rows(start, [220 - 0.02 * i for i in range(1300)])]
+    rows.append({'id': 'log-no-weight', 'client_id': 'c1', 'logged_date': '2026-01-01', 'body_weight': None})
+    supabase = FakeSupabase({'nutrition_logs': rows})
+
+    trend = await WeightVerificationService(supabase).analyze_client('c1', start)
+
+    assert len(trend.days) == 1300
+    assert trend.days[-1] == np.datetime64(start + timedelta(days=1299))
+    assert trend.current == pytest.approx(220 - 0.02 * 1299, abs=0.5)
@@ -0,0 +1,40 @@
+-- =====================================================
+-- Nightly Nutrition Intelligence State
+-- =====================================================
+-- Written in bulk by the nightly recompute
+-- (apps/ai-backend/app/nutrition_intelligence/nightly.py) and read by
+-- GET /api/v1/nutrition-intelligence/state/{client_id} on every API instance.
+-- The backend uses the service role; clients and trainers may read directly.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS nutrition_client_state (
+    client_id UUID PRIMARY KEY REFERENCES profiles(id) ON DELETE CASCADE,
+    as_of DATE NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL,
+    payload JSONB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS nutrition_pipeline_checkpoints (
+    run_id TEXT PRIMARY KEY,
+    as_of DATE NOT NULL,
+    cursor TEXT,
+    clients_read INTEGER NOT NULL DEFAULT 0,
+    clients_written INTEGER NOT NULL DEFAULT 0,
+    pages INTEGER NOT NULL DEFAULT 0,
+    finished_at TIMESTAMPTZ
+);
+
+ALTER TABLE nutrition_client_state ENABLE ROW LEVEL SECURITY;
+ALTER TABLE nutrition_pipeline_checkpoints ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "client_read_own_nutrition_state"
+  ON nutrition_client_state FOR SELECT
+  USING (client_id = auth.uid());
+
+CREATE POLICY "trainer_read_client_nutrition_state"
+  ON nutrition_client_state FOR SELECT
+  USING (
+    client_id IN (
+      SELECT id FROM client_profiles WHERE trainer_id = auth.uid()
+    )
+  );
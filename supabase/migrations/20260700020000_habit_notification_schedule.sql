@@ -0,0 +1,54 @@
+-- =====================================================
+-- Habit Notification Schedule
+-- =====================================================
+-- Registrations and per-user daily counters for the heap-based scheduler
+-- (apps/ai-backend/app/habits/notification_scheduler.py). Every API instance
+-- writes through to these tables; instances rebuild their heap from them on
+-- startup and apply rows changed since their last sync on every poll.
+-- Accessed by the backend with the service role only.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS habit_notification_registrations (
+    user_id UUID NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    habit_id TEXT NOT NULL,
+    revision TEXT,                 -- Changes whenever the strategy is replaced
+    strategy JSONB,
+    window_time TIME,
+    completed_on DATE,
+    sent_on DATE,
+    sent_today INTEGER NOT NULL DEFAULT 0,
+    active BOOLEAN NOT NULL DEFAULT TRUE,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, habit_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_habit_notification_registrations_updated
+  ON habit_notification_registrations (updated_at);
+
+CREATE TABLE IF NOT EXISTS habit_notification_counters (
+    user_id UUID PRIMARY KEY REFERENCES profiles(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    sent INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Sync watermarks compare updated_at, so the database clock wins over
+-- whatever the writing instance sent
+CREATE OR REPLACE FUNCTION set_habit_notification_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at := NOW();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER habit_notification_registrations_updated_at
+  BEFORE INSERT OR UPDATE ON habit_notification_registrations
+  FOR EACH ROW EXECUTE FUNCTION set_habit_notification_updated_at();
+
+CREATE TRIGGER habit_notification_counters_updated_at
+  BEFORE INSERT OR UPDATE ON habit_notification_counters
+  FOR EACH ROW EXECUTE FUNCTION set_habit_notification_updated_at();
+
+ALTER TABLE habit_notification_registrations ENABLE ROW LEVEL SECURITY;
+ALTER TABLE habit_notification_counters ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,32 @@
+-- =====================================================
+-- JITAI Feature Rows
+-- =====================================================
+-- One row per user with the incrementally updated JITAI features
+-- (apps/ai-backend/app/jitai/feature_store.py). /events writes the rows of
+-- the users it touched; every instance pulls rows changed since its last
+-- sync before scoring. Accessed by the backend with the service role only.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS jitai_features (
+    user_id UUID PRIMARY KEY REFERENCES profiles(id) ON DELETE CASCADE,
+    features JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_jitai_features_updated
+  ON jitai_features (updated_at);
+
+-- Sync watermarks compare updated_at, so the database clock wins
+CREATE OR REPLACE FUNCTION set_jitai_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at := NOW();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jitai_features_updated_at
+  BEFORE INSERT OR UPDATE ON jitai_features
+  FOR EACH ROW EXECUTE FUNCTION set_jitai_updated_at();
+
+ALTER TABLE jitai_features ENABLE ROW LEVEL SECURITY;
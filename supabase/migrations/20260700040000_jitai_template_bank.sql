@@ -0,0 +1,76 @@
+-- =====================================================
+-- JITAI Template Bank
+-- =====================================================
+-- Intervention message templates with their send/engagement counts and the
+-- intervention -> template mapping used to attribute responses
+-- (apps/ai-backend/app/jitai/templates.py). /generate and /log-response can
+-- reach different instances, so both go through the functions below, which
+-- update the counts atomically. Accessed by the backend with the service
+-- role only.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS jitai_templates (
+    template_id TEXT PRIMARY KEY,
+    intervention_type TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    voice TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    action_label TEXT NOT NULL,
+    source TEXT NOT NULL,          -- 'builtin' or 'llm'
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    sent INTEGER NOT NULL DEFAULT 0,
+    engaged INTEGER NOT NULL DEFAULT 0,
+    active BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS jitai_issued_interventions (
+    intervention_id TEXT PRIMARY KEY,
+    template_id TEXT NOT NULL REFERENCES jitai_templates(template_id) ON DELETE CASCADE,
+    issued_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_jitai_issued_interventions_issued
+  ON jitai_issued_interventions (issued_at);
+
+-- Count a send and remember which template it used
+CREATE OR REPLACE FUNCTION issue_jitai_intervention(
+  intervention_id_param TEXT,
+  template_id_param TEXT,
+  issued_at_param TIMESTAMPTZ
+)
+RETURNS VOID AS $$
+BEGIN
+  UPDATE jitai_templates SET sent = sent + 1 WHERE template_id = template_id_param;
+
+  INSERT INTO jitai_issued_interventions (intervention_id, template_id, issued_at)
+  VALUES (intervention_id_param, template_id_param, issued_at_param)
+  ON CONFLICT (intervention_id) DO UPDATE
+    SET template_id = EXCLUDED.template_id, issued_at = EXCLUDED.issued_at;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Consume the mapping (so a response is counted once) and count an
+-- engagement; returns the template id, or NULL if unknown or already logged
+CREATE OR REPLACE FUNCTION record_jitai_response(
+  intervention_id_param TEXT,
+  engaged_param BOOLEAN
+)
+RETURNS TEXT AS $$
+DECLARE
+  issued_template TEXT;
+BEGIN
+  DELETE FROM jitai_issued_interventions
+  WHERE intervention_id = intervention_id_param
+  RETURNING template_id INTO issued_template;
+
+  IF issued_template IS NOT NULL AND engaged_param THEN
+    UPDATE jitai_templates SET engaged = engaged + 1 WHERE template_id = issued_template;
+  END IF;
+
+  RETURN issued_template;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE jitai_templates ENABLE ROW LEVEL SECURITY;
+ALTER TABLE jitai_issued_interventions ENABLE ROW LEVEL SECURITY;